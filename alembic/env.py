@@ -1,10 +1,12 @@
+import asyncio
 import sys
 from pathlib import Path
 
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 
@@ -15,12 +17,13 @@ if str(BASE_DIR) not in sys.path:
 
 from app.config.config_reader import env_config
 from app.database.models import metadata_obj as initialized_metadata_obj
+from app.modules.archive import ARCHIVE_PARTITION_PATTERN
 
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
-config.set_main_option("sqlalchemy.url", f"{env_config.DATABASE_URL_asyncpg}?async_fallback=True")
+config.set_main_option("sqlalchemy.url", env_config.DATABASE_URL_asyncpg)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -33,6 +36,15 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = initialized_metadata_obj
 
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """Skip monthly users_archive partitions: they are created at runtime
+    by users_archive_ensure_partitions() and are not part of the models."""
+    if type_ == "table" and reflected and name and ARCHIVE_PARTITION_PATTERN.match(name):
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -57,32 +69,56 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
         context.run_migrations()
 
 
-def run_migrations_online() -> None:
-    """Run migrations in 'online' mode.
+def do_run_migrations(connection: Connection) -> None:
+    """Run migrations on a sync facade of the async connection.
 
-    In this scenario we need to create an Engine
-    and associate a connection with the context.
+    Migrations (and app.database.migration_helpers) use the regular sync
+    Alembic API; run_sync executes them inside the asyncpg connection.
 
     """
-    connectable = engine_from_config(
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # Хелперы с autocommit_block фиксируют текущую транзакцию — пусть это
+        # будет транзакция одной миграции, а не всей цепочки
+        transaction_per_migration=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    """Create an async Engine and run migrations through it."""
+    connectable = async_engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode.
+
+    In this scenario we need to create an Engine
+    and associate a connection with the context.
 
-        with context.begin_transaction():
-            context.run_migrations()
+    """
+    asyncio.run(run_async_migrations())
 
 
 if context.is_offline_mode():
@@ -0,0 +1,59 @@
+"""Регистронезависимый email: уникальный индекс по lower(email)
+
+Revision ID: 7d41e0b9c3a5
+Revises: 3c9a1f7d2b64
+Create Date: 2026-10-19 14:21:07.302115
+
+Индексы строятся и удаляются `CONCURRENTLY` вне транзакции миграции, поэтому
+запись в `users` не блокируется. Email нормализуется пачками (`backfill_column`),
+чтобы не держать блокировки всех строк одним `UPDATE`. Удаляется `ix_users_email`:
+уникальность по email с учётом регистра слабее новой по `lower(email)`, а поиск
+идёт по `lower(email)`. Составной `idx_user_email_is_hidden` остаётся.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.database.migration_helpers import (
+    backfill_column,
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d41e0b9c3a5'
+down_revision: Union[str, Sequence[str], None] = '3c9a1f7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not op.get_context().as_sql:
+        duplicates = op.get_bind().execute(sa.text(
+            'SELECT lower(email) FROM users GROUP BY lower(email) HAVING count(*) > 1 LIMIT 10'
+        )).scalars().all()
+        if duplicates:
+            raise RuntimeError(
+                'Есть email, отличающиеся только регистром; объедините пользователей '
+                f'перед миграцией: {", ".join(duplicates)}'
+            )
+
+    create_index_concurrently('ux_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+
+    # Уникальный индекс уже не даст нормализации создать дубликаты
+    if op.get_context().as_sql:
+        # В offline-режиме пачки не вычислить: скрипт применяют вручную
+        op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+    else:
+        backfill_column('users', 'email', 'lower(email)', only_null=False, where='email <> lower(email)')
+
+    drop_index_concurrently('ix_users_email', 'users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    create_index_concurrently('ix_users_email', 'users', ['email'], unique=True)
+    drop_index_concurrently('ux_users_email_lower', 'users')
@@ -0,0 +1,59 @@
+"""Уведомления об изменениях users (NOTIFY users_changes)
+
+Revision ID: a5e2c8d40f17
+Revises: 7d41e0b9c3a5
+Create Date: 2026-10-19 16:02:44.871930
+
+Триггер шлёт `pg_notify('users_changes', ...)` после вставки и после
+изменения строки (если строка действительно изменилась). Номер события
+берётся из последовательности `users_change_seq` — он общий для всех воркеров
+и служит `id` события SSE. Уведомление уходит только при фиксации транзакции.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5e2c8d40f17'
+down_revision: Union[str, Sequence[str], None] = '7d41e0b9c3a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SEQUENCE IF NOT EXISTS users_change_seq")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION users_notify_change() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM pg_notify('users_changes', json_build_object(
+                'id', nextval('users_change_seq'),
+                'op', TG_OP,
+                'user_id', NEW.id,
+                'changed_at', now()
+            )::text);
+            RETURN NULL;
+        END;
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER users_notify_insert
+        AFTER INSERT ON users
+        FOR EACH ROW EXECUTE FUNCTION users_notify_change()
+    """)
+    op.execute("""
+        CREATE TRIGGER users_notify_update
+        AFTER UPDATE ON users
+        FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+        EXECUTE FUNCTION users_notify_change()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_notify_update ON users")
+    op.execute("DROP TRIGGER IF EXISTS users_notify_insert ON users")
+    op.execute("DROP FUNCTION IF EXISTS users_notify_change()")
+    op.execute("DROP SEQUENCE IF EXISTS users_change_seq")
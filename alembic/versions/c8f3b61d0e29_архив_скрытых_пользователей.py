@@ -0,0 +1,165 @@
+"""Архив давно скрытых пользователей: users_hidden и секционированная users_archive
+
+Revision ID: c8f3b61d0e29
+Revises: a5e2c8d40f17
+Create Date: 2026-10-19 18:40:12.518204
+
+Скрытые пользователи переносятся задачей архивации (`app.modules.archive`)
+из `users` в `users_archive`, поэтому индексы и сканы `users` не растут за
+счёт «мёртвых» строк. Сама `users` не секционируется: у секционированной
+таблицы уникальные индексы обязаны включать ключ секционирования, что ломает
+глобальную уникальность `lower(email)` (и внешний ключ `orders` при `RANGE`
+по `created_at`).
+
+- `users_hidden` — момент скрытия; ведёт триггер `users_track_hidden`.
+  Уже скрытые пользователи получают `hidden_at = now()` миграции.
+- `users_archive` секционирована помесячно по `archived_at`. Секции на текущий
+  и следующие месяцы создаёт `users_archive_ensure_partitions(months_ahead)`;
+  задача архивации вызывает её перед каждым запуском.
+- Триггер `users_email_not_archived` отклоняет вставку email из архива с
+  `unique_violation`, как это сделал бы уникальный индекс. Он берёт
+  разделяемую advisory-блокировку транзакции, а задача архивации на время
+  переноса пачки — исключительную, поэтому проверка не пропустит email,
+  который переносится прямо сейчас.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.database.migration_helpers import lock_timeout
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f3b61d0e29'
+down_revision: Union[str, Sequence[str], None] = 'a5e2c8d40f17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Секций вперёд, создаваемых миграцией
+PARTITIONS_AHEAD = 3
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'users_hidden',
+        sa.Column('user_id', sa.BigInteger(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('hidden_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.create_index('ix_users_hidden_hidden_at', 'users_hidden', ['hidden_at'])
+
+    op.create_table(
+        'users_archive',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('full_name', sa.Text(), nullable=False),
+        sa.Column('is_hidden', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('hidden_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('archived_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'archived_at'),
+        postgresql_partition_by='RANGE (archived_at)',
+    )
+    op.create_index('ix_users_archive_email_lower', 'users_archive', [sa.text('lower(email)')])
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION users_archive_ensure_partitions(months_ahead integer DEFAULT 3)
+        RETURNS integer
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            first_month date := date_trunc('month', now())::date;
+            month_start date;
+            partition_name text;
+            created integer := 0;
+        BEGIN
+            FOR i IN 0..months_ahead LOOP
+                month_start := first_month + make_interval(months => i);
+                partition_name := 'users_archive_' || to_char(month_start, 'YYYY_MM');
+                IF to_regclass(partition_name) IS NULL THEN
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF users_archive FOR VALUES FROM (%L) TO (%L)',
+                        partition_name, month_start, month_start + interval '1 month'
+                    );
+                    created := created + 1;
+                END IF;
+            END LOOP;
+            RETURN created;
+        END;
+        $$
+    """)
+    op.execute(f"SELECT users_archive_ensure_partitions({PARTITIONS_AHEAD})")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION users_track_hidden() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF NEW.is_hidden THEN
+                INSERT INTO users_hidden (user_id) VALUES (NEW.id) ON CONFLICT (user_id) DO NOTHING;
+            ELSE
+                DELETE FROM users_hidden WHERE user_id = NEW.id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION users_email_not_archived() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            -- Одна блокировка на транзакцию, сколько бы строк она ни вставляла
+            PERFORM pg_advisory_xact_lock_shared(hashtext('users_archive'));
+            IF EXISTS (SELECT 1 FROM users_archive WHERE lower(email) = lower(NEW.email)) THEN
+                RAISE EXCEPTION 'duplicate key value violates unique constraint "ux_users_email_lower"'
+                    USING ERRCODE = 'unique_violation',
+                          CONSTRAINT = 'ux_users_email_lower',
+                          DETAIL = format('Key (lower(email))=(%s) already exists in users_archive.', lower(NEW.email));
+            END IF;
+            RETURN NEW;
+        END;
+        $$
+    """)
+
+    with lock_timeout(5000):
+        op.execute("""
+            CREATE TRIGGER users_track_hidden_insert
+            AFTER INSERT ON users
+            FOR EACH ROW WHEN (NEW.is_hidden)
+            EXECUTE FUNCTION users_track_hidden()
+        """)
+        op.execute("""
+            CREATE TRIGGER users_track_hidden_update
+            AFTER UPDATE OF is_hidden ON users
+            FOR EACH ROW WHEN (OLD.is_hidden IS DISTINCT FROM NEW.is_hidden)
+            EXECUTE FUNCTION users_track_hidden()
+        """)
+        op.execute("""
+            CREATE TRIGGER users_email_not_archived
+            BEFORE INSERT OR UPDATE OF email ON users
+            FOR EACH ROW EXECUTE FUNCTION users_email_not_archived()
+        """)
+
+    # Момент скрытия уже скрытых пользователей неизвестен — отсчёт от миграции
+    op.execute("INSERT INTO users_hidden (user_id) SELECT id FROM users WHERE is_hidden ON CONFLICT DO NOTHING")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_email_not_archived ON users")
+    op.execute("DROP TRIGGER IF EXISTS users_track_hidden_update ON users")
+    op.execute("DROP TRIGGER IF EXISTS users_track_hidden_insert ON users")
+
+    # Архивные пользователи возвращаются в users, иначе их данные пропадут
+    op.execute("""
+        INSERT INTO users (id, email, full_name, is_hidden, created_at)
+        SELECT id, email, full_name, is_hidden, created_at FROM users_archive
+    """)
+
+    op.execute("DROP FUNCTION IF EXISTS users_email_not_archived()")
+    op.execute("DROP FUNCTION IF EXISTS users_track_hidden()")
+    op.execute("DROP FUNCTION IF EXISTS users_archive_ensure_partitions(integer)")
+    op.drop_index('ix_users_archive_email_lower', table_name='users_archive')
+    op.drop_table('users_archive')
+    op.drop_index('ix_users_hidden_hidden_at', table_name='users_hidden')
+    op.drop_table('users_hidden')
@@ -1,10 +1,11 @@
 """Пакет DAO для работы с данными в API."""
 
 from .base import BaseDAO
-from .user import UserDAO, user_dao
+from .order import OrderDAO
+from .user import UserDAO
 
 __all__ = [
 	'BaseDAO',
+	'OrderDAO',
 	'UserDAO',
-	'user_dao',
 ]
@@ -1,14 +1,24 @@
 """Базовый слой доступа к данным (DAO)."""
 
-from typing import Any, Optional, Type, TypeVar, Iterable
+import asyncio
+from typing import Any, Awaitable, Callable, Collection, Hashable, Optional, Type, TypeVar, Iterable
 
 from pydantic import BaseModel
 
 from sqlalchemy import Select, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
 
+from app.api.exceptions.base import GatewayTimeoutException
+from app.config.config_reader import env_config
 from app.database.models import Base
 from app.database.connection import db_connection
+from app.modules.coalescing import SingleFlight
+from app.modules.deadline import bind_statement_timeout, current_deadline
+from app.modules.resilience import retry_transient
+
+from .statements import StatementRegistry
 
 
 
@@ -16,6 +26,13 @@ from app.database.connection import db_connection
 TModel = TypeVar('TModel', bound=Base)
 # Тип переменной для Pydantic схем
 TSchema = TypeVar('TSchema', bound=BaseModel)
+# Тип результата чтения
+T = TypeVar('T')
+
+# SQLSTATE нарушения уникальности в PostgreSQL
+UNIQUE_VIOLATION = '23505'
+# SQLSTATE нарушения внешнего ключа в PostgreSQL
+FOREIGN_KEY_VIOLATION = '23503'
 
 
 
@@ -25,7 +42,22 @@ class BaseDAO:
 
     Содержит общие хелперы для выполнения типовых операций чтения данных
     и преобразования ORM-объектов в словари/Pydantic-схемы.
+
+    Attributes:
+        statements (StatementRegistry): Реестр заранее собранных выражений,
+            свой у каждого класса-наследника.
+        single_flight (SingleFlight | None): Объединитель одинаковых чтений
+            (`None` — каждое чтение выполняется отдельно).
     """
+    statements: StatementRegistry = StatementRegistry('BaseDAO')
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """
+        ## Создаёт отдельный реестр выражений для каждого наследника.
+        """
+        super().__init_subclass__(**kwargs)
+        cls.statements = StatementRegistry(cls.__name__)
+
     def __init__(self) -> None:
         """
         ## Инициализирует экземпляр `BaseDAO`.
@@ -34,6 +66,7 @@ class BaseDAO:
             db: Объект подключения к базе данных.
         """
         self.db = db_connection
+        self.single_flight: SingleFlight[Hashable, Any] | None = None
     
     def _return_dict_from_obj(self, obj: Any, model: type[Base]) -> dict:
         """
@@ -69,6 +102,164 @@ class BaseDAO:
         """
         return select(model)
 
+    def _statement(self, name: str, factory: Callable[[], Executable]) -> Executable:
+        """
+        ## Возвращает выражение из реестра класса, собирая его при первом обращении.
+
+        Фабрика должна использовать `bindparam` вместо литералов, чтобы
+        выражение можно было переиспользовать с разными параметрами.
+
+        Args:
+            name (str): Имя выражения в реестре.
+            factory (Callable[[], Executable]): Фабрика выражения.
+
+        Returns:
+            Executable: Выражение SQLAlchemy.
+        """
+        return self.statements.get(name, factory)
+
+    async def run_read(self, session: AsyncSession, read: Callable[[], Awaitable[T]]) -> T:
+        """
+        ## Выполняет идемпотентное чтение в транзакции, повторяя его при обрыве связи с БД.
+
+        Каждая попытка — отдельная транзакция `session.begin()`: после обрыва
+        сессия получает из пула новое соединение. Повторяются только ошибки
+        соединения, с паузами `DB_RETRY_*` в пределах дедлайна запроса.
+
+        Args:
+            session (AsyncSession): Сессия без открытой транзакции.
+            read (Callable[[], Awaitable[T]]): Чтение через методы DAO с этой сессией.
+
+        Returns:
+            T: Результат чтения.
+        """
+        async def attempt() -> T:
+            async with session.begin():
+                return await read()
+
+        return await retry_transient(
+            attempt,
+            breaker=self.db.breaker,
+            attempts=env_config.db_retry_attempts,
+            base_delay=env_config.db_retry_base_delay_ms / 1000,
+            max_delay=env_config.db_retry_max_delay_ms / 1000,
+        )
+
+    async def run_shared_read(
+        self,
+        session: AsyncSession,
+        key: Hashable,
+        read: Callable[[AsyncSession], Awaitable[T]],
+    ) -> T:
+        """
+        ## Выполняет чтение через `run_read`, объединяя одинаковые конкурентные вызовы.
+
+        При включённом `single_flight` к БД идёт одно выполнение на `key`.
+        Оно открывает собственную сессию: сессия первого запроса закрывается,
+        если его клиент отключится, а результат ещё ждут другие запросы.
+        `statement_timeout` берётся из дедлайна первого запроса, поэтому
+        каждый вызов ждёт общий результат не дольше своего дедлайна.
+
+        Args:
+            session (AsyncSession): Сессия запроса (используется без `single_flight`).
+            key (Hashable): Ключ чтения: имя запроса и все его параметры.
+            read (Callable[[AsyncSession], Awaitable[T]]): Чтение через методы DAO с переданной сессией.
+
+        Raises:
+            GatewayTimeoutException: Дедлайн вызова истёк раньше общего чтения.
+
+        Returns:
+            T: Результат чтения, общий для объединённых вызовов (не изменять на месте).
+        """
+        if self.single_flight is None:
+            return await self.run_read(session, lambda: read(session))
+
+        async def shared() -> T:
+            async with self.db.get_session() as own:
+                deadline = current_deadline()
+                if deadline is not None:
+                    bind_statement_timeout(own, deadline, env_config.db_statement_timeout_ms)
+                return await self.run_read(own, lambda: read(own))
+
+        deadline = current_deadline()
+        if deadline is None:
+            return await self.single_flight.do(key, shared)
+        # Присоединившийся вызов мог прийти с меньшим бюджетом, чем первый
+        timeout = asyncio.timeout(deadline.remaining())
+        try:
+            async with timeout:
+                return await self.single_flight.do(key, shared)
+        except TimeoutError as exc:
+            if not timeout.expired():
+                raise
+            raise GatewayTimeoutException(deadline.timeout_ms) from exc
+
+    @staticmethod
+    def _constraint_name(exc: IntegrityError) -> str | None:
+        """
+        ## Возвращает имя нарушенного ограничения или индекса.
+
+        psycopg отдаёт его в `diag`, asyncpg — в исходной ошибке драйвера,
+        которую адаптер SQLAlchemy сохраняет в `__cause__`.
+
+        Args:
+            exc (IntegrityError): Ошибка SQLAlchemy.
+
+        Returns:
+            str | None: Имя ограничения, если драйвер его сообщил.
+        """
+        orig = exc.orig
+        diag = getattr(orig, 'diag', None)
+        if diag is not None:
+            return diag.constraint_name
+        return getattr(orig, 'constraint_name', None) or getattr(orig.__cause__, 'constraint_name', None)
+
+    @classmethod
+    def _is_unique_violation(cls, exc: IntegrityError, constraints: Collection[str] | None = None) -> bool:
+        """
+        ## Проверяет, что ошибка целостности — нарушение уникальности.
+
+        Args:
+            exc (IntegrityError): Ошибка SQLAlchemy.
+            constraints (Collection[str] | None): Если заданы — засчитывается только
+                нарушение одного из этих ограничений (индексов).
+
+        Returns:
+            bool: `True` для SQLSTATE `23505` (и подходящего ограничения).
+        """
+        if getattr(exc.orig, 'pgcode', None) != UNIQUE_VIOLATION:
+            return False
+        return constraints is None or cls._constraint_name(exc) in constraints
+
+    @staticmethod
+    def _is_foreign_key_violation(exc: IntegrityError) -> bool:
+        """
+        ## Проверяет, что ошибка целостности — ссылка на несуществующую запись.
+
+        Args:
+            exc (IntegrityError): Ошибка SQLAlchemy.
+
+        Returns:
+            bool: `True` для SQLSTATE `23503`.
+        """
+        return getattr(exc.orig, 'pgcode', None) == FOREIGN_KEY_VIOLATION
+
+    @classmethod
+    def statement_stats(cls) -> dict[str, dict[str, int]]:
+        """
+        ## Собирает статистику реестров всех DAO-классов.
+
+        Returns:
+            dict[str, dict[str, int]]: `{класс DAO: {выражение: использований}}`.
+        """
+        stats: dict[str, dict[str, int]] = {}
+        pending = list(cls.__subclasses__())
+        while pending:
+            dao_cls = pending.pop()
+            stats[dao_cls.__name__] = dao_cls.statements.snapshot()
+            pending.extend(dao_cls.__subclasses__())
+        return stats
+
     @staticmethod
     def _as_schema(
         obj: Optional[Any],
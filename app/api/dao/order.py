@@ -0,0 +1,125 @@
+"""DAO для операций с заказом."""
+
+from sqlalchemy import bindparam, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .base import BaseDAO
+from app.api.exceptions.user import UserNotFoundException
+from app.api.v1.models.request import CreateOrderRequestModel
+from app.api.v1.models.response import OrderResponseModel
+
+from app.database.models import Order
+from app.modules.tracing import traced
+
+
+
+class OrderDAO(BaseDAO):
+    """
+    ## DAO для ресурса заказа.
+
+    Инкапсулирует операции создания и чтения заказов из БД.
+
+    ### Inherits:
+        BaseDAO: Базовый класс DAO-хелперов.
+    """
+    def __init__(self):
+        """
+        ## Инициализация DAO заказа.
+
+        Устанавливает ссылку на модель `Order`.
+        """
+        super().__init__()
+        self.model = Order
+
+    @traced()
+    async def create(
+        self,
+        order: CreateOrderRequestModel,
+        session: AsyncSession
+    ) -> OrderResponseModel:
+        """
+        ## Создать заказ.
+
+        ### Args:
+            order (CreateOrderRequestModel): Данные для создания.
+            session (AsyncSession): Активная сессия БД.
+
+        ### Raises:
+            UserNotFoundException: Владелец заказа не существует.
+
+        ### Returns:
+            OrderResponseModel: Созданный заказ.
+        """
+        stmt = self._statement('create', lambda: (
+            insert(self.model)
+            .values({
+                name: bindparam(name)
+                for name in CreateOrderRequestModel.model_fields
+            })
+            .returning(self.model)
+        ))
+        try:
+            res = await session.execute(stmt, order.model_dump())
+        except IntegrityError as exc:
+            if self._is_foreign_key_violation(exc):
+                raise UserNotFoundException(order.user_id) from exc
+            raise
+        obj = res.scalar_one()
+        return OrderResponseModel(**self._return_dict_from_obj(obj, self.model))
+
+    @traced()
+    async def get_by_id(
+        self,
+        order_id: int,
+        session: AsyncSession
+    ) -> OrderResponseModel | None:
+        """
+        ## Получить заказ по идентификатору.
+
+        ### Args:
+            order_id (int): Идентификатор заказа.
+            session (AsyncSession): Активная сессия БД.
+
+        ### Returns:
+            OrderResponseModel | None: Заказ или `None`, если не найден.
+        """
+        query = self._statement('get_by_id', lambda: (
+            select(self.model).where(self.model.id == bindparam('order_id'))
+        ))
+        res = await session.execute(query, {'order_id': order_id})
+        obj = res.scalar_one_or_none()
+        if not obj:
+            return None
+        return OrderResponseModel(**self._return_dict_from_obj(obj, self.model))
+
+    @traced()
+    async def get_by_user(
+        self,
+        user_id: int,
+        session: AsyncSession
+    ) -> list[OrderResponseModel]:
+        """
+        ## Получить заказы пользователя.
+
+        ### Args:
+            user_id (int): Идентификатор пользователя.
+            session (AsyncSession): Активная сессия БД.
+
+        ### Returns:
+            list[OrderResponseModel]: Заказы по возрастанию `id`.
+        """
+        table = self.model.__table__
+        query = self._statement('get_by_user', lambda: (
+            select(*table.c)
+            .where(table.c.user_id == bindparam('user_id'))
+            .order_by(table.c.id)
+        ))
+        res = await session.execute(query, {'user_id': user_id})
+        return [OrderResponseModel(**row) for row in res.mappings()]
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    'OrderDAO',
+]
@@ -0,0 +1,65 @@
+"""Реестр заранее собранных SQL-выражений для DAO.
+
+Выражения строятся один раз с `bindparam` вместо литералов, поэтому у каждого
+запроса один и тот же cache key SQLAlchemy и один и тот же текст SQL, а значит
+повторно используются и скомпилированная форма, и prepared statement `asyncpg`.
+"""
+
+from collections import Counter
+from typing import Callable
+
+from sqlalchemy.sql import Executable
+
+
+
+class StatementRegistry:
+    """
+    ## Реестр выражений одного DAO-класса.
+
+    Хранит выражения по имени и считает, сколько раз каждое было взято
+    из реестра и сколько раз пришлось его строить.
+    """
+    def __init__(self, owner: str) -> None:
+        """
+        ## Инициализирует пустой реестр.
+
+        ### Args:
+            owner (str): Имя владельца (класса DAO) для статистики.
+        """
+        self.owner = owner
+        self._statements: dict[str, Executable] = {}
+        self._uses: Counter[str] = Counter()
+        self.builds = 0
+
+    def get(self, name: str, factory: Callable[[], Executable]) -> Executable:
+        """
+        ## Возвращает выражение по имени, собирая его при первом обращении.
+
+        ### Args:
+            name (str): Имя выражения в реестре.
+            factory (Callable[[], Executable]): Фабрика, строящая выражение.
+
+        ### Returns:
+            Executable: Готовое к выполнению выражение с `bindparam`.
+        """
+        stmt = self._statements.get(name)
+        if stmt is None:
+            stmt = self._statements[name] = factory()
+            self.builds += 1
+        self._uses[name] += 1
+        return stmt
+
+    def snapshot(self) -> dict[str, int]:
+        """
+        ## Возвращает количество использований каждого выражения.
+
+        ### Returns:
+            dict[str, int]: Словарь `{имя: использований}`.
+        """
+        return dict(self._uses)
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    'StatementRegistry',
+]
@@ -1,13 +1,43 @@
 """DAO для операций с пользователем."""
 
-from sqlalchemy import insert, select
+import asyncio
+from contextlib import aclosing
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Literal
+
+from sqlalchemy import JSON, Select, Text, bindparam, cast, func, insert, literal_column, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from .base import BaseDAO
+from app.api.exceptions.user import UserAlreadyExistsException
 from app.api.v1.models.request import CreateUserRequestModel
-from app.api.v1.models.response import UserResponseModel
+from app.api.v1.models.response import (
+    OrderResponseModel,
+    UserResponseModel,
+    UserWithOrdersResponseModel,
+)
+
+from app.config.config_reader import env_config
+from app.database.models import Order, User, UserArchive
+from app.modules.archive import archive_hidden_users
+from app.modules.bloom import BloomFilterFeed, RefreshableBloomFilter
+from app.modules.coalescing import SingleFlight, WriteCoalescer
+from app.modules.export import arrow_schema, copy_query_chunks, fetch_batches, parquet_chunks
+from app.modules.invalidation import (
+    InvalidationBus,
+    VersionedCache,
+    get_invalidation_bus,
+    invalidate_after_commit,
+)
+from app.modules.logging.app_logger import get_app_logger
+from app.modules.tracing import traced
+
+
 
-from app.database.models import User
+logger = get_app_logger("email_filter")
+archive_logger = get_app_logger("user_archive")
 
 
 
@@ -20,15 +50,60 @@ class UserDAO(BaseDAO):
     ### Inherits:
         BaseDAO: Базовый класс DAO-хелперов.
     """
+    # Занятый email: уникальный индекс и триггер архива сообщают это имя,
+    # остальные нарушения уникальности не означают дубль email
+    EMAIL_CONSTRAINTS = frozenset({'ux_users_email_lower'})
+
     def __init__(self):
         """
         ## Инициализация DAO пользователя.
 
-        Устанавливает ссылку на модель `User`.
+        Устанавливает ссылку на модель `User`, создаёт коалесцер вставок
+        (`USER_WRITE_COALESCE_ENABLED`) и фильтр Блума занятых email
+        (`USER_EMAIL_FILTER_ENABLED`), кэш пользователей по `id`
+        (`USER_CACHE_ENABLED`), подключая кэш и фильтр к шине инвалидации, объединитель
+        одинаковых чтений (`USER_READ_SINGLE_FLIGHT_ENABLED`) и поиск в архиве
+        скрытых пользователей (`USER_ARCHIVE_ENABLED`), если они включены.
         """
         super().__init__()
         self.model = User
+        self.coalescer: WriteCoalescer[dict[str, Any], dict[str, Any]] | None = None
+        if env_config.user_write_coalesce_enabled:
+            self.coalescer = WriteCoalescer(
+                self._flush_new_users,
+                max_batch=env_config.user_write_coalesce_max_batch,
+                max_delay=env_config.user_write_coalesce_max_delay_ms / 1000,
+            )
+        self.email_filter: RefreshableBloomFilter | None = None
+        if env_config.user_email_filter_enabled:
+            self.email_filter = RefreshableBloomFilter(
+                env_config.user_email_filter_capacity,
+                env_config.user_email_filter_error_rate,
+            )
+        self._email_filter_task: asyncio.Task | None = None
+        self._email_filter_lost = asyncio.Event()
+        self.cache: VersionedCache | None = None
+        self.invalidation: InvalidationBus | None = None
+        if env_config.user_cache_enabled:
+            self.cache = VersionedCache(
+                env_config.user_cache_max_entries,
+                env_config.user_cache_ttl_seconds,
+            )
+            self.invalidation = get_invalidation_bus()
+            self.invalidation.subscribe(self.cache)
+        if self.email_filter is not None:
+            # Вставки других воркеров приходят через шину, иначе фильтр отвечал бы «свободен»
+            self.invalidation = get_invalidation_bus()
+            self.invalidation.subscribe(
+                BloomFilterFeed(self.email_filter, self.email_key(''), self._email_filter_lost.set)
+            )
+        if env_config.user_read_single_flight_enabled:
+            self.single_flight = SingleFlight()
+        # Архив читается только после промаха по users: горячий путь не меняется
+        self.archive: type[UserArchive] | None = UserArchive if env_config.user_archive_enabled else None
+        self._archive_task: asyncio.Task | None = None
 
+    @traced()
     async def create(self,
         user: CreateUserRequestModel,
         session: AsyncSession
@@ -37,24 +112,464 @@ class UserDAO(BaseDAO):
         ## Создать пользователя.
 
         Записывает нового пользователя и возвращает сохранённые данные.
+        Email приводится к нижнему регистру (см. `normalize_email`).
+        При включённом коалесцере запись уходит общей пачкой в отдельной
+        транзакции, а `session` не используется.
 
         ### Args:
             user (CreateUserRequestModel): Данные для создания.
             session (AsyncSession): Активная сессия БД.
 
+        ### Raises:
+            UserAlreadyExistsException: Email уже занят.
+
         ### Returns:
             UserResponseModel: Созданный пользователь.
         """
-        stmt = (
+        values = {**user.model_dump(), 'email': self.normalize_email(user.email)}
+        if self.coalescer is not None:
+            row = await self.coalescer.submit(values)
+            self._remember_email(row['email'])
+            # Пачка коалесцера уже зафиксирована в своей транзакции
+            self._invalidate_users(row['id'], emails=[row['email']])
+            return UserResponseModel(**row)
+
+        stmt = self._statement('create', lambda: (
             insert(self.model)
-            .values(**user.model_dump())
+            .values({
+                name: bindparam(name)
+                for name in CreateUserRequestModel.model_fields
+            })
             .returning(self.model)
-        )
-        res = await session.execute(stmt)
+        ))
+        try:
+            res = await session.execute(stmt, values)
+        except IntegrityError as exc:
+            if self._is_unique_violation(exc, self.EMAIL_CONSTRAINTS):
+                raise UserAlreadyExistsException(values['email']) from exc
+            raise
         await session.flush()
         obj = res.scalar_one()
+        self._remember_email(obj.email)
+        self._invalidate_users(obj.id, emails=[obj.email], session=session)
         return UserResponseModel(**self._return_dict_from_obj(obj, self.model))
 
+    @traced()
+    async def _flush_new_users(
+        self,
+        users: list[dict[str, Any]]
+    ) -> list[dict[str, Any] | Exception]:
+        """
+        ## Записать пачку пользователей от коалесцера одной транзакцией.
+
+        `ON CONFLICT DO NOTHING` не даёт одному занятому email откатить всю
+        пачку: конфликтующие строки просто не попадают в `RETURNING`. Email
+        из архива отклоняет триггер, а не индекс, и откатывает пачку — тогда
+        записи вставляются по одной.
+
+        ### Args:
+            users (list[dict]): Данные пользователей (поля `CreateUserRequestModel`).
+
+        ### Returns:
+            list[dict | Exception]: Созданная строка или ошибка для каждого входа.
+        """
+        # Диалект PostgreSQL загружается только при включённом коалесцере
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        table = self.model.__table__
+        stmt = self._statement('create_coalesced', lambda: (
+            pg_insert(table)
+            .values({
+                name: bindparam(name)
+                for name in CreateUserRequestModel.model_fields
+            })
+            .on_conflict_do_nothing()
+            .returning(*table.c)
+        ))
+        try:
+            inserted = await self._insert_rows(stmt, users)
+        except IntegrityError as exc:
+            if not self._is_unique_violation(exc, self.EMAIL_CONSTRAINTS):
+                raise
+            results: list[dict[str, Any] | Exception] = []
+            for user in users:
+                try:
+                    results.extend(self.match_inserted_rows([user], await self._insert_rows(stmt, [user])))
+                except IntegrityError as row_exc:
+                    if not self._is_unique_violation(row_exc, self.EMAIL_CONSTRAINTS):
+                        raise
+                    results.append(UserAlreadyExistsException(user['email']))
+            return results
+        return self.match_inserted_rows(users, inserted)
+
+    async def _insert_rows(self, stmt: Any, users: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        ## Выполнить вставку пачки в отдельной транзакции.
+
+        ### Args:
+            stmt (Any): Выражение `INSERT ... RETURNING`.
+            users (list[dict]): Данные пользователей.
+
+        ### Returns:
+            list[dict]: Вставленные строки.
+        """
+        async with self.db.get_session() as session:
+            async with session.begin():
+                res = await session.execute(stmt, users)
+                return [dict(row) for row in res.mappings()]
+
+    @staticmethod
+    def match_inserted_rows(
+        users: list[dict[str, Any]],
+        inserted: list[dict[str, Any]]
+    ) -> list[dict[str, Any] | Exception]:
+        """
+        ## Сопоставить входные записи со строками из `RETURNING` по email.
+
+        Порядок строк `RETURNING` при `ON CONFLICT DO NOTHING` не гарантирован,
+        поэтому сопоставление идёт по уникальному email. Из дублей внутри
+        пачки строку получает первый, остальные — ошибку конфликта.
+
+        ### Args:
+            users (list[dict]): Входные записи в порядке ожидающих запросов.
+            inserted (list[dict]): Вставленные строки.
+
+        ### Returns:
+            list[dict | Exception]: Строка или `UserAlreadyExistsException` на каждый вход.
+        """
+        by_email = {row['email']: row for row in inserted}
+        return [
+            by_email.pop(user['email'], None) or UserAlreadyExistsException(user['email'])
+            for user in users
+        ]
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        """
+        ## Привести email к виду, в котором он хранится в БД.
+
+        Email сравниваются без учёта регистра (уникальный индекс по
+        `lower(email)`), поэтому хранится и ищется нижний регистр.
+
+        ### Args:
+            email (str): Email в произвольном регистре.
+
+        ### Returns:
+            str: Email без пробелов по краям в нижнем регистре.
+        """
+        return email.strip().lower()
+
+    async def aclose(self) -> None:
+        """
+        ## Остановить пересборку фильтра email и архивацию и дописать
+        накопленные в коалесцере записи (при остановке приложения).
+        """
+        if self._email_filter_task is not None:
+            self._email_filter_task.cancel()
+            await asyncio.gather(self._email_filter_task, return_exceptions=True)
+            self._email_filter_task = None
+        if self._archive_task is not None:
+            self._archive_task.cancel()
+            await asyncio.gather(self._archive_task, return_exceptions=True)
+            self._archive_task = None
+        if self.coalescer is not None:
+            await self.coalescer.drain()
+
+    def _remember_email(self, email: str) -> None:
+        """
+        ## Добавить email в фильтр Блума своего воркера (если он включён).
+
+        Другие воркеры получают email через шину (см. `_invalidate_users`).
+        Если транзакция потом откатится, фильтр лишь чаще будет отвечать
+        «возможно занят» — ложноотрицательных ответов это не создаёт.
+
+        ### Args:
+            email (str): Записанный email.
+        """
+        if self.email_filter is not None:
+            self.email_filter.add(email)
+
+    @staticmethod
+    def cache_key(user_id: int) -> str:
+        """
+        ## Ключ пользователя в кэше и шине инвалидации.
+
+        ### Args:
+            user_id (int): Идентификатор пользователя.
+
+        ### Returns:
+            str: Ключ вида `user:<id>`.
+        """
+        return f'user:{user_id}'
+
+    @staticmethod
+    def email_key(email: str) -> str:
+        """
+        ## Ключ занятого email в шине инвалидации (пополняет фильтры Блума).
+
+        ### Args:
+            email (str): Нормализованный email.
+
+        ### Returns:
+            str: Ключ вида `email:<email>`.
+        """
+        return f'email:{email}'
+
+    def _invalidate_users(
+        self,
+        *user_ids: int,
+        emails: list[str] | None = None,
+        session: AsyncSession | None = None,
+    ) -> None:
+        """
+        ## Разослать изменения пользователей во все воркеры.
+
+        Ключи `id` инвалидируют кэш (если он включён), ключи `emails`
+        добавляют созданные email в фильтры Блума других воркеров (если
+        фильтр включён). С `session` ключи уходят в шину только после
+        фиксации её транзакции. Инвалидируется и только что созданный `id`:
+        в кэше мог лежать ответ «не найден».
+
+        ### Args:
+            *user_ids (int): Идентификаторы изменённых пользователей.
+            emails (list[str] | None): Созданные email.
+            session (AsyncSession | None): Сессия с незафиксированными изменениями.
+        """
+        if self.invalidation is None:
+            return
+        keys = []
+        if self.cache is not None:
+            keys.extend(self.cache_key(user_id) for user_id in user_ids)
+        if self.email_filter is not None and emails:
+            keys.extend(self.email_key(email) for email in emails)
+        if not keys:
+            return
+        if session is None:
+            self.invalidation.invalidate(*keys)
+        else:
+            invalidate_after_commit(session, self.invalidation, *keys)
+
+    def email_maybe_taken(self, email: str) -> bool:
+        """
+        ## Проверить email по фильтру Блума без обращения к БД.
+
+        ### Args:
+            email (str): Проверяемый email.
+
+        ### Returns:
+            bool: `False` — email точно свободен; `True` — нужна проверка в БД
+            (в том числе когда фильтр выключен или ещё не собран).
+        """
+        if self.email_filter is None:
+            return True
+        return self.email_filter.might_contain(self.normalize_email(email))
+
+    @traced()
+    async def email_exists(self, email: str, session: AsyncSession) -> bool:
+        """
+        ## Проверить по БД, занят ли email.
+
+        ### Args:
+            email (str): Проверяемый email.
+            session (AsyncSession): Активная сессия БД.
+
+        ### Returns:
+            bool: `True`, если пользователь с таким email существует (в том числе в архиве).
+        """
+        if self.archive is not None:
+            # Занятый email чаще всего не найден: один запрос вместо двух
+            query = self._statement('email_exists_with_archive', lambda: (
+                select(self.model.id)
+                .where(func.lower(self.model.email) == bindparam('email'))
+                .union_all(
+                    select(self.archive.id)
+                    .where(func.lower(self.archive.email) == bindparam('email'))
+                )
+                .limit(1)
+            ))
+        else:
+            query = self._statement('email_exists', lambda: (
+                select(self.model.id)
+                .where(func.lower(self.model.email) == bindparam('email'))
+                .limit(1)
+            ))
+        res = await session.execute(query, {'email': self.normalize_email(email)})
+        return res.scalar_one_or_none() is not None
+
+    @traced()
+    async def rebuild_email_filter(self, batch_size: int = 10000) -> None:
+        """
+        ## Пересобрать фильтр Блума, прочитав все email потоком.
+
+        Строки читаются серверным курсором пачками по `batch_size`, поэтому
+        таблица не загружается в память целиком. Email из архива тоже
+        считаются занятыми.
+
+        ### Args:
+            batch_size (int): Количество строк в одной выборке курсора.
+        """
+        if self.email_filter is None:
+            return
+
+        tables = [self.model] if self.archive is None else [self.model, self.archive]
+
+        async def emails(session: AsyncSession) -> AsyncIterator[str]:
+            for table in tables:
+                res = await session.stream_scalars(
+                    select(func.lower(table.email)).execution_options(yield_per=batch_size)
+                )
+                async for email in res:
+                    yield email
+
+        async with self.db.get_session() as session:
+            async with session.begin():
+                total = 0
+                for table in tables:
+                    total += await session.scalar(select(func.count()).select_from(table)) or 0
+                await self.email_filter.rebuild(emails(session), expected=total)
+
+    def start_email_filter_refresh(self, interval: float) -> None:
+        """
+        ## Запустить фоновую сборку фильтра email и его периодическую пересборку.
+
+        Email, созданные другими воркерами, приходят через шину инвалидации.
+        Пересборка подхватывает вставки в обход API (засев, архив), а при
+        потере сообщений шины запускается сразу.
+
+        ### Args:
+            interval (float): Период пересборки, секунды; `0` — только один раз.
+        """
+        if self.email_filter is None or self._email_filter_task is not None:
+            return
+        self._email_filter_task = asyncio.create_task(
+            self._refresh_email_filter_forever(interval),
+            name='email-filter-refresh',
+        )
+
+    def start_archiving(self, interval: float) -> None:
+        """
+        ## Запустить периодическую архивацию давно скрытых пользователей в фоне.
+
+        Несколько воркеров могут архивировать одновременно: пачки не
+        пересекаются (`FOR UPDATE SKIP LOCKED`).
+
+        ### Args:
+            interval (float): Период запуска, секунды; `0` — архивация только из CLI.
+        """
+        if self.archive is None or interval <= 0 or self._archive_task is not None:
+            return
+        self._archive_task = asyncio.create_task(self._archive_forever(interval), name='user-archive')
+
+    async def _archive_forever(self, interval: float) -> None:
+        """
+        ## Цикл архивации; ошибка БД не останавливает цикл.
+
+        ### Args:
+            interval (float): Период запуска, секунды.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with self.db.engine.connect() as connection:
+                    result = await archive_hidden_users(
+                        connection,
+                        hidden_days=env_config.user_archive_hidden_days,
+                        batch_size=env_config.user_archive_batch_size,
+                        months_ahead=env_config.user_archive_partitions_ahead,
+                        lock_timeout_ms=env_config.user_archive_lock_timeout_ms,
+                    )
+                archive_logger.info(f"Архивация скрытых пользователей: {result}")
+            except Exception as exc:
+                archive_logger.error(f"Не удалось архивировать скрытых пользователей: {exc!r}")
+
+    async def _refresh_email_filter_forever(self, interval: float) -> None:
+        """
+        ## Цикл пересборки фильтра; ошибка БД не останавливает цикл.
+
+        Следующая пересборка начинается через `interval` секунд или сразу,
+        как только шина сообщит о потерянных сообщениях.
+
+        ### Args:
+            interval (float): Период пересборки, секунды; `0` — только при
+                старте и после потери сообщений шины.
+        """
+        while True:
+            self._email_filter_lost.clear()
+            try:
+                await self.rebuild_email_filter()
+                logger.info(f"Фильтр email пересобран: {self.email_filter.stats()}")
+            except Exception as exc:
+                logger.error(f"Не удалось пересобрать фильтр email: {exc!r}")
+            try:
+                await asyncio.wait_for(self._email_filter_lost.wait(), interval if interval > 0 else None)
+            except TimeoutError:
+                pass
+
+    @traced()
+    async def create_many(
+        self,
+        users: list[dict[str, Any]],
+        session: AsyncSession
+    ) -> list[dict[str, Any]]:
+        """
+        ## Создать пачку пользователей одним выражением.
+
+        Записи уже валидированы (см. `validate_new_users_json`), поэтому
+        работаем со словарями без построения pydantic-моделей на event loop.
+        Email приводятся к нижнему регистру, как в `create`.
+        SQLAlchemy отправляет пачку как multi-row `INSERT ... RETURNING`.
+
+        ### Args:
+            users (list[dict]): Данные пользователей (поля `CreateUserRequestModel`).
+            session (AsyncSession): Активная сессия БД.
+
+        ### Returns:
+            list[dict]: Созданные строки в порядке входных данных.
+        """
+        if not users:
+            return []
+        users = [{**user, 'email': self.normalize_email(user['email'])} for user in users]
+        table = self.model.__table__
+        stmt = self._statement('create_many', lambda: (
+            insert(table).returning(*table.c, sort_by_parameter_order=True)
+        ))
+        res = await session.execute(stmt, users)
+        rows = [dict(row) for row in res.mappings()]
+        for row in rows:
+            self._remember_email(row['email'])
+        self._invalidate_users(
+            *(row['id'] for row in rows),
+            emails=[row['email'] for row in rows],
+            session=session,
+        )
+        return rows
+
+    @traced()
+    async def get_all_rows(self, session: AsyncSession) -> list[dict[str, Any]]:
+        """
+        ## Получить всех пользователей в виде словарей.
+
+        В отличие от `get_all` не строит ORM-объекты и pydantic-модели —
+        сериализацию можно вынести из event loop целиком. При включённом
+        архиве к строкам `users` добавляются архивные.
+
+        ### Args:
+            session (AsyncSession): Активная сессия БД.
+
+        ### Returns:
+            list[dict]: Строки таблицы `users` (и `users_archive`).
+        """
+        table = self.model.__table__
+        if self.archive is not None:
+            query = self._statement('get_all_rows_with_archive', lambda: (
+                select(*table.c).union_all(select(*self._archive_columns()))
+            ))
+        else:
+            query = self._statement('get_all_rows', lambda: select(*table.c))
+        res = await session.execute(query)
+        return [dict(row) for row in res.mappings()]
+
+    @traced()
     async def get_all(self, session: AsyncSession) -> list[UserResponseModel]:
         """
         ## Получить всех пользователей.
@@ -65,7 +580,9 @@ class UserDAO(BaseDAO):
         ### Returns:
             list[UserResponseModel]: Коллекция пользователей.
         """
-        query = select(self.model)
+        if self.archive is not None:
+            return [UserResponseModel(**row) for row in await self.get_all_rows(session)]
+        query = self._statement('get_all', lambda: select(self.model))
         res = await session.execute(query)
         objects = res.scalars().all()
         return [
@@ -73,6 +590,7 @@ class UserDAO(BaseDAO):
             for obj in objects
         ]
     
+    @traced()
     async def get_by_id(
         self,
         user_id: int,
@@ -81,6 +599,11 @@ class UserDAO(BaseDAO):
         """
         ## Получить пользователя по идентификатору.
 
+        При включённом кэше (`USER_CACHE_ENABLED`) ответ, в том числе «не найден»,
+        берётся из памяти воркера. Токен версии берётся до запроса в БД:
+        если пользователя инвалидируют во время чтения, результат не попадёт в кэш.
+        Не найденный в `users` пользователь ищется в архиве (`USER_ARCHIVE_ENABLED`).
+
         ### Args:
             user_id (int): Идентификатор пользователя.
             session (AsyncSession): Активная сессия БД.
@@ -88,13 +611,297 @@ class UserDAO(BaseDAO):
         ### Returns:
             UserResponseModel | None: Пользователь или `None`, если не найден.
         """
-        query = select(self.model).where(self.model.id == user_id)
-        res = await session.execute(query)
+        if self.cache is not None:
+            key = self.cache_key(user_id)
+            hit, cached = self.cache.lookup(key)
+            if hit:
+                return cached
+            token = self.cache.token()
+        query = self._statement('get_by_id', lambda: (
+            select(self.model).where(self.model.id == bindparam('user_id'))
+        ))
+        res = await session.execute(query, {'user_id': user_id})
+        obj = res.scalar_one_or_none()
+        if obj:
+            user = UserResponseModel(**self._return_dict_from_obj(obj, self.model))
+        else:
+            user = await self._find_archived(
+                session, 'get_archived_by_id', lambda: self.archive.id == bindparam('user_id'), {'user_id': user_id},
+            )
+        if self.cache is not None:
+            self.cache.set(key, user, token)
+        return user
+
+    @staticmethod
+    def page_with_orders_query() -> Select:
+        """
+        ## Запрос страницы пользователей с заказами через `selectinload`.
+
+        Выполняется двумя выражениями на любую страницу: выборка пользователей
+        и одна выборка заказов `WHERE user_id IN (...)` по их идентификаторам.
+
+        ### Returns:
+            Select: Выражение с параметрами `limit` и `offset`.
+        """
+        return (
+            select(User)
+            .options(selectinload(User.orders))
+            .order_by(User.id)
+            .limit(bindparam('limit'))
+            .offset(bindparam('offset'))
+        )
+
+    @staticmethod
+    def page_with_orders_aggregated_query() -> Select:
+        """
+        ## Запрос страницы пользователей с заказами одним выражением (PostgreSQL).
+
+        Заказы каждого пользователя собираются коррелированным подзапросом
+        в JSON-массив (`json_agg`), поэтому на страницу уходит ровно один запрос.
+        Сумма передаётся строкой, чтобы не терять точность `Numeric` в JSON.
+
+        ### Returns:
+            Select: Выражение с параметрами `limit` и `offset`.
+        """
+        from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+        fields = {
+            'id': Order.id,
+            'user_id': Order.user_id,
+            'title': Order.title,
+            'amount': cast(Order.amount, Text),
+            'created_at': Order.created_at,
+        }
+        # Ключи — литералы в тексте SQL: у параметра в `json_build_object`
+        # asyncpg не может вывести тип
+        order_json = func.json_build_object(*(
+            part
+            for key, column in fields.items()
+            for part in (literal_column(f"'{key}'"), column)
+        ))
+        orders = (
+            select(func.coalesce(
+                func.json_agg(aggregate_order_by(order_json, Order.id)),
+                literal_column("'[]'::json"),
+                type_=JSON,
+            ))
+            .where(Order.user_id == User.id)
+            .scalar_subquery()
+        )
+        return (
+            select(*User.__table__.c, orders.label('orders'))
+            .order_by(User.id)
+            .limit(bindparam('limit'))
+            .offset(bindparam('offset'))
+        )
+
+    @traced()
+    async def get_page_with_orders(
+        self,
+        limit: int,
+        offset: int,
+        session: AsyncSession
+    ) -> list[UserWithOrdersResponseModel]:
+        """
+        ## Получить страницу пользователей вместе с заказами (два запроса).
+
+        ### Args:
+            limit (int): Размер страницы.
+            offset (int): Смещение от начала списка.
+            session (AsyncSession): Активная сессия БД.
+
+        ### Returns:
+            list[UserWithOrdersResponseModel]: Пользователи по возрастанию `id`.
+        """
+        query = self._statement('get_page_with_orders', self.page_with_orders_query)
+        res = await session.execute(query, {'limit': limit, 'offset': offset})
+        return [
+            UserWithOrdersResponseModel(
+                **self._return_dict_from_obj(obj, self.model),
+                orders=[
+                    OrderResponseModel(**self._return_dict_from_obj(order, Order))
+                    for order in obj.orders
+                ],
+            )
+            for obj in res.scalars().all()
+        ]
+
+    @traced()
+    async def get_page_with_orders_aggregated(
+        self,
+        limit: int,
+        offset: int,
+        session: AsyncSession
+    ) -> list[UserWithOrdersResponseModel]:
+        """
+        ## Получить страницу пользователей вместе с заказами (один запрос).
+
+        ### Args:
+            limit (int): Размер страницы.
+            offset (int): Смещение от начала списка.
+            session (AsyncSession): Активная сессия БД.
+
+        ### Returns:
+            list[UserWithOrdersResponseModel]: Пользователи по возрастанию `id`.
+        """
+        query = self._statement(
+            'get_page_with_orders_aggregated',
+            self.page_with_orders_aggregated_query,
+        )
+        res = await session.execute(query, {'limit': limit, 'offset': offset})
+        return [UserWithOrdersResponseModel(**row) for row in res.mappings()]
+
+    @traced()
+    async def get_by_email(
+        self,
+        email: str,
+        session: AsyncSession
+    ) -> UserResponseModel | None:
+        """
+        ## Получить пользователя по email без учёта регистра.
+
+        Условие `lower(email) = :email` обслуживает уникальный индекс
+        `ux_users_email_lower`. Не найденный в `users` email ищется в архиве.
+
+        ### Args:
+            email (str): Email в произвольном регистре.
+            session (AsyncSession): Активная сессия БД.
+
+        ### Returns:
+            UserResponseModel | None: Пользователь или `None`, если не найден.
+        """
+        query = self._statement('get_by_email', lambda: (
+            select(self.model).where(func.lower(self.model.email) == bindparam('email'))
+        ))
+        email = self.normalize_email(email)
+        res = await session.execute(query, {'email': email})
         obj = res.scalar_one_or_none()
         if not obj:
-            return None
+            return await self._find_archived(
+                session, 'get_archived_by_email',
+                lambda: func.lower(self.archive.email) == bindparam('email'), {'email': email},
+            )
         return UserResponseModel(**self._return_dict_from_obj(obj, self.model))
 
+    def _archive_columns(self) -> list[Any]:
+        """
+        ## Колонки архива, совпадающие с колонками `users` (в том же порядке).
+        """
+        return [self.archive.__table__.c[name] for name in self.model.__table__.c.keys()]
 
+    async def _find_archived(
+        self,
+        session: AsyncSession,
+        name: str,
+        condition: Callable[[], Any],
+        params: dict[str, Any],
+    ) -> UserResponseModel | None:
+        """
+        ## Найти пользователя в архиве, если архив включён.
+
+        ### Args:
+            session (AsyncSession): Активная сессия БД.
+            name (str): Имя выражения в реестре.
+            condition (Callable[[], Any]): Фабрика условия `WHERE` с `bindparam`.
+            params (dict): Значения параметров.
+
+        ### Returns:
+            UserResponseModel | None: Архивный пользователь или `None`.
+        """
+        if self.archive is None:
+            return None
+        query = self._statement(name, lambda: (
+            select(*self._archive_columns()).where(condition()).limit(1)
+        ))
+        row = (await session.execute(query, params)).mappings().first()
+        return UserResponseModel(**row) if row else None
+
+
+    def export_query(
+        self,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        is_hidden: bool | None = None,
+    ) -> tuple[str, list[Any]]:
+        """
+        ## Собрать `SELECT` выгрузки пользователей с позиционными параметрами.
+
+        Условия добавляются только для заданных фильтров, чтобы планировщик
+        видел простой запрос (полная выгрузка — последовательное чтение).
+        Порядок строк не задаётся: сортировка миллионов строк дороже выгрузки.
+
+        ### Args:
+            created_from (datetime | None): Нижняя граница `created_at` (включительно).
+            created_to (datetime | None): Верхняя граница `created_at` (не включительно).
+            is_hidden (bool | None): Только скрытые/видимые пользователи.
+
+        ### Returns:
+            tuple[str, list[Any]]: Текст запроса с `$1, $2, ...` и значения параметров.
+        """
+        table = self.model.__table__
+        conditions: list[str] = []
+        args: list[Any] = []
+        for column, operator, value in (
+            ('created_at', '>=', created_from),
+            ('created_at', '<', created_to),
+            ('is_hidden', '=', is_hidden),
+        ):
+            if value is not None:
+                args.append(value)
+                conditions.append(f'{column} {operator} ${len(args)}')
+        query = f"SELECT {', '.join(table.c.keys())} FROM {table.name}"
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        return query, args
+
+    async def export_chunks(
+        self,
+        file_format: Literal['csv', 'parquet'] = 'csv',
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        is_hidden: bool | None = None,
+        batch_size: int = 50000,
+    ) -> AsyncIterator[bytes]:
+        """
+        ## Выгрузить пользователей потоком байтов в CSV или Parquet.
+
+        CSV формирует сам Postgres (`COPY ... TO STDOUT`), Parquet собирается
+        из пачек по `batch_size` строк серверного курсора. На время выгрузки
+        занимается одно соединение пула; если выгрузка прервана (клиент
+        отключился), соединение закрывается, а не возвращается в пул.
+
+        ### Args:
+            file_format (Literal['csv', 'parquet']): Формат выгрузки.
+            created_from (datetime | None): Нижняя граница `created_at` (включительно).
+            created_to (datetime | None): Верхняя граница `created_at` (не включительно).
+            is_hidden (bool | None): Только скрытые/видимые пользователи.
+            batch_size (int): Строк в группе Parquet.
+
+        ### Yields:
+            bytes: Очередной кусок файла.
+        """
+        query, args = self.export_query(created_from, created_to, is_hidden)
+        async with self.db.connect() as conn:
+            raw = await conn.get_raw_connection()
+            driver = raw.driver_connection
+            if file_format == 'parquet':
+                chunks = parquet_chunks(
+                    fetch_batches(driver, query, args, batch_size),
+                    arrow_schema(list(self.model.__table__.c)),
+                )
+            else:
+                chunks = copy_query_chunks(driver, query, args)
+            completed = False
+            try:
+                async with aclosing(chunks):
+                    async for chunk in chunks:
+                        yield chunk
+                completed = True
+            finally:
+                if not completed:
+                    await conn.invalidate()
 
-user_dao = UserDAO()
\ No newline at end of file
+# Экспортируемый интерфейс модуля
+__all__ = [
+    'UserDAO',
+]
@@ -1,16 +1,41 @@
 """Зависимости для работы с DAO."""
 
-from app.api.dao.user import user_dao, UserDAO
+from functools import lru_cache
 
+from app.api.dao.order import OrderDAO
+from app.api.dao.user import UserDAO
 
 
+
+@lru_cache
 def get_user_dao() -> UserDAO:
     """
     ## Зависимость: Получение экземпляра `UserDAO`.
 
     Возвращает объект доступа к данным пользователя для использования в эндпоинтах.
+    Экземпляр создаётся при первом вызове и переиспользуется.
 
     ### Returns:
         UserDAO: Экземпляр DAO для работы с пользователями.
     """
-    return user_dao
\ No newline at end of file
+    return UserDAO()
+
+
+@lru_cache
+def get_order_dao() -> OrderDAO:
+    """
+    ## Зависимость: Получение экземпляра `OrderDAO`.
+
+    Экземпляр создаётся при первом вызове и переиспользуется.
+
+    ### Returns:
+        OrderDAO: Экземпляр DAO для работы с заказами.
+    """
+    return OrderDAO()
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "get_order_dao",
+    "get_user_dao",
+]
@@ -1,26 +1,80 @@
 """Зависимости для работы с базой данных.
 
 Предоставляет генератор асинхронных сессий `AsyncSession` через `Depends`.
+Дедлайн запроса переносится в `statement_timeout` каждой транзакции сессии,
+а отмена запроса по нему превращается в ответ 504. Пока выключатель БД
+разомкнут, сессия не открывается и запрос сразу получает 503.
 """
-from typing import AsyncIterator
+import math
+from typing import Annotated, AsyncIterator
 
+from fastapi import Depends
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.exceptions.base import GatewayTimeoutException, ServiceUnavailableException
+from app.config.config_reader import env_config
 from app.database.connection import db_connection
+from app.modules.deadline import Deadline, DeadlineExceeded, bind_statement_timeout, is_statement_timeout
+from app.modules.resilience import CircuitOpenError, is_transient_db_error
+from app.modules.tracing import get_tracer
 
+from .deadline import get_request_deadline
 
 
-async def get_db_session() -> AsyncIterator[AsyncSession]:
+
+async def get_db_session(
+    deadline: Annotated[Deadline | None, Depends(get_request_deadline)],
+) -> AsyncIterator[AsyncSession]:
     """
     ## Зависимость: Получение сессии БД.
 
     Генератор асинхронной сессии SQLAlchemy для использования в эндпоинтах.
+    Исход запроса учитывается выключателем БД: ошибки соединения считаются
+    неудачами, любой ответ сервера (в том числе ошибка SQL) — успехом.
+
+    ### Args:
+        deadline (Deadline | None): Дедлайн запроса.
 
     ### Yields:
         AsyncSession: Активная сессия для выполнения операций с БД.
+
+    ### Raises:
+        ServiceUnavailableException: Выключатель БД разомкнут.
+        GatewayTimeoutException: Запрос отменён по `statement_timeout`
+            или бюджет исчерпан до начала транзакции.
     """
-    async with db_connection.get_session() as session:
-        yield session
+    breaker = db_connection.breaker
+    try:
+        breaker.before_call()
+    except CircuitOpenError as exc:
+        raise ServiceUnavailableException('База данных недоступна', retry_after=math.ceil(exc.retry_after)) from exc
+
+    try:
+        with get_tracer().span('db.session'):
+            async with db_connection.get_session() as session:
+                if deadline is not None:
+                    bind_statement_timeout(session, deadline, env_config.db_statement_timeout_ms)
+                timeout_ms = deadline.timeout_ms if deadline is not None else None
+                try:
+                    yield session
+                except DeadlineExceeded as exc:
+                    raise GatewayTimeoutException(timeout_ms) from exc
+                except DBAPIError as exc:
+                    # Отмена могла прийти и по дедлайну другого запроса (общее чтение single-flight)
+                    if is_statement_timeout(exc):
+                        raise GatewayTimeoutException(timeout_ms) from exc
+                    raise
+    except Exception as exc:
+        if is_transient_db_error(exc):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_success()
 
 
 # Экспортируемый интерфейс модуля
@@ -0,0 +1,53 @@
+"""Зависимость дедлайна запроса.
+
+Бюджет берётся из `request_timeout` на эндпоинте или `REQUEST_TIMEOUT_MS`
+и может быть переопределён заголовком `X-Request-Timeout` в пределах
+`REQUEST_TIMEOUT_MAX_MS`.
+"""
+from typing import Annotated
+
+from fastapi import Header, Request
+
+from app.config.config_reader import env_config
+from app.modules.deadline import (
+    REQUEST_TIMEOUT_HEADER,
+    Deadline,
+    resolve_timeout_ms,
+    route_timeout_ms,
+    set_current_deadline,
+)
+
+
+
+async def get_request_deadline(
+    request: Request,
+    x_request_timeout: Annotated[int | None, Header(
+        alias=REQUEST_TIMEOUT_HEADER,
+        ge=1,
+        description='Бюджет запроса, мс (не больше `REQUEST_TIMEOUT_MAX_MS`)',
+    )] = None,
+) -> Deadline | None:
+    """
+    ## Зависимость: Дедлайн текущего запроса.
+
+    Отсчёт начинается при разрешении зависимости; дедлайн доступен
+    через `current_deadline()` до конца запроса.
+
+    ### Args:
+        request (Request): Текущий запрос.
+        x_request_timeout (int | None): Бюджет из заголовка клиента, мс.
+
+    ### Returns:
+        Deadline | None: Дедлайн или `None`, если бюджет не задан.
+    """
+    route_ms = route_timeout_ms(request.scope.get('endpoint'), env_config.request_timeout_ms)
+    timeout_ms = resolve_timeout_ms(route_ms, x_request_timeout, env_config.request_timeout_max_ms)
+    deadline = Deadline(timeout_ms) if timeout_ms else None
+    set_current_deadline(deadline)
+    return deadline
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "get_request_deadline",
+]
@@ -1,10 +1,23 @@
 """Пакет пользовательских исключений для API."""
 
-from .base import BaseAPIException, NotFoundException
-from .user import UserNotFoundException
+from .base import (
+    BaseAPIException,
+    ConflictException,
+    GatewayTimeoutException,
+    NotFoundException,
+    ServiceUnavailableException,
+)
+from .order import OrderNotFoundException
+from .user import UserAlreadyExistsException, UserEmailNotFoundException, UserNotFoundException
 
 __all__ = [
     'BaseAPIException',
+    'ConflictException',
+    'GatewayTimeoutException',
     'NotFoundException',
+    'OrderNotFoundException',
+    'ServiceUnavailableException',
+    'UserAlreadyExistsException',
+    'UserEmailNotFoundException',
     'UserNotFoundException',
 ]
\ No newline at end of file
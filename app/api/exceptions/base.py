@@ -2,7 +2,7 @@
 
 from fastapi import HTTPException
 
-from .statuses import NOT_FOUND
+from .statuses import CONFLICT, GATEWAY_TIMEOUT, NOT_FOUND, SERVICE_UNAVAILABLE
 
 
 
@@ -15,15 +15,16 @@ class BaseAPIException(HTTPException):
     ### Inherits:
         HTTPException: Исключение FastAPI для HTTP-ответов.
     """    
-    def __init__(self, status_code: int, detail: str):
+    def __init__(self, status_code: int, detail: str, headers: dict[str, str] | None = None):
         """
         ## Инициализация базового исключения.
 
         ### Args:
             status_code (int): HTTP-статус код.
             detail (str): Описание ошибки.
+            headers (dict[str, str] | None): Дополнительные заголовки ответа.
         """        
-        super().__init__(status_code=status_code, detail=detail)
+        super().__init__(status_code=status_code, detail=detail, headers=headers)
 
 
 class NotFoundException(BaseAPIException):
@@ -45,4 +46,66 @@ class NotFoundException(BaseAPIException):
             resource_name (str): Название ресурса.
         """        
         detail = f"{resource_name} не найден."
-        super().__init__(status_code=NOT_FOUND, detail=detail)
\ No newline at end of file
+        super().__init__(status_code=NOT_FOUND, detail=detail)
+
+
+class ConflictException(BaseAPIException):
+    """
+    ## Исключение: Конфликт с существующим ресурсом.
+
+    Используется, когда запись нарушает уникальность уже существующих данных.
+
+    ### Inherits:
+        BaseAPIException: Базовое исключение для API.
+    """
+    def __init__(self, detail: str):
+        """
+        ## Инициализация исключения.
+
+        ### Args:
+            detail (str): Описание конфликта.
+        """
+        super().__init__(status_code=CONFLICT, detail=detail)
+
+
+class ServiceUnavailableException(BaseAPIException):
+    """
+    ## Исключение: Сервис временно недоступен.
+
+    Используется, когда запрос нельзя обработать из-за перегрузки или
+    недоступности зависимостей; клиенту предлагается повторить позже.
+
+    ### Inherits:
+        BaseAPIException: Базовое исключение для API.
+    """
+    def __init__(self, detail: str, retry_after: int | None = None):
+        """
+        ## Инициализация исключения.
+
+        ### Args:
+            detail (str): Описание причины недоступности.
+            retry_after (int | None): Через сколько секунд имеет смысл повторить запрос.
+        """
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+        super().__init__(status_code=SERVICE_UNAVAILABLE, detail=detail, headers=headers)
+
+
+class GatewayTimeoutException(BaseAPIException):
+    """
+    ## Исключение: Запрос не уложился в дедлайн.
+
+    Используется, когда PostgreSQL отменил запрос по `statement_timeout`
+    или бюджет запроса исчерпан до обращения к БД.
+
+    ### Inherits:
+        BaseAPIException: Базовое исключение для API.
+    """
+    def __init__(self, timeout_ms: int | None = None):
+        """
+        ## Инициализация исключения.
+
+        ### Args:
+            timeout_ms (int | None): Бюджет запроса, мс (`None` — бюджет не задан).
+        """
+        detail = f"Запрос не уложился в {timeout_ms} мс." if timeout_ms else "Запрос не уложился в дедлайн."
+        super().__init__(status_code=GATEWAY_TIMEOUT, detail=detail)
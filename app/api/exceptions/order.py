@@ -0,0 +1,23 @@
+"""Исключения, связанные с ресурсом заказа."""
+
+from .base import NotFoundException
+
+
+class OrderNotFoundException(NotFoundException):
+    """
+    ## Исключение: Заказ не найден.
+
+    Выбрасывается, если заказ с указанным идентификатором не найден в базе данных.
+
+    ### Inherits:
+        NotFoundException: Базовое исключение для ресурса, который не найден.
+    """
+    def __init__(self, order_id: int):
+        """
+        ## Инициализация исключения.
+
+        ### Args:
+            order_id (int): Идентификатор заказа.
+        """
+        detail = f"Заказ с идентификатором {order_id}."
+        super().__init__(resource_name=detail)
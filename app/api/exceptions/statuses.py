@@ -8,4 +8,32 @@ NOT_FOUND = status.HTTP_404_NOT_FOUND
     ## NOT_FOUND
 
     HTTP-статус для случаев, когда запрашиваемый ресурс отсутствует.
-"""
\ No newline at end of file
+"""
+
+CONFLICT = status.HTTP_409_CONFLICT
+"""
+    ## CONFLICT
+
+    HTTP-статус для случаев, когда ресурс с такими уникальными данными уже существует.
+"""
+
+SERVICE_UNAVAILABLE = status.HTTP_503_SERVICE_UNAVAILABLE
+"""
+    ## SERVICE_UNAVAILABLE
+
+    HTTP-статус для случаев, когда сервис временно перегружен или недоступен.
+"""
+
+GATEWAY_TIMEOUT = status.HTTP_504_GATEWAY_TIMEOUT
+"""
+    ## GATEWAY_TIMEOUT
+
+    HTTP-статус для случаев, когда запрос не уложился в свой дедлайн.
+"""
+
+TOO_MANY_REQUESTS = status.HTTP_429_TOO_MANY_REQUESTS
+"""
+    ## TOO_MANY_REQUESTS
+
+    HTTP-статус для случаев, когда клиент превысил допустимую частоту запросов.
+"""
@@ -1,6 +1,6 @@
 """Исключения, связанные с ресурсом пользователя."""
 
-from .base import NotFoundException
+from .base import ConflictException, NotFoundException
 
 
 class UserNotFoundException(NotFoundException):
@@ -22,4 +22,40 @@ class UserNotFoundException(NotFoundException):
             user_id (int): Идентификатор пользователя.
         """
         detail = f"Пользователь с идентификатором {user_id}."
-        super().__init__(resource_name=detail)
\ No newline at end of file
+        super().__init__(resource_name=detail)
+
+
+class UserEmailNotFoundException(NotFoundException):
+    """
+    ## Исключение: Пользователь с указанным email не найден.
+
+    ### Inherits:
+        NotFoundException: Базовое исключение для ресурса, который не найден.
+    """
+    def __init__(self, email: str):
+        """
+        ## Инициализация исключения.
+
+        ### Args:
+            email (str): Искомый email.
+        """
+        super().__init__(resource_name=f"Пользователь с email {email}")
+
+
+class UserAlreadyExistsException(ConflictException):
+    """
+    ## Исключение: Пользователь уже существует.
+
+    Выбрасывается, если пользователь с указанным email уже есть в базе данных.
+
+    ### Inherits:
+        ConflictException: Базовое исключение для конфликта уникальности.
+    """
+    def __init__(self, email: str):
+        """
+        ## Инициализация исключения.
+
+        ### Args:
+            email (str): Email, который уже занят.
+        """
+        super().__init__(detail=f"Пользователь с email {email} уже существует.")
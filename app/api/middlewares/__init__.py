@@ -0,0 +1,12 @@
+"""Пакет ASGI-миддлвейров приложения."""
+
+from .compression import CompressionMiddleware
+from .disconnect import CancelOnDisconnectMiddleware
+from .rate_limit import RateLimitMiddleware
+
+
+__all__ = [
+    "CancelOnDisconnectMiddleware",
+    "CompressionMiddleware",
+    "RateLimitMiddleware",
+]
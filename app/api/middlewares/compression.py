@@ -0,0 +1,350 @@
+"""Сжатие HTTP-ответов (gzip, brotli, zstd) с порогом по размеру.
+
+`gzip` доступен всегда, `br` и `zstd` — только если установлены пакеты
+`brotli` и `zstandard` (импортируются лениво, при первом сжатии).
+Потоковые ответы сжимаются по частям: каждый чанк сбрасывается в сеть
+сразу (sync flush), поэтому клиент не ждёт окончания всего ответа.
+"""
+
+import zlib
+from importlib.util import find_spec
+from typing import Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+
+EXCLUDED_CONTENT_TYPES = ("text/event-stream", "application/vnd.apache.parquet")
+"""
+    ## EXCLUDED_CONTENT_TYPES
+
+    Типы содержимого, которые никогда не сжимаются (SSE должен уходить клиенту без буферизации,
+    Parquet уже сжат постранично).
+"""
+
+DEFAULT_ENCODINGS_PREFERENCE = ("zstd", "br", "gzip")
+"""
+    ## DEFAULT_ENCODINGS_PREFERENCE
+
+    Порядок предпочтения кодировок сервером при равных `q` у клиента.
+"""
+
+# Пакет, без которого кодировка недоступна (None — только стандартная библиотека)
+_ENCODING_MODULES: dict[str, str | None] = {
+    "gzip": None,
+    "br": "brotli",
+    "zstd": "zstandard",
+}
+
+
+
+class Compressor(Protocol):
+    """
+    ## Потоковый компрессор для одного ответа.
+    """
+    def compress(self, data: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+    def finish(self) -> bytes: ...
+
+
+class GzipCompressor:
+    """
+    ## Компрессор `gzip` на базе `zlib`.
+    """
+    def __init__(self, level: int) -> None:
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    """
+    ## Компрессор `br` (требует пакет `brotli`).
+    """
+    def __init__(self, quality: int) -> None:
+        import brotli
+
+        self._obj = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class ZstdCompressor:
+    """
+    ## Компрессор `zstd` (требует пакет `zstandard`).
+    """
+    def __init__(self, level: int) -> None:
+        import zstandard
+
+        self._zstd = zstandard
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(self._zstd.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(self._zstd.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_encodings(preference: tuple[str, ...] = DEFAULT_ENCODINGS_PREFERENCE) -> tuple[str, ...]:
+    """
+    ## Возвращает кодировки из `preference`, для которых установлены зависимости.
+
+    ### Args:
+        preference (tuple[str, ...]): Желаемые кодировки в порядке предпочтения.
+
+    ### Returns:
+        tuple[str, ...]: Доступные кодировки в том же порядке.
+    """
+    result = []
+    for encoding in preference:
+        if encoding not in _ENCODING_MODULES:
+            continue
+        module = _ENCODING_MODULES[encoding]
+        if module is None or find_spec(module) is not None:
+            result.append(encoding)
+    return tuple(result)
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """
+    ## Разбирает заголовок `Accept-Encoding` в словарь `{кодировка: q}`.
+
+    ### Args:
+        header (str): Значение заголовка, например `"gzip, br;q=0.8"`.
+
+    ### Returns:
+        dict[str, float]: Вес каждой упомянутой кодировки.
+    """
+    weights: dict[str, float] = {}
+    for item in header.split(","):
+        parts = item.strip().split(";")
+        name = parts[0].strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+    return weights
+
+
+def negotiate_encoding(header: str, supported: tuple[str, ...]) -> str | None:
+    """
+    ## Выбирает кодировку ответа по заголовку клиента.
+
+    Из поддерживаемых сервером кодировок берётся та, у которой наибольший `q`,
+    при равенстве — первая по порядку в `supported`.
+
+    ### Args:
+        header (str): Значение заголовка `Accept-Encoding`.
+        supported (tuple[str, ...]): Доступные кодировки в порядке предпочтения.
+
+    ### Returns:
+        str | None: Имя кодировки или `None`, если сжимать нельзя.
+    """
+    if not header:
+        return None
+    weights = parse_accept_encoding(header)
+    wildcard = weights.get("*", 0.0)
+    best: str | None = None
+    best_q = 0.0
+    for encoding in supported:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    ## ASGI-миддлвейр сжатия ответов.
+
+    Сжимает ответы не меньше `minimum_size` байт кодировкой, согласованной
+    с клиентом по `Accept-Encoding`. Ответы с уже выставленным
+    `Content-Encoding` и типы из `EXCLUDED_CONTENT_TYPES` пропускаются как есть.
+    """
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+        encodings: tuple[str, ...] = DEFAULT_ENCODINGS_PREFERENCE,
+    ) -> None:
+        """
+        ## Инициализирует миддлвейр.
+
+        ### Args:
+            app (ASGIApp): Оборачиваемое ASGI-приложение.
+            minimum_size (int): Минимальный размер тела для сжатия, байт.
+            gzip_level (int): Уровень сжатия `gzip` (1-9).
+            brotli_quality (int): Качество `brotli` (0-11).
+            zstd_level (int): Уровень `zstd` (1-22).
+            encodings (tuple[str, ...]): Разрешённые кодировки в порядке предпочтения.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.zstd_level = zstd_level
+        self.encodings = available_encodings(encodings)
+
+    def make_compressor(self, encoding: str) -> Compressor:
+        """
+        ## Создаёт компрессор для выбранной кодировки.
+
+        ### Args:
+            encoding (str): `gzip`, `br` или `zstd`.
+
+        ### Returns:
+            Compressor: Новый потоковый компрессор.
+        """
+        if encoding == "br":
+            return BrotliCompressor(self.brotli_quality)
+        if encoding == "zstd":
+            return ZstdCompressor(self.zstd_level)
+        return GzipCompressor(self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = negotiate_encoding(headers.get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """
+    ## Обработчик исходящих сообщений одного ответа.
+
+    Откладывает `http.response.start`, пока не станет ясно, нужно ли сжатие,
+    и затем подменяет заголовки и тело.
+    """
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.compressor: Compressor | None = None
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+            )
+            return
+
+        if message_type != "http.response.body":
+            # Например, `http.response.pathsend` — отправляем без изменений
+            if not self.started:
+                self.started = True
+                await self._send(self.initial_message)
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.passthrough:
+            if not self.started:
+                self.started = True
+                await self._send(self.initial_message)
+            await self._send(message)
+            return
+
+        if not self.started:
+            self.started = True
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body and len(body) < self.middleware.minimum_size:
+                # Маленький ответ: сжатие дороже выигрыша
+                await self._send(self.initial_message)
+                await self._send(message)
+                return
+
+            self.compressor = self.middleware.make_compressor(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                # Итоговая длина неизвестна — переходим на chunked
+                del headers["Content-Length"]
+            message["body"] = self._compress(body, more_body)
+            if not more_body:
+                headers["Content-Length"] = str(len(message["body"]))
+            await self._send(self.initial_message)
+            await self._send(message)
+            return
+
+        if self.compressor is None:
+            # Ответ ушёл несжатым — продолжения быть не может, но не ломаем поток
+            await self._send(message)
+            return
+
+        message["body"] = self._compress(body, more_body)
+        await self._send(message)
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        """
+        ## Сжимает очередной кусок тела.
+
+        ### Args:
+            body (bytes): Исходные байты.
+            more_body (bool): Будут ли ещё куски.
+
+        ### Returns:
+            bytes: Сжатые байты, готовые к отправке.
+        """
+        assert self.compressor is not None
+        data = self.compressor.compress(body)
+        if more_body:
+            return data + self.compressor.flush()
+        return data + self.compressor.finish()
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "CompressionMiddleware",
+    "available_encodings",
+    "negotiate_encoding",
+    "parse_accept_encoding",
+    "EXCLUDED_CONTENT_TYPES",
+]
@@ -0,0 +1,90 @@
+"""Отмена обработки запроса, когда клиент отключился.
+
+Без этого эндпоинт, чей клиент уже закрыл соединение (таймаут прокси,
+закрытая вкладка), продолжает держать соединение пула и ждать PostgreSQL.
+Миддлвейр сам читает `receive` в фоновой задаче и при `http.disconnect` до
+окончания ответа отменяет задачу приложения; `asyncpg` при отмене ожидания
+отправляет серверу запрос отмены, и выполняющийся SQL прерывается.
+"""
+
+import asyncio
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.modules.logging.app_logger import get_app_logger
+
+
+
+class CancelOnDisconnectMiddleware:
+    """
+    ## `ASGI`-миддлвейр: отменяет обработчик при отключении клиента.
+
+    Сообщения `receive` пересылаются приложению через очередь без изменений,
+    поэтому чтение тела запроса и потоковые ответы работают как раньше.
+
+    ### Attributes:
+        cancelled (int): Сколько запросов отменено с момента старта.
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        ## Инициализирует миддлвейр.
+
+        ### Args:
+            app (ASGIApp): Следующее `ASGI`-приложение.
+        """
+        self.app = app
+        self.cancelled = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue[Message] = asyncio.Queue()
+        disconnected = False
+        response_complete = False
+
+        async def wrapped_receive() -> Message:
+            if disconnected and messages.empty():
+                return {"type": "http.disconnect"}
+            return await messages.get()
+
+        async def wrapped_send(message: Message) -> None:
+            nonlocal response_complete
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        app_task = asyncio.create_task(self.app(scope, wrapped_receive, wrapped_send))
+
+        async def watch_disconnect() -> None:
+            nonlocal disconnected
+            while True:
+                message = await receive()
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    disconnected = True
+                    if not response_complete:
+                        app_task.cancel()
+                    return
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            await app_task
+        except asyncio.CancelledError:
+            if not app_task.done():
+                # Отменили нас самих (остановка сервера) — отменяем и приложение
+                app_task.cancel()
+                raise
+            if not disconnected:
+                raise
+            self.cancelled += 1
+            get_app_logger("disconnect").info(f"Клиент отключился, обработка {scope['method']} {scope['path']} отменена")
+        finally:
+            watcher.cancel()
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "CancelOnDisconnectMiddleware",
+]
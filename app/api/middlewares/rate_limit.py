@@ -0,0 +1,172 @@
+"""Ограничение частоты запросов по клиенту и маршруту (token bucket).
+
+Клиент — ключ API из заголовка (`X-API-Key`) или IP-адрес. Маршруты с
+собственным правилом (`RATE_LIMIT_ROUTES`) получают своё ведро на клиента,
+остальные делят общее ведро клиента с правилом по умолчанию. В каждый
+ответ добавляются заголовки `RateLimit-Limit`, `RateLimit-Remaining`,
+`RateLimit-Reset` и `RateLimit-Policy` (черновик IETF «RateLimit header
+fields for HTTP»), в отказ 429 — ещё и `Retry-After`.
+"""
+
+import hashlib
+import math
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.exceptions.statuses import TOO_MANY_REQUESTS
+from app.modules.rate_limit import RateLimitBackend, RateLimitDecision, RateLimitRule, get_rate_limit_backend
+
+
+
+DEFAULT_BUCKET = "*"
+
+
+
+def rate_limit_headers(decision: RateLimitDecision) -> list[tuple[bytes, bytes]]:
+    """
+    ## Заголовки `RateLimit-*` для решения.
+
+    ### Args:
+        decision (RateLimitDecision): Решение по запросу.
+
+    ### Returns:
+        list[tuple[bytes, bytes]]: Заголовки ответа в формате `ASGI`.
+    """
+    rule = decision.rule
+    values = {
+        b"ratelimit-limit": rule.burst,
+        b"ratelimit-remaining": math.floor(decision.remaining),
+        b"ratelimit-reset": math.ceil(decision.reset_after),
+        b"ratelimit-policy": f"{rule.burst};w={math.ceil(rule.window)}",
+    }
+    return [(name, str(value).encode("latin-1")) for name, value in values.items()]
+
+
+class RateLimitMiddleware:
+    """
+    ## `ASGI`-миддлвейр: token bucket на клиента и маршрут.
+
+    ### Attributes:
+        default_rule (RateLimitRule | None): Правило по умолчанию (`None` — без ограничения).
+        route_rules (dict[str, RateLimitRule | None]): Правила маршрутов `"METHOD /шаблон"`.
+        key_header (str): Заголовок с ключом API.
+        trust_forwarded (bool): Брать IP клиента из `X-Forwarded-For` (только за доверенным прокси).
+    """
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_rule: RateLimitRule | None,
+        route_rules: dict[str, RateLimitRule | None] | None = None,
+        backend: RateLimitBackend | None = None,
+        key_header: str = "X-API-Key",
+        trust_forwarded: bool = False,
+    ) -> None:
+        """
+        ## Инициализирует миддлвейр.
+
+        ### Args:
+            app (ASGIApp): Следующее `ASGI`-приложение.
+            default_rule (RateLimitRule | None): Правило по умолчанию.
+            route_rules (dict[str, RateLimitRule | None] | None): Правила маршрутов.
+            backend (RateLimitBackend | None): Хранилище вёдер; по умолчанию — из настроек.
+            key_header (str): Заголовок с ключом API.
+            trust_forwarded (bool): Доверять `X-Forwarded-For`.
+        """
+        self.app = app
+        self.default_rule = default_rule
+        self.route_rules = route_rules or {}
+        self._backend = backend
+        self.key_header = key_header
+        self.trust_forwarded = trust_forwarded
+
+    @property
+    def backend(self) -> RateLimitBackend:
+        """ ## Хранилище вёдер (создаётся при первом запросе). """
+        if self._backend is None:
+            self._backend = get_rate_limit_backend()
+        return self._backend
+
+    def route_id(self, scope: Scope) -> str | None:
+        """
+        ## Маршрут запроса в виде `"METHOD /шаблон"` или `None`, если маршрут не найден.
+
+        ### Args:
+            scope (Scope): `ASGI`-scope запроса.
+
+        ### Returns:
+            str | None: Идентификатор маршрута.
+        """
+        app = scope.get("app")
+        router = getattr(app, "router", None)
+        for route in getattr(router, "routes", ()):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return f"{scope['method']} {route.path}"
+        return None
+
+    def client_id(self, scope: Scope) -> str:
+        """
+        ## Клиент запроса: хэш ключа API или IP-адрес.
+
+        ### Args:
+            scope (Scope): `ASGI`-scope запроса.
+
+        ### Returns:
+            str: Идентификатор клиента.
+        """
+        headers = Headers(scope=scope)
+        api_key = headers.get(self.key_header)
+        if api_key:
+            return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        if self.trust_forwarded and (forwarded := headers.get("x-forwarded-for")):
+            return "ip:" + forwarded.split(",")[0].strip()
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        bucket, rule = DEFAULT_BUCKET, self.default_rule
+        if self.route_rules:
+            route = self.route_id(scope)
+            if route in self.route_rules:
+                bucket, rule = route, self.route_rules[route]
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        decision = await self.backend.acquire(f"{bucket}|{self.client_id(scope)}", rule)
+        headers = rate_limit_headers(decision)
+
+        if not decision.allowed:
+            response = JSONResponse(
+                {"detail": "Слишком много запросов, повторите позже."},
+                status_code=TOO_MANY_REQUESTS,
+                headers={
+                    **{name.decode(): value.decode() for name, value in headers},
+                    "Retry-After": str(math.ceil(decision.retry_after)),
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], *headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "DEFAULT_BUCKET",
+    "RateLimitMiddleware",
+    "rate_limit_headers",
+]
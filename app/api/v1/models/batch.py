@@ -0,0 +1,59 @@
+"""Пакетная валидация и сериализация моделей пользователя (v1).
+
+Функции принимают и возвращают только «чистые» данные (bytes, list, dict),
+поэтому их можно выполнять как inline, так и в пуле потоков или процессов
+(`app.modules.offload`).
+"""
+
+from typing import Any
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.api.v1.models.request.user import CreateUserRequestModel
+from app.api.v1.models.response.user import UserResponseModel
+
+
+
+_new_users_adapter = TypeAdapter(list[CreateUserRequestModel])
+_users_adapter = TypeAdapter(list[UserResponseModel])
+
+
+def validate_new_users_json(body: bytes) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    ## Разбирает и валидирует JSON-массив пользователей для создания.
+
+    `ValidationError` не сериализуется между процессами, поэтому ошибки
+    возвращаются списком словарей, а не исключением.
+
+    ### Args:
+        body (bytes): Тело запроса — JSON-массив объектов `CreateUserRequestModel`.
+
+    ### Returns:
+        tuple[list[dict], list[dict]]: Валидированные записи и ошибки
+        (ровно один из списков непустой, если вход не пустой массив).
+    """
+    try:
+        users = _new_users_adapter.validate_json(body)
+    except ValidationError as exc:
+        return [], exc.errors(include_url=False, include_context=False)
+    return [user.model_dump() for user in users], []
+
+
+def dump_users_json(rows: list[dict[str, Any]]) -> bytes:
+    """
+    ## Сериализует строки пользователей в JSON по схеме `UserResponseModel`.
+
+    ### Args:
+        rows (list[dict]): Строки таблицы `users` в виде словарей.
+
+    ### Returns:
+        bytes: JSON-массив пользователей.
+    """
+    return _users_adapter.dump_json(_users_adapter.validate_python(rows))
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    'dump_users_json',
+    'validate_new_users_json',
+]
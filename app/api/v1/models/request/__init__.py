@@ -1,7 +1,9 @@
 """Пакет моделей запросов для API v1."""
 
+from app.api.v1.models.request.order import CreateOrderRequestModel
 from app.api.v1.models.request.user import CreateUserRequestModel
 
 __all__ = [
+	'CreateOrderRequestModel',
 	'CreateUserRequestModel',
 ]
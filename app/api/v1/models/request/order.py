@@ -0,0 +1,13 @@
+"""Модели запросов для ресурса заказа (v1)."""
+
+from app.schemas.order import NewOrder
+
+
+class CreateOrderRequestModel(NewOrder):
+    """
+    ## Модель запроса на создание заказа.
+
+    ### Inherits:
+        NewOrder: Базовая схема создания заказа.
+    """
+    pass
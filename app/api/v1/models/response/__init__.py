@@ -1,9 +1,22 @@
 """Пакет моделей ответов для API v1."""
 
 from app.api.v1.models.response.healthcheck import HealthCheckResponseModel
-from app.api.v1.models.response.user import UserResponseModel
+from app.api.v1.models.response.metrics import (
+	LoopLagResponseModel,
+	StatementCacheStatsResponseModel,
+)
+from app.api.v1.models.response.order import (
+	OrderResponseModel,
+	UserWithOrdersResponseModel,
+)
+from app.api.v1.models.response.user import EmailAvailabilityResponseModel, UserResponseModel
 
 __all__ = [
+	'EmailAvailabilityResponseModel',
 	'HealthCheckResponseModel',
+	'LoopLagResponseModel',
+	'OrderResponseModel',
+	'StatementCacheStatsResponseModel',
 	'UserResponseModel',
+	'UserWithOrdersResponseModel',
 ]
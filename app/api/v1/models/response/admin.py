@@ -0,0 +1,92 @@
+"""Модели ответов административных эндпоинтов (v1)."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.api.v1.models.base import BaseResponseModel
+
+
+
+class IndexStatsModel(BaseModel):
+    """
+    ## Индекс и его счётчики.
+
+    ### Attributes:
+        table (str): Таблица.
+        name (str): Имя индекса.
+        method (str): Метод доступа.
+        columns (list[str]): Колонки или выражения.
+        predicate (str | None): Условие частичного индекса.
+        is_unique (bool): Уникальный индекс.
+        is_primary (bool): Индекс первичного ключа.
+        backs_constraint (bool): Индекс ограничения.
+        is_valid (bool): Индекс валиден.
+        definition (str): Определение `CREATE INDEX`.
+        size_bytes (int): Размер индекса.
+        scans (int): Сканирования индекса.
+        tuples_read (int): Прочитанные через индекс записи.
+        blocks_read (int): Блоки, прочитанные с диска.
+        blocks_hit (int): Блоки из shared buffers.
+        table_rows (int): Оценка числа строк таблицы.
+        table_writes (int): Вставки, обновления и удаления в таблице.
+    """
+    table: str
+    name: str
+    method: str
+    columns: list[str]
+    predicate: str | None = None
+    is_unique: bool
+    is_primary: bool
+    backs_constraint: bool
+    is_valid: bool
+    definition: str
+    size_bytes: int = Field(..., description='Размер индекса, байт')
+    scans: int = Field(..., description='Сканирования с момента сброса статистики')
+    tuples_read: int
+    blocks_read: int
+    blocks_hit: int
+    table_rows: int
+    table_writes: int = Field(..., description='Записи в таблицу, каждая обновляет индекс')
+
+
+class IndexFindingModel(BaseModel):
+    """
+    ## Замечание советника индексов.
+
+    ### Attributes:
+        kind (str): Правило (`unused`, `duplicate`, `redundant`, `low_selectivity`, ...).
+        table (str): Таблица.
+        index (str): Имя индекса.
+        detail (str): Пояснение.
+        droppable (bool): Индекс включён в миграцию-кандидат.
+    """
+    kind: str
+    table: str
+    index: str
+    detail: str
+    droppable: bool
+
+
+class IndexReportResponseModel(BaseResponseModel):
+    """
+    ## Модель ответа от `'/v1/admin/indexes'`.
+
+    ### Attributes:
+        stats_reset (datetime | None): Начало накопления счётчиков.
+        indexes (list[IndexStatsModel]): Индексы схемы.
+        findings (list[IndexFindingModel]): Замечания советника.
+        migration (str | None): Миграция-кандидат Alembic.
+    """
+    stats_reset: datetime | None = Field(None, description='С какого момента накоплены счётчики')
+    indexes: list[IndexStatsModel] = Field(default_factory=list)
+    findings: list[IndexFindingModel] = Field(default_factory=list)
+    migration: str | None = Field(None, description='Миграция-кандидат Alembic для удаления индексов')
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    'IndexFindingModel',
+    'IndexReportResponseModel',
+    'IndexStatsModel',
+]
@@ -1,10 +1,32 @@
 # Плохо
 # from ..base import BaseResponseModel
 # Хорошо (Явное лучше неявного)
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
 from app.api.v1.models.base import BaseResponseModel
 
 
 
+class DatabaseHealthModel(BaseModel):
+    """
+    ## Состояние выключателя БД воркера.
+
+    Attributes:
+        state (str): `closed` — запросы идут в БД, `open` — сразу 503, `half_open` — ждём пробный запрос.
+        consecutive_failures (int): Запросов подряд с недоступной БД.
+        retry_after (float): Секунды до пробного запроса.
+        opened_total (int): Сколько раз выключатель размыкался.
+        rejected_total (int): Запросов отклонено без обращения к БД.
+    """
+    state: Literal['closed', 'open', 'half_open']
+    consecutive_failures: int
+    retry_after: float = Field(..., description='Секунды до пробного запроса')
+    opened_total: int
+    rejected_total: int
+
+
 class HealthCheckResponseModel(BaseResponseModel):
     """
     ## Модель для ответа от `'/v1/healthcheck'`.
@@ -15,5 +37,7 @@ class HealthCheckResponseModel(BaseResponseModel):
     Attributes:
         status_code (int): Статус код..
         description (str): Описание результата..
+        database (DatabaseHealthModel | None): Состояние выключателя БД.
     """    
-    description: str = 'API работает'
\ No newline at end of file
+    description: str = 'API работает'
+    database: DatabaseHealthModel | None = None
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""Модели ответов для метрик производительности (v1)."""
+
+from pydantic import BaseModel, Field
+
+from app.api.v1.models.base import BaseResponseModel
+
+
+
+class CompiledCacheStatsModel(BaseModel):
+    """
+    ## Статистика кэша компиляции SQLAlchemy.
+
+    ### Attributes:
+        hits (int): Выполнения со скомпилированной формой из кэша.
+        misses (int): Выполнения, потребовавшие компиляции.
+        uncached (int): Выполнения без кэширования (текстовый SQL, DDL и т.п.).
+        hit_rate (float): Доля попаданий среди кэшируемых выполнений.
+    """
+    hits: int = Field(..., description='Попадания в кэш компиляции')
+    misses: int = Field(..., description='Промахи кэша компиляции')
+    uncached: int = Field(..., description='Выполнения без кэширования')
+    hit_rate: float = Field(..., description='Доля попаданий среди кэшируемых выполнений')
+
+
+class StatementCacheStatsResponseModel(BaseResponseModel):
+    """
+    ## Модель ответа от `'/v1/metrics/statements'`.
+
+    ### Attributes:
+        compiled_cache (CompiledCacheStatsModel): Статистика кэша компиляции.
+        registries (dict[str, dict[str, int]]): Использования выражений из реестров DAO.
+        prepared_statement_cache_size (int): Размер кэша prepared statements `asyncpg`.
+    """
+    compiled_cache: CompiledCacheStatsModel
+    registries: dict[str, dict[str, int]] = Field(
+        default_factory=dict,
+        description='Использования выражений из реестров DAO: {DAO: {выражение: количество}}'
+    )
+    prepared_statement_cache_size: int = Field(
+        ...,
+        description='Размер кэша подготовленных выражений asyncpg на соединение'
+    )
+
+
+class LoopLagResponseModel(BaseResponseModel):
+    """
+    ## Модель ответа от `'/v1/metrics/loop-lag'`.
+
+    ### Attributes:
+        enabled (bool): Запущен ли монитор.
+        interval_ms (float): Период измерения, мс.
+        threshold_ms (float): Порог блокировки, мс.
+        count (int): Количество измерений.
+        mean_ms (float): Средний лаг, мс.
+        max_ms (float): Максимальный лаг, мс.
+        stalls (int): Количество блокировок выше порога.
+        buckets (dict[str, int]): Накопительная гистограмма лагов.
+    """
+    enabled: bool = Field(..., description='Запущен ли монитор лага event loop')
+    interval_ms: float = Field(0.0, description='Период измерения, мс')
+    threshold_ms: float = Field(0.0, description='Порог блокировки, мс')
+    count: int = Field(0, description='Количество измерений')
+    mean_ms: float = Field(0.0, description='Средний лаг, мс')
+    max_ms: float = Field(0.0, description='Максимальный лаг, мс')
+    stalls: int = Field(0, description='Количество блокировок выше порога')
+    buckets: dict[str, int] = Field(
+        default_factory=dict,
+        description='Накопительная гистограмма лагов: {"<=N мс": количество}'
+    )
+
+
+class WriteCoalescerResponseModel(BaseResponseModel):
+    """
+    ## Модель ответа от `'/v1/metrics/write-coalescer'`.
+
+    ### Attributes:
+        enabled (bool): Включено ли объединение вставок.
+        batches (int): Количество выполненных пачек.
+        items (int): Количество записанных через коалесцер элементов.
+        largest_batch (int): Размер самой большой пачки.
+        mean_batch (float): Средний размер пачки.
+        pending (int): Элементы, ожидающие отправки.
+    """
+    enabled: bool = Field(..., description='Включено ли объединение вставок')
+    batches: int = Field(0, description='Количество выполненных пачек')
+    items: int = Field(0, description='Количество записанных элементов')
+    largest_batch: int = Field(0, description='Размер самой большой пачки')
+    mean_batch: float = Field(0.0, description='Средний размер пачки')
+    pending: int = Field(0, description='Элементы, ожидающие отправки')
+
+
+class SingleFlightResponseModel(BaseResponseModel):
+    """
+    ## Модель ответа от `'/v1/metrics/single-flight'`.
+
+    ### Attributes:
+        enabled (bool): Включено ли объединение одинаковых чтений.
+        executions (int): Выполненных чтений (обращений к БД).
+        coalesced (int): Запросов, получивших результат чужого чтения.
+        abandoned (int): Чтений, отменённых из-за отключения всех ожидавших клиентов.
+        in_flight (int): Чтений, выполняющихся сейчас.
+        coalesced_ratio (float): Доля запросов, обслуженных без своего обращения к БД.
+    """
+    enabled: bool = Field(..., description='Включено ли объединение одинаковых чтений')
+    executions: int = Field(0, description='Выполненных чтений')
+    coalesced: int = Field(0, description='Запросов, получивших результат чужого чтения')
+    abandoned: int = Field(0, description='Чтений, отменённых после ухода всех клиентов')
+    in_flight: int = Field(0, description='Чтений, выполняющихся сейчас')
+    coalesced_ratio: float = Field(0.0, description='Доля объединённых запросов')
+
+
+class EmailFilterResponseModel(BaseResponseModel):
+    """
+    ## Модель ответа от `'/v1/metrics/email-filter'`.
+
+    ### Attributes:
+        enabled (bool): Включён ли фильтр Блума для email.
+        ready (bool): Собран ли фильтр из БД.
+        items (int): Количество email в фильтре.
+        capacity (int): Ёмкость фильтра.
+        size_bits (int): Размер битового массива.
+        hashes (int): Количество хеш-функций.
+        estimated_error_rate (float): Оценка доли ложноположительных ответов.
+        rebuilds (int): Количество пересборок из БД.
+        checks (int): Количество проверок.
+        negatives (int): Проверки, отвеченные без обращения к БД.
+    """
+    enabled: bool = Field(..., description='Включён ли фильтр')
+    ready: bool = Field(False, description='Собран ли фильтр из БД')
+    items: int = Field(0, description='Количество email в фильтре')
+    capacity: int = Field(0, description='Ёмкость фильтра')
+    size_bits: int = Field(0, description='Размер битового массива')
+    hashes: int = Field(0, description='Количество хеш-функций')
+    estimated_error_rate: float = Field(0.0, description='Оценка доли ложноположительных ответов')
+    rebuilds: int = Field(0, description='Количество пересборок из БД')
+    checks: int = Field(0, description='Количество проверок')
+    negatives: int = Field(0, description='Проверки, отвеченные без обращения к БД')
+
+
+class ChangeFeedResponseModel(BaseResponseModel):
+    """
+    ## Модель ответа от `'/v1/metrics/change-feed'`.
+
+    ### Attributes:
+        enabled (bool): Включена ли лента изменений.
+        connected (bool): Слушатель `LISTEN` подключён.
+        reconnects (int): Количество переподключений слушателя.
+        subscribers (int): Активные SSE-подписчики воркера.
+        published (int): Событий раздано подписчикам.
+        overflows (int): Подписки, закрытые из-за переполнения очереди клиента.
+        buffered (int): Событий в буфере для возобновления.
+    """
+    enabled: bool = Field(..., description='Включена ли лента изменений')
+    connected: bool = Field(False, description='Слушатель LISTEN подключён')
+    reconnects: int = Field(0, description='Количество переподключений слушателя')
+    subscribers: int = Field(0, description='Активные SSE-подписчики')
+    published: int = Field(0, description='Событий раздано подписчикам')
+    overflows: int = Field(0, description='Подписки, закрытые из-за переполнения')
+    buffered: int = Field(0, description='Событий в буфере для возобновления')
+
+
+class UserCacheResponseModel(BaseResponseModel):
+    """
+    ## Модель ответа от `'/v1/metrics/user-cache'`.
+
+    ### Attributes:
+        enabled (bool): Включён ли кэш пользователей.
+        backend (str): Шина инвалидации (`postgres` или `memory`).
+        cache (dict[str, int]): Счётчики кэша воркера (`VersionedCache.stats`).
+        bus (dict[str, int]): Счётчики шины инвалидации (`InvalidationBus.stats`).
+    """
+    enabled: bool = Field(..., description='Включён ли кэш пользователей')
+    backend: str = Field(..., description='Шина инвалидации')
+    cache: dict[str, int] = Field(default_factory=dict, description='Счётчики кэша воркера')
+    bus: dict[str, int] = Field(default_factory=dict, description='Счётчики шины инвалидации')
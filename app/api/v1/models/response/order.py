@@ -0,0 +1,32 @@
+"""Модели ответов для ресурса заказа (v1)."""
+
+from pydantic import Field
+
+from app.schemas.order import ExistsOrder
+from app.api.v1.models.response.user import UserResponseModel
+
+
+class OrderResponseModel(ExistsOrder):
+    """
+    ## Модель ответа с данными заказа.
+
+    ### Inherits:
+        ExistsOrder: Схема существующего заказа с `id` и `created_at`.
+    """
+    pass
+
+
+class UserWithOrdersResponseModel(UserResponseModel):
+    """
+    ## Модель ответа: пользователь вместе с его заказами.
+
+    ### Inherits:
+        UserResponseModel: Данные пользователя.
+
+    ### Attributes:
+        orders (list[OrderResponseModel]): Заказы пользователя по возрастанию `id`.
+    """
+    orders: list[OrderResponseModel] = Field(
+        default_factory=list,
+        description='Заказы пользователя'
+    )
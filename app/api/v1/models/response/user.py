@@ -1,5 +1,7 @@
 """Модели ответов для ресурсов пользователя (v1)."""
 
+from pydantic import BaseModel, Field
+
 from app.schemas.user import ExistsUser
 
 
@@ -13,4 +15,16 @@ class UserResponseModel(ExistsUser):
     ### Inherits:
         ExistsUser: Схема существующего пользователя с `id` и `created_at`.
     """
-    pass
\ No newline at end of file
+    pass
+
+
+class EmailAvailabilityResponseModel(BaseModel):
+    """
+    ## Модель ответа проверки занятости email.
+
+    ### Attributes:
+        email (str): Проверенный email.
+        available (bool): `True`, если email свободен.
+    """
+    email: str = Field(..., description='Проверенный email')
+    available: bool = Field(..., description='Свободен ли email')
@@ -0,0 +1,68 @@
+"""Административные маршруты `API` версии v1 (включаются `ADMIN_API_ENABLED`)."""
+
+from dataclasses import asdict
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.db import get_db_session
+from app.api.exceptions.base import NotFoundException
+from app.api.v1.models.response.admin import IndexReportResponseModel
+from app.config.config_reader import env_config
+from app.modules.index_advisor import build_index_report
+
+
+
+def require_admin_api() -> None:
+    """
+    ## Зависимость: административные эндпоинты открыты.
+
+    ### Raises:
+        NotFoundException: `ADMIN_API_ENABLED=False` (ответ 404, как будто маршрута нет).
+    """
+    if not env_config.admin_api_enabled:
+        raise NotFoundException('Административный API')
+
+
+router = APIRouter(prefix='/admin', tags=['admin', 'v1'], dependencies=[Depends(require_admin_api)])
+
+
+
+@router.get('/indexes', response_model=IndexReportResponseModel)
+async def get_index_report(
+    session: Annotated[AsyncSession, Depends(get_db_session)],
+    min_scans: Annotated[int, Query(ge=0, description='Сканирований не больше — индекс не используется')] = 0,
+    max_distinct: Annotated[float, Query(gt=0, description='Значений в колонке не больше — малоселективный')] = 10,
+    max_top_frequency: Annotated[
+        float, Query(gt=0, le=1, description='Доля самого частого значения не меньше — малоселективный')
+    ] = 0.5,
+):
+    """
+    ## Эндпоинт отчёта по индексам.
+
+    Читает `pg_stat_user_indexes`, `pg_statio_user_indexes` и размеры индексов,
+    отмечает неиспользуемые, дублирующие и малоселективные индексы, сверяет
+    их с моделями и предлагает миграцию Alembic для удаления лишних.
+
+    ### Args:
+        session (AsyncSession): Сессия БД.
+        min_scans (int): Порог неиспользуемого индекса.
+        max_distinct (float): Порог числа значений малоселективной колонки.
+        max_top_frequency (float): Порог доли самого частого значения.
+
+    ### Returns:
+        IndexReportResponseModel: Индексы, замечания и миграция-кандидат.
+    """
+    report = await build_index_report(
+        session,
+        min_scans=min_scans,
+        max_distinct=max_distinct,
+        max_top_frequency=max_top_frequency,
+    )
+    return IndexReportResponseModel(
+        stats_reset=report.stats_reset,
+        indexes=[asdict(index) for index in report.indexes],
+        findings=[asdict(finding) for finding in report.findings],
+        migration=report.migration,
+    )
@@ -3,6 +3,7 @@
 from fastapi import APIRouter
 
 from app.api.v1.models.response.healthcheck import HealthCheckResponseModel
+from app.database.connection import db_connection
 
 # from enum import Enum
 
@@ -23,11 +24,12 @@ async def get_healthcheck():
     """
     ## Эндпоинт проверки работоспособности `API`.
 
-    Возвращает статическое тело ответа, подтверждающее, что сервис успешно
-    поднят и готов обрабатывать запросы.
+    Возвращает тело ответа, подтверждающее, что сервис успешно поднят и готов
+    обрабатывать запросы, и состояние выключателя БД. Статус всегда 200: при
+    недоступной БД воркер жив и отвечает 503 сам, без обращения к ней.
 
     ### Returns:
         HealthCheckResponseModel: Ответ `{'status': 'ok'}` с дополнительной
         метаинформацией.
     """
-    return HealthCheckResponseModel()
\ No newline at end of file
+    return HealthCheckResponseModel(database=db_connection.breaker.snapshot())
\ No newline at end of file
@@ -0,0 +1,174 @@
+"""Маршруты метрик производительности `API` версии v1."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Request
+
+from app.api.dao.base import BaseDAO
+from app.api.dao.user import UserDAO
+from app.api.dependencies.dao import get_user_dao
+from app.api.v1.models.response.metrics import (
+    ChangeFeedResponseModel,
+    EmailFilterResponseModel,
+    LoopLagResponseModel,
+    SingleFlightResponseModel,
+    StatementCacheStatsResponseModel,
+    UserCacheResponseModel,
+    WriteCoalescerResponseModel,
+)
+from app.config.config_reader import env_config
+from app.database.statement_cache import compiled_cache_stats
+from app.modules.change_feed import get_change_feed_hub
+
+
+
+router = APIRouter(prefix='/metrics', tags=['metrics', 'v1'])
+
+
+
+@router.get('/statements', response_model=StatementCacheStatsResponseModel)
+async def get_statement_stats():
+    """
+    ## Эндпоинт статистики кэширования SQL-выражений.
+
+    Возвращает долю попаданий в кэш компиляции SQLAlchemy и количество
+    использований заранее собранных выражений из реестров DAO.
+
+    ### Returns:
+        StatementCacheStatsResponseModel: Текущие счётчики.
+    """
+    return StatementCacheStatsResponseModel(
+        compiled_cache=compiled_cache_stats.snapshot(),
+        registries=BaseDAO.statement_stats(),
+        prepared_statement_cache_size=env_config.db_prepared_statement_cache_size,
+    )
+
+
+@router.get('/loop-lag', response_model=LoopLagResponseModel)
+async def get_loop_lag(request: Request):
+    """
+    ## Эндпоинт гистограммы лага event loop.
+
+    Монитор запускается в `lifespan`, если `LOOP_MONITOR_ENABLED=True`;
+    иначе возвращается `enabled=False` без измерений.
+
+    ### Args:
+        request (Request): Текущий запрос (для доступа к `app.state`).
+
+    ### Returns:
+        LoopLagResponseModel: Гистограмма и агрегаты лага.
+    """
+    monitor = getattr(request.app.state, 'loop_monitor', None)
+    if monitor is None:
+        return LoopLagResponseModel(enabled=False)
+    return LoopLagResponseModel(enabled=monitor.running, **monitor.snapshot())
+
+
+@router.get('/write-coalescer', response_model=WriteCoalescerResponseModel)
+async def get_write_coalescer_stats(
+    user_dao: Annotated[UserDAO, Depends(get_user_dao)],
+):
+    """
+    ## Эндпоинт статистики объединения вставок пользователей.
+
+    Средний размер пачки показывает, сколько транзакций экономит group commit.
+
+    ### Args:
+        user_dao (UserDAO): Объект доступа к данным пользователя.
+
+    ### Returns:
+        WriteCoalescerResponseModel: Счётчики коалесцера.
+    """
+    if user_dao.coalescer is None:
+        return WriteCoalescerResponseModel(enabled=False)
+    return WriteCoalescerResponseModel(enabled=True, **user_dao.coalescer.stats())
+
+
+@router.get('/single-flight', response_model=SingleFlightResponseModel)
+async def get_single_flight_stats(
+    user_dao: Annotated[UserDAO, Depends(get_user_dao)],
+):
+    """
+    ## Эндпоинт статистики объединения одинаковых чтений пользователей.
+
+    Доля объединённых запросов показывает, сколько обращений к БД сэкономлено
+    при всплесках одинаковых `GET`.
+
+    ### Args:
+        user_dao (UserDAO): Объект доступа к данным пользователя.
+
+    ### Returns:
+        SingleFlightResponseModel: Счётчики объединителя.
+    """
+    if user_dao.single_flight is None:
+        return SingleFlightResponseModel(enabled=False)
+    return SingleFlightResponseModel(enabled=True, **user_dao.single_flight.stats())
+
+
+@router.get('/email-filter', response_model=EmailFilterResponseModel)
+async def get_email_filter_stats(
+    user_dao: Annotated[UserDAO, Depends(get_user_dao)],
+):
+    """
+    ## Эндпоинт статистики фильтра Блума для проверки занятости email.
+
+    Доля `negatives` от `checks` — проверки, не дошедшие до БД.
+
+    ### Args:
+        user_dao (UserDAO): Объект доступа к данным пользователя.
+
+    ### Returns:
+        EmailFilterResponseModel: Состояние и счётчики фильтра.
+    """
+    if user_dao.email_filter is None:
+        return EmailFilterResponseModel(enabled=False)
+    return EmailFilterResponseModel(enabled=True, **user_dao.email_filter.stats())
+
+
+@router.get('/change-feed', response_model=ChangeFeedResponseModel)
+async def get_change_feed_stats(request: Request):
+    """
+    ## Эндпоинт состояния ленты изменений пользователей.
+
+    ### Args:
+        request (Request): Запрос (для доступа к слушателю в `app.state`).
+
+    ### Returns:
+        ChangeFeedResponseModel: Состояние слушателя и счётчики хаба воркера.
+    """
+    listener = getattr(request.app.state, 'change_feed_listener', None)
+    if listener is None:
+        return ChangeFeedResponseModel(enabled=False)
+    return ChangeFeedResponseModel(
+        enabled=True,
+        connected=listener.connected,
+        reconnects=listener.reconnects,
+        **get_change_feed_hub().stats(),
+    )
+
+
+@router.get('/user-cache', response_model=UserCacheResponseModel)
+async def get_user_cache_stats(
+    user_dao: Annotated[UserDAO, Depends(get_user_dao)],
+):
+    """
+    ## Эндпоинт статистики кэша пользователей и шины инвалидации.
+
+    Рост `gaps`/`resets` означает потерянные сообщения шины: кэш воркера
+    очищался целиком.
+
+    ### Args:
+        user_dao (UserDAO): Объект доступа к данным пользователя.
+
+    ### Returns:
+        UserCacheResponseModel: Счётчики кэша и шины.
+    """
+    backend = env_config.cache_invalidation_backend
+    if user_dao.cache is None:
+        return UserCacheResponseModel(enabled=False, backend=backend)
+    return UserCacheResponseModel(
+        enabled=True,
+        backend=backend,
+        cache=user_dao.cache.stats(),
+        bus=user_dao.invalidation.stats(),
+    )
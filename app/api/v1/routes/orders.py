@@ -0,0 +1,92 @@
+"""Маршруты для работы с ресурсом заказа."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dao.order import OrderDAO
+from app.api.exceptions.order import OrderNotFoundException
+
+from app.api.v1.models.request import CreateOrderRequestModel
+from app.api.v1.models.response import OrderResponseModel
+
+from app.api.dependencies.dao import get_order_dao
+from app.api.dependencies.db import get_db_session
+
+
+
+router = APIRouter(prefix='/orders', tags=['orders', 'Заказы', 'v1'])
+
+
+
+@router.post('/', response_model=OrderResponseModel)
+async def create_order(
+    order: CreateOrderRequestModel,
+    order_dao: Annotated[OrderDAO, Depends(get_order_dao)],
+    session: Annotated[AsyncSession, Depends(get_db_session)]
+):
+    """
+    ## Эндпоинт создания заказа.
+
+    ### Args:
+        order (CreateOrderRequestModel): Данные для создания заказа.
+        order_dao (OrderDAO): Объект доступа к данным заказа.
+        session (AsyncSession): Асинхронная сессия SQLAlchemy для транзакции.
+
+    ### Raises:
+        UserNotFoundException: Владелец заказа не существует (404).
+
+    ### Returns:
+        OrderResponseModel: Созданный заказ с идентификатором.
+    """
+    async with session.begin():
+        res = await order_dao.create(order, session)
+    return res
+
+
+@router.get('/', response_model=list[OrderResponseModel])
+async def get_by_user(
+    user_id: int,
+    order_dao: Annotated[OrderDAO, Depends(get_order_dao)],
+    session: Annotated[AsyncSession, Depends(get_db_session)]
+):
+    """
+    ## Эндпоинт получения заказов пользователя.
+
+    ### Args:
+        user_id (int): Идентификатор пользователя.
+        order_dao (OrderDAO): Объект доступа к данным заказа.
+        session (AsyncSession): Асинхронная сессия SQLAlchemy для транзакции.
+
+    ### Returns:
+        list[OrderResponseModel]: Заказы пользователя по возрастанию `id`.
+    """
+    res = await order_dao.run_read(session, lambda: order_dao.get_by_user(user_id, session))
+    return res
+
+
+@router.get('/{order_id}', response_model=OrderResponseModel)
+async def get_by_id(
+    order_id: int,
+    order_dao: Annotated[OrderDAO, Depends(get_order_dao)],
+    session: Annotated[AsyncSession, Depends(get_db_session)]
+):
+    """
+    ## Эндпоинт получения заказа по идентификатору.
+
+    ### Args:
+        order_id (int): Идентификатор заказа.
+        order_dao (OrderDAO): Объект доступа к данным заказа.
+        session (AsyncSession): Асинхронная сессия SQLAlchemy для транзакции.
+
+    ### Raises:
+        OrderNotFoundException: Заказ с указанным `id` не найден.
+
+    ### Returns:
+        OrderResponseModel: Найденный заказ.
+    """
+    res = await order_dao.run_read(session, lambda: order_dao.get_by_id(order_id, session))
+    if not res:
+        raise OrderNotFoundException(order_id)
+    return res
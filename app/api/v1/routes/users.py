@@ -1,19 +1,35 @@
 """Маршруты CRUD для работы с ресурсом пользователя."""
 
-from typing import Annotated
+import asyncio
+from datetime import datetime
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.exceptions import RequestValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dao.user import UserDAO
-from app.api.exceptions.user import UserNotFoundException
+from app.api.exceptions.base import ServiceUnavailableException
+from app.api.exceptions.user import UserEmailNotFoundException, UserNotFoundException
 
+from app.api.v1.models.batch import dump_users_json, validate_new_users_json
 from app.api.v1.models.request import CreateUserRequestModel
-from app.api.v1.models.response import UserResponseModel
+from app.api.v1.models.response import (
+    EmailAvailabilityResponseModel,
+    UserResponseModel,
+    UserWithOrdersResponseModel,
+)
 
 from app.api.dependencies.dao import get_user_dao
 from app.api.dependencies.db import get_db_session
 
+from app.config.config_reader import env_config
+from app.modules.change_feed import get_change_feed_hub
+from app.modules.deadline import request_timeout
+from app.modules.export import parquet_available
+from app.modules.offload.pool import WorkerPoolOverloaded, get_worker_pool
+
 
 
 router = APIRouter(prefix='/users', tags=['users', 'Пользователи', 'v1'])
@@ -30,13 +46,16 @@ async def create_user(
     ## Эндпоинт создания нового пользователя.
 
     Создает запись в БД на основе валидированной схемы `NewUser` и возвращает
-    представление созданного пользователя.
+    представление созданного пользователя. Email сохраняется в нижнем регистре.
 
     ### Args:
         user (CreateUserRequestModel): Данные для создания пользователя.
         user_dao (UserDAO): Объект доступа к данным пользователя.
         session (AsyncSession): Асинхронная сессия SQLAlchemy для транзакции.
 
+    ### Raises:
+        UserAlreadyExistsException: Пользователь с таким email уже существует (409).
+
     ### Returns:
         UserResponseModel: Созданный пользователь с идентификатором.
     """
@@ -45,7 +64,66 @@ async def create_user(
     return res
 
 
-@router.get('/', response_model=list[UserResponseModel])
+@router.post(
+    '/bulk',
+    response_class=Response,
+    responses={200: {'model': list[UserResponseModel]}},
+    openapi_extra={
+        'requestBody': {
+            'required': True,
+            'content': {'application/json': {'schema': {
+                'type': 'array',
+                'items': {'$ref': '#/components/schemas/CreateUserRequestModel'},
+            }}},
+        },
+    },
+)
+async def create_users_bulk(
+    request: Request,
+    user_dao: Annotated[UserDAO, Depends(get_user_dao)],
+    session: Annotated[AsyncSession, Depends(get_db_session)]
+):
+    """
+    ## Эндпоинт пакетного создания пользователей.
+
+    Тело читается как сырые байты: разбор JSON и валидация `EmailStr` для
+    больших пачек выполняются в пуле исполнителей, а не на event loop.
+
+    ### Args:
+        request (Request): Запрос с JSON-массивом `CreateUserRequestModel`.
+        user_dao (UserDAO): Объект доступа к данным пользователя.
+        session (AsyncSession): Асинхронная сессия SQLAlchemy для транзакции.
+
+    ### Raises:
+        RequestValidationError: Тело не прошло валидацию (ответ 422).
+        ServiceUnavailableException: Пул исполнителей перегружен (ответ 503).
+
+    ### Returns:
+        Response: JSON-массив созданных пользователей.
+    """
+    body = await request.body()
+    pool = get_worker_pool()
+    try:
+        users, errors = await pool.maybe_offload(
+            validate_new_users_json, body, size_bytes=len(body)
+        )
+        if errors:
+            raise RequestValidationError(
+                [{**error, 'loc': ('body', *error['loc'])} for error in errors]
+            )
+        async with session.begin():
+            rows = await user_dao.create_many(users, session)
+        content = await pool.maybe_offload(dump_users_json, rows, items=len(rows))
+    except WorkerPoolOverloaded as exc:
+        raise ServiceUnavailableException(str(exc), retry_after=1) from exc
+    return Response(content=content, media_type='application/json')
+
+
+@router.get(
+    '/',
+    response_class=Response,
+    responses={200: {'model': list[UserResponseModel]}},
+)
 async def get_all(
     user_dao: Annotated[UserDAO, Depends(get_user_dao)],
     session: Annotated[AsyncSession, Depends(get_db_session)]
@@ -53,20 +131,223 @@ async def get_all(
     """
     ## Эндпоинт получения списка пользователей.
 
-    Возвращает все записи пользователей из базы данных.
+    Возвращает все записи пользователей из базы данных. Строки сериализуются
+    в JSON напрямую; для длинных списков — в пуле исполнителей.
 
     ### Args:
         user_dao (UserDAO): Объект доступа к данным пользователя.
         session (AsyncSession): Асинхронная сессия SQLAlchemy для транзакции.
 
+    ### Raises:
+        ServiceUnavailableException: Пул исполнителей перегружен (ответ 503).
+
     ### Returns:
-        list[UserResponseModel]: Коллекция пользователей.
+        Response: JSON-массив пользователей (схема `UserResponseModel`).
     """
-    async with session.begin():
-        res = await user_dao.get_all(session)
+    rows = await user_dao.run_shared_read(session, ('get_all_rows',), user_dao.get_all_rows)
+    try:
+        content = await get_worker_pool().maybe_offload(dump_users_json, rows, items=len(rows))
+    except WorkerPoolOverloaded as exc:
+        raise ServiceUnavailableException(str(exc), retry_after=1) from exc
+    return Response(content=content, media_type='application/json')
+
+
+@router.get(
+    '/changes',
+    response_class=StreamingResponse,
+    responses={200: {'content': {'text/event-stream': {}}}},
+)
+async def stream_changes(
+    last_event_id: Annotated[str | None, Header()] = None,
+    after: Annotated[str | None, Query(description='Аналог Last-Event-ID для первого подключения')] = None,
+):
+    """
+    ## Эндпоинт ленты изменений пользователей (Server-Sent Events).
+
+    Отдаёт события `INSERT`/`UPDATE` таблицы `users` по мере фиксации транзакций
+    вместо опроса `GET /v1/users`. Событие содержит `user_id`; данные
+    пользователя читаются через `GET /v1/users/{id}`. При переподключении
+    с `Last-Event-ID` пропущенные события отдаются из буфера воркера. Если
+    продолжить нельзя, приходит событие `reset`: клиент перечитывает данные
+    целиком и дальше получает новые события.
+
+    ### Args:
+        last_event_id (str | None): Заголовок `Last-Event-ID` (ставит `EventSource`).
+        after (str | None): То же в query-параметре.
+
+    ### Raises:
+        ServiceUnavailableException: Лента отключена (`CHANGE_FEED_ENABLED=False`).
+
+    ### Returns:
+        StreamingResponse: Поток `text/event-stream`.
+    """
+    if not env_config.change_feed_enabled:
+        raise ServiceUnavailableException('Лента изменений отключена.')
+    hub = get_change_feed_hub()
+    subscription = hub.subscribe(last_event_id or after)
+    heartbeat = env_config.change_feed_heartbeat_seconds
+
+    async def events():
+        try:
+            yield b'retry: 3000\n\n'
+            while True:
+                try:
+                    event = await subscription.next(heartbeat)
+                except asyncio.TimeoutError:
+                    yield b': keep-alive\n\n'
+                    continue
+                if event is None:
+                    break
+                yield event.to_sse()
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@router.get(
+    '/export',
+    response_class=StreamingResponse,
+    responses={200: {'content': {'text/csv': {}, 'application/vnd.apache.parquet': {}}}},
+)
+async def export_users(
+    user_dao: Annotated[UserDAO, Depends(get_user_dao)],
+    file_format: Annotated[Literal['csv', 'parquet'], Query(alias='format')] = 'csv',
+    created_from: Annotated[datetime | None, Query(description='created_at >= (включительно)')] = None,
+    created_to: Annotated[datetime | None, Query(description='created_at < (не включительно)')] = None,
+    is_hidden: bool | None = None,
+):
+    """
+    ## Эндпоинт полной выгрузки пользователей в CSV или Parquet.
+
+    CSV отдаётся потоком прямо из `COPY (SELECT ...) TO STDOUT`, без ORM
+    и pydantic. Parquet собирается пачками по `USER_EXPORT_BATCH_SIZE` строк
+    и требует пакет `pyarrow`. Та же выгрузка доступна из консоли:
+    `python -m app.cli.export_users`.
+
+    ### Args:
+        user_dao (UserDAO): Объект доступа к данным пользователя.
+        file_format (Literal['csv', 'parquet']): Формат файла (query-параметр `format`).
+        created_from (datetime | None): Нижняя граница `created_at`.
+        created_to (datetime | None): Верхняя граница `created_at`.
+        is_hidden (bool | None): Только скрытые/видимые пользователи.
+
+    ### Raises:
+        ServiceUnavailableException: Запрошен Parquet, а `pyarrow` не установлен.
+
+    ### Returns:
+        StreamingResponse: Файл выгрузки.
+    """
+    if file_format == 'parquet' and not parquet_available():
+        raise ServiceUnavailableException('Выгрузка в Parquet недоступна: не установлен пакет pyarrow.')
+    media_type = 'text/csv' if file_format == 'csv' else 'application/vnd.apache.parquet'
+    return StreamingResponse(
+        user_dao.export_chunks(
+            file_format,
+            created_from=created_from,
+            created_to=created_to,
+            is_hidden=is_hidden,
+            batch_size=env_config.user_export_batch_size,
+        ),
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="users.{file_format}"'},
+    )
+
+
+@router.get('/email-available', response_model=EmailAvailabilityResponseModel)
+@request_timeout(2_000)
+async def check_email_available(
+    email: Annotated[str, Query(min_length=1, max_length=255)],
+    user_dao: Annotated[UserDAO, Depends(get_user_dao)],
+    session: Annotated[AsyncSession, Depends(get_db_session)]
+):
+    """
+    ## Эндпоинт проверки, свободен ли email.
+
+    Сначала email проверяется по фильтру Блума в памяти: если фильтр отвечает
+    «точно нет», ответ возвращается без обращения к БД. Запрос к БД выполняется
+    только при ответе «возможно есть».
+
+    ### Args:
+        email (str): Проверяемый email.
+        user_dao (UserDAO): Объект доступа к данным пользователя.
+        session (AsyncSession): Асинхронная сессия SQLAlchemy (только для подтверждения).
+
+    ### Returns:
+        EmailAvailabilityResponseModel: Результат проверки.
+    """
+    if not user_dao.email_maybe_taken(email):
+        return EmailAvailabilityResponseModel(email=email, available=True)
+    taken = await user_dao.run_read(session, lambda: user_dao.email_exists(email, session))
+    return EmailAvailabilityResponseModel(email=email, available=not taken)
+
+
+@router.get('/by-email/{email}', response_model=UserResponseModel)
+async def get_by_email(
+    email: str,
+    user_dao: Annotated[UserDAO, Depends(get_user_dao)],
+    session: Annotated[AsyncSession, Depends(get_db_session)]
+):
+    """
+    ## Эндпоинт получения пользователя по email без учёта регистра.
+
+    ### Args:
+        email (str): Email в произвольном регистре.
+        user_dao (UserDAO): Объект доступа к данным пользователя.
+        session (AsyncSession): Асинхронная сессия SQLAlchemy для транзакции.
+
+    ### Raises:
+        UserEmailNotFoundException: Пользователь с указанным email не найден.
+
+    ### Returns:
+        UserResponseModel: Найденный пользователь.
+    """
+    res = await user_dao.run_read(session, lambda: user_dao.get_by_email(email, session))
+    if not res:
+        raise UserEmailNotFoundException(email)
     return res
 
 
+@router.get('/with-orders', response_model=list[UserWithOrdersResponseModel])
+async def get_page_with_orders(
+    user_dao: Annotated[UserDAO, Depends(get_user_dao)],
+    session: Annotated[AsyncSession, Depends(get_db_session)],
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    strategy: Literal['selectin', 'aggregate'] = 'selectin',
+):
+    """
+    ## Эндпоинт получения страницы пользователей вместе с их заказами.
+
+    Количество запросов к БД не зависит от размера страницы:
+    `selectin` — два запроса (пользователи + заказы `WHERE user_id IN (...)`),
+    `aggregate` — один запрос с JSON-агрегацией заказов.
+
+    ### Args:
+        user_dao (UserDAO): Объект доступа к данным пользователя.
+        session (AsyncSession): Асинхронная сессия SQLAlchemy для транзакции.
+        limit (int): Размер страницы.
+        offset (int): Смещение от начала списка.
+        strategy (str): Стратегия загрузки заказов.
+
+    ### Returns:
+        list[UserWithOrdersResponseModel]: Пользователи по возрастанию `id`.
+    """
+    if strategy == 'aggregate':
+        return await user_dao.run_shared_read(
+            session, ('page_with_orders_aggregated', limit, offset),
+            lambda s: user_dao.get_page_with_orders_aggregated(limit, offset, s),
+        )
+    return await user_dao.run_shared_read(
+        session, ('page_with_orders', limit, offset),
+        lambda s: user_dao.get_page_with_orders(limit, offset, s),
+    )
+
+
 @router.get('/{user_id}', response_model=UserResponseModel)
 async def get_by_id(
     user_id: int,
@@ -90,8 +371,7 @@ async def get_by_id(
     ### Returns:
         UserResponseModel: Найденный пользователь.
     """
-    async with session.begin():
-        res = await user_dao.get_by_id(user_id, session)
+    res = await user_dao.run_shared_read(session, ('get_by_id', user_id), lambda s: user_dao.get_by_id(user_id, s))
     if not res:
         raise UserNotFoundException(user_id)
     return res
\ No newline at end of file
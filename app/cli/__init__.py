@@ -0,0 +1 @@
+"""Консольные команды обслуживания: `python -m app.cli.<команда>`."""
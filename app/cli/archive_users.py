@@ -0,0 +1,81 @@
+"""CLI архивации скрытых пользователей: `python -m app.cli.archive_users [--options]`.
+
+Переносит пользователей, скрытых дольше `USER_ARCHIVE_HIDDEN_DAYS` дней,
+из `users` в секционированную `users_archive` пачками по
+`USER_ARCHIVE_BATCH_SIZE` и создаёт секции архива на месяцы вперёд.
+Рассчитан на запуск по расписанию (cron), например раз в сутки:
+
+    python -m app.cli.archive_users --pause 0.2
+
+Требует `USER_ARCHIVE_ENABLED=true`: только тогда `UserDAO` ищет
+пользователей и в архиве, и перенесённые записи остаются доступны API.
+"""
+
+import argparse
+import asyncio
+import sys
+from dataclasses import asdict
+
+from app.config.config_reader import env_config
+from app.database.connection import db_connection
+from app.modules.archive import ArchiveResult, archive_hidden_users
+
+
+
+async def archive_users(
+    hidden_days: float | None = None,
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+    pause: float = 0.0,
+) -> ArchiveResult:
+    """
+    ## Запускает архивацию на отдельном соединении.
+
+    ### Args:
+        hidden_days (float | None): Порог скрытости, дни (`USER_ARCHIVE_HIDDEN_DAYS`).
+        batch_size (int | None): Пользователей в пачке (`USER_ARCHIVE_BATCH_SIZE`).
+        max_batches (int | None): Ограничение числа пачек за запуск.
+        pause (float): Пауза между пачками, секунды.
+
+    ### Returns:
+        ArchiveResult: Итог запуска.
+    """
+    try:
+        async with db_connection.engine.connect() as connection:
+            return await archive_hidden_users(
+                connection,
+                hidden_days=env_config.user_archive_hidden_days if hidden_days is None else hidden_days,
+                batch_size=batch_size or env_config.user_archive_batch_size,
+                months_ahead=env_config.user_archive_partitions_ahead,
+                lock_timeout_ms=env_config.user_archive_lock_timeout_ms,
+                max_batches=max_batches,
+                pause=pause,
+            )
+    finally:
+        await db_connection.dispose()
+
+
+def main() -> None:
+    """
+    ## Разбирает аргументы командной строки и запускает архивацию.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli.archive_users",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--hidden-days", type=float, help="Скрыт дольше, дней (USER_ARCHIVE_HIDDEN_DAYS)")
+    parser.add_argument("--batch-size", type=int, help="Пользователей в пачке (USER_ARCHIVE_BATCH_SIZE)")
+    parser.add_argument("--max-batches", type=int, help="Не больше пачек за запуск")
+    parser.add_argument("--pause", type=float, default=0.0, help="Пауза между пачками, секунды")
+    args = parser.parse_args()
+
+    if not env_config.user_archive_enabled:
+        parser.error("архивация выключена: задайте USER_ARCHIVE_ENABLED=true для API и этой команды")
+
+    result = asyncio.run(archive_users(args.hidden_days, args.batch_size, args.max_batches, args.pause))
+    print(", ".join(f"{name}={value}" for name, value in asdict(result).items()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""CLI выгрузки пользователей: `python -m app.cli.export_users [--options]`.
+
+Пишет CSV (`COPY ... TO STDOUT`) или Parquet в файл либо в stdout (`-o -`),
+не загружая таблицу в память. Пример ежедневной выгрузки:
+
+    python -m app.cli.export_users --format parquet \\
+        --created-from 2026-01-01 --created-to 2026-01-02 -o users-2026-01-01.parquet
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from typing import BinaryIO
+
+from app.api.dao.user import UserDAO
+from app.config.config_reader import env_config
+from app.database.connection import db_connection
+from app.modules.export import parquet_available
+
+
+
+def _parse_bool(value: str) -> bool:
+    """
+    ## Разбирает `true/false` для `--is-hidden`.
+    """
+    lowered = value.lower()
+    if lowered not in ("true", "false", "1", "0"):
+        raise argparse.ArgumentTypeError("ожидается true или false")
+    return lowered in ("true", "1")
+
+
+async def export_users(
+    output: BinaryIO,
+    file_format: str = "csv",
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    is_hidden: bool | None = None,
+    batch_size: int | None = None,
+) -> int:
+    """
+    ## Выгружает пользователей в открытый бинарный поток.
+
+    ### Args:
+        output (BinaryIO): Файл или `sys.stdout.buffer`.
+        file_format (str): `csv` или `parquet`.
+        created_from (datetime | None): Нижняя граница `created_at` (включительно).
+        created_to (datetime | None): Верхняя граница `created_at` (не включительно).
+        is_hidden (bool | None): Только скрытые/видимые пользователи.
+        batch_size (int | None): Строк в группе Parquet (`USER_EXPORT_BATCH_SIZE`).
+
+    ### Returns:
+        int: Количество записанных байтов.
+    """
+    written = 0
+    try:
+        async for chunk in UserDAO().export_chunks(
+            file_format,
+            created_from=created_from,
+            created_to=created_to,
+            is_hidden=is_hidden,
+            batch_size=batch_size or env_config.user_export_batch_size,
+        ):
+            output.write(chunk)
+            written += len(chunk)
+    finally:
+        await db_connection.dispose()
+    output.flush()
+    return written
+
+
+def main() -> None:
+    """
+    ## Разбирает аргументы командной строки и запускает выгрузку.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli.export_users",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--format", dest="file_format", choices=("csv", "parquet"), default="csv")
+    parser.add_argument("-o", "--output", default="-", help="Файл выгрузки, `-` — stdout")
+    parser.add_argument("--created-from", type=datetime.fromisoformat, help="created_at >= (ISO 8601)")
+    parser.add_argument("--created-to", type=datetime.fromisoformat, help="created_at < (ISO 8601)")
+    parser.add_argument("--is-hidden", type=_parse_bool, help="true — только скрытые, false — только видимые")
+    parser.add_argument("--batch-size", type=int, help="Строк в группе Parquet (USER_EXPORT_BATCH_SIZE)")
+    args = parser.parse_args()
+
+    if args.file_format == "parquet" and not parquet_available():
+        parser.error("для --format parquet нужен пакет pyarrow")
+
+    options = {
+        "file_format": args.file_format,
+        "created_from": args.created_from,
+        "created_to": args.created_to,
+        "is_hidden": args.is_hidden,
+        "batch_size": args.batch_size,
+    }
+    if args.output == "-":
+        asyncio.run(export_users(sys.stdout.buffer, **options))
+        return
+    with open(args.output, "wb") as output:
+        written = asyncio.run(export_users(output, **options))
+    print(f"{args.output}: {written} байт", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""CLI отчёта по индексам: `python -m app.cli.index_report [--options]`.
+
+Печатает индексы схемы со счётчиками использования и размером, замечания
+советника (неиспользуемые, дублирующие, малоселективные, расхождения
+с моделями) и миграцию-кандидат Alembic. Примеры:
+
+    python -m app.cli.index_report
+    python -m app.cli.index_report --json > indexes.json
+    python -m app.cli.index_report --migration > alembic/versions/drop_unused_indexes.py
+
+Во втором примере заголовок ревизии (`revision`, `down_revision`) нужно
+добавить вручную или перенести тело в файл от `alembic revision -m ...`.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import asdict
+
+from app.database.connection import db_connection
+from app.modules.index_advisor import IndexReport, build_index_report
+
+
+
+def format_report(report: IndexReport) -> str:
+    """
+    ## Форматирует отчёт для терминала.
+
+    ### Args:
+        report (IndexReport): Отчёт советника.
+
+    ### Returns:
+        str: Таблица индексов и список замечаний.
+    """
+    since = report.stats_reset.isoformat() if report.stats_reset else "создания кластера"
+    lines = [f"Счётчики накоплены с {since}", ""]
+    lines.append(f"{'индекс':<40} {'размер, КБ':>10} {'сканирований':>13} {'записей в табл.':>16}")
+    for index in report.indexes:
+        lines.append(
+            f"{index.table + '.' + index.name:<40} {index.size_bytes // 1024:>10} "
+            f"{index.scans:>13} {index.table_writes:>16}"
+        )
+    lines.append("")
+    if not report.findings:
+        lines.append("Замечаний нет")
+    for finding in report.findings:
+        mark = "DROP?" if finding.droppable else "     "
+        lines.append(f"{mark} [{finding.kind}] {finding.table}.{finding.index}: {finding.detail}")
+    return "\n".join(lines)
+
+
+async def index_report(schema: str = "public", **thresholds) -> IndexReport:
+    """
+    ## Строит отчёт по индексам схемы.
+
+    ### Args:
+        schema (str): Схема.
+        **thresholds: Пороги `analyze_indexes`.
+
+    ### Returns:
+        IndexReport: Отчёт советника.
+    """
+    try:
+        async with db_connection.engine.connect() as connection:
+            return await build_index_report(connection, schema, **thresholds)
+    finally:
+        await db_connection.dispose()
+
+
+def main() -> None:
+    """
+    ## Разбирает аргументы командной строки и печатает отчёт.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli.index_report",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--schema", default="public", help="Схема БД")
+    parser.add_argument("--min-scans", type=int, default=0, help="Сканирований не больше — индекс не используется")
+    parser.add_argument("--max-distinct", type=float, default=10, help="Значений не больше — малоселективный")
+    parser.add_argument(
+        "--max-top-frequency", type=float, default=0.5, help="Доля самого частого значения — малоселективный",
+    )
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="Отчёт в JSON")
+    output.add_argument("--migration", action="store_true", help="Только миграция-кандидат")
+    args = parser.parse_args()
+
+    report = asyncio.run(index_report(
+        args.schema,
+        min_scans=args.min_scans,
+        max_distinct=args.max_distinct,
+        max_top_frequency=args.max_top_frequency,
+    ))
+    if args.json:
+        print(json.dumps(asdict(report), ensure_ascii=False, indent=2, default=str))
+    elif args.migration:
+        if report.migration is None:
+            print("Удалять нечего", file=sys.stderr)
+            sys.exit(1)
+        print(report.migration, end="")
+    else:
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""CLI генерации тестовых пользователей: `python -m app.cli.seed_users [--options]`.
+
+Заполняет `users` миллионами правдоподобных строк для бенчмарков:
+уникальные email, имена из словарей, перекошенная доля `is_hidden`,
+`created_at` с ростом регистраций к концу периода. Пачки генерируются
+в пуле процессов и загружаются бинарным `COPY` (`copy_records_to_table`)
+в несколько соединений.
+
+Пачка `i` генерируется из `Random(seed, i)` и не зависит от порядка
+загрузки. `id` не берётся из последовательности во время `COPY`: перед
+загрузкой из `users_id_seq` резервируется блок на `--rows` значений, и строка
+с номером `n` получает `id = начало блока + n`. `--truncate` сбрасывает и
+последовательности, блок тогда начинается с 1. Поэтому при тех же `--seed`,
+`--rows`, `--batch-size`, `--end` и `--truncate` таблица получается
+одинаковой при любом `--workers`. Пример:
+
+    python -m app.cli.seed_users --rows 5000000 --workers 8 --truncate
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from pathlib import Path
+
+from app.config.config_reader import env_config
+from app.modules.change_feed.listener import asyncpg_dsn
+
+
+
+FIRST_NAMES = (
+    "Alexander", "Anna", "Dmitry", "Elena", "Ivan", "Maria", "Sergey", "Olga", "Pavel", "Natalia",
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David", "Sarah",
+    "Wei", "Li", "Hiroshi", "Yuki", "Carlos", "Sofia", "Ahmed", "Fatima", "Lukas", "Emma",
+)
+LAST_NAMES = (
+    "Ivanov", "Petrova", "Smirnov", "Kuznetsova", "Popov", "Sokolova", "Lebedev", "Kozlova",
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Wilson",
+    "Wang", "Zhang", "Tanaka", "Suzuki", "Rodriguez", "Martinez", "Hassan", "Muller", "Schmidt",
+)
+EMAIL_DOMAINS = (
+    # Перекос как в реальных данных: несколько популярных доменов и длинный хвост
+    ("gmail.com", 40), ("yandex.ru", 15), ("mail.ru", 12), ("outlook.com", 10),
+    ("yahoo.com", 8), ("icloud.com", 5), ("proton.me", 3), ("example.org", 2),
+    ("corp.example.com", 5),
+)
+_DOMAINS = [domain for domain, _ in EMAIL_DOMAINS]
+_DOMAIN_CUM_WEIGHTS = list(accumulate(weight for _, weight in EMAIL_DOMAINS))
+COLUMNS = ("id", "email", "full_name", "is_hidden", "created_at")
+"""
+    ## COLUMNS
+
+    Колонки `COPY`; `id` выводится из номера строки (см. `reserve_ids`).
+"""
+NOTIFY_TRIGGERS = ("users_notify_insert",)
+"""
+    ## NOTIFY_TRIGGERS
+
+    Триггеры, которые на время загрузки отключаются: миллионы `NOTIFY` никому не нужны.
+"""
+ARCHIVE_TRIGGERS = ("users_email_not_archived", "users_track_hidden_insert")
+"""
+    ## ARCHIVE_TRIGGERS
+
+    Построчные триггеры архива, отключаемые при загрузке после `--truncate`:
+    архив пуст, поэтому проверка email в нём не нужна, а `users_hidden`
+    заполняется после загрузки одним выражением (`TRACK_HIDDEN_SQL`).
+"""
+TRACK_HIDDEN_SQL = """
+INSERT INTO users_hidden (user_id)
+SELECT id FROM users WHERE is_hidden AND id BETWEEN $1 AND $2
+ON CONFLICT (user_id) DO NOTHING
+"""
+
+
+
+@dataclass(frozen=True)
+class SeedOptions:
+    """
+    ## Параметры генерации.
+
+    ### Attributes:
+        rows (int): Сколько строк создать.
+        batch_size (int): Строк в одной пачке `COPY`.
+        seed (int): Зерно генератора.
+        hidden_ratio (float): Доля скрытых пользователей.
+        days (int): Длина периода `created_at`, дни.
+        end (datetime): Конец периода `created_at`.
+    """
+    rows: int = 1_000_000
+    batch_size: int = 50_000
+    seed: int = 42
+    hidden_ratio: float = 0.03
+    days: int = 730
+    end: datetime = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    @property
+    def batches(self) -> int:
+        """ ## Количество пачек. """
+        return -(-self.rows // self.batch_size)
+
+
+def generate_batch(
+    options: SeedOptions,
+    batch_index: int,
+    first_id: int = 1,
+) -> list[tuple[int, str, str, bool, datetime]]:
+    """
+    ## Генерирует одну пачку строк детерминированно по `(seed, batch_index)`.
+
+    `id` и email уникальны за счёт глобального номера строки, поэтому пачки
+    можно грузить в любом порядке и параллельно.
+
+    ### Args:
+        options (SeedOptions): Параметры генерации.
+        batch_index (int): Номер пачки.
+        first_id (int): `id` строки с номером 0 (начало зарезервированного блока).
+
+    ### Returns:
+        list[tuple[int, str, str, bool, datetime]]: Записи в порядке `COLUMNS`.
+    """
+    rng = random.Random(f"{options.seed}:{batch_index}")
+    period = options.days * 86400
+    start = batch_index * options.batch_size
+    stop = min(start + options.batch_size, options.rows)
+    records = []
+    for number in range(start, stop):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        domain = rng.choices(_DOMAINS, cum_weights=_DOMAIN_CUM_WEIGHTS)[0]
+        # Квадрат равномерной величины: регистраций больше ближе к концу периода
+        age = period * rng.random() ** 2
+        records.append((
+            first_id + number,
+            f"{first}.{last}.{number}@{domain}".lower(),
+            f"{first} {last}",
+            rng.random() < options.hidden_ratio,
+            options.end - timedelta(seconds=age),
+        ))
+    return records
+
+
+def alembic_head() -> str:
+    """
+    ## Возвращает ревизию head из `alembic/versions`.
+
+    ### Returns:
+        str: Идентификатор ревизии.
+    """
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(Path(__file__).resolve().parents[2] / "alembic.ini"))
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+async def check_schema(connection) -> None:
+    """
+    ## Проверяет, что схема БД накатана миграциями до head.
+
+    ### Args:
+        connection (asyncpg.Connection): Соединение.
+
+    ### Raises:
+        RuntimeError: Миграции не применены или применены не до конца.
+    """
+    head = alembic_head()
+    current = await connection.fetchval("SELECT version_num FROM alembic_version")
+    if current != head:
+        raise RuntimeError(f"Схема БД на ревизии {current}, а head — {head}: выполните `alembic upgrade head`")
+
+
+async def reserve_ids(connection, rows: int) -> int:
+    """
+    ## Резервирует в `users_id_seq` блок из `rows` значений.
+
+    Последовательность сдвигается за конец блока до загрузки, поэтому
+    вставки приложения во время загрузки получают `id` после блока.
+
+    ### Args:
+        connection (asyncpg.Connection): Соединение.
+        rows (int): Размер блока.
+
+    ### Returns:
+        int: Первый `id` блока.
+    """
+    async with connection.transaction():
+        # Блокировка не даёт двум загрузкам зарезервировать пересекающиеся блоки
+        await connection.execute("LOCK TABLE users IN SHARE ROW EXCLUSIVE MODE")
+        first_id = await connection.fetchval("SELECT nextval('users_id_seq')")
+        await connection.execute("SELECT setval('users_id_seq', $1)", first_id + rows - 1)
+    return first_id
+
+
+async def seed_users(options: SeedOptions, workers: int = 4, truncate: bool = False) -> float:
+    """
+    ## Загружает пользователей пачками через `COPY` в `workers` соединений.
+
+    ### Args:
+        options (SeedOptions): Параметры генерации.
+        workers (int): Количество параллельных соединений.
+        truncate (bool): Очистить `users` (и зависимые `orders`, `users_hidden`, архив) перед загрузкой.
+
+    ### Returns:
+        float: Длительность загрузки, секунды.
+    """
+    import asyncpg
+
+    dsn = asyncpg_dsn(env_config.DATABASE_URL_asyncpg)
+    workers = max(1, min(workers, options.batches))
+    loop = asyncio.get_running_loop()
+    admin = await asyncpg.connect(dsn)
+    disabled: list[str] = []
+    try:
+        await check_schema(admin)
+        if truncate:
+            await admin.execute("TRUNCATE users, orders, users_hidden, users_archive RESTART IDENTITY")
+        for trigger in NOTIFY_TRIGGERS + (ARCHIVE_TRIGGERS if truncate else ()):
+            await admin.execute(f"ALTER TABLE users DISABLE TRIGGER {trigger}")
+            disabled.append(trigger)
+        first_id = await reserve_ids(admin, options.rows)
+
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for batch_index in range(options.batches):
+            queue.put_nowait(batch_index)
+        loaded = 0
+        started = time.perf_counter()
+
+        async def worker(pool: ProcessPoolExecutor) -> None:
+            nonlocal loaded
+            connection = await asyncpg.connect(dsn)
+            try:
+                while not queue.empty():
+                    batch_index = queue.get_nowait()
+                    records = await loop.run_in_executor(pool, generate_batch, options, batch_index, first_id)
+                    await connection.copy_records_to_table("users", records=records, columns=COLUMNS)
+                    loaded += len(records)
+                    elapsed = time.perf_counter() - started
+                    print(f"\r{loaded}/{options.rows} строк, {loaded / elapsed:,.0f} строк/с", end="", file=sys.stderr)
+            finally:
+                await connection.close()
+
+        with ProcessPoolExecutor(workers) as pool:
+            await asyncio.gather(*(worker(pool) for _ in range(workers)))
+        elapsed = time.perf_counter() - started
+        print(file=sys.stderr)
+        if truncate:
+            # Момент скрытия, который вёл бы отключённый users_track_hidden_insert
+            await admin.execute(TRACK_HIDDEN_SQL, first_id, first_id + options.rows - 1)
+        # Свежая статистика, иначе планы запросов в бенчмарке будут для пустой таблицы
+        await admin.execute("ANALYZE users")
+        return elapsed
+    finally:
+        for trigger in disabled:
+            await admin.execute(f"ALTER TABLE users ENABLE TRIGGER {trigger}")
+        await admin.close()
+
+
+def main() -> None:
+    """
+    ## Разбирает аргументы командной строки и запускает генерацию.
+    """
+    defaults = SeedOptions()
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli.seed_users",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--rows", type=int, default=defaults.rows, help="Сколько строк создать")
+    parser.add_argument("--batch-size", type=int, default=defaults.batch_size, help="Строк в пачке COPY")
+    parser.add_argument("--workers", type=int, default=4, help="Параллельных соединений")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Зерно генератора")
+    parser.add_argument("--hidden-ratio", type=float, default=defaults.hidden_ratio, help="Доля is_hidden")
+    parser.add_argument("--days", type=int, default=defaults.days, help="Длина периода created_at, дни")
+    parser.add_argument(
+        "--end",
+        type=lambda value: datetime.fromisoformat(value).astimezone(timezone.utc),
+        default=defaults.end,
+        help="Конец периода created_at (ISO 8601)",
+    )
+    parser.add_argument("--truncate", action="store_true", help="Очистить users, orders и архив перед загрузкой")
+    args = parser.parse_args()
+
+    options = SeedOptions(
+        rows=args.rows,
+        batch_size=args.batch_size,
+        seed=args.seed,
+        hidden_ratio=args.hidden_ratio,
+        days=args.days,
+        end=args.end,
+    )
+    elapsed = asyncio.run(seed_users(options, workers=args.workers, truncate=args.truncate))
+    print(f"{options.rows} строк за {elapsed:.1f} с ({options.rows / elapsed:,.0f} строк/с)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,6 +22,11 @@ class Settings(BaseSettings):
     ### Attributes:
         api_host (str): Хост для `API`.
         api_port (int): Порт для `API`.
+        server_workers (int): Количество воркеров (`0` — по числу CPU).
+        server_keepalive (int): Таймаут keep-alive соединений, секунды.
+        server_backlog (int): Размер очереди входящих соединений сокета.
+        server_preload (bool): Загружать приложение в мастер-процессе до `fork`.
+        server_graceful_timeout (int): Время на штатное завершение воркера, секунды.
         db_name (str): Имя базы данных `PostgreSQL`.
         db_user (str): Пользователь базы данных `PostgreSQL`.
         db_password (str): Пароль для базы данных `PostgreSQL`.
@@ -29,13 +35,89 @@ class Settings(BaseSettings):
         db_echo (bool): Логирование `SQL`-запросов.
         db_pool_size (int): Размер пула соединений.
         db_max_overflow (int): Максимальное количество дополнительных соединений.
+        db_prepared_statement_cache_size (int): Размер кэша подготовленных выражений `asyncpg` на соединение.
+        db_max_connections (int): Значение `max_connections` сервера `PostgreSQL` (бюджет соединений).
+        db_reserved_connections (int): Соединения, оставляемые под миграции, админку и т.п.
+        db_retry_attempts (int): Попыток идемпотентного чтения при обрыве связи с БД (`1` — без повторов).
+        db_retry_base_delay_ms (float): Пауза первого повтора, мс (дальше удваивается, со случайным джиттером).
+        db_retry_max_delay_ms (float): Верхняя граница паузы между повторами, мс.
+        db_breaker_failure_threshold (int): Запросов подряд с недоступной БД до размыкания выключателя.
+        db_breaker_reset_seconds (float): Время в разомкнутом состоянии до пробного запроса, секунды.
         env (str): Текущая среда (`production`/`development`).
+        log_mode (str): Запись логов: `file` — каждый процесс в свой файл, `socket` — через процесс-писатель.
+        log_socket_path (str): Unix-сокет процесса-писателя логов.
+        log_flush_interval (float): Период сброса буферов процесса-писателя, секунды.
+        log_queue_size (int): Максимум неотправленных записей в очереди процесса.
+        tracing_enabled (bool): Включена ли трассировка запросов.
+        tracing_sample_ratio (float): Доля записываемых трасс (head-based семплирование).
+        tracing_exporter (str): Куда экспортировать спаны (`file`/`memory`).
+        tracing_file_path (str): Файл спанов в формате JSONL.
+        tracing_service_name (str): Имя сервиса в спанах.
+        compression_enabled (bool): Включено ли сжатие ответов.
+        compression_minimum_size (int): Минимальный размер ответа для сжатия, байт.
+        compression_gzip_level (int): Уровень сжатия `gzip` (1-9).
+        compression_brotli_quality (int): Качество сжатия `brotli` (0-11).
+        compression_zstd_level (int): Уровень сжатия `zstd` (1-22).
+        loop_monitor_enabled (bool): Запускать ли монитор лага event loop.
+        loop_monitor_interval (float): Период измерения лага, секунды.
+        loop_monitor_threshold (float): Порог лага для записи стека блокировки, секунды.
+        offload_executor (str): Пул для тяжёлой валидации/сериализации (`thread`/`process`/`none`).
+        offload_max_workers (int): Количество потоков/процессов пула.
+        offload_min_items (int): Порог количества элементов для выноса в пул.
+        offload_min_bytes (int): Порог размера тела запроса для выноса в пул, байт.
+        offload_max_queue (int): Максимум задач, ожидающих свободного исполнителя.
+        user_write_coalesce_enabled (bool): Объединять ли конкурентные создания пользователей в пачки.
+        user_write_coalesce_max_batch (int): Максимальный размер пачки вставок.
+        user_write_coalesce_max_delay_ms (float): Окно ожидания попутчиков для пачки, мс.
+        user_read_single_flight_enabled (bool): Объединять ли одинаковые конкурентные чтения пользователей.
+        user_email_filter_enabled (bool): Отвечать ли на проверки занятости email из фильтра Блума.
+        user_email_filter_capacity (int): Минимальная ёмкость фильтра email.
+        user_email_filter_error_rate (float): Целевая доля ложноположительных ответов фильтра.
+        user_email_filter_refresh_seconds (float): Период пересборки фильтра из БД, `0` — только при старте и после потери сообщений шины.
+        change_feed_enabled (bool): Слушать ли `NOTIFY users_changes` и отдавать ленту изменений по SSE.
+        change_feed_buffer_size (int): Событий в буфере для возобновления по `Last-Event-ID`.
+        change_feed_client_queue_size (int): Размер очереди одного SSE-клиента.
+        change_feed_heartbeat_seconds (float): Период комментариев keep-alive в SSE, секунды.
+        user_cache_enabled (bool): Кэшировать ли пользователей по `id` в памяти воркера.
+        user_cache_max_entries (int): Максимум пользователей в кэше воркера.
+        user_cache_ttl_seconds (float): Время жизни записи кэша, секунды (страховка от потерянной инвалидации).
+        cache_invalidation_backend (str): Шина инвалидации: `postgres` — `LISTEN/NOTIFY` между воркерами и подами, `memory` — внутри процесса.
+        cache_invalidation_max_batch (int): Ключей в одном сообщении шины.
+        cache_invalidation_max_delay_ms (float): Максимальная задержка отправки инвалидации, мс.
+        user_export_batch_size (int): Строк в одной группе Parquet при выгрузке пользователей.
+        user_archive_enabled (bool): Искать ли пользователей и в архиве `users_archive` (и разрешить архивацию).
+        user_archive_hidden_days (float): Сколько дней пользователь должен пробыть скрытым до переноса в архив.
+        user_archive_batch_size (int): Пользователей в одной пачке архивации.
+        user_archive_interval_seconds (float): Период архивации в фоне воркера, `0` — только `python -m app.cli.archive_users`.
+        user_archive_partitions_ahead (int): На сколько месяцев вперёд создавать секции архива.
+        user_archive_lock_timeout_ms (int): Ожидание блокировки архива пачкой, мс.
+        admin_api_enabled (bool): Открыть административные эндпоинты `/v1/admin/*`.
+        request_timeout_ms (int): Бюджет запроса по умолчанию, мс (`0` — без дедлайна); переносится в `statement_timeout`.
+        request_timeout_max_ms (int): Верхняя граница бюджета из заголовка `X-Request-Timeout`, мс.
+        request_cancel_on_disconnect (bool): Отменять ли обработку запроса при отключении клиента.
+        db_statement_timeout_ms (int): `statement_timeout` всех соединений приложения, мс (`0` — как на сервере);
+            при остатке бюджета около него транзакция не задаёт свой.
+        rate_limit_enabled (bool): Включено ли ограничение частоты запросов.
+        rate_limit_backend (str): Где хранятся вёдра: `memory` — в воркере, `redis` — общие для всех воркеров.
+        rate_limit_redis_url (str): Адрес Redis для `RATE_LIMIT_BACKEND=redis`.
+        rate_limit_default (str): Правило по умолчанию `"rate:burst"` (запросов в секунду и всплеск) или `"off"`.
+        rate_limit_routes (dict[str, str]): Правила маршрутов `{"METHOD /шаблон": "rate:burst" | "off"}`.
+        rate_limit_key_header (str): Заголовок с ключом API клиента.
+        rate_limit_trust_forwarded (bool): Брать IP клиента из `X-Forwarded-For`.
+        rate_limit_max_keys (int): Максимум вёдер в памяти воркера.
     """
 
     # FastAPI
     api_host: str = Field("localhost", validation_alias="API_HOST")
     api_port: int = Field(8000, validation_alias="API_PORT")
 
+    # Сервер (gunicorn + uvicorn)
+    server_workers: int = Field(0, validation_alias="SERVER_WORKERS")
+    server_keepalive: int = Field(5, validation_alias="SERVER_KEEPALIVE")
+    server_backlog: int = Field(2048, validation_alias="SERVER_BACKLOG")
+    server_preload: bool = Field(False, validation_alias="SERVER_PRELOAD")
+    server_graceful_timeout: int = Field(30, validation_alias="SERVER_GRACEFUL_TIMEOUT")
+
     # PostgreSQL
     db_name: str = Field("postgrocker_db", validation_alias="POSTGRES_DB")
     db_user: str = Field("postgrocker_user", validation_alias="POSTGRES_USER")
@@ -47,10 +129,115 @@ class Settings(BaseSettings):
     db_echo: bool = Field(True, validation_alias="DB_ECHO")
     db_pool_size: int = Field(10, validation_alias="DB_POOL_SIZE")
     db_max_overflow: int = Field(20, validation_alias="DB_MAX_OVERFLOW")
+    db_prepared_statement_cache_size: int = Field(500, validation_alias="DB_PREPARED_STATEMENT_CACHE_SIZE")
+    db_max_connections: int = Field(100, validation_alias="DB_MAX_CONNECTIONS")
+    db_reserved_connections: int = Field(10, validation_alias="DB_RESERVED_CONNECTIONS")
+
+    # Повтор чтений и выключатель при недоступности БД
+    db_retry_attempts: int = Field(3, validation_alias="DB_RETRY_ATTEMPTS")
+    db_retry_base_delay_ms: float = Field(50.0, validation_alias="DB_RETRY_BASE_DELAY_MS")
+    db_retry_max_delay_ms: float = Field(1000.0, validation_alias="DB_RETRY_MAX_DELAY_MS")
+    db_breaker_failure_threshold: int = Field(5, validation_alias="DB_BREAKER_FAILURE_THRESHOLD")
+    db_breaker_reset_seconds: float = Field(5.0, validation_alias="DB_BREAKER_RESET_SECONDS")
 
     # Дополнительные настройки
     env: str = Field("development", validation_alias="ENV")
 
+    # Логирование
+    log_mode: Literal["file", "socket"] = Field("file", validation_alias="LOG_MODE")
+    log_socket_path: str = Field("/tmp/fastapi_app_log.sock", validation_alias="LOG_SOCKET_PATH")
+    log_flush_interval: float = Field(0.5, validation_alias="LOG_FLUSH_INTERVAL")
+    log_queue_size: int = Field(10000, validation_alias="LOG_QUEUE_SIZE")
+
+    # Трассировка
+    tracing_enabled: bool = Field(False, validation_alias="TRACING_ENABLED")
+    tracing_sample_ratio: float = Field(1.0, validation_alias="TRACING_SAMPLE_RATIO")
+    tracing_exporter: Literal["file", "memory"] = Field("file", validation_alias="TRACING_EXPORTER")
+    tracing_file_path: str = Field("logs/traces/spans.jsonl", validation_alias="TRACING_FILE_PATH")
+    tracing_service_name: str = Field("fastapi-app", validation_alias="TRACING_SERVICE_NAME")
+
+    # Сжатие ответов
+    compression_enabled: bool = Field(True, validation_alias="COMPRESSION_ENABLED")
+    compression_minimum_size: int = Field(1024, validation_alias="COMPRESSION_MINIMUM_SIZE")
+    compression_gzip_level: int = Field(6, validation_alias="COMPRESSION_GZIP_LEVEL")
+    compression_brotli_quality: int = Field(4, validation_alias="COMPRESSION_BROTLI_QUALITY")
+    compression_zstd_level: int = Field(3, validation_alias="COMPRESSION_ZSTD_LEVEL")
+
+    # Мониторинг event loop
+    loop_monitor_enabled: bool = Field(False, validation_alias="LOOP_MONITOR_ENABLED")
+    loop_monitor_interval: float = Field(0.25, validation_alias="LOOP_MONITOR_INTERVAL")
+    loop_monitor_threshold: float = Field(0.1, validation_alias="LOOP_MONITOR_THRESHOLD")
+
+    # Вынос тяжёлой валидации/сериализации из event loop
+    offload_executor: Literal["thread", "process", "none"] = Field("thread", validation_alias="OFFLOAD_EXECUTOR")
+    offload_max_workers: int = Field(2, validation_alias="OFFLOAD_MAX_WORKERS")
+    offload_min_items: int = Field(1000, validation_alias="OFFLOAD_MIN_ITEMS")
+    offload_min_bytes: int = Field(262144, validation_alias="OFFLOAD_MIN_BYTES")
+    offload_max_queue: int = Field(64, validation_alias="OFFLOAD_MAX_QUEUE")
+
+    # Group commit для создания пользователей
+    user_write_coalesce_enabled: bool = Field(False, validation_alias="USER_WRITE_COALESCE_ENABLED")
+    user_write_coalesce_max_batch: int = Field(100, validation_alias="USER_WRITE_COALESCE_MAX_BATCH")
+    user_write_coalesce_max_delay_ms: float = Field(2.0, validation_alias="USER_WRITE_COALESCE_MAX_DELAY_MS")
+    user_read_single_flight_enabled: bool = Field(False, validation_alias="USER_READ_SINGLE_FLIGHT_ENABLED")
+
+    # Фильтр Блума для проверки занятости email
+    user_email_filter_enabled: bool = Field(False, validation_alias="USER_EMAIL_FILTER_ENABLED")
+    user_email_filter_capacity: int = Field(1_000_000, validation_alias="USER_EMAIL_FILTER_CAPACITY")
+    user_email_filter_error_rate: float = Field(0.01, validation_alias="USER_EMAIL_FILTER_ERROR_RATE")
+    user_email_filter_refresh_seconds: float = Field(300.0, validation_alias="USER_EMAIL_FILTER_REFRESH_SECONDS")
+
+    # Лента изменений пользователей (LISTEN/NOTIFY + SSE)
+    change_feed_enabled: bool = Field(False, validation_alias="CHANGE_FEED_ENABLED")
+    change_feed_buffer_size: int = Field(10000, validation_alias="CHANGE_FEED_BUFFER_SIZE")
+    change_feed_client_queue_size: int = Field(1000, validation_alias="CHANGE_FEED_CLIENT_QUEUE_SIZE")
+    change_feed_heartbeat_seconds: float = Field(15.0, validation_alias="CHANGE_FEED_HEARTBEAT_SECONDS")
+
+    # Кэш пользователей в памяти воркера и шина его инвалидации
+    user_cache_enabled: bool = Field(False, validation_alias="USER_CACHE_ENABLED")
+    user_cache_max_entries: int = Field(10000, validation_alias="USER_CACHE_MAX_ENTRIES")
+    user_cache_ttl_seconds: float = Field(60.0, validation_alias="USER_CACHE_TTL_SECONDS")
+    cache_invalidation_backend: Literal["postgres", "memory"] = Field("postgres", validation_alias="CACHE_INVALIDATION_BACKEND")
+    cache_invalidation_max_batch: int = Field(100, validation_alias="CACHE_INVALIDATION_MAX_BATCH")
+    cache_invalidation_max_delay_ms: float = Field(20.0, validation_alias="CACHE_INVALIDATION_MAX_DELAY_MS")
+
+    # Выгрузка пользователей (GET /v1/users/export, python -m app.cli.export_users)
+    user_export_batch_size: int = Field(50000, validation_alias="USER_EXPORT_BATCH_SIZE")
+
+    # Архив давно скрытых пользователей (users_archive, python -m app.cli.archive_users)
+    user_archive_enabled: bool = Field(False, validation_alias="USER_ARCHIVE_ENABLED")
+    user_archive_hidden_days: float = Field(90.0, validation_alias="USER_ARCHIVE_HIDDEN_DAYS")
+    user_archive_batch_size: int = Field(1000, validation_alias="USER_ARCHIVE_BATCH_SIZE")
+    user_archive_interval_seconds: float = Field(0.0, validation_alias="USER_ARCHIVE_INTERVAL_SECONDS")
+    user_archive_partitions_ahead: int = Field(3, validation_alias="USER_ARCHIVE_PARTITIONS_AHEAD")
+    user_archive_lock_timeout_ms: int = Field(2000, validation_alias="USER_ARCHIVE_LOCK_TIMEOUT_MS")
+
+    # Административные эндпоинты (/v1/admin/*)
+    admin_api_enabled: bool = Field(False, validation_alias="ADMIN_API_ENABLED")
+
+    # Дедлайны запросов (statement_timeout) и отмена при отключении клиента
+    request_timeout_ms: int = Field(30000, validation_alias="REQUEST_TIMEOUT_MS")
+    request_timeout_max_ms: int = Field(120000, validation_alias="REQUEST_TIMEOUT_MAX_MS")
+    request_cancel_on_disconnect: bool = Field(True, validation_alias="REQUEST_CANCEL_ON_DISCONNECT")
+    db_statement_timeout_ms: int = Field(0, validation_alias="DB_STATEMENT_TIMEOUT_MS")
+
+    # Ограничение частоты запросов (token bucket на клиента и маршрут)
+    rate_limit_enabled: bool = Field(False, validation_alias="RATE_LIMIT_ENABLED")
+    rate_limit_backend: Literal["memory", "redis"] = Field("memory", validation_alias="RATE_LIMIT_BACKEND")
+    rate_limit_redis_url: str = Field("redis://localhost:6379/0", validation_alias="RATE_LIMIT_REDIS_URL")
+    rate_limit_default: str = Field("20:40", validation_alias="RATE_LIMIT_DEFAULT")
+    rate_limit_routes: dict[str, str] = Field(
+        default_factory=lambda: {
+            "GET /v1/users/": "2:10",
+            "GET /v1/users/export": "0.1:2",
+            "GET /v1/healthcheck/": "off",
+        },
+        validation_alias="RATE_LIMIT_ROUTES",
+    )
+    rate_limit_key_header: str = Field("X-API-Key", validation_alias="RATE_LIMIT_KEY_HEADER")
+    rate_limit_trust_forwarded: bool = Field(False, validation_alias="RATE_LIMIT_TRUST_FORWARDED")
+    rate_limit_max_keys: int = Field(100000, validation_alias="RATE_LIMIT_MAX_KEYS")
+
     @property
     def DATABASE_URL_asyncpg(self):
         return (
@@ -1,14 +1,18 @@
 """Асинхронное подключение к БД для примера SQLAlchemyExample.
 
-Использует параметры подключения и пула из конфигурации: `db_echo`, `db_pool_size`, `db_max_overflow`.
+Использует параметры подключения и пула из конфигурации: `db_echo`, `db_pool_size`, `db_max_overflow`,
+`db_prepared_statement_cache_size`.
 """
 
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterator
 
 from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, async_sessionmaker, AsyncSession
 
 from app.config.config_reader import env_config
+from app.database.statement_cache import compiled_cache_stats
+from app.modules.resilience import CircuitBreaker
 
 
 
@@ -16,20 +20,63 @@ class DbConnection:
     """
     ## Класс для работы с асинхронными сессиями базы данных.
 
-    Использует глобальный Engine (singleton) и создаёт sessionmaker для управления сессиями.
-    Согласно best practices SQLAlchemy, Engine создаётся один раз на уровне модуля,
-    а DbConnection может создаваться многократно, используя один и тот же Engine.
-    
+    Движок создаётся лениво, при первом обращении к сессии: импорт модуля не
+    загружает драйвер `asyncpg` и не создаёт пул. Так воркер сервера и тесты,
+    которым БД не нужна, стартуют быстрее, а после `fork` каждый воркер
+    создаёт свой пул с настройками из плана ёмкости.
     """
-    def __init__(self, engine: AsyncEngine) -> None:
+    def __init__(self, engine: AsyncEngine | None = None) -> None:
         """
         ## Инициализирует экземпляр `DbConnection`.
         
         Args:
-            engine (AsyncEngine): Если не указан, используется глобальный `_engine`.
+            engine (AsyncEngine | None): Готовый движок. Если не указан, он будет
+                создан по настройкам при первом обращении.
+        """
+        self._engine: AsyncEngine | None = None
+        self._sessionmaker: async_sessionmaker[AsyncSession] | None = None
+        self._engine_kwargs: dict[str, Any] = {}
+        self._connection: AsyncConnection | None = None
+        self._breaker: CircuitBreaker | None = None
+        if engine is not None:
+            self.bind(engine)
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """ ## Текущий движок БД (создаётся при первом обращении). """
+        self._get_sessionmaker()
+        return self._engine
+
+    @property
+    def engine_created(self) -> bool:
+        """ ## Создан ли уже движок БД. """
+        return self._engine is not None
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """
+        ## Выключатель обращений к БД этого процесса (создаётся при первом обращении).
+
+        Сессии запросов не открываются, пока он разомкнут (ответ 503); его
+        состояние показывает `GET /v1/healthcheck`.
+        """
+        if self._breaker is None:
+            self._breaker = CircuitBreaker(
+                'postgres',
+                failure_threshold=env_config.db_breaker_failure_threshold,
+                reset_timeout=env_config.db_breaker_reset_seconds,
+            )
+        return self._breaker
+
+    def bind(self, engine: AsyncEngine) -> None:
+        """
+        ## Привязывает подключение к движку.
+
+        Args:
+            engine (AsyncEngine): Движок БД.
         """
         self._engine = engine  # Сохраняем ссылку на движок БД
-        self._sessionmaker: async_sessionmaker[AsyncSession] = async_sessionmaker(
+        self._sessionmaker = async_sessionmaker(
             # Создаем фабрику асинхронных сессий, привязанную к нашему движку
             bind=self._engine,   # Движок, к которому будут привязываться все сессии
             class_=AsyncSession,  # Указываем тип сессии - асинхронная AsyncSession (не синхронная Session)
@@ -37,6 +84,74 @@ class DbConnection:
             # Объекты остаются валидными для чтения после транзакции
         )
 
+    def configure(self, **engine_kwargs: Any) -> None:
+        """
+        ## Задаёт параметры движка, который будет создан при первом обращении.
+
+        Используется сервером после `fork` (см. `app.server.launcher`). Если
+        движок уже был создан в родительском процессе, его пул отпускается
+        без закрытия сокетов (`dispose(close=False)`), чтобы не оборвать
+        соединения родителя.
+
+        Args:
+            **engine_kwargs: Аргументы `create_engine_from_settings`.
+        """
+        self._engine_kwargs = engine_kwargs
+        inherited, self._engine, self._sessionmaker = self._engine, None, None
+        if inherited is not None:
+            inherited.sync_engine.dispose(close=False)
+
+    def _get_sessionmaker(self) -> async_sessionmaker[AsyncSession]:
+        """
+        ## Возвращает фабрику сессий, при необходимости создавая движок.
+
+        Returns:
+            async_sessionmaker[AsyncSession]: Фабрика асинхронных сессий.
+        """
+        if self._sessionmaker is None:
+            self.bind(create_engine_from_settings(**self._engine_kwargs))
+        return self._sessionmaker
+
+    @contextmanager
+    def bound_to(self, connection: AsyncConnection) -> Iterator[None]:
+        """
+        ## Временно направляет все сессии и `connect()` в одно открытое соединение.
+
+        Используется тестами: сессии присоединяются к внешней транзакции
+        соединения через `SAVEPOINT`, поэтому `commit` приложения фиксирует
+        только точку сохранения, а откат внешней транзакции убирает все
+        изменения теста.
+
+        Args:
+            connection (AsyncConnection): Соединение с начатой транзакцией.
+        """
+        previous = self._sessionmaker, self._connection
+        self._sessionmaker = async_sessionmaker(
+            bind=connection,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            join_transaction_mode='create_savepoint',
+        )
+        self._connection = connection
+        try:
+            yield
+        finally:
+            self._sessionmaker, self._connection = previous
+
+    @asynccontextmanager
+    async def connect(self) -> AsyncIterator[AsyncConnection]:
+        """
+        ## Соединение вне ORM-сессии (например, для `COPY`).
+
+        Yields:
+            AsyncConnection: Соединение из пула или соединение из `bound_to`.
+        """
+        if self._connection is not None:
+            yield self._connection
+            return
+        async with self.engine.connect() as connection:
+            yield connection
+
     async def db_close(self, engine: AsyncEngine) -> None:
         """
         ## Закрывает соединение с базой данных.
@@ -46,6 +161,13 @@ class DbConnection:
         """
         await engine.dispose()
 
+    async def dispose(self) -> None:
+        """
+        ## Закрывает пул соединений, если движок был создан.
+        """
+        if self._engine is not None:
+            await self.db_close(self._engine)
+
     @asynccontextmanager
     async def get_session(self):
         """
@@ -54,7 +176,7 @@ class DbConnection:
         Yields:
             AsyncSession: Асинхронная сессия БД.
         """
-        async with self._sessionmaker() as session:
+        async with self._get_sessionmaker()() as session:
             try:
                 yield session
             except Exception:
@@ -65,20 +187,45 @@ class DbConnection:
             # https://chat.qwen.ai/s/dfb67396-c32f-4152-8335-3580f390ceab?fev=0.1.15
 
 
-# Создаётся один раз при импорте модуля
-_engine: AsyncEngine = create_async_engine(
-    url=env_config.DATABASE_URL_asyncpg,
-    echo=env_config.db_echo,
-    pool_size=env_config.db_pool_size,
-    max_overflow=env_config.db_max_overflow,
-)
+def create_engine_from_settings(
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+) -> AsyncEngine:
+    """
+    ## Создаёт движок БД по настройкам приложения.
+
+    Args:
+        pool_size (int | None): Размер пула; по умолчанию `db_pool_size`.
+        max_overflow (int | None): Дополнительные соединения; по умолчанию `db_max_overflow`.
+
+    Returns:
+        AsyncEngine: Новый движок со сбором статистики кэша выражений.
+    """
+    connect_args = {"prepared_statement_cache_size": env_config.db_prepared_statement_cache_size}
+    if env_config.db_statement_timeout_ms > 0:
+        # Значение по умолчанию для транзакций, которым дедлайн не задаёт свой (см. app.modules.deadline)
+        connect_args["server_settings"] = {"statement_timeout": str(env_config.db_statement_timeout_ms)}
+    engine = create_async_engine(
+        url=env_config.DATABASE_URL_asyncpg,
+        echo=env_config.db_echo,
+        pool_size=env_config.db_pool_size if pool_size is None else pool_size,
+        max_overflow=env_config.db_max_overflow if max_overflow is None else max_overflow,
+        # asyncpg готовит (PREPARE) каждый запрос и кэширует его по тексту SQL
+        # на уровне соединения; стабильный текст запросов DAO делает кэш эффективным
+        connect_args=connect_args,
+    )
+    compiled_cache_stats.attach(engine)
+    return engine
+
 
 # Глобальный экземпляр DbConnection для использования в приложении
-db_connection = DbConnection(_engine)
+# (движок создаётся при первом обращении)
+db_connection = DbConnection()
 
 
 # Экспортируемый интерфейс модуля
 __all__ = [
+    'create_engine_from_settings',
     'db_connection',
     'DbConnection',
 ]
\ No newline at end of file
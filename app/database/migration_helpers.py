@@ -0,0 +1,313 @@
+"""Хелперы Alembic для миграций без простоя на больших таблицах.
+
+Обычные `op.create_index` и `op.add_column(..., nullable=False)` берут блокировки,
+которые останавливают запись в таблицу на всё время построения индекса или
+проверки данных. Здесь собраны операции, которые этого избегают:
+
+- `create_index_concurrently` / `drop_index_concurrently` — `CREATE/DROP INDEX
+  CONCURRENTLY` вне транзакции миграции; невалидный индекс от прерванной
+  попытки пересоздаётся;
+- `backfill_column` — заполнение колонки пачками по диапазонам `id`: каждая пачка
+  в своей короткой транзакции, с паузой между пачками и отчётом о прогрессе;
+- `add_check_constraint_not_valid`, `add_foreign_key_not_valid`,
+  `validate_constraint` — ограничение сначала добавляется `NOT VALID` (только для
+  новых строк, без сканирования), а проверка старых строк идёт отдельным шагом
+  под блокировкой, не мешающей записи;
+- `set_not_null` — `SET NOT NULL` через проверенный `CHECK (... IS NOT NULL)`,
+  чтобы Postgres не сканировал таблицу под `ACCESS EXCLUSIVE`;
+- `lock_timeout` — ограничение ожидания блокировки: миграция падает быстро,
+  а не выстраивает за собой очередь из запросов приложения.
+
+Пример новой NOT NULL колонки на большой таблице:
+
+    op.add_column('users', sa.Column('email_domain', sa.Text(), nullable=True))
+    backfill_column('users', 'email_domain', "split_part(email, '@', 2)")
+    set_not_null('users', 'email_domain')
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+ProgressCallback = Callable[[int, int, int], None]
+"""
+    ## ProgressCallback
+
+    Функция отчёта о прогрессе: `(обновлено строк, последний id, максимальный id)`.
+"""
+
+
+
+def _log_progress(updated: int, last_id: int, max_id: int) -> None:
+    """
+    ## Отчёт о прогрессе по умолчанию — строка в лог Alembic.
+
+    ### Args:
+        updated (int): Обновлено строк на текущий момент.
+        last_id (int): Последний обработанный `id`.
+        max_id (int): Максимальный `id` на момент старта.
+    """
+    logger.info(f"backfill: обновлено {updated} строк, id {last_id} из {max_id}")
+
+
+def _is_offline() -> bool:
+    """
+    ## Миграция генерирует SQL-скрипт (`alembic upgrade --sql`), а не выполняется.
+
+    ### Returns:
+        bool: `True` в offline-режиме.
+    """
+    return op.get_context().as_sql
+
+
+@contextmanager
+def lock_timeout(milliseconds: int) -> Iterator[None]:
+    """
+    ## Ограничивает ожидание блокировок внутри блока.
+
+    Без ограничения `ALTER TABLE`, ждущий долгую транзакцию, блокирует и все
+    запросы, пришедшие после него. С `lock_timeout` миграция падает, и её
+    можно повторить позже.
+
+    ### Args:
+        milliseconds (int): Максимальное ожидание блокировки, мс.
+    """
+    op.execute(f"SET lock_timeout = {int(milliseconds)}")
+    try:
+        yield
+    finally:
+        op.execute("RESET lock_timeout")
+
+
+def _index_is_invalid(name: str) -> bool:
+    """
+    ## Проверяет, что индекс существует и помечен невалидным (прерванный `CONCURRENTLY`).
+
+    ### Args:
+        name (str): Имя индекса.
+
+    ### Returns:
+        bool: `True`, если индекс нужно пересоздать.
+    """
+    if _is_offline():
+        return False
+    res = op.get_bind().execute(
+        sa.text(
+            "SELECT NOT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND pg_catalog.pg_table_is_visible(c.oid)"
+        ),
+        {"name": name},
+    )
+    return bool(res.scalar())
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence[str | sa.TextClause],
+    unique: bool = False,
+    **kwargs,
+) -> None:
+    """
+    ## Строит индекс `CONCURRENTLY` вне транзакции миграции.
+
+    `CREATE INDEX CONCURRENTLY` не блокирует запись, но не может выполняться
+    в транзакции и при ошибке оставляет невалидный индекс. Такой индекс
+    удаляется перед повторной попыткой; валидный — не трогается.
+
+    ### Args:
+        name (str): Имя индекса.
+        table (str): Имя таблицы.
+        columns (Sequence[str | TextClause]): Колонки или выражения (`sa.text('lower(email)')`).
+        unique (bool): Уникальный индекс.
+        **kwargs: Прочие аргументы `op.create_index` (например, `postgresql_where`).
+    """
+    with op.get_context().autocommit_block():
+        if _index_is_invalid(name):
+            logger.info(f"Индекс {name} невалиден после прерванной попытки, пересоздаём")
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        op.create_index(
+            name, table, list(columns),
+            unique=unique, postgresql_concurrently=True, if_not_exists=True, **kwargs,
+        )
+
+
+def drop_index_concurrently(name: str, table: str) -> None:
+    """
+    ## Удаляет индекс `CONCURRENTLY` вне транзакции миграции.
+
+    ### Args:
+        name (str): Имя индекса.
+        table (str): Имя таблицы.
+    """
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def backfill_column(
+    table: str,
+    column: str,
+    value_sql: str,
+    batch_size: int = 10000,
+    pause: float = 0.1,
+    only_null: bool = True,
+    where: str | None = None,
+    progress: ProgressCallback = _log_progress,
+) -> int:
+    """
+    ## Заполняет колонку пачками по диапазонам `id`.
+
+    Каждая пачка — отдельный `UPDATE ... WHERE id >= :lo AND id <= :hi` в своей
+    транзакции, поэтому строки блокируются ненадолго, а WAL и автовакуум
+    успевают за изменениями. Границы пачек берутся по индексу первичного ключа,
+    так что разреженные `id` не дают пустых итераций. Строки, вставленные после
+    старта, должно заполнять уже приложение (или `server_default`).
+
+    ### Args:
+        table (str): Имя таблицы (с первичным ключом `id`).
+        column (str): Заполняемая колонка.
+        value_sql (str): SQL-выражение значения, например `lower(email)`.
+        batch_size (int): Строк в одной пачке.
+        pause (float): Пауза между пачками, секунды (троттлинг).
+        only_null (bool): Обновлять только строки, где колонка ещё `NULL`.
+        where (str | None): Дополнительное SQL-условие отбора строк, например
+            `email <> lower(email)`.
+        progress (ProgressCallback): Отчёт о прогрессе после каждой пачки.
+
+    ### Raises:
+        RuntimeError: Вызов в offline-режиме (`--sql`): пачки зависят от данных.
+
+    ### Returns:
+        int: Количество обновлённых строк.
+    """
+    if _is_offline():
+        raise RuntimeError("backfill_column требует подключения к БД и не работает с --sql")
+
+    bind = op.get_bind()
+    condition = f" AND {column} IS NULL" if only_null else ""
+    if where:
+        condition += f" AND ({where})"
+    next_bound = sa.text(
+        f"SELECT max(id) FROM (SELECT id FROM {table} WHERE id >= :lo ORDER BY id LIMIT :n) AS batch"
+    )
+    update = sa.text(
+        f"UPDATE {table} SET {column} = {value_sql} WHERE id >= :lo AND id <= :hi{condition}"
+    )
+
+    updated = 0
+    with op.get_context().autocommit_block():
+        bounds = bind.execute(sa.text(f"SELECT min(id), max(id) FROM {table}")).one()
+        if bounds[0] is None:
+            return 0
+        lo, max_id = bounds
+        while lo <= max_id:
+            hi = bind.execute(next_bound, {"lo": lo, "n": batch_size}).scalar()
+            if hi is None:
+                break
+            hi = min(hi, max_id)
+            # В autocommit каждая пачка фиксируется сразу
+            updated += bind.execute(update, {"lo": lo, "hi": hi}).rowcount
+            progress(updated, hi, max_id)
+            if hi >= max_id:
+                break
+            lo = hi + 1
+            if pause:
+                time.sleep(pause)
+    return updated
+
+
+def add_check_constraint_not_valid(name: str, table: str, condition: str) -> None:
+    """
+    ## Добавляет `CHECK` без проверки существующих строк.
+
+    Ограничение сразу действует для новых и изменённых строк; старые строки
+    проверяет `validate_constraint`.
+
+    ### Args:
+        name (str): Имя ограничения.
+        table (str): Имя таблицы.
+        condition (str): SQL-условие.
+    """
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} CHECK ({condition}) NOT VALID")
+
+
+def add_foreign_key_not_valid(
+    name: str,
+    source_table: str,
+    referent_table: str,
+    local_cols: Sequence[str],
+    remote_cols: Sequence[str],
+) -> None:
+    """
+    ## Добавляет внешний ключ без проверки существующих строк.
+
+    ### Args:
+        name (str): Имя ограничения.
+        source_table (str): Таблица со ссылкой.
+        referent_table (str): Таблица, на которую ссылаются.
+        local_cols (Sequence[str]): Колонки ссылки.
+        remote_cols (Sequence[str]): Колонки ключа.
+    """
+    op.execute(
+        f"ALTER TABLE {source_table} ADD CONSTRAINT {name} "
+        f"FOREIGN KEY ({', '.join(local_cols)}) "
+        f"REFERENCES {referent_table} ({', '.join(remote_cols)}) NOT VALID"
+    )
+
+
+def validate_constraint(name: str, table: str) -> None:
+    """
+    ## Проверяет существующие строки для ограничения, добавленного `NOT VALID`.
+
+    `VALIDATE CONSTRAINT` берёт `SHARE UPDATE EXCLUSIVE`: чтение и запись
+    в таблицу продолжаются. Выполняется в отдельной транзакции, чтобы не держать
+    более сильные блокировки, взятые миграцией раньше.
+
+    ### Args:
+        name (str): Имя ограничения.
+        table (str): Имя таблицы.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+
+def set_not_null(table: str, column: str) -> None:
+    """
+    ## Делает колонку `NOT NULL` без долгой блокировки таблицы.
+
+    Сначала добавляется и проверяется `CHECK (column IS NOT NULL)`; увидев
+    проверенное ограничение, Postgres (12+) выполняет `SET NOT NULL` без
+    сканирования. После этого `CHECK` больше не нужен.
+
+    ### Args:
+        table (str): Имя таблицы.
+        column (str): Имя колонки.
+    """
+    check = f"{table}_{column}_not_null"
+    add_check_constraint_not_valid(check, table, f"{column} IS NOT NULL")
+    validate_constraint(check, table)
+    op.alter_column(table, column, nullable=False)
+    op.drop_constraint(check, table, type_="check")
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "ProgressCallback",
+    "add_check_constraint_not_valid",
+    "add_foreign_key_not_valid",
+    "backfill_column",
+    "create_index_concurrently",
+    "drop_index_concurrently",
+    "lock_timeout",
+    "set_not_null",
+    "validate_constraint",
+]
@@ -11,10 +11,10 @@
 Если требуется удалить связанные объекты — это должно быть реализовано явно в сервисном слое приложения.
 """
 
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, relationship
 from sqlalchemy import (
-    Boolean, Column, Index, Sequence, TIMESTAMP,  # служебные классы
-    BigInteger, String, Text,  # типы данных
+    Boolean, Column, ForeignKey, Index, Sequence, TIMESTAMP,  # служебные классы
+    BigInteger, Numeric, String, Text,  # типы данных
     func, # Функции
 )
 
@@ -53,7 +53,7 @@ class User(Base):
         primary_key=True,
         autoincrement=True,
     )
-    email = Column(String(255), unique=True, nullable=False, index=True)
+    email = Column(String(255), nullable=False)
     full_name = Column(Text, nullable=False)
     is_hidden = Column(Boolean, nullable=False, default=False, index=True)
 
@@ -65,8 +65,15 @@ class User(Base):
         nullable=False,
     )
 
-    # Дополнительный составной индекс для поиска по is_hidden и email
+    # lazy='raise': заказы подгружаются только явно (selectinload), N+1 невозможен
+    orders = relationship('Order', back_populates='user', lazy='raise', order_by='Order.id')
+
+    # Email хранится в нижнем регистре (нормализует UserDAO), поиск идёт по lower(email).
+    # Уникальность обеспечивает ux_users_email_lower; отдельный ix_users_email по email
+    # с учётом регистра был избыточен и удалён
     __table_args__ = (
+        Index('ux_users_email_lower', func.lower(email), unique=True),
+        # Дополнительный составной индекс для поиска по is_hidden и email
         Index('idx_user_email_is_hidden', 'email', 'is_hidden'),
         # Составное уникальное ограничение для email и full_name  ДЛЯ ПРИМЕРА
         # from sqlalchemy import UniqueConstraint
@@ -74,12 +81,110 @@ class User(Base):
     )
 
 
+class Order(Base):
+    """
+    ## Заказ пользователя.
+
+    Attributes:
+        id (int): Первичный ключ.
+        user_id (int): Идентификатор владельца заказа (внешний ключ на `users.id`).
+        title (str): Описание заказа.
+        amount (Decimal): Сумма заказа.
+        created_at (datetime): Дата создания записи.
+        user (_RelationshipDeclared[Any]): Связь с владельцем заказа.
+    """
+    __tablename__ = 'orders'
+
+    id = Column(
+        BigInteger,
+        Sequence('orders_id_seq', start=Base.MAX_MIN_INT_64),
+        primary_key=True,
+        autoincrement=True,
+    )
+    # Индекс обязателен: по нему идёт пакетная загрузка `user_id IN (...)`
+    user_id = Column(BigInteger, ForeignKey('users.id'), nullable=False, index=True)
+    title = Column(Text, nullable=False)
+    amount = Column(Numeric(12, 2), nullable=False)
+    created_at = Column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    user = relationship('User', back_populates='orders', lazy='raise')
+
+
+class HiddenUser(Base):
+    """
+    ## Отметка о скрытии пользователя.
+
+    Строку добавляет и удаляет триггер `users_track_hidden` при смене
+    `users.is_hidden`, поэтому схема `users` и ответы API не меняются.
+    По `hidden_at` задача архивации находит давно скрытых пользователей.
+
+    Attributes:
+        user_id (int): Скрытый пользователь (внешний ключ на `users.id`).
+        hidden_at (datetime): Момент скрытия.
+    """
+    __tablename__ = 'users_hidden'
+
+    user_id = Column(BigInteger, ForeignKey('users.id'), primary_key=True, autoincrement=False)
+    hidden_at = Column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
+
+
+class UserArchive(Base):
+    """
+    ## Давно скрытый пользователь, перенесённый из `users` в холодную таблицу.
+
+    Таблица секционирована по месяцам `archived_at` (`RANGE`); секции
+    `users_archive_YYYY_MM` создаёт функция `users_archive_ensure_partitions`.
+    Первичный ключ обязан включать ключ секционирования, поэтому уникальность
+    email между `users` и архивом обеспечивает триггер `users_email_not_archived`.
+
+    Attributes:
+        id (int): Идентификатор пользователя из `users`.
+        email (str): Email пользователя.
+        full_name (str): Полное имя пользователя.
+        is_hidden (bool): Флаг скрытия (в архиве всегда `True`).
+        created_at (datetime): Дата создания пользователя.
+        hidden_at (datetime): Момент скрытия.
+        archived_at (datetime): Момент переноса в архив (ключ секционирования).
+    """
+    __tablename__ = 'users_archive'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=False)
+    email = Column(String(255), nullable=False)
+    full_name = Column(Text, nullable=False)
+    is_hidden = Column(Boolean, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    hidden_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    archived_at = Column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        primary_key=True,
+    )
+
+    # Поиск по id обслуживает первичный ключ (id, archived_at) каждой секции
+    __table_args__ = (
+        Index('ix_users_archive_email_lower', func.lower(email)),
+        {'postgresql_partition_by': 'RANGE (archived_at)'},
+    )
+
+
 # Объект метаданны для использования вне модуля
 metadata_obj = Base.metadata
 
 
 # Экспортируемый интерфейс модуля
 __all__ = [
+    'HiddenUser',
     'metadata_obj',
+    'Order',
     'User',
+    'UserArchive',
 ]
\ No newline at end of file
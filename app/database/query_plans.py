@@ -0,0 +1,151 @@
+"""Перехват SQL-выражений и разбор их планов `EXPLAIN (FORMAT JSON)`.
+
+Используется тестами регрессии планов (`tests/test_query_plans.py`): выражения,
+которые DAO реально отправляет в БД, перехватываются событием
+`before_cursor_execute` вместе с параметрами драйвера, а затем каждое
+объясняется на той же БД. Из плана извлекаются последовательные сканирования
+таблиц и итоговая стоимость, чтобы сравнить её с записанной базовой.
+"""
+
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+
+
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+"""
+    ## EXPLAINABLE
+
+    Начала выражений, планы которых проверяются. `INSERT ... VALUES` таблицы
+    не читает, а служебные команды (`BEGIN`, `SAVEPOINT`) плана не имеют.
+"""
+
+
+
+@dataclass(frozen=True)
+class CapturedStatement:
+    """
+    ## Выражение, отправленное драйверу.
+
+    ### Attributes:
+        sql (str): Текст SQL в синтаксисе драйвера (`$1` у asyncpg).
+        parameters (Any): Параметры драйвера.
+    """
+    sql: str
+    parameters: Any
+
+
+@contextmanager
+def capture_statements(engine: AsyncEngine) -> Iterator[list[CapturedStatement]]:
+    """
+    ## Собирает выражения `EXPLAINABLE`, выполненные движком внутри блока.
+
+    Пакетные выполнения (`executemany`) пропускаются.
+
+    ### Args:
+        engine (AsyncEngine): Движок, через который работает DAO.
+
+    ### Yields:
+        list[CapturedStatement]: Список, пополняемый по ходу блока.
+    """
+    captured: list[CapturedStatement] = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(EXPLAINABLE):
+            captured.append(CapturedStatement(statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", on_execute)
+
+
+async def explain(connection: AsyncConnection, statement: CapturedStatement) -> dict[str, Any]:
+    """
+    ## Возвращает план выражения без его выполнения.
+
+    Параметры передаются те же, что получил драйвер, поэтому Postgres строит
+    план для реальных значений, как при выполнении запроса приложением.
+
+    ### Args:
+        connection (AsyncConnection): Соединение с той же БД.
+        statement (CapturedStatement): Перехваченное выражение.
+
+    ### Returns:
+        dict[str, Any]: Корневой узел плана (`Plan` из вывода `EXPLAIN`).
+    """
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement.sql}",
+        statement.parameters,
+    )
+    output = result.scalar_one()
+    if isinstance(output, str):
+        output = json.loads(output)
+    return output[0]["Plan"]
+
+
+def iter_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """
+    ## Обходит узлы плана в глубину, начиная с корня.
+
+    ### Args:
+        plan (dict[str, Any]): Узел плана.
+
+    ### Yields:
+        dict[str, Any]: Узлы плана.
+    """
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from iter_nodes(child)
+
+
+def seq_scans(plan: dict[str, Any], relations: Iterable[str] | None = None) -> list[str]:
+    """
+    ## Находит последовательные сканирования таблиц в плане.
+
+    ### Args:
+        plan (dict[str, Any]): Корневой узел плана.
+        relations (Iterable[str] | None): Учитывать только эти таблицы;
+            `None` — все.
+
+    ### Returns:
+        list[str]: Имена таблиц под узлами `Seq Scan` (с повторами).
+    """
+    wanted = None if relations is None else set(relations)
+    return [
+        node["Relation Name"]
+        for node in iter_nodes(plan)
+        if node.get("Node Type") == "Seq Scan"
+        and (wanted is None or node.get("Relation Name") in wanted)
+    ]
+
+
+def total_cost(plan: dict[str, Any]) -> float:
+    """
+    ## Итоговая оценка стоимости плана.
+
+    ### Args:
+        plan (dict[str, Any]): Корневой узел плана.
+
+    ### Returns:
+        float: `Total Cost` корневого узла.
+    """
+    return float(plan["Total Cost"])
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "CapturedStatement",
+    "EXPLAINABLE",
+    "capture_statements",
+    "explain",
+    "iter_nodes",
+    "seq_scans",
+    "total_cost",
+]
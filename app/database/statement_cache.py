@@ -0,0 +1,91 @@
+"""Статистика кэша скомпилированных SQL-выражений SQLAlchemy.
+
+SQLAlchemy кэширует результат компиляции выражения по его структуре
+(cache key). Каждое выполнение помечается в `ExecutionContext.cache_hit`,
+здесь эти пометки собираются в счётчики для метрик.
+"""
+
+from collections import Counter
+from threading import Lock
+
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+
+class CompiledCacheStats:
+    """
+    ## Счётчики попаданий в кэш компиляции SQLAlchemy.
+
+    Подписывается на событие `after_cursor_execute` движка и считает
+    выполнения по категориям `CacheStats` (`CACHE_HIT`, `CACHE_MISS`, ...).
+    """
+    def __init__(self) -> None:
+        """
+        ## Инициализирует пустые счётчики.
+        """
+        self._counter: Counter[str] = Counter()
+        self._lock = Lock()
+
+    def attach(self, engine: AsyncEngine) -> None:
+        """
+        ## Подключает сбор статистики к движку.
+
+        ### Args:
+            engine (AsyncEngine): Асинхронный движок SQLAlchemy.
+        """
+        event.listen(engine.sync_engine, "after_cursor_execute", self._on_execute)
+
+    def detach(self, engine: AsyncEngine) -> None:
+        """
+        ## Отключает сбор статистики от движка.
+
+        ### Args:
+            engine (AsyncEngine): Асинхронный движок SQLAlchemy.
+        """
+        if event.contains(engine.sync_engine, "after_cursor_execute", self._on_execute):
+            event.remove(engine.sync_engine, "after_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit is None:
+            return
+        with self._lock:
+            self._counter[cache_hit.name] += 1
+
+    def snapshot(self) -> dict[str, int | float]:
+        """
+        ## Возвращает текущие значения счётчиков.
+
+        ### Returns:
+            dict[str, int | float]: `hits`, `misses`, `uncached` и `hit_rate`
+            (доля попаданий среди кэшируемых выполнений).
+        """
+        with self._lock:
+            hits = self._counter[CacheStats.CACHE_HIT.name]
+            misses = self._counter[CacheStats.CACHE_MISS.name]
+            uncached = sum(self._counter.values()) - hits - misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "uncached": uncached,
+            "hit_rate": hits / total if total else 0.0,
+        }
+
+    def reset(self) -> None:
+        """ ## Обнуляет счётчики. """
+        with self._lock:
+            self._counter.clear()
+
+
+# Глобальный сборщик статистики для движка приложения
+compiled_cache_stats = CompiledCacheStats()
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    'CompiledCacheStats',
+    'compiled_cache_stats',
+]
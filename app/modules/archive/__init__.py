@@ -0,0 +1,21 @@
+"""Архивация давно скрытых пользователей в секционированную `users_archive`."""
+
+from .archiver import (
+    ARCHIVE_BATCH_SQL,
+    ARCHIVE_PARTITION_PATTERN,
+    ENSURE_PARTITIONS_SQL,
+    ArchiveResult,
+    archive_batch,
+    archive_hidden_users,
+    ensure_archive_partitions,
+)
+
+__all__ = [
+    "ARCHIVE_BATCH_SQL",
+    "ARCHIVE_PARTITION_PATTERN",
+    "ENSURE_PARTITIONS_SQL",
+    "ArchiveResult",
+    "archive_batch",
+    "archive_hidden_users",
+    "ensure_archive_partitions",
+]
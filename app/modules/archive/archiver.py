@@ -0,0 +1,199 @@
+"""Перенос давно скрытых пользователей из `users` в холодную `users_archive`.
+
+Пачка — одна транзакция: строки `users_hidden` старше порога блокируются
+(`FOR UPDATE SKIP LOCKED`, поэтому несколько воркеров не мешают друг другу),
+удаляются из `users` и вставляются в текущую месячную секцию архива одним
+выражением. Пользователи с заказами не переносятся: на них ссылается
+внешний ключ `orders.user_id`.
+
+На время пачки берётся исключительная advisory-блокировка `users_archive`.
+Триггер `users_email_not_archived` при вставке в `users` берёт её же
+разделяемой, поэтому вставки ждут не дольше одной пачки. Ожидание самой
+задачи ограничено `lock_timeout`: при долгой пишущей транзакции пачка
+пропускается до следующего запуска.
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass
+from datetime import timedelta
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+
+ARCHIVE_PARTITION_PATTERN = re.compile(r"^users_archive_\d{4}_\d{2}$")
+"""
+    ## ARCHIVE_PARTITION_PATTERN
+
+    Имена месячных секций `users_archive`. Секций нет в моделях, поэтому
+    `alembic/env.py` исключает их из автогенерации.
+"""
+
+LOCK_NOT_AVAILABLE = "55P03"
+
+ENSURE_PARTITIONS_SQL = text("SELECT users_archive_ensure_partitions(:months_ahead)")
+"""
+    ## ENSURE_PARTITIONS_SQL
+
+    Создаёт недостающие секции на текущий и `months_ahead` следующих месяцев,
+    возвращает число созданных.
+"""
+
+LOCK_ARCHIVE_SQL = text(
+    "SELECT set_config('lock_timeout', :lock_timeout, true), "
+    "pg_advisory_xact_lock(hashtext('users_archive'))"
+)
+
+ARCHIVE_BATCH_SQL = text("""
+WITH batch AS (
+    SELECT h.user_id
+    FROM users_hidden AS h
+    WHERE h.hidden_at < now() - CAST(:hidden_for AS interval)
+      AND NOT EXISTS (SELECT 1 FROM orders AS o WHERE o.user_id = h.user_id)
+    ORDER BY h.hidden_at
+    LIMIT :batch_size
+    FOR UPDATE SKIP LOCKED
+), marks AS (
+    DELETE FROM users_hidden AS h
+    USING batch AS b
+    WHERE h.user_id = b.user_id
+    RETURNING h.user_id, h.hidden_at
+), moved AS (
+    DELETE FROM users AS u
+    USING marks AS m
+    WHERE u.id = m.user_id AND u.is_hidden
+    RETURNING u.id, u.email, u.full_name, u.is_hidden, u.created_at, m.hidden_at
+)
+INSERT INTO users_archive (id, email, full_name, is_hidden, created_at, hidden_at)
+SELECT id, email, full_name, is_hidden, created_at, hidden_at FROM moved
+""")
+"""
+    ## ARCHIVE_BATCH_SQL
+
+    Переносит до `batch_size` пользователей, скрытых дольше `hidden_for`.
+    Без явного `CAST` asyncpg выводит тип `now() - $1` как `timestamptz`
+    и не принимает `timedelta`.
+"""
+
+
+
+@dataclass
+class ArchiveResult:
+    """
+    ## Итог запуска архивации.
+
+    ### Attributes:
+        moved (int): Перенесено пользователей.
+        batches (int): Зафиксировано пачек.
+        partitions_created (int): Создано новых секций архива.
+        lock_timeouts (int): Пачек, пропущенных из-за `lock_timeout`.
+    """
+    moved: int = 0
+    batches: int = 0
+    partitions_created: int = 0
+    lock_timeouts: int = 0
+
+
+async def ensure_archive_partitions(connection: AsyncConnection, months_ahead: int) -> int:
+    """
+    ## Создаёт секции архива на текущий и следующие месяцы.
+
+    ### Args:
+        connection (AsyncConnection): Соединение без открытой транзакции.
+        months_ahead (int): Сколько месяцев вперёд держать секции.
+
+    ### Returns:
+        int: Число созданных секций.
+    """
+    async with connection.begin():
+        return (await connection.execute(ENSURE_PARTITIONS_SQL, {"months_ahead": months_ahead})).scalar_one()
+
+
+async def archive_batch(
+    connection: AsyncConnection,
+    hidden_for: timedelta,
+    batch_size: int,
+    lock_timeout_ms: int,
+) -> int:
+    """
+    ## Переносит в архив одну пачку в отдельной транзакции.
+
+    ### Args:
+        connection (AsyncConnection): Соединение без открытой транзакции.
+        hidden_for (timedelta): Сколько пользователь должен пробыть скрытым.
+        batch_size (int): Максимум пользователей в пачке.
+        lock_timeout_ms (int): Ожидание блокировки архива, мс.
+
+    ### Returns:
+        int: Перенесено пользователей.
+    """
+    async with connection.begin():
+        await connection.execute(LOCK_ARCHIVE_SQL, {"lock_timeout": f"{int(lock_timeout_ms)}ms"})
+        result = await connection.execute(
+            ARCHIVE_BATCH_SQL, {"hidden_for": hidden_for, "batch_size": batch_size}
+        )
+        return result.rowcount
+
+
+async def archive_hidden_users(
+    connection: AsyncConnection,
+    hidden_days: float,
+    batch_size: int = 1000,
+    months_ahead: int = 3,
+    lock_timeout_ms: int = 2000,
+    max_batches: int | None = None,
+    pause: float = 0.0,
+) -> ArchiveResult:
+    """
+    ## Переносит в архив всех пользователей, скрытых дольше `hidden_days`.
+
+    Пачки идут, пока очередная не окажется неполной (или до `max_batches`).
+    Между пачками — пауза `pause`, чтобы не занимать WAL и автовакуум.
+
+    ### Args:
+        connection (AsyncConnection): Соединение без открытой транзакции.
+        hidden_days (float): Порог скрытости, дни.
+        batch_size (int): Пользователей в одной пачке.
+        months_ahead (int): Сколько месяцев вперёд держать секции архива.
+        lock_timeout_ms (int): Ожидание блокировки архива, мс.
+        max_batches (int | None): Ограничение числа пачек за запуск.
+        pause (float): Пауза между пачками, секунды.
+
+    ### Raises:
+        DBAPIError: Ошибка БД, кроме истёкшего `lock_timeout`.
+
+    ### Returns:
+        ArchiveResult: Итог запуска.
+    """
+    result = ArchiveResult(partitions_created=await ensure_archive_partitions(connection, months_ahead))
+    hidden_for = timedelta(days=hidden_days)
+    while max_batches is None or result.batches < max_batches:
+        try:
+            moved = await archive_batch(connection, hidden_for, batch_size, lock_timeout_ms)
+        except DBAPIError as exc:
+            if getattr(exc.orig, "pgcode", None) != LOCK_NOT_AVAILABLE:
+                raise
+            result.lock_timeouts += 1
+            break
+        result.moved += moved
+        result.batches += 1
+        if moved < batch_size:
+            break
+        if pause:
+            await asyncio.sleep(pause)
+    return result
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "ARCHIVE_BATCH_SQL",
+    "ARCHIVE_PARTITION_PATTERN",
+    "ENSURE_PARTITIONS_SQL",
+    "ArchiveResult",
+    "archive_batch",
+    "archive_hidden_users",
+    "ensure_archive_partitions",
+]
@@ -0,0 +1,6 @@
+"""Вероятностные фильтры принадлежности множеству."""
+
+from .bloom_filter import BloomFilter, RefreshableBloomFilter
+from .feed import BloomFilterFeed
+
+__all__ = ["BloomFilter", "BloomFilterFeed", "RefreshableBloomFilter"]
@@ -0,0 +1,232 @@
+"""Фильтр Блума для быстрых отрицательных ответов «такого значения точно нет».
+
+Фильтр не даёт ложноотрицательных ответов: если `might_contain` вернул `False`,
+значения во множестве нет, и обращаться к БД не нужно. Ответ `True` означает
+«возможно есть» (с вероятностью ошибки около `error_rate`) и должен
+подтверждаться запросом.
+
+`RefreshableBloomFilter` дополнительно умеет пересобираться из потока значений
+(например, из таблицы) без окна, в котором фильтр «забывает» добавленные
+во время пересборки значения.
+"""
+
+import math
+from hashlib import blake2b
+from typing import AsyncIterable
+
+
+
+class BloomFilter:
+    """
+    ## Классический фильтр Блума с двойным хешированием.
+
+    Размер битового массива и количество хеш-функций подбираются по ожидаемому
+    числу элементов и допустимой доле ложноположительных ответов.
+
+    ### Attributes:
+        capacity (int): Ожидаемое количество элементов.
+        error_rate (float): Целевая доля ложноположительных ответов.
+        size (int): Размер битового массива, бит.
+        hashes (int): Количество хеш-функций.
+        count (int): Количество добавленных элементов (с повторами).
+    """
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """
+        ## Инициализирует пустой фильтр.
+
+        ### Args:
+            capacity (int): Ожидаемое количество элементов.
+            error_rate (float): Целевая доля ложноположительных ответов, `(0, 1)`.
+
+        ### Raises:
+            ValueError: Некорректные `capacity` или `error_rate`.
+        """
+        if capacity < 1:
+            raise ValueError("capacity должен быть положительным")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate должен быть в интервале (0, 1)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> list[int]:
+        """
+        ## Номера битов элемента: `h1 + i * h2` по модулю размера массива.
+
+        ### Args:
+            item (str): Элемент.
+
+        ### Returns:
+            list[int]: `hashes` номеров битов.
+        """
+        digest = blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        """
+        ## Добавляет элемент.
+
+        ### Args:
+            item (str): Элемент.
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def might_contain(self, item: str) -> bool:
+        """
+        ## Проверяет, мог ли элемент быть добавлен.
+
+        ### Args:
+            item (str): Элемент.
+
+        ### Returns:
+            bool: `False` — элемента точно нет, `True` — возможно есть.
+        """
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    __contains__ = might_contain
+
+    def estimated_error_rate(self) -> float:
+        """
+        ## Оценивает долю ложноположительных ответов при текущем заполнении.
+
+        ### Returns:
+            float: `(1 - e^(-k·n/m))^k`.
+        """
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+
+class RefreshableBloomFilter:
+    """
+    ## Фильтр Блума, который можно пересобрать из источника данных.
+
+    До первой сборки фильтр не готов и на любой запрос отвечает «возможно есть»,
+    то есть все проверки идут в источник. Значения, добавленные во время
+    пересборки, попадают и в старый, и в новый фильтр. Если часть добавлений
+    могла потеряться, `mark_stale` снова делает фильтр неготовым до пересборки.
+
+    ### Attributes:
+        capacity (int): Минимальная ёмкость фильтра.
+        error_rate (float): Целевая доля ложноположительных ответов.
+        ready (bool): Фильтр собран и может давать отрицательные ответы.
+        rebuilds (int): Количество завершённых пересборок.
+        checks (int): Количество проверок.
+        negatives (int): Проверки, на которые фильтр ответил «точно нет».
+        stale_marks (int): Сколько раз фильтр помечался устаревшим.
+    """
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """
+        ## Инициализирует несобранный фильтр.
+
+        ### Args:
+            capacity (int): Минимальная ёмкость фильтра.
+            error_rate (float): Целевая доля ложноположительных ответов.
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.ready = False
+        self.rebuilds = 0
+        self.checks = 0
+        self.negatives = 0
+        self.stale_marks = 0
+        self._filter = BloomFilter(capacity, error_rate)
+        self._pending: list[str] | None = None
+        self._stale = False
+
+    def add(self, item: str) -> None:
+        """
+        ## Добавляет элемент (в том числе в фильтр, который сейчас собирается).
+
+        ### Args:
+            item (str): Элемент.
+        """
+        self._filter.add(item)
+        if self._pending is not None:
+            self._pending.append(item)
+
+    def might_contain(self, item: str) -> bool:
+        """
+        ## Проверяет элемент.
+
+        ### Args:
+            item (str): Элемент.
+
+        ### Returns:
+            bool: `False` — элемента точно нет, `True` — возможно есть
+            (всегда `True`, пока фильтр не собран).
+        """
+        self.checks += 1
+        if not self.ready or self._filter.might_contain(item):
+            return True
+        self.negatives += 1
+        return False
+
+    def mark_stale(self) -> None:
+        """
+        ## Помечает фильтр устаревшим: до пересборки он отвечает «возможно есть».
+
+        Пересборка, идущая в этот момент, тоже не делает фильтр готовым:
+        её источник мог не увидеть потерянные значения.
+        """
+        self.ready = False
+        self._stale = True
+        self.stale_marks += 1
+
+    async def rebuild(self, items: AsyncIterable[str], expected: int = 0) -> None:
+        """
+        ## Собирает новый фильтр из потока значений и подменяет им текущий.
+
+        Ёмкость берётся с запасом на рост: не меньше `capacity` и вдвое
+        больше `expected`. Пока идёт сборка, старый фильтр продолжает отвечать.
+
+        ### Args:
+            items (AsyncIterable[str]): Все значения множества.
+            expected (int): Ожидаемое количество значений.
+        """
+        fresh = BloomFilter(max(self.capacity, expected * 2), self.error_rate)
+        self._pending = []
+        self._stale = False
+        try:
+            async for item in items:
+                fresh.add(item)
+            for item in self._pending:
+                fresh.add(item)
+        finally:
+            self._pending = None
+        self._filter = fresh
+        self.ready = not self._stale
+        self.rebuilds += 1
+
+    def stats(self) -> dict:
+        """
+        ## Возвращает состояние и счётчики фильтра.
+
+        ### Returns:
+            dict: `ready`, `items`, `capacity`, `size_bits`, `hashes`,
+            `estimated_error_rate`, `rebuilds`, `checks`, `negatives`, `stale_marks`.
+        """
+        return {
+            "ready": self.ready,
+            "items": self._filter.count,
+            "capacity": self._filter.capacity,
+            "size_bits": self._filter.size,
+            "hashes": self._filter.hashes,
+            "estimated_error_rate": self._filter.estimated_error_rate(),
+            "rebuilds": self.rebuilds,
+            "checks": self.checks,
+            "negatives": self.negatives,
+            "stale_marks": self.stale_marks,
+        }
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "BloomFilter",
+    "RefreshableBloomFilter",
+]
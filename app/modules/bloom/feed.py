@@ -0,0 +1,71 @@
+"""Пополнение фильтра Блума из шины инвалидации.
+
+Каждый воркер держит свой фильтр и сам добавляет в него только собственные
+вставки. Чтобы фильтр не отвечал «точно нет» на значение, только что
+записанное другим воркером, вставки рассылаются через шину инвалидации
+ключами с префиксом, а `BloomFilterFeed` добавляет их в фильтр получателя.
+Если шина сообщает о потере сообщений, фильтр помечается устаревшим и до
+пересборки все проверки идут в источник.
+"""
+
+from typing import Callable, Hashable, Iterable
+
+from .bloom_filter import RefreshableBloomFilter
+
+
+
+class BloomFilterFeed:
+    """
+    ## Подписчик шины инвалидации, добавляющий значения в фильтр.
+
+    Реализует `InvalidationTarget`: ключи вида `<prefix><значение>` попадают
+    в фильтр, остальные ключи шины пропускаются.
+
+    ### Attributes:
+        bloom (RefreshableBloomFilter): Пополняемый фильтр.
+        prefix (str): Префикс ключей фильтра в шине.
+        on_lost (Callable[[], None] | None): Вызывается после потери сообщений
+            (например, чтобы запустить пересборку).
+    """
+    def __init__(
+        self,
+        bloom: RefreshableBloomFilter,
+        prefix: str,
+        on_lost: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        ## Инициализирует подписчика.
+
+        ### Args:
+            bloom (RefreshableBloomFilter): Пополняемый фильтр.
+            prefix (str): Префикс ключей фильтра в шине.
+            on_lost (Callable[[], None] | None): Вызывается после потери сообщений.
+        """
+        self.bloom = bloom
+        self.prefix = prefix
+        self.on_lost = on_lost
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        """
+        ## Добавляет в фильтр значения из ключей с префиксом.
+
+        ### Args:
+            keys (Iterable[Hashable]): Ключи сообщения шины.
+        """
+        for key in keys:
+            if isinstance(key, str) and key.startswith(self.prefix):
+                self.bloom.add(key[len(self.prefix):])
+
+    def clear(self) -> None:
+        """
+        ## Помечает фильтр устаревшим: часть добавлений могла потеряться.
+        """
+        self.bloom.mark_stale()
+        if self.on_lost is not None:
+            self.on_lost()
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "BloomFilterFeed",
+]
@@ -0,0 +1,18 @@
+"""Лента изменений строк БД через LISTEN/NOTIFY с раздачей подписчикам."""
+
+from .feed import USERS_CHANNEL, create_users_listener, get_change_feed_hub, parse_notification
+from .hub import ChangeEvent, ChangeFeedHub, Subscription, reset_event
+from .listener import PgListener, asyncpg_dsn
+
+__all__ = [
+    "USERS_CHANNEL",
+    "ChangeEvent",
+    "ChangeFeedHub",
+    "PgListener",
+    "Subscription",
+    "asyncpg_dsn",
+    "create_users_listener",
+    "get_change_feed_hub",
+    "parse_notification",
+    "reset_event",
+]
@@ -0,0 +1,87 @@
+"""Лента изменений таблицы `users`: канал, разбор уведомлений и общий хаб воркера.
+
+Уведомления шлёт триггер `users_notify_change` (см. миграцию `a5e2c8d40f17`):
+`{"id": <номер события>, "op": "INSERT"|"UPDATE", "user_id": ..., "changed_at": ...}`.
+"""
+
+import json
+
+from app.config.config_reader import env_config
+
+from .hub import ChangeEvent, ChangeFeedHub
+from .listener import PgListener, asyncpg_dsn
+
+
+
+USERS_CHANNEL = "users_changes"
+"""
+    ## USERS_CHANNEL
+
+    Канал `NOTIFY` триггера таблицы `users`.
+"""
+
+
+
+def parse_notification(payload: str) -> ChangeEvent:
+    """
+    ## Разбирает полезную нагрузку уведомления триггера.
+
+    ### Args:
+        payload (str): JSON из `pg_notify`.
+
+    ### Raises:
+        ValueError: Нагрузка не является JSON-объектом с `id` и `op`.
+
+    ### Returns:
+        ChangeEvent: Событие ленты.
+    """
+    data = json.loads(payload)
+    if not isinstance(data, dict) or "id" not in data or "op" not in data:
+        raise ValueError(f"Неожиданное уведомление: {payload[:200]}")
+    return ChangeEvent(id=str(data["id"]), op=str(data["op"]), data=data)
+
+
+_hub: ChangeFeedHub | None = None
+
+
+def get_change_feed_hub() -> ChangeFeedHub:
+    """
+    ## Возвращает хаб ленты воркера, создавая его по настройкам при первом вызове.
+
+    ### Returns:
+        ChangeFeedHub: Общий хаб воркера.
+    """
+    global _hub
+    if _hub is None:
+        _hub = ChangeFeedHub(
+            buffer_size=env_config.change_feed_buffer_size,
+            client_queue_size=env_config.change_feed_client_queue_size,
+        )
+    return _hub
+
+
+def create_users_listener(hub: ChangeFeedHub) -> PgListener:
+    """
+    ## Создаёт слушатель канала `users_changes`, публикующий события в хаб.
+
+    ### Args:
+        hub (ChangeFeedHub): Хаб воркера.
+
+    ### Returns:
+        PgListener: Незапущенный слушатель.
+    """
+    return PgListener(
+        asyncpg_dsn(env_config.DATABASE_URL_asyncpg),
+        USERS_CHANNEL,
+        on_notify=lambda payload: hub.publish(parse_notification(payload)),
+        on_reconnect=hub.publish_gap,
+    )
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "USERS_CHANNEL",
+    "create_users_listener",
+    "get_change_feed_hub",
+    "parse_notification",
+]
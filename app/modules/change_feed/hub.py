@@ -0,0 +1,267 @@
+"""Раздача событий изменений подписчикам (fan-out) с ограниченными буферами.
+
+Хаб получает события от единственного слушателя `LISTEN` воркера и раздаёт их
+всем подписчикам SSE. У каждого подписчика своя очередь ограниченного размера:
+медленный клиент не копит память без предела — при переполнении его подписка
+закрывается, и клиент переподключается с `Last-Event-ID`.
+
+Для возобновления хаб хранит кольцевой буфер последних событий. Позиция ищется
+по идентификатору события, а не сравнением чисел: Postgres доставляет
+уведомления в порядке фиксации транзакций, и этот порядок одинаков для всех
+воркеров, а идентификаторы из последовательности могут идти не по возрастанию.
+"""
+
+import asyncio
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """
+    ## Событие изменения строки.
+
+    ### Attributes:
+        id (str): Глобальный идентификатор события (из последовательности в БД).
+        op (str): Операция: `INSERT`, `UPDATE` либо служебная `reset`.
+        data (dict[str, Any]): Полезная нагрузка уведомления.
+    """
+    id: str
+    op: str
+    data: dict[str, Any] = field(default_factory=dict)
+
+    def to_sse(self) -> bytes:
+        """
+        ## Форматирует событие для `text/event-stream`.
+
+        ### Returns:
+            bytes: Кадр SSE с полями `id`, `event`, `data`.
+        """
+        lines = f"event: {self.op}\ndata: {json.dumps(self.data, ensure_ascii=False)}\n\n"
+        if self.id:
+            lines = f"id: {self.id}\n" + lines
+        return lines.encode("utf-8")
+
+
+def reset_event(reason: str) -> ChangeEvent:
+    """
+    ## Служебное событие «история потеряна — перечитайте данные целиком».
+
+    ### Args:
+        reason (str): Причина (`gap`, `overflow`, `unknown_last_event_id`).
+
+    ### Returns:
+        ChangeEvent: Событие без идентификатора.
+    """
+    return ChangeEvent(id="", op="reset", data={"reason": reason})
+
+
+class Subscription:
+    """
+    ## Подписка одного клиента на события хаба.
+
+    ### Attributes:
+        queue (asyncio.Queue): Ограниченная очередь событий клиента.
+        closed (bool): Подписка закрыта (переполнение или остановка хаба).
+    """
+    def __init__(self, max_queue: int) -> None:
+        """
+        ## Инициализирует подписку.
+
+        ### Args:
+            max_queue (int): Размер очереди клиента.
+        """
+        self.queue: asyncio.Queue[ChangeEvent | None] = asyncio.Queue(max_queue)
+        self.closed = False
+
+    def offer(self, event: ChangeEvent) -> bool:
+        """
+        ## Кладёт событие в очередь, не дожидаясь клиента.
+
+        ### Args:
+            event (ChangeEvent): Событие.
+
+        ### Returns:
+            bool: `False`, если очередь переполнена.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def close(self, reason: ChangeEvent | None = None) -> None:
+        """
+        ## Закрывает подписку; клиент получит `reason` (если есть место) и конец потока.
+
+        ### Args:
+            reason (ChangeEvent | None): Последнее событие для клиента.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        # Освобождаем место под служебные события, очередь клиента всё равно устарела
+        while self.queue.qsize() > self.queue.maxsize - 2 and not self.queue.empty():
+            self.queue.get_nowait()
+        if reason is not None:
+            self.queue.put_nowait(reason)
+        self.queue.put_nowait(None)
+
+    async def next(self, timeout: float) -> ChangeEvent | None:
+        """
+        ## Ждёт следующее событие.
+
+        ### Args:
+            timeout (float): Сколько ждать, секунды.
+
+        ### Raises:
+            TimeoutError: Событий не было `timeout` секунд.
+
+        ### Returns:
+            ChangeEvent | None: Событие или `None` — конец потока.
+        """
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class ChangeFeedHub:
+    """
+    ## Хаб событий изменений одного воркера.
+
+    ### Attributes:
+        buffer_size (int): Размер кольцевого буфера для возобновления.
+        client_queue_size (int): Размер очереди каждого подписчика.
+        published (int): Количество опубликованных событий.
+        overflows (int): Подписки, закрытые из-за переполнения.
+    """
+    def __init__(self, buffer_size: int = 10000, client_queue_size: int = 1000) -> None:
+        """
+        ## Инициализирует пустой хаб.
+
+        ### Args:
+            buffer_size (int): Размер кольцевого буфера для возобновления.
+            client_queue_size (int): Размер очереди каждого подписчика (не меньше 2).
+        """
+        self.buffer_size = buffer_size
+        self.client_queue_size = max(2, client_queue_size)
+        self.published = 0
+        self.overflows = 0
+        self._history: deque[ChangeEvent] = deque(maxlen=buffer_size)
+        self._subscribers: set[Subscription] = set()
+
+    @property
+    def subscribers(self) -> int:
+        """ ## Количество активных подписчиков. """
+        return len(self._subscribers)
+
+    def publish(self, event: ChangeEvent) -> None:
+        """
+        ## Сохраняет событие в буфере и раздаёт его подписчикам.
+
+        ### Args:
+            event (ChangeEvent): Событие.
+        """
+        if event.id:
+            self._history.append(event)
+        self.published += 1
+        for subscription in list(self._subscribers):
+            if not subscription.offer(event):
+                self.overflows += 1
+                self.unsubscribe(subscription, reset_event("overflow"))
+
+    def publish_gap(self) -> None:
+        """
+        ## Сообщает, что часть событий могла быть потеряна (обрыв `LISTEN`).
+
+        Буфер очищается: возобновление через разрыв было бы неполным.
+        """
+        self._history.clear()
+        self.publish(reset_event("gap"))
+
+    def subscribe(self, last_event_id: str | None = None) -> Subscription:
+        """
+        ## Создаёт подписку; при `last_event_id` сначала отдаёт пропущенные события.
+
+        Если событие `last_event_id` уже вытеснено из буфера или пропущенных
+        событий больше, чем помещается в очередь, клиент получает `reset`
+        и дальше — только новые события.
+
+        ### Args:
+            last_event_id (str | None): Последнее событие, полученное клиентом.
+
+        ### Returns:
+            Subscription: Подписка клиента.
+        """
+        subscription = Subscription(self.client_queue_size)
+        if last_event_id:
+            missed = self._events_after(last_event_id)
+            if missed is None:
+                subscription.offer(reset_event("unknown_last_event_id"))
+            elif len(missed) >= self.client_queue_size:
+                # Столько не догнать через очередь: клиент перечитывает данные целиком
+                subscription.offer(reset_event("overflow"))
+            else:
+                for event in missed:
+                    subscription.offer(event)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription, reason: ChangeEvent | None = None) -> None:
+        """
+        ## Удаляет подписку и закрывает её.
+
+        ### Args:
+            subscription (Subscription): Подписка.
+            reason (ChangeEvent | None): Последнее событие для клиента.
+        """
+        self._subscribers.discard(subscription)
+        subscription.close(reason)
+
+    def close(self) -> None:
+        """
+        ## Закрывает все подписки (при остановке приложения).
+        """
+        for subscription in list(self._subscribers):
+            self.unsubscribe(subscription)
+
+    def _events_after(self, last_event_id: str) -> list[ChangeEvent] | None:
+        """
+        ## События буфера после указанного.
+
+        ### Args:
+            last_event_id (str): Идентификатор последнего полученного события.
+
+        ### Returns:
+            list[ChangeEvent] | None: События после него или `None`, если его
+            нет в буфере (слишком старое или неизвестное).
+        """
+        history = list(self._history)
+        for position in range(len(history) - 1, -1, -1):
+            if history[position].id == last_event_id:
+                return history[position + 1:]
+        return None
+
+    def stats(self) -> dict[str, int]:
+        """
+        ## Возвращает счётчики хаба.
+
+        ### Returns:
+            dict[str, int]: `subscribers`, `published`, `overflows`, `buffered`.
+        """
+        return {
+            "subscribers": self.subscribers,
+            "published": self.published,
+            "overflows": self.overflows,
+            "buffered": len(self._history),
+        }
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "ChangeEvent",
+    "ChangeFeedHub",
+    "Subscription",
+    "reset_event",
+]
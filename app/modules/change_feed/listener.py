@@ -0,0 +1,150 @@
+"""Слушатель `LISTEN` Postgres: одно соединение на воркер.
+
+Соединение открывается отдельно от пула SQLAlchemy: `LISTEN` привязан
+к сессии, а соединения пула возвращаются и сбрасываются после каждого запроса.
+Уведомления, пришедшие по каналу, передаются функции `on_notify`. Если
+соединение оборвалось, слушатель переподключается с экспоненциальной паузой
+и вызывает `on_reconnect`: уведомления, отправленные без слушателя, потеряны.
+"""
+
+import asyncio
+from logging import Logger
+from typing import Callable
+
+from sqlalchemy.engine import make_url
+
+from app.modules.logging.app_logger import get_app_logger
+
+
+
+def asyncpg_dsn(sqlalchemy_url: str) -> str:
+    """
+    ## Превращает URL SQLAlchemy (`postgresql+asyncpg://...`) в DSN для `asyncpg.connect`.
+
+    ### Args:
+        sqlalchemy_url (str): URL SQLAlchemy.
+
+    ### Returns:
+        str: DSN `postgresql://...`.
+    """
+    return make_url(sqlalchemy_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class PgListener:
+    """
+    ## Фоновый слушатель одного канала `LISTEN`.
+
+    ### Attributes:
+        dsn (str): DSN подключения к Postgres.
+        channel (str): Имя канала.
+        ping_interval (float): Период проверки соединения, секунды.
+        reconnects (int): Количество переподключений.
+        connected (bool): Соединение установлено и канал прослушивается.
+    """
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_reconnect: Callable[[], None] | None = None,
+        ping_interval: float = 30.0,
+        max_backoff: float = 30.0,
+        logger: Logger | None = None,
+    ) -> None:
+        """
+        ## Инициализирует слушатель (соединение открывается в `start`).
+
+        ### Args:
+            dsn (str): DSN подключения к Postgres.
+            channel (str): Имя канала.
+            on_notify (Callable[[str], None]): Обработчик полезной нагрузки уведомления.
+            on_reconnect (Callable[[], None] | None): Вызывается после каждого подключения,
+                кроме удавшейся первой попытки.
+            ping_interval (float): Период проверки соединения, секунды.
+            max_backoff (float): Максимальная пауза между попытками подключения, секунды.
+            logger (Logger | None): Логгер; по умолчанию `change_feed`.
+        """
+        self.dsn = dsn
+        self.channel = channel
+        self.on_notify = on_notify
+        self.on_reconnect = on_reconnect
+        self.ping_interval = ping_interval
+        self.max_backoff = max_backoff
+        self.logger = logger or get_app_logger("change_feed")
+        self.reconnects = 0
+        self.connected = False
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """
+        ## Запускает фоновую задачу прослушивания.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"listen-{self.channel}")
+
+    async def stop(self) -> None:
+        """
+        ## Останавливает прослушивание и закрывает соединение.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _handle(self, connection, pid: int, channel: str, payload: str) -> None:
+        """
+        ## Колбэк `asyncpg` на уведомление; ошибка обработчика не рвёт соединение.
+        """
+        try:
+            self.on_notify(payload)
+        except Exception as exc:
+            self.logger.error(f"Ошибка обработки уведомления {channel}: {exc!r}")
+
+    async def _run(self) -> None:
+        """
+        ## Цикл: подключиться, слушать до обрыва, переподключиться.
+        """
+        import asyncpg
+
+        backoff = 0.5
+        first = True
+        while True:
+            connection = None
+            # Уведомления теряются и тогда, когда не удалась самая первая попытка
+            reconnect = not first
+            first = False
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(self.channel, self._handle)
+                self.connected = True
+                backoff = 0.5
+                if reconnect:
+                    self.reconnects += 1
+                    self.logger.info(f"LISTEN {self.channel}: соединение восстановлено")
+                    if self.on_reconnect is not None:
+                        self.on_reconnect()
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), self.ping_interval)
+                    except asyncio.TimeoutError:
+                        # Без трафика «тихий» обрыв сети не заметить; полуоткрытое TCP-соединение не ответит
+                        await connection.execute("SELECT 1", timeout=self.ping_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.logger.error(f"LISTEN {self.channel}: {exc!r}, повтор через {backoff:.1f} с")
+            finally:
+                self.connected = False
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "PgListener",
+    "asyncpg_dsn",
+]
@@ -0,0 +1,6 @@
+"""Объединение конкурентных операций: записи в пачки (group commit) и одинаковые чтения (single-flight)."""
+
+from .coalescer import WriteCoalescer
+from .single_flight import SingleFlight
+
+__all__ = ["SingleFlight", "WriteCoalescer"]
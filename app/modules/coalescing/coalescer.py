@@ -0,0 +1,169 @@
+"""Объединение конкурентных записей в одну пачку (group commit).
+
+При всплеске регистраций каждая запись идёт отдельной транзакцией, и большая
+часть времени Postgres уходит на фиксацию транзакций (fsync WAL), а не на сами
+вставки. `WriteCoalescer` собирает элементы, пришедшие в течение `max_delay`
+секунд (или до `max_batch` штук), передаёт их одной функцией `flush` и раздаёт
+результаты каждому ожидающему вызову.
+
+Функция `flush` возвращает по одному результату на элемент в том же порядке;
+исключение вместо результата поднимается только у «своего» вызывающего.
+Если `flush` падает целиком, ошибку получают все элементы пачки.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+
+
+TItem = TypeVar("TItem")
+TResult = TypeVar("TResult")
+
+
+
+class WriteCoalescer(Generic[TItem, TResult]):
+    """
+    ## Собирает конкурентные записи в пачки и выполняет их одним вызовом.
+
+    Экземпляр привязан к event loop, в котором впервые вызван `submit`.
+
+    ### Attributes:
+        max_batch (int): Максимальный размер пачки; при достижении сброс идёт сразу.
+        max_delay (float): Сколько секунд ждать попутчиков после первого элемента.
+        batches (int): Количество выполненных пачек.
+        items (int): Количество обработанных элементов.
+        largest_batch (int): Размер самой большой пачки.
+    """
+    def __init__(
+        self,
+        flush: Callable[[list[TItem]], Awaitable[list[TResult | BaseException]]],
+        max_batch: int = 100,
+        max_delay: float = 0.002,
+    ) -> None:
+        """
+        ## Инициализирует коалесцер.
+
+        ### Args:
+            flush (Callable): Корутина, записывающая пачку и возвращающая
+                результат или исключение для каждого элемента.
+            max_batch (int): Максимальный размер пачки.
+            max_delay (float): Окно ожидания попутчиков, секунды.
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch должен быть не меньше 1")
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self._flush = flush
+        self._pending: list[tuple[TItem, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, item: TItem) -> TResult:
+        """
+        ## Ставит элемент в текущую пачку и ждёт его результата.
+
+        Отмена ожидающего вызова не отзывает элемент из уже отправленной пачки.
+
+        ### Args:
+            item (TItem): Элемент для записи.
+
+        ### Raises:
+            BaseException: Ошибка записи этого элемента или всей пачки.
+
+        ### Returns:
+            TResult: Результат записи элемента.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._dispatch)
+        return await future
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        ## Возвращает счётчики коалесцера.
+
+        ### Returns:
+            dict: `batches`, `items`, `largest_batch`, `mean_batch`, `pending`.
+        """
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "largest_batch": self.largest_batch,
+            "mean_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "pending": len(self._pending),
+        }
+
+    async def drain(self) -> None:
+        """
+        ## Отправляет накопленные элементы и дожидается всех пачек.
+
+        Вызывается при остановке приложения.
+        """
+        if self._pending:
+            self._dispatch()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        """
+        ## Забирает текущую пачку и запускает её запись в отдельной задаче.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+        if self._pending:
+            # Остаток больше max_batch (после drain) — следующей пачкой без ожидания
+            asyncio.get_running_loop().call_soon(self._dispatch)
+        if not batch:
+            return
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[TItem, asyncio.Future]]) -> None:
+        """
+        ## Записывает пачку и раздаёт результаты ожидающим.
+
+        ### Args:
+            batch (list[tuple[TItem, asyncio.Future]]): Элементы и их future.
+        """
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        try:
+            results = await self._flush([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"flush вернул {len(results)} результатов на {len(batch)} элементов"
+                )
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "WriteCoalescer",
+]
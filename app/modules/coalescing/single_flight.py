@@ -0,0 +1,111 @@
+"""Объединение одинаковых конкурентных чтений (single-flight).
+
+При всплеске десятки одновременных `GET /v1/users/{id}` или одной и той же
+страницы списка выполняют одинаковые запросы к БД. `SingleFlight` пропускает
+к БД одно выполнение на ключ, а остальные вызовы с тем же ключом, пришедшие
+пока оно идёт, получают его результат (или его исключение). Результат
+не кэшируется: следующий вызов после завершения выполняется заново.
+
+Выполнение идёт в отдельной задаче, а вызовы ждут его через `shield`.
+Поэтому отмена первого вызова (клиент отключился) не прерывает чтение для
+остальных. Выполнение отменяется, только когда ушли все ожидающие.
+
+Результат общий для всех вызовов — его нельзя изменять на месте.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+
+
+TKey = TypeVar("TKey", bound=Hashable)
+TResult = TypeVar("TResult")
+
+
+
+@dataclass
+class _Flight(Generic[TResult]):
+    """ ## Выполняющееся чтение и число ожидающих его вызовов. """
+    task: "asyncio.Task[TResult]"
+    waiters: int = field(default=0)
+
+
+class SingleFlight(Generic[TKey, TResult]):
+    """
+    ## Одно выполнение на ключ для конкурентных вызовов.
+
+    ### Attributes:
+        executions (int): Выполнений (обращений к БД).
+        coalesced (int): Вызовов, получивших результат чужого выполнения.
+        abandoned (int): Выполнений, отменённых из-за ухода всех ожидающих.
+    """
+    def __init__(self) -> None:
+        """
+        ## Инициализирует объединитель.
+        """
+        self.executions = 0
+        self.coalesced = 0
+        self.abandoned = 0
+        self._flights: dict[TKey, _Flight[TResult]] = {}
+
+    async def do(self, key: TKey, call: Callable[[], Awaitable[TResult]]) -> TResult:
+        """
+        ## Выполняет `call` или присоединяется к уже идущему выполнению с тем же ключом.
+
+        ### Args:
+            key (TKey): Ключ чтения (запрос и его параметры).
+            call (Callable[[], Awaitable[TResult]]): Чтение; вызывается только первым вызовом.
+
+        ### Raises:
+            BaseException: Исключение выполнения — у всех присоединившихся вызовов.
+
+        ### Returns:
+            TResult: Общий результат выполнения.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Ушли все ожидающие — результат никому не нужен
+                flight.task.cancel()
+                self._forget(key, flight)
+                self.abandoned += 1
+
+    def _forget(self, key: TKey, flight: _Flight[TResult]) -> None:
+        """ ## Убирает выполнение из таблицы, если на его месте ещё не новое. """
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        ## Возвращает счётчики объединителя.
+
+        ### Returns:
+            dict: `executions`, `coalesced`, `abandoned`, `in_flight`, `coalesced_ratio`.
+        """
+        calls = self.executions + self.coalesced
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "abandoned": self.abandoned,
+            "in_flight": len(self._flights),
+            "coalesced_ratio": round(self.coalesced / calls, 4) if calls else 0.0,
+        }
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "SingleFlight",
+]
@@ -0,0 +1,31 @@
+"""Дедлайны запросов: бюджет маршрута, заголовок клиента и `statement_timeout`."""
+
+from .deadline import (
+    QUERY_CANCELED,
+    REQUEST_TIMEOUT_HEADER,
+    Deadline,
+    DeadlineExceeded,
+    bind_statement_timeout,
+    current_deadline,
+    is_statement_timeout,
+    needs_statement_timeout,
+    request_timeout,
+    resolve_timeout_ms,
+    route_timeout_ms,
+    set_current_deadline,
+)
+
+__all__ = [
+    "Deadline",
+    "DeadlineExceeded",
+    "QUERY_CANCELED",
+    "REQUEST_TIMEOUT_HEADER",
+    "bind_statement_timeout",
+    "current_deadline",
+    "is_statement_timeout",
+    "needs_statement_timeout",
+    "request_timeout",
+    "resolve_timeout_ms",
+    "route_timeout_ms",
+    "set_current_deadline",
+]
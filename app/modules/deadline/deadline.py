@@ -0,0 +1,250 @@
+"""Дедлайны запросов и их перенос в `statement_timeout` PostgreSQL.
+
+Бюджет запроса задаётся по умолчанию (`REQUEST_TIMEOUT_MS`), для отдельного
+маршрута — декоратором `request_timeout`, а клиент может сократить или
+продлить его заголовком `X-Request-Timeout` в пределах `REQUEST_TIMEOUT_MAX_MS`.
+
+Дедлайн отсчитывается от начала запроса по `time.monotonic()`. В начале
+транзакции остаток бюджета записывается в `statement_timeout` через
+`set_config(..., true)` — параметризованный аналог `SET LOCAL`, который
+действует только до конца транзакции и не протекает в пул соединений.
+Если соединения открыты с `statement_timeout` (`DB_STATEMENT_TIMEOUT_MS`),
+а остаток бюджета почти равен ему, лишний round trip не делается: типичный
+запрос начинает транзакцию почти с полным бюджетом.
+"""
+
+import math
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, TypeVar
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+
+
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout"
+"""
+    ## REQUEST_TIMEOUT_HEADER
+
+    Заголовок, которым клиент задаёт бюджет запроса в миллисекундах.
+"""
+
+QUERY_CANCELED = "57014"
+"""
+    ## QUERY_CANCELED
+
+    SQLSTATE отмены запроса: истёк `statement_timeout` или пришёл `pg_cancel_backend`.
+"""
+
+STATEMENT_TIMEOUT_SQL = text("SELECT set_config('statement_timeout', :value, true)")
+
+STATEMENT_TIMEOUT_SLACK = 0.1
+"""
+    ## STATEMENT_TIMEOUT_SLACK
+
+    Доля `statement_timeout` по умолчанию, на которую остаток бюджета может быть
+    меньше него без отдельного `set_config`: на столько же запрос может
+    пережить свой дедлайн.
+"""
+
+_ENDPOINT_ATTR = "__request_timeout_ms__"
+
+_current_deadline: ContextVar["Deadline | None"] = ContextVar("current_deadline", default=None)
+
+_Endpoint = TypeVar("_Endpoint", bound=Callable[..., Any])
+
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    ## Бюджет запроса исчерпан до начала очередной транзакции.
+    """
+
+
+class Deadline:
+    """
+    ## Момент, к которому запрос должен завершиться.
+
+    ### Attributes:
+        timeout_ms (int): Исходный бюджет запроса, мс.
+        expires_at (float): Момент истечения по часам `clock`.
+    """
+    def __init__(self, timeout_ms: int, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        ## Запускает отсчёт дедлайна.
+
+        ### Args:
+            timeout_ms (int): Бюджет запроса, мс.
+            clock (Callable[[], float]): Монотонные часы в секундах.
+        """
+        self.timeout_ms = timeout_ms
+        self._clock = clock
+        self.expires_at = clock() + timeout_ms / 1000
+
+    def remaining(self) -> float:
+        """
+        ## Остаток бюджета в секундах (не меньше нуля).
+        """
+        return max(self.expires_at - self._clock(), 0.0)
+
+    def remaining_ms(self) -> int:
+        """
+        ## Остаток бюджета в целых миллисекундах, округлённый вверх.
+        """
+        return math.ceil(self.remaining() * 1000)
+
+    @property
+    def expired(self) -> bool:
+        """
+        ## Бюджет исчерпан.
+        """
+        return self.remaining() <= 0
+
+    def __repr__(self) -> str:
+        return f"Deadline(timeout_ms={self.timeout_ms}, remaining_ms={self.remaining_ms()})"
+
+
+def request_timeout(milliseconds: int | None) -> Callable[[_Endpoint], _Endpoint]:
+    """
+    ## Декоратор эндпоинта: собственный бюджет маршрута.
+
+    Ставится под `@router.get(...)`, чтобы атрибут оказался на функции,
+    которую FastAPI кладёт в `scope["endpoint"]`.
+
+    ### Args:
+        milliseconds (int | None): Бюджет, мс; `None` или `0` — без дедлайна
+            (клиент всё равно может задать его заголовком).
+
+    ### Returns:
+        Callable: Декоратор, возвращающий ту же функцию.
+    """
+    def decorator(endpoint: _Endpoint) -> _Endpoint:
+        setattr(endpoint, _ENDPOINT_ATTR, milliseconds)
+        return endpoint
+    return decorator
+
+
+def route_timeout_ms(endpoint: Callable[..., Any] | None, default_ms: int | None) -> int | None:
+    """
+    ## Бюджет маршрута: из `request_timeout` или значение по умолчанию.
+
+    ### Args:
+        endpoint (Callable | None): Функция эндпоинта.
+        default_ms (int | None): Бюджет по умолчанию, мс.
+
+    ### Returns:
+        int | None: Бюджет маршрута, мс.
+    """
+    return getattr(endpoint, _ENDPOINT_ATTR, default_ms)
+
+
+def resolve_timeout_ms(route_ms: int | None, header_ms: int | None, max_ms: int) -> int | None:
+    """
+    ## Итоговый бюджет запроса с учётом заголовка клиента.
+
+    Заголовок заменяет бюджет маршрута, но не больше `max_ms`, — клиент может
+    отказаться ждать раньше или подождать дольше, не занимая соединение
+    бесконечно.
+
+    ### Args:
+        route_ms (int | None): Бюджет маршрута, мс.
+        header_ms (int | None): Значение `X-Request-Timeout`, мс.
+        max_ms (int): Верхняя граница для заголовка, мс (`0` — без границы).
+
+    ### Returns:
+        int | None: Бюджет, мс, или `None`, если дедлайна нет.
+    """
+    if header_ms is not None and header_ms > 0:
+        return min(header_ms, max_ms) if max_ms > 0 else header_ms
+    return route_ms if route_ms else None
+
+
+def current_deadline() -> Deadline | None:
+    """
+    ## Дедлайн текущего запроса (или `None`).
+    """
+    return _current_deadline.get()
+
+
+def set_current_deadline(deadline: Deadline | None) -> None:
+    """
+    ## Делает дедлайн текущим для задачи запроса.
+
+    ### Args:
+        deadline (Deadline | None): Дедлайн запроса.
+    """
+    _current_deadline.set(deadline)
+
+
+def needs_statement_timeout(remaining_ms: int, default_ms: int) -> bool:
+    """
+    ## Нужно ли задавать `statement_timeout` транзакции отдельно.
+
+    ### Args:
+        remaining_ms (int): Остаток бюджета, мс.
+        default_ms (int): `statement_timeout` соединения, мс (`0` — не задан).
+
+    ### Returns:
+        bool: `False`, если значение соединения не больше остатка и меньше
+        него не более чем на `STATEMENT_TIMEOUT_SLACK`.
+    """
+    if default_ms <= 0:
+        return True
+    return not default_ms * (1 - STATEMENT_TIMEOUT_SLACK) <= remaining_ms <= default_ms
+
+
+def bind_statement_timeout(session: AsyncSession, deadline: Deadline, default_ms: int = 0) -> None:
+    """
+    ## Переносит остаток дедлайна в `statement_timeout` каждой транзакции сессии.
+
+    ### Args:
+        session (AsyncSession): Сессия запроса.
+        deadline (Deadline): Дедлайн запроса.
+        default_ms (int): `statement_timeout`, с которым открыты соединения, мс
+            (`0` — не задан, остаток записывается всегда).
+
+    ### Raises:
+        DeadlineExceeded: При начале транзакции, если бюджет уже исчерпан.
+    """
+    def on_begin(sync_session: Session, transaction: SessionTransaction, connection: Connection) -> None:
+        remaining_ms = deadline.remaining_ms()
+        if remaining_ms <= 0:
+            raise DeadlineExceeded(f"Бюджет запроса {deadline.timeout_ms} мс исчерпан")
+        if needs_statement_timeout(remaining_ms, default_ms):
+            connection.execute(STATEMENT_TIMEOUT_SQL, {"value": f"{remaining_ms}ms"})
+
+    event.listen(session.sync_session, "after_begin", on_begin)
+
+
+def is_statement_timeout(exc: BaseException) -> bool:
+    """
+    ## Ошибка драйвера — отмена запроса по `statement_timeout`.
+
+    ### Args:
+        exc (BaseException): Исключение.
+
+    ### Returns:
+        bool: `True` для `DBAPIError` с SQLSTATE `57014`.
+    """
+    return isinstance(exc, DBAPIError) and getattr(exc.orig, 'pgcode', None) == QUERY_CANCELED
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "Deadline",
+    "DeadlineExceeded",
+    "QUERY_CANCELED",
+    "REQUEST_TIMEOUT_HEADER",
+    "bind_statement_timeout",
+    "current_deadline",
+    "is_statement_timeout",
+    "needs_statement_timeout",
+    "request_timeout",
+    "resolve_timeout_ms",
+    "route_timeout_ms",
+    "set_current_deadline",
+]
@@ -0,0 +1,12 @@
+"""Потоковая выгрузка таблиц: CSV через `COPY TO STDOUT` и Parquet пачками."""
+
+from .copy_stream import copy_query_chunks, fetch_batches
+from .parquet import arrow_schema, parquet_available, parquet_chunks
+
+__all__ = [
+    "arrow_schema",
+    "copy_query_chunks",
+    "fetch_batches",
+    "parquet_available",
+    "parquet_chunks",
+]
@@ -0,0 +1,99 @@
+"""Потоковая выгрузка результатов запроса из Postgres.
+
+`COPY (SELECT ...) TO STDOUT` отдаёт строки в готовом CSV прямо из сервера БД:
+ни ORM-объектов, ни pydantic-моделей, ни даже кортежей Python. `asyncpg`
+передаёт куски данных в колбэк `output`; здесь они перекладываются в очередь
+ограниченного размера, и медленный клиент притормаживает чтение из БД,
+а не копит выгрузку в памяти.
+
+Для Arrow/Parquet строки читаются серверным курсором пачками фиксированного
+размера (`fetch_batches`).
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Sequence
+
+
+
+async def copy_query_chunks(
+    connection: Any,
+    query: str,
+    args: Sequence[Any] = (),
+    format: str = "csv",
+    header: bool = True,
+    max_chunks: int = 16,
+) -> AsyncIterator[bytes]:
+    """
+    ## Выполняет `COPY (query) TO STDOUT` и отдаёт данные кусками по мере чтения.
+
+    ### Args:
+        connection (asyncpg.Connection): Соединение `asyncpg`.
+        query (str): `SELECT` с параметрами `$1, $2, ...`.
+        args (Sequence[Any]): Значения параметров.
+        format (str): Формат `COPY` (`csv`, `text`, `binary`).
+        header (bool): Первая строка CSV — имена колонок.
+        max_chunks (int): Сколько кусков может ждать клиента (обратное давление).
+
+    ### Raises:
+        asyncpg.PostgresError: Ошибка выполнения запроса.
+
+    ### Yields:
+        bytes: Очередной кусок выгрузки.
+    """
+    queue: asyncio.Queue[bytearray | Exception | None] = asyncio.Queue(max_chunks)
+
+    async def run() -> None:
+        try:
+            await connection.copy_from_query(
+                query, *args, output=queue.put, format=format, header=header,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await queue.put(exc)
+            return
+        await queue.put(None)
+
+    task = asyncio.create_task(run(), name="copy-to-stdout")
+    try:
+        while (chunk := await queue.get()) is not None:
+            if isinstance(chunk, Exception):
+                raise chunk
+            # asyncpg отдаёт `bytearray`, а StreamingResponse принимает только `bytes`/`str`
+            yield bytes(chunk)
+    finally:
+        if not task.done():
+            # Клиент ушёл: COPY прерывается, соединение вызывающий код не должен переиспользовать
+            task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def fetch_batches(
+    connection: Any,
+    query: str,
+    args: Sequence[Any] = (),
+    batch_size: int = 50000,
+) -> AsyncIterator[list[Any]]:
+    """
+    ## Читает результат запроса серверным курсором пачками по `batch_size` строк.
+
+    ### Args:
+        connection (asyncpg.Connection): Соединение `asyncpg`.
+        query (str): `SELECT` с параметрами `$1, $2, ...`.
+        args (Sequence[Any]): Значения параметров.
+        batch_size (int): Строк в пачке.
+
+    ### Yields:
+        list[asyncpg.Record]: Пачка строк (последняя может быть короче).
+    """
+    async with connection.transaction(readonly=True):
+        cursor = await connection.cursor(query, *args)
+        while rows := await cursor.fetch(batch_size):
+            yield rows
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "copy_query_chunks",
+    "fetch_batches",
+]
@@ -0,0 +1,130 @@
+"""Запись выгрузки в Parquet пачками (требует пакет `pyarrow`).
+
+Каждая пачка строк превращается в `RecordBatch` и пишется отдельной группой
+строк; готовые байты сразу отдаются клиенту. В памяти одновременно лежит
+только одна пачка, а не вся таблица. Кодирование выполняется в потоке,
+чтобы не блокировать event loop.
+"""
+
+import asyncio
+from importlib.util import find_spec
+from typing import Any, AsyncIterator, Sequence
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, Numeric
+
+
+
+def parquet_available() -> bool:
+    """
+    ## Проверяет, установлен ли `pyarrow`.
+
+    ### Returns:
+        bool: `True`, если Parquet-выгрузка возможна.
+    """
+    return find_spec("pyarrow") is not None
+
+
+def arrow_schema(columns: Sequence[Column]):
+    """
+    ## Строит схему Arrow по колонкам SQLAlchemy.
+
+    Неизвестные типы выгружаются строками.
+
+    ### Args:
+        columns (Sequence[Column]): Колонки таблицы в порядке выгрузки.
+
+    ### Returns:
+        pyarrow.Schema: Схема выгрузки.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for column in columns:
+        if isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp("us", tz="UTC" if column.type.timezone else None)
+        elif isinstance(column.type, Numeric) and column.type.precision is not None:
+            arrow_type = pa.decimal128(column.type.precision, column.type.scale or 0)
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type, nullable=bool(column.nullable)))
+    return pa.schema(fields)
+
+
+class _ChunkSink:
+    """
+    ## Файлоподобный приёмник: копит записанные байты до `take`.
+    """
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def parquet_chunks(
+    batches: AsyncIterator[list[Sequence[Any]]],
+    schema,
+    compression: str = "snappy",
+) -> AsyncIterator[bytes]:
+    """
+    ## Превращает поток пачек строк в поток байтов файла Parquet.
+
+    ### Args:
+        batches (AsyncIterator[list[Sequence[Any]]]): Пачки строк (кортежи в порядке `schema`).
+        schema (pyarrow.Schema): Схема выгрузки (`arrow_schema`).
+        compression (str): Сжатие страниц Parquet.
+
+    ### Yields:
+        bytes: Очередная часть файла; последняя содержит футер.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression=compression)
+
+    def write(rows: list[Sequence[Any]]) -> bytes:
+        arrays = [
+            pa.array([row[index] for row in rows], type=field.type)
+            for index, field in enumerate(schema)
+        ]
+        writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+        return sink.take()
+
+    try:
+        async for rows in batches:
+            if chunk := await asyncio.to_thread(write, rows):
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "arrow_schema",
+    "parquet_available",
+    "parquet_chunks",
+]
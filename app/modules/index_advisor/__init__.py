@@ -0,0 +1,26 @@
+"""Советник индексов: статистика использования, лишние индексы, миграция-кандидат."""
+
+from .advisor import (
+    FindingKind,
+    IndexFinding,
+    IndexReport,
+    analyze_indexes,
+    build_index_report,
+    model_indexes,
+    render_migration,
+)
+from .stats import ColumnStats, IndexSnapshot, IndexStats, fetch_index_snapshot
+
+__all__ = [
+    "ColumnStats",
+    "FindingKind",
+    "IndexFinding",
+    "IndexReport",
+    "IndexSnapshot",
+    "IndexStats",
+    "analyze_indexes",
+    "build_index_report",
+    "fetch_index_snapshot",
+    "model_indexes",
+    "render_migration",
+]
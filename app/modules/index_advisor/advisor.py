@@ -0,0 +1,344 @@
+"""Советник индексов: находит лишние индексы и предлагает миграцию.
+
+Каждый индекс обновляется при каждой вставке в таблицу (`UserDAO.create`
+платит за все индексы `users`), поэтому неиспользуемые и дублирующие
+индексы — чистый расход. Правила:
+
+- `invalid` — остаток прерванного `CREATE INDEX CONCURRENTLY`;
+- `duplicate` — те же колонки, метод и предикат, что у другого индекса;
+- `redundant` — колонки индекса являются началом колонок другого btree-индекса
+  или уникальность по `col` уже следует из уникального индекса по `lower(col)`;
+- `unused` — сканирований не больше `min_scans` с момента сброса статистики;
+- `low_selectivity` — индекс по колонке с несколькими значениями
+  или с преобладающим значением (например, `boolean`);
+- `not_in_models` / `missing` — расхождение с `app/database/models.py`.
+
+Индексы первичных ключей и ограничений миграцией не удаляются. Миграция —
+кандидат для ревью: решение о `DROP INDEX` принимает человек, проверив
+счётчики на всех репликах.
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal
+
+from sqlalchemy import MetaData
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.database.models import metadata_obj
+
+from .stats import IndexSnapshot, IndexStats, fetch_index_snapshot
+
+
+
+FindingKind = Literal[
+    "invalid", "duplicate", "redundant", "unused", "low_selectivity", "not_in_models", "missing",
+]
+
+_PLAIN_COLUMN = re.compile(r'^"?([A-Za-z_][A-Za-z0-9_$]*)"?$')
+_LOWER_COLUMN = re.compile(r'^lower\(\(?"?([A-Za-z_][A-Za-z0-9_$]*)"?\)?(?:::text)?\)$')
+
+MIGRATION_TEMPLATE = '''"""Удаление лишних индексов (кандидат от советника индексов)
+
+Сгенерировано `python -m app.cli.index_report --migration`. Перед применением
+проверьте счётчики на всех репликах и уберите индексы из `app/database/models.py`
+(`index=True` / `Index(...)`), иначе autogenerate вернёт их обратно.
+"""
+import sqlalchemy as sa
+
+from app.database.migration_helpers import create_index_concurrently, drop_index_concurrently
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+{upgrade}
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+{downgrade}
+'''
+"""
+    ## MIGRATION_TEMPLATE
+
+    Тело файла миграции Alembic; заголовок с ревизиями создаёт `alembic revision`.
+"""
+
+
+
+@dataclass(frozen=True)
+class IndexFinding:
+    """
+    ## Замечание советника по одному индексу.
+
+    ### Attributes:
+        kind (FindingKind): Правило, по которому найден индекс.
+        table (str): Таблица.
+        index (str): Имя индекса.
+        detail (str): Пояснение.
+        droppable (bool): Индекс можно удалить миграцией-кандидатом.
+    """
+    kind: FindingKind
+    table: str
+    index: str
+    detail: str
+    droppable: bool
+
+
+@dataclass(frozen=True)
+class IndexReport:
+    """
+    ## Отчёт советника.
+
+    ### Attributes:
+        stats_reset (datetime | None): Начало накопления счётчиков.
+        indexes (list[IndexStats]): Индексы схемы.
+        findings (list[IndexFinding]): Замечания.
+        migration (str | None): Миграция-кандидат; `None`, если удалять нечего.
+    """
+    stats_reset: datetime | None
+    indexes: list[IndexStats]
+    findings: list[IndexFinding]
+    migration: str | None
+
+
+def model_indexes(metadata: MetaData) -> dict[str, str]:
+    """
+    ## Индексы, объявленные в моделях.
+
+    Индексы секционированных таблиц пропускаются: у родительской таблицы нет
+    своих счётчиков в `pg_stat_user_indexes`, а секции в отчёт не входят.
+
+    ### Args:
+        metadata (MetaData): Метаданные моделей.
+
+    ### Returns:
+        dict[str, str]: `{имя индекса: таблица}`.
+    """
+    return {
+        str(index.name): table.name
+        for table in metadata.tables.values()
+        if not table.dialect_options['postgresql'].get('partition_by')
+        for index in table.indexes
+    }
+
+
+def _plain_column(expression: str) -> str | None:
+    match = _PLAIN_COLUMN.match(expression)
+    return match.group(1) if match else None
+
+
+def _keeper_rank(index: IndexStats, declared: dict[str, str]) -> tuple:
+    """Какой из одинаковых индексов оставить: ограничение, объявленный в моделях, используемый."""
+    return (index.is_primary, index.backs_constraint, index.name in declared, index.scans)
+
+
+def _drop_detail(index: IndexStats) -> str:
+    return f"{index.size_bytes} байт, обновляется при каждой из {index.table_writes} записей в {index.table}"
+
+
+def analyze_indexes(
+    snapshot: IndexSnapshot,
+    metadata: MetaData = metadata_obj,
+    min_scans: int = 0,
+    max_distinct: float = 10,
+    max_top_frequency: float = 0.5,
+    min_table_rows: int = 1000,
+) -> list[IndexFinding]:
+    """
+    ## Применяет правила советника к снимку статистики.
+
+    ### Args:
+        snapshot (IndexSnapshot): Статистика индексов и колонок.
+        metadata (MetaData): Метаданные моделей для сверки.
+        min_scans (int): Индекс с числом сканирований не больше этого — неиспользуемый.
+        max_distinct (float): Индекс по колонке с числом значений не больше этого — малоселективный.
+        max_top_frequency (float): Индекс по колонке, где самое частое значение занимает
+            не меньше этой доли строк, — малоселективный.
+        min_table_rows (int): На таблицах меньше этого селективность не оценивается.
+
+    ### Returns:
+        list[IndexFinding]: Замечания в порядке таблица, индекс.
+    """
+    declared = model_indexes(metadata)
+    findings: list[IndexFinding] = []
+
+    def add(kind: FindingKind, index: IndexStats, detail: str, droppable: bool) -> None:
+        droppable = droppable and not index.is_primary and not index.backs_constraint
+        findings.append(IndexFinding(kind, index.table, index.name, detail, droppable))
+
+    by_table: dict[str, list[IndexStats]] = defaultdict(list)
+    for index in snapshot.indexes:
+        by_table[index.table].append(index)
+
+    for table, indexes in by_table.items():
+        # Дубли: одинаковые метод, колонки и предикат
+        groups: dict[tuple, list[IndexStats]] = defaultdict(list)
+        for index in indexes:
+            groups[(index.method, index.columns, index.predicate)].append(index)
+        duplicates: set[str] = set()
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            keeper = max(group, key=lambda index: _keeper_rank(index, declared))
+            for index in group:
+                if index is keeper:
+                    continue
+                duplicates.add(index.name)
+                add("duplicate", index, f"дублирует {keeper.name} ({', '.join(index.columns)}); {_drop_detail(index)}",
+                    droppable=not index.is_unique or keeper.is_unique)
+
+        for index in indexes:
+            if not index.is_valid:
+                add("invalid", index, "невалиден после прерванного CREATE INDEX CONCURRENTLY", droppable=True)
+            if index.name not in declared and not index.is_primary and not index.backs_constraint:
+                add("not_in_models", index, "нет в app/database/models.py: autogenerate предложит удалить его",
+                    droppable=False)
+            if index.name in duplicates:
+                continue
+            for other in indexes:
+                if other is index or other.predicate != index.predicate:
+                    continue
+                # Начало колонок другого btree-индекса: тот обслуживает те же запросы
+                if (
+                    index.method == other.method == "btree"
+                    and not index.is_unique
+                    and len(index.columns) < len(other.columns)
+                    and other.columns[:len(index.columns)] == index.columns
+                ):
+                    add("redundant", index, f"колонки — начало {other.name} ({', '.join(other.columns)}); "
+                        f"{_drop_detail(index)}", droppable=True)
+                    break
+                # Уникальность col следует из уникальности lower(col)
+                column = _plain_column(index.columns[0]) if len(index.columns) == 1 else None
+                lower = _LOWER_COLUMN.match(other.columns[0]) if len(other.columns) == 1 else None
+                if index.is_unique and other.is_unique and column and lower and lower.group(1) == column:
+                    add("redundant", index, f"уникальность {column} уже обеспечивает {other.name}; "
+                        f"нужен только для поиска по точному {column} (сканирований: {index.scans})",
+                        droppable=index.scans <= min_scans)
+                    break
+
+            if index.scans <= min_scans and not index.is_primary:
+                if index.is_unique or index.backs_constraint:
+                    add("unused", index, f"сканирований {index.scans}, но индекс обеспечивает уникальность",
+                        droppable=False)
+                else:
+                    add("unused", index, f"сканирований {index.scans}; {_drop_detail(index)}", droppable=True)
+
+            column = _plain_column(index.columns[0]) if len(index.columns) == 1 else None
+            stats = snapshot.columns.get((table, column)) if column else None
+            if (
+                stats is not None
+                and not index.is_unique
+                and index.predicate is None
+                and index.table_rows >= min_table_rows
+            ):
+                distinct = stats.distinct_values(index.table_rows)
+                top = stats.top_frequency or 0.0
+                if distinct <= max_distinct or top >= max_top_frequency:
+                    add("low_selectivity", index, (
+                        f"{column}: ~{distinct:.0f} значений, самое частое — {top:.0%} строк; планировщик "
+                        f"выберет индекс только для редких значений (для них хватит частичного индекса "
+                        f"WHERE {column} = <редкое значение>); сканирований: {index.scans}"
+                    ), droppable=True)
+
+
+    existing = {index.name for index in snapshot.indexes}
+    for name, table in declared.items():
+        if name not in existing:
+            findings.append(IndexFinding(
+                "missing", table, name, "объявлен в моделях, но отсутствует в БД: проверьте `alembic upgrade head`",
+                droppable=False,
+            ))
+
+    return sorted(findings, key=lambda finding: (finding.table, finding.index))
+
+
+def _render_column(expression: str) -> str:
+    column = _plain_column(expression)
+    return repr(column) if column else f"sa.text({expression!r})"
+
+
+def _render_create(index: IndexStats) -> str:
+    args = [repr(index.name), repr(index.table), f"[{', '.join(map(_render_column, index.columns))}]"]
+    if index.is_unique:
+        args.append("unique=True")
+    if index.method != "btree":
+        args.append(f"postgresql_using={index.method!r}")
+    if index.predicate:
+        args.append(f"postgresql_where=sa.text({index.predicate!r})")
+    return f"create_index_concurrently({', '.join(args)})"
+
+
+def render_migration(findings: list[IndexFinding], indexes: list[IndexStats]) -> str | None:
+    """
+    ## Собирает миграцию-кандидат, удаляющую индексы с `droppable=True`.
+
+    `downgrade` пересоздаёт индексы с теми же колонками, уникальностью,
+    методом и предикатом.
+
+    ### Args:
+        findings (list[IndexFinding]): Замечания советника.
+        indexes (list[IndexStats]): Индексы схемы.
+
+    ### Returns:
+        str | None: Текст миграции или `None`, если удалять нечего.
+    """
+    by_name = {(index.table, index.name): index for index in indexes}
+    reasons: dict[tuple[str, str], list[str]] = {}
+    for finding in findings:
+        if finding.droppable and (finding.table, finding.index) in by_name:
+            reasons.setdefault((finding.table, finding.index), []).append(finding.kind)
+    if not reasons:
+        return None
+
+    upgrade, downgrade = [], []
+    for key, kinds in reasons.items():
+        index = by_name[key]
+        upgrade.append(f"    # {', '.join(kinds)}; сканирований: {index.scans}")
+        upgrade.append(f"    drop_index_concurrently({index.name!r}, {index.table!r})")
+        downgrade.append(f"    {_render_create(index)}")
+    return MIGRATION_TEMPLATE.format(upgrade="\n".join(upgrade), downgrade="\n".join(reversed(downgrade)))
+
+
+async def build_index_report(
+    connection: AsyncConnection | AsyncSession,
+    schema: str = "public",
+    metadata: MetaData = metadata_obj,
+    **thresholds,
+) -> IndexReport:
+    """
+    ## Читает статистику, применяет правила и собирает миграцию-кандидат.
+
+    ### Args:
+        connection (AsyncConnection | AsyncSession): Соединение или сессия.
+        schema (str): Схема.
+        metadata (MetaData): Метаданные моделей.
+        **thresholds: Пороги `analyze_indexes`.
+
+    ### Returns:
+        IndexReport: Отчёт.
+    """
+    snapshot = await fetch_index_snapshot(connection, schema)
+    findings = analyze_indexes(snapshot, metadata, **thresholds)
+    return IndexReport(
+        stats_reset=snapshot.stats_reset,
+        indexes=snapshot.indexes,
+        findings=findings,
+        migration=render_migration(findings, snapshot.indexes),
+    )
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "FindingKind",
+    "IndexFinding",
+    "IndexReport",
+    "MIGRATION_TEMPLATE",
+    "analyze_indexes",
+    "build_index_report",
+    "model_indexes",
+    "render_migration",
+]
@@ -0,0 +1,202 @@
+"""Сбор статистики индексов из каталога Postgres.
+
+Объединяет `pg_stat_user_indexes` (сканирования), `pg_statio_user_indexes`
+(чтения блоков), `pg_index` (колонки, уникальность, предикат, валидность)
+и размеры индексов, а также статистику колонок из `pg_stats` для оценки
+селективности. Счётчики накапливаются с момента `stats_reset` базы: выводы
+о неиспользуемых индексах верны только за этот период и только для
+текущего сервера (у реплик свои счётчики).
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+
+
+INDEX_STATS_SQL = text("""
+SELECT
+    s.relname AS "table",
+    s.indexrelname AS name,
+    am.amname AS method,
+    ARRAY(
+        SELECT pg_get_indexdef(i.indexrelid, k, true)
+        FROM generate_series(1, i.indnkeyatts) AS k
+        ORDER BY k
+    ) AS columns,
+    pg_get_expr(i.indpred, i.indrelid, true) AS predicate,
+    i.indisunique AS is_unique,
+    i.indisprimary AS is_primary,
+    con.conname IS NOT NULL AS backs_constraint,
+    i.indisvalid AS is_valid,
+    pg_get_indexdef(i.indexrelid) AS definition,
+    pg_relation_size(i.indexrelid) AS size_bytes,
+    s.idx_scan AS scans,
+    s.idx_tup_read AS tuples_read,
+    io.idx_blks_read AS blocks_read,
+    io.idx_blks_hit AS blocks_hit,
+    t.n_live_tup AS table_rows,
+    t.n_tup_ins + t.n_tup_upd + t.n_tup_del AS table_writes
+FROM pg_stat_user_indexes AS s
+JOIN pg_statio_user_indexes AS io ON io.indexrelid = s.indexrelid
+JOIN pg_stat_user_tables AS t ON t.relid = s.relid
+JOIN pg_index AS i ON i.indexrelid = s.indexrelid
+JOIN pg_class AS ic ON ic.oid = s.indexrelid
+JOIN pg_class AS tc ON tc.oid = s.relid
+JOIN pg_am AS am ON am.oid = ic.relam
+LEFT JOIN pg_constraint AS con ON con.conindid = s.indexrelid AND con.contype IN ('p', 'u', 'x')
+WHERE s.schemaname = :schema AND NOT tc.relispartition
+ORDER BY s.relname, s.indexrelname
+""")
+"""
+    ## INDEX_STATS_SQL
+
+    Индексы схемы со счётчиками использования, описанием и размером.
+    Индексы секций (`users_archive_YYYY_MM`) не входят: их создаёт Postgres
+    по индексам секционированной таблицы, и в моделях их нет.
+"""
+
+COLUMN_STATS_SQL = text("""
+SELECT tablename AS "table", attname AS "column", n_distinct, most_common_freqs[1] AS top_frequency
+FROM pg_stats
+WHERE schemaname = :schema
+""")
+"""
+    ## COLUMN_STATS_SQL
+
+    Оценки `ANALYZE`: число различных значений и доля самого частого.
+"""
+
+STATS_RESET_SQL = text("SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()")
+
+
+
+@dataclass(frozen=True)
+class IndexStats:
+    """
+    ## Описание и счётчики одного индекса.
+
+    ### Attributes:
+        table (str): Таблица.
+        name (str): Имя индекса.
+        method (str): Метод доступа (`btree`, `gin`, ...).
+        columns (tuple[str, ...]): Ключевые колонки или выражения по порядку.
+        predicate (str | None): Условие частичного индекса.
+        is_unique (bool): Уникальный индекс.
+        is_primary (bool): Индекс первичного ключа.
+        backs_constraint (bool): Индекс ограничения (`PRIMARY KEY`, `UNIQUE`, `EXCLUDE`).
+        is_valid (bool): `False` — остаток прерванного `CREATE INDEX CONCURRENTLY`.
+        definition (str): `CREATE INDEX ...` из `pg_get_indexdef`.
+        size_bytes (int): Размер индекса.
+        scans (int): Сканирования индекса с момента сброса статистики.
+        tuples_read (int): Прочитанные через индекс записи.
+        blocks_read (int): Блоки индекса, прочитанные с диска.
+        blocks_hit (int): Блоки индекса, найденные в shared buffers.
+        table_rows (int): Оценка числа живых строк таблицы.
+        table_writes (int): Вставки, обновления и удаления в таблице — каждая
+            запись обновляет и этот индекс (кроме HOT-обновлений).
+    """
+    table: str
+    name: str
+    method: str
+    columns: tuple[str, ...]
+    predicate: str | None
+    is_unique: bool
+    is_primary: bool
+    backs_constraint: bool
+    is_valid: bool
+    definition: str
+    size_bytes: int
+    scans: int
+    tuples_read: int
+    blocks_read: int
+    blocks_hit: int
+    table_rows: int
+    table_writes: int
+
+
+@dataclass(frozen=True)
+class ColumnStats:
+    """
+    ## Оценки `ANALYZE` для колонки.
+
+    ### Attributes:
+        table (str): Таблица.
+        column (str): Колонка.
+        n_distinct (float): Число различных значений (> 0) или его доля
+            от числа строк со знаком минус (< 0), как в `pg_stats`.
+        top_frequency (float | None): Доля самого частого значения.
+    """
+    table: str
+    column: str
+    n_distinct: float
+    top_frequency: float | None
+
+    def distinct_values(self, rows: int) -> float:
+        """
+        ## Оценка числа различных значений.
+
+        ### Args:
+            rows (int): Число строк таблицы.
+
+        ### Returns:
+            float: Число различных значений.
+        """
+        return self.n_distinct if self.n_distinct >= 0 else -self.n_distinct * rows
+
+
+@dataclass(frozen=True)
+class IndexSnapshot:
+    """
+    ## Снимок статистики индексов схемы.
+
+    ### Attributes:
+        indexes (list[IndexStats]): Индексы.
+        columns (dict[tuple[str, str], ColumnStats]): Статистика колонок
+            по `(таблица, колонка)`.
+        stats_reset (datetime | None): Начало накопления счётчиков.
+    """
+    indexes: list[IndexStats]
+    columns: dict[tuple[str, str], ColumnStats]
+    stats_reset: datetime | None
+
+
+async def fetch_index_snapshot(
+    connection: AsyncConnection | AsyncSession,
+    schema: str = "public",
+) -> IndexSnapshot:
+    """
+    ## Читает статистику индексов и колонок схемы.
+
+    ### Args:
+        connection (AsyncConnection | AsyncSession): Соединение или сессия.
+        schema (str): Схема.
+
+    ### Returns:
+        IndexSnapshot: Снимок статистики.
+    """
+    params: dict[str, Any] = {"schema": schema}
+    indexes = [
+        IndexStats(**{**row, "columns": tuple(row["columns"])})
+        for row in (await connection.execute(INDEX_STATS_SQL, params)).mappings()
+    ]
+    columns = {
+        (row["table"], row["column"]): ColumnStats(**row)
+        for row in (await connection.execute(COLUMN_STATS_SQL, params)).mappings()
+    }
+    stats_reset = (await connection.execute(STATS_RESET_SQL)).scalar_one_or_none()
+    return IndexSnapshot(indexes, columns, stats_reset)
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "COLUMN_STATS_SQL",
+    "ColumnStats",
+    "INDEX_STATS_SQL",
+    "IndexSnapshot",
+    "IndexStats",
+    "fetch_index_snapshot",
+]
@@ -0,0 +1,17 @@
+"""Локальные кэши воркера и шина их инвалидации между воркерами."""
+
+from .bus import InMemoryInvalidationBus, InvalidationBus, InvalidationMessage, InvalidationTarget
+from .cache import VersionedCache
+from .factory import INVALIDATION_CHANNEL, get_invalidation_bus
+from .session import invalidate_after_commit
+
+__all__ = [
+    "INVALIDATION_CHANNEL",
+    "InMemoryInvalidationBus",
+    "InvalidationBus",
+    "InvalidationMessage",
+    "InvalidationTarget",
+    "VersionedCache",
+    "get_invalidation_bus",
+    "invalidate_after_commit",
+]
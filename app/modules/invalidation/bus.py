@@ -0,0 +1,323 @@
+"""Шина инвалидации кэшей между воркерами.
+
+Воркер, изменивший данные, вызывает `invalidate(*keys)`: локальные кэши
+очищаются сразу, а ключи копятся и уходят другим воркерам одним сообщением
+раз в `max_delay` секунд или при наборе `max_batch` ключей. Если транспорт
+ограничивает размер сообщения (`max_payload_bytes`), пачка дополнительно
+делится так, чтобы каждое сообщение в него помещалось.
+
+Каждое сообщение несёт идентификатор отправителя и его порядковый номер.
+Получатель помнит последний номер каждого отправителя; пропуск номера (сообщение
+потеряно или не отправилось) или переподключение транспорта означают, что
+часть инвалидаций могла не дойти, и кэши очищаются целиком. Номер
+увеличивается и для неотправленного сообщения — так сбой отправки
+обнаружат получатели.
+"""
+
+import asyncio
+import json
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from logging import Logger
+from typing import Hashable, Iterable, Protocol
+
+from app.modules.logging.app_logger import get_app_logger
+
+
+
+class InvalidationTarget(Protocol):
+    """
+    ## Получатель инвалидаций (например, `VersionedCache`).
+    """
+    def invalidate(self, keys: Iterable[Hashable]) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+@dataclass(frozen=True)
+class InvalidationMessage:
+    """
+    ## Сообщение шины: пачка ключей от одного отправителя.
+
+    ### Attributes:
+        source (str): Идентификатор процесса-отправителя.
+        seq (int): Порядковый номер сообщения у отправителя (с 1).
+        keys (tuple[str, ...]): Инвалидируемые ключи.
+    """
+    source: str
+    seq: int
+    keys: tuple[str, ...]
+
+    def to_json(self) -> str:
+        """
+        ## Сериализует сообщение.
+
+        ### Returns:
+            str: JSON `{"src": ..., "seq": ..., "keys": [...]}`.
+        """
+        return json.dumps({"src": self.source, "seq": self.seq, "keys": list(self.keys)})
+
+    @classmethod
+    def from_json(cls, payload: str) -> "InvalidationMessage":
+        """
+        ## Разбирает сообщение.
+
+        ### Args:
+            payload (str): JSON из `to_json`.
+
+        ### Raises:
+            ValueError: Нагрузка не похожа на сообщение шины.
+
+        ### Returns:
+            InvalidationMessage: Сообщение.
+        """
+        data = json.loads(payload)
+        if not isinstance(data, dict) or not {"src", "seq", "keys"} <= data.keys():
+            raise ValueError(f"Неожиданное сообщение инвалидации: {payload[:200]}")
+        return cls(str(data["src"]), int(data["seq"]), tuple(map(str, data["keys"])))
+
+
+class InvalidationBus(ABC):
+    """
+    ## Базовая шина инвалидации с пакетной отправкой.
+
+    Наследники реализуют транспорт: `_send`, а также `start`/`stop`, если
+    ему нужно соединение. Полученные сообщения передаются в `_receive`,
+    потеря связи — в `_reset`.
+
+    ### Attributes:
+        source (str): Идентификатор этого процесса.
+        max_batch (int): Ключей в сообщении, после которых оно уходит сразу.
+        max_delay (float): Максимальная задержка отправки, секунды.
+        max_payload_bytes (int | None): Предел размера сообщения транспорта в байтах.
+        sent (int): Отправленные сообщения.
+        send_errors (int): Сообщения, которые не удалось отправить.
+        received (int): Полученные сообщения от других процессов.
+        gaps (int): Обнаруженные пропуски сообщений.
+        resets (int): Полные очистки кэшей (пропуски и переподключения).
+    """
+    def __init__(
+        self,
+        max_batch: int = 100,
+        max_delay: float = 0.02,
+        max_payload_bytes: int | None = None,
+        logger: Logger | None = None,
+    ) -> None:
+        """
+        ## Инициализирует шину без подписчиков.
+
+        ### Args:
+            max_batch (int): Ключей в сообщении, после которых оно уходит сразу.
+            max_delay (float): Максимальная задержка отправки, секунды.
+            max_payload_bytes (int | None): Предел размера сообщения в байтах (`None` — без предела).
+            logger (Logger | None): Логгер; по умолчанию `invalidation`.
+        """
+        self.source = uuid.uuid4().hex
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay
+        self.max_payload_bytes = max_payload_bytes
+        self.logger = logger or get_app_logger("invalidation")
+        self.sent = 0
+        self.send_errors = 0
+        self.received = 0
+        self.gaps = 0
+        self.resets = 0
+        self._seq = 0
+        self._last_seq: dict[str, int] = {}
+        self._targets: list[InvalidationTarget] = []
+        self._pending: dict[str, None] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._send_lock = asyncio.Lock()
+
+    def subscribe(self, target: InvalidationTarget) -> None:
+        """
+        ## Подключает локальный кэш к шине.
+
+        ### Args:
+            target (InvalidationTarget): Кэш воркера.
+        """
+        self._targets.append(target)
+
+    def invalidate(self, *keys: str) -> None:
+        """
+        ## Инвалидирует ключи локально и ставит их в очередь на отправку.
+
+        Вызывается после фиксации транзакции: до неё другие воркеры могли бы
+        снова прочитать из БД старые данные.
+
+        ### Args:
+            *keys (str): Ключи.
+        """
+        if not keys:
+            return
+        for target in self._targets:
+            target.invalidate(keys)
+        self._pending.update(dict.fromkeys(keys))
+        if len(self._pending) >= self.max_batch:
+            self._schedule_flush(0)
+        elif self._flush_task is None:
+            self._schedule_flush(self.max_delay)
+
+    def _schedule_flush(self, delay: float) -> None:
+        """
+        ## Запускает отправку накопленных ключей через `delay` секунд.
+        """
+        if self._flush_task is not None:
+            if delay > 0:
+                return
+            self._flush_task.cancel()
+        self._flush_task = asyncio.create_task(self._flush_after(delay), name="invalidation-flush")
+
+    async def _flush_after(self, delay: float) -> None:
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """
+        ## Отправляет накопленные ключи пачками по `max_batch` и `max_payload_bytes`.
+        """
+        async with self._send_lock:
+            while self._pending:
+                keys = self._next_batch()
+                for key in keys:
+                    del self._pending[key]
+                self._seq += 1
+                message = InvalidationMessage(self.source, self._seq, tuple(keys))
+                try:
+                    await self._send(message)
+                    self.sent += 1
+                except Exception as exc:
+                    # Номер уже занят: получатели увидят пропуск и очистят кэши
+                    self.send_errors += 1
+                    self.logger.error(f"Не удалось отправить инвалидацию {len(keys)} ключей: {exc!r}")
+
+    def _next_batch(self) -> list[str]:
+        """
+        ## Выбирает первые ключи очереди, помещающиеся в одно сообщение.
+
+        Размер считается по JSON сообщения с запасом на разделители.
+        Ключ, который не помещается даже один, уходит отдельным сообщением:
+        транспорт его отвергнет, и получатели увидят пропуск номера.
+
+        ### Returns:
+            list[str]: Ключи следующего сообщения (хотя бы один).
+        """
+        if self.max_payload_bytes is None:
+            return list(self._pending)[:self.max_batch]
+        size = len(InvalidationMessage(self.source, self._seq + 1, ()).to_json().encode("utf-8"))
+        keys: list[str] = []
+        for key in self._pending:
+            key_size = len(json.dumps(key).encode("utf-8")) + 2
+            if keys and (len(keys) >= self.max_batch or size + key_size > self.max_payload_bytes):
+                break
+            keys.append(key)
+            size += key_size
+        return keys
+
+    def _receive(self, message: InvalidationMessage) -> None:
+        """
+        ## Применяет сообщение другого процесса к локальным кэшам.
+
+        ### Args:
+            message (InvalidationMessage): Полученное сообщение.
+        """
+        if message.source == self.source:
+            return
+        self.received += 1
+        last = self._last_seq.get(message.source)
+        self._last_seq[message.source] = message.seq
+        if last is not None and message.seq != last + 1:
+            self.gaps += 1
+            self.logger.warning(
+                f"Пропуск инвалидаций от {message.source}: {last} -> {message.seq}, кэши очищены"
+            )
+            self._reset()
+            return
+        for target in self._targets:
+            target.invalidate(message.keys)
+
+    def _reset(self) -> None:
+        """
+        ## Очищает локальные кэши целиком: часть инвалидаций могла потеряться.
+        """
+        self.resets += 1
+        for target in self._targets:
+            target.clear()
+
+    async def start(self) -> None:
+        """
+        ## Подключает транспорт (по умолчанию ничего не делает).
+        """
+
+    async def stop(self) -> None:
+        """
+        ## Отправляет накопленные ключи и отключает транспорт.
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
+
+    @abstractmethod
+    async def _send(self, message: InvalidationMessage) -> None:
+        """
+        ## Доставляет сообщение другим процессам.
+
+        ### Args:
+            message (InvalidationMessage): Сообщение.
+        """
+
+    def stats(self) -> dict[str, int]:
+        """
+        ## Возвращает счётчики шины.
+
+        ### Returns:
+            dict[str, int]: `pending`, `sent`, `send_errors`, `received`, `gaps`, `resets`.
+        """
+        return {
+            "pending": len(self._pending),
+            "sent": self.sent,
+            "send_errors": self.send_errors,
+            "received": self.received,
+            "gaps": self.gaps,
+            "resets": self.resets,
+        }
+
+
+class InMemoryInvalidationBus(InvalidationBus):
+    """
+    ## Шина внутри одного процесса: для тестов и запуска с одним воркером.
+
+    Шины с общим `peers` имитируют несколько воркеров.
+
+    ### Inherits:
+        InvalidationBus: Базовая шина инвалидации.
+    """
+    def __init__(self, peers: list["InMemoryInvalidationBus"] | None = None, **kwargs) -> None:
+        """
+        ## Инициализирует шину и регистрирует её среди `peers`.
+
+        ### Args:
+            peers (list[InMemoryInvalidationBus] | None): Общий список «воркеров».
+            **kwargs: Аргументы `InvalidationBus`.
+        """
+        super().__init__(**kwargs)
+        self.peers = peers if peers is not None else []
+        self.peers.append(self)
+
+    async def _send(self, message: InvalidationMessage) -> None:
+        for peer in self.peers:
+            peer._receive(message)
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "InMemoryInvalidationBus",
+    "InvalidationBus",
+    "InvalidationMessage",
+    "InvalidationTarget",
+]
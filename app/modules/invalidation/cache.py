@@ -0,0 +1,166 @@
+"""Локальный кэш воркера с версиями ключей.
+
+Запись в кэш сопровождается токеном — значением логических часов кэша,
+взятым *до* чтения из БД. Инвалидация двигает часы и запоминает, на каком
+тике ключ стал недействителен. Значение, прочитанное до инвалидации,
+а записанное после неё, отбрасывается: гонка «чтение — инвалидация — запись
+в кэш» не оставляет в кэше старые данные.
+
+Список инвалидированных ключей ограничен; при вытеснении из него кэш поднимает
+«пол» токенов и отбрасывает все записи, начатые раньше. Поэтому память
+ограничена, а ошибка возможна только в сторону лишнего похода в БД.
+
+TTL — последняя страховка: даже если сообщение об инвалидации потеряно
+так, что шина этого не заметила, запись живёт не дольше `ttl` секунд.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+
+
+
+class VersionedCache:
+    """
+    ## Ограниченный LRU-кэш с TTL и версиями ключей.
+
+    ### Attributes:
+        max_entries (int): Максимум записей (и запомненных инвалидаций).
+        ttl (float): Время жизни записи, секунды.
+        hits (int): Попадания.
+        misses (int): Промахи.
+        stale_writes (int): Записи, отброшенные из-за инвалидации во время чтения.
+        invalidations (int): Инвалидированные ключи.
+        clears (int): Полные очистки кэша.
+    """
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        ## Инициализирует пустой кэш.
+
+        ### Args:
+            max_entries (int): Максимум записей.
+            ttl (float): Время жизни записи, секунды.
+            clock (Callable[[], float]): Источник времени (подменяется в тестах).
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._invalidated: OrderedDict[Hashable, int] = OrderedDict()
+        self._tick = 0
+        self._floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_writes = 0
+        self.invalidations = 0
+        self.clears = 0
+
+    def token(self) -> int:
+        """
+        ## Токен версии для последующей записи (берётся до чтения из БД).
+
+        ### Returns:
+            int: Текущее значение логических часов.
+        """
+        return self._tick
+
+    def lookup(self, key: Hashable) -> tuple[bool, Any]:
+        """
+        ## Ищет значение по ключу.
+
+        Кэшируется и `None` (например, «пользователь не найден»), поэтому
+        попадание возвращается отдельным флагом.
+
+        ### Args:
+            key (Hashable): Ключ.
+
+        ### Returns:
+            tuple[bool, Any]: `(True, значение)` при попадании, иначе `(False, None)`.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= self._clock():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+    def set(self, key: Hashable, value: Any, token: int) -> bool:
+        """
+        ## Сохраняет значение, если ключ не инвалидирован после получения `token`.
+
+        ### Args:
+            key (Hashable): Ключ.
+            value (Any): Значение.
+            token (int): Токен из `token()`, взятый до чтения значения.
+
+        ### Returns:
+            bool: `False`, если значение устарело и не сохранено.
+        """
+        if token < self._floor or self._invalidated.get(key, -1) > token:
+            self.stale_writes += 1
+            return False
+        self._entries[key] = (value, self._clock() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        """
+        ## Удаляет ключи и запрещает запись значений, прочитанных до этого момента.
+
+        ### Args:
+            keys (Iterable[Hashable]): Ключи.
+        """
+        self._tick += 1
+        for key in keys:
+            self._entries.pop(key, None)
+            self._invalidated[key] = self._tick
+            self._invalidated.move_to_end(key)
+            self.invalidations += 1
+        while len(self._invalidated) > self.max_entries:
+            _, tick = self._invalidated.popitem(last=False)
+            self._floor = max(self._floor, tick)
+
+    def clear(self) -> None:
+        """
+        ## Очищает кэш целиком (пропущены сообщения об инвалидации).
+        """
+        self._tick += 1
+        self._floor = self._tick
+        self._entries.clear()
+        self._invalidated.clear()
+        self.clears += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        """
+        ## Возвращает счётчики кэша.
+
+        ### Returns:
+            dict[str, int]: `entries`, `hits`, `misses`, `stale_writes`, `invalidations`, `clears`.
+        """
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_writes": self.stale_writes,
+            "invalidations": self.invalidations,
+            "clears": self.clears,
+        }
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "VersionedCache",
+]
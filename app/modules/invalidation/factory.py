@@ -0,0 +1,58 @@
+"""Общая шина инвалидации воркера, создаваемая по настройкам."""
+
+from app.config.config_reader import env_config
+
+from .bus import InMemoryInvalidationBus, InvalidationBus
+
+
+
+INVALIDATION_CHANNEL = "cache_invalidation"
+"""
+    ## INVALIDATION_CHANNEL
+
+    Канал `NOTIFY` шины инвалидации.
+"""
+
+
+
+_bus: InvalidationBus | None = None
+
+
+def get_invalidation_bus() -> InvalidationBus:
+    """
+    ## Возвращает шину воркера, создавая её при первом вызове.
+
+    `CACHE_INVALIDATION_BACKEND=postgres` — рассылка через `LISTEN/NOTIFY`
+    всем воркерам и подам; `memory` — только внутри процесса (один воркер, тесты).
+
+    ### Returns:
+        InvalidationBus: Общая шина воркера.
+    """
+    global _bus
+    if _bus is None:
+        options = {
+            "max_batch": env_config.cache_invalidation_max_batch,
+            "max_delay": env_config.cache_invalidation_max_delay_ms / 1000,
+        }
+        if env_config.cache_invalidation_backend == "postgres":
+            # Драйвер и пул нужны только этой реализации
+            from app.database.connection import db_connection
+            from app.modules.change_feed.listener import asyncpg_dsn
+            from .postgres import PgInvalidationBus
+
+            _bus = PgInvalidationBus(
+                asyncpg_dsn(env_config.DATABASE_URL_asyncpg),
+                INVALIDATION_CHANNEL,
+                db_connection,
+                **options,
+            )
+        else:
+            _bus = InMemoryInvalidationBus(**options)
+    return _bus
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "INVALIDATION_CHANNEL",
+    "get_invalidation_bus",
+]
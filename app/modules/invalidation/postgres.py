@@ -0,0 +1,91 @@
+"""Шина инвалидации поверх Postgres `LISTEN/NOTIFY`.
+
+Сообщения отправляются `SELECT pg_notify(...)` через пул приложения,
+а принимаются отдельным соединением `LISTEN` (`PgListener`). Postgres
+доставляет уведомления всем слушателям канала — воркерам и подам сразу.
+После переподключения слушателя кэши очищаются: уведомления, отправленные,
+пока соединения не было, потеряны.
+"""
+
+from sqlalchemy import text
+
+from app.database.connection import DbConnection
+from app.modules.change_feed.listener import PgListener
+
+from .bus import InvalidationBus, InvalidationMessage
+
+
+
+NOTIFY_PAYLOAD_LIMIT = 7999
+"""
+    ## NOTIFY_PAYLOAD_LIMIT
+
+    Максимальный размер нагрузки `NOTIFY` в байтах (по умолчанию в Postgres).
+"""
+
+
+
+class PgInvalidationBus(InvalidationBus):
+    """
+    ## Шина инвалидации через канал `NOTIFY`.
+
+    ### Inherits:
+        InvalidationBus: Базовая шина инвалидации.
+
+    ### Attributes:
+        channel (str): Имя канала.
+        listener (PgListener): Слушатель канала.
+    """
+    def __init__(self, dsn: str, channel: str, db: DbConnection, **kwargs) -> None:
+        """
+        ## Инициализирует шину (соединение открывается в `start`).
+
+        ### Args:
+            dsn (str): DSN для соединения `LISTEN` (см. `asyncpg_dsn`).
+            channel (str): Имя канала.
+            db (DbConnection): Подключение приложения для отправки `NOTIFY`.
+            **kwargs: Аргументы `InvalidationBus`.
+        """
+        super().__init__(**{"max_payload_bytes": NOTIFY_PAYLOAD_LIMIT, **kwargs})
+        self.channel = channel
+        self.db = db
+        self.listener = PgListener(
+            dsn,
+            channel,
+            on_notify=self._on_notify,
+            on_reconnect=self._reset,
+            logger=self.logger,
+        )
+
+    def _on_notify(self, payload: str) -> None:
+        self._receive(InvalidationMessage.from_json(payload))
+
+    async def start(self) -> None:
+        """
+        ## Запускает слушатель канала.
+        """
+        self.listener.start()
+
+    async def stop(self) -> None:
+        """
+        ## Отправляет накопленные ключи и останавливает слушатель.
+        """
+        await super().stop()
+        await self.listener.stop()
+
+    async def _send(self, message: InvalidationMessage) -> None:
+        payload = message.to_json()
+        if len(payload.encode("utf-8")) > NOTIFY_PAYLOAD_LIMIT:
+            raise ValueError(f"Ключ инвалидации не помещается в NOTIFY: сообщение {len(payload)} байт")
+        async with self.db.engine.begin() as connection:
+            await connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": payload},
+            )
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "NOTIFY_PAYLOAD_LIMIT",
+    "PgInvalidationBus",
+]
@@ -0,0 +1,49 @@
+"""Отложенная до фиксации транзакции инвалидация.
+
+Если разослать инвалидацию до `COMMIT`, другой воркер может успеть перечитать
+из БД ещё старые данные и положить их в кэш. Поэтому DAO только помечают
+ключи в сессии, а шина получает их из события `after_commit`; при откате
+пометки отбрасываются.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .bus import InvalidationBus
+
+
+
+_PENDING_KEY = "pending_invalidations"
+
+
+
+def invalidate_after_commit(session: AsyncSession | Session, bus: InvalidationBus, *keys: str) -> None:
+    """
+    ## Запоминает ключи и отдаёт их шине после фиксации транзакции сессии.
+
+    ### Args:
+        session (AsyncSession | Session): Сессия, в транзакции которой изменены данные.
+        bus (InvalidationBus): Шина инвалидации.
+        *keys (str): Ключи.
+    """
+    sync_session = session.sync_session if isinstance(session, AsyncSession) else session
+    pending: dict[InvalidationBus, dict[str, None]] = sync_session.info.setdefault(_PENDING_KEY, {})
+    pending.setdefault(bus, {}).update(dict.fromkeys(keys))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for bus, keys in session.info.pop(_PENDING_KEY, {}).items():
+        bus.invalidate(*keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "invalidate_after_commit",
+]
@@ -1,5 +1,6 @@
 """Logging helpers with shared formatting."""
 
 from .app_logger import AppLogger, get_app_logger
+from .shipping import LogShipper, get_log_shipper
 
-__all__ = ["AppLogger", "get_app_logger"]
+__all__ = ["AppLogger", "LogShipper", "get_app_logger", "get_log_shipper"]
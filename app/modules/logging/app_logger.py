@@ -1,11 +1,37 @@
+import threading
 from logging import (
-    FileHandler, Formatter, Logger, LogRecord,
+    FileHandler, Formatter, Handler, Logger, LogRecord,
     DEBUG, FATAL, ERROR, WARN, INFO, StreamHandler
 )
 from pathlib import Path
 from datetime import datetime
 from typing import Literal
 
+from app.config.config_reader import env_config
+
+
+
+LOG_FORMAT = "[%(asctime)s] [%(filename)s] [%(threadName)s] [%(levelname)s] - %(message)s"
+"""
+    ## LOG_FORMAT
+
+    Формат сообщения: `[Время] [Файл] [Поток] [Уровень] - Сообщение`.
+"""
+
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+"""
+    ## LOG_DATE_FORMAT
+
+    Формат времени в сообщении.
+"""
+
+LOG_ROOT = Path("logs")
+"""
+    ## LOG_ROOT
+
+    Корневой каталог логов; логгер `name` пишет в `LOG_ROOT/name/`.
+"""
+
 
 
 class DailyRotatingFileHandler(FileHandler):
@@ -17,7 +43,13 @@ class DailyRotatingFileHandler(FileHandler):
     буфер после записи.
     """
 
-    def __init__(self, log_dir: Path, encoding: str = "utf-8", mode: str = "a"):
+    def __init__(
+        self,
+        log_dir: Path,
+        encoding: str = "utf-8",
+        mode: str = "a",
+        flush_each_record: bool = True,
+    ):
         """
         ## Создаёт обработчик с динамической ротацией по дням.
 
@@ -25,16 +57,20 @@ class DailyRotatingFileHandler(FileHandler):
             log_dir (Path): Директория для сохранения логов.
             encoding (str): Кодировка файла. По умолчанию "utf-8".
             mode (str): Режим открытия файла. По умолчанию "a" (добавление).
+            flush_each_record (bool): Сбрасывать буфер после каждой записи.
+                Процесс-писатель (`app.modules.logging.writer`) отключает это
+                и сбрасывает буфер пачками.
         """
         self.log_dir = log_dir
         self.encoding = encoding
         self.mode = mode
+        self.flush_each_record = flush_each_record
         self._current_date = None
         self._current_file = None
         
-        # Инициализируем родительский класс с временным файлом
-        # (он будет заменен при первой записи)
-        super().__init__(self._get_current_log_file(), mode, encoding)
+        # Инициализируем родительский класс с отложенным открытием (delay=True):
+        # каталог и файл создаются при первой записи, а не при импорте модуля
+        super().__init__(self._get_current_log_file(), mode, encoding, delay=True)
     
     def _get_current_log_file(self) -> Path:
         """
@@ -66,14 +102,15 @@ class DailyRotatingFileHandler(FileHandler):
                 self._current_file = current_log_file
                 self.baseFilename = str(current_log_file)
                 
-                # Открываем новый файл
+                # Открываем новый файл (каталог создаётся при первой записи)
+                self.log_dir.mkdir(parents=True, exist_ok=True)
                 self.stream = self._open()
             
             # Записываем лог
             super().emit(record)
             
             # Немедленно сбрасываем буфер
-            if self.stream:
+            if self.stream and self.flush_each_record:
                 self.flush()
         except Exception:
             self.handleError(record)
@@ -108,15 +145,48 @@ class AppLogger(Logger):
 
 
 
+_loggers: dict[str, AppLogger] = {}
+_registry_lock = threading.Lock()
+
+
+def _make_output_handler(logger_name: str) -> Handler:
+    """
+    ## Создаёт основной обработчик логгера по режиму `LOG_MODE`.
+
+    - `file` — свой файл с ротацией по дням в каждом процессе;
+    - `socket` — записи отправляются процессу-писателю через unix-сокет
+      (общий обработчик на все логгеры процесса, см. `shipping`).
+
+    Args:
+        logger_name (str): Имя логгера.
+
+    Returns:
+        Handler: Обработчик логгера.
+    """
+    if env_config.log_mode == "socket":
+        from .shipping import get_log_shipper
+
+        return get_log_shipper().handler
+
+    file_handler = DailyRotatingFileHandler(LOG_ROOT / logger_name, encoding='utf-8')
+    file_handler.setFormatter(Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+    return file_handler
+
+
 def get_app_logger(
     logger_name: str,
     level: Literal["DEBUG", "FATAL", "ERROR", "WARN", "INFO"] = "INFO",
     to_console: bool = False
 ) -> AppLogger:
     """
-    ## Создаёт и настраивает логгер приложения c файловой ротацией.
+    ## Возвращает логгер приложения c файловой ротацией.
 
-    Логи пишутся в каталог `logs/<logger_name>/`. Формат имени файла:
+    Логгеры хранятся в реестре по имени: повторный вызов с тем же именем
+    возвращает тот же экземпляр с теми же обработчиками, а не открывает
+    ещё один файл.
+
+    Логи пишутся в каталог `logs/<logger_name>/`, который создаётся вместе
+    с файлом при первой записи. Формат имени файла:
     `DD_MM_YY_logs.log`. Формат сообщения:
     `[Время] [Файл] [Поток] [Уровень] - Сообщение`.
 
@@ -136,38 +206,22 @@ def get_app_logger(
         "INFO": INFO,
     }
     current_level: int = levels_map.get(level, INFO)
-    
-    # Создаем директорию logs если не существует
-    log_dir = Path("logs")
-    current_dir = log_dir / logger_name
-    log_dir.mkdir(exist_ok=True)
-    current_dir.mkdir(exist_ok=True)
-    
-    # Получаем логгер
-    logger = AppLogger(logger_name)
-    logger.setLevel(current_level)
-    
-    # Проверяем наличие обработчиков чтобы избежать дублирования
-    if not logger.handlers:
-        # Создаем обработчик файла с автоматической ротацией по дням
-        file_handler = DailyRotatingFileHandler(current_dir, encoding='utf-8')
-        file_handler.setLevel(current_level)
-        
-        # Настраиваем формат сообщения
-        log_format = (
-            "[%(asctime)s] [%(filename)s] [%(threadName)s] [%(levelname)s] - %(message)s"
-        )
-        formatter = Formatter(log_format, datefmt='%Y-%m-%d %H:%M:%S')
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-        
-        # Опционально добавляем StreamHandler для вывода в консоль
-        if to_console:
+
+    with _registry_lock:
+        logger = _loggers.get(logger_name)
+        if logger is None:
+            logger = AppLogger(logger_name)
+            logger.addHandler(_make_output_handler(logger_name))
+            _loggers[logger_name] = logger
+        logger.setLevel(current_level)
+
+        # Опционально добавляем StreamHandler для вывода в консоль (один на логгер)
+        has_console = any(type(handler) is StreamHandler for handler in logger.handlers)
+        if to_console and not has_console:
             stream_handler = StreamHandler()
-            stream_handler.setLevel(current_level)
-            stream_handler.setFormatter(formatter)
+            stream_handler.setFormatter(Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
             logger.addHandler(stream_handler)
-    
+
     return logger
 
 
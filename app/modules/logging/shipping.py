@@ -0,0 +1,178 @@
+"""Отправка записей логов процессу-писателю через unix-сокет.
+
+В режиме `LOG_MODE=socket` воркеры не открывают файлы логов сами: записи
+кладутся в ограниченную очередь, а фоновый поток отправляет их процессу-писателю
+(`app.modules.logging.writer`) кадрами «4 байта длины + JSON». Каждая запись
+уходит одним `sendall` по своему соединению, поэтому строки разных воркеров
+не перемешиваются, а количество открытых файлов не растёт с числом воркеров.
+
+Event loop не ждёт сокет: при переполнении очереди запись отбрасывается
+и учитывается в `LogShipper.dropped`.
+"""
+
+import atexit
+import json
+import os
+import queue
+import struct
+import threading
+from logging import LogRecord
+from logging.handlers import QueueHandler, QueueListener, SocketHandler
+
+from app.config.config_reader import env_config
+
+
+
+FRAME_HEADER = struct.Struct(">L")
+"""
+    ## FRAME_HEADER
+
+    Заголовок кадра: длина JSON-записи (как у `logging.handlers.SocketHandler`).
+"""
+
+
+
+class JsonSocketHandler(SocketHandler):
+    """
+    ## `SocketHandler` для unix-сокета, сериализующий записи в JSON вместо pickle.
+
+    Писатель принимает только JSON, поэтому чужой процесс, имеющий доступ
+    к сокету, не сможет выполнить код через распаковку pickle.
+    """
+    def __init__(self, socket_path: str) -> None:
+        """
+        ## Инициализирует обработчик.
+
+        ### Args:
+            socket_path (str): Путь к unix-сокету писателя.
+        """
+        # port=None — SocketHandler подключается к unix-сокету по пути host
+        super().__init__(socket_path, None)
+
+    def makePickle(self, record: LogRecord) -> bytes:
+        """
+        ## Упаковывает запись в кадр «длина + JSON».
+
+        ### Args:
+            record (LogRecord): Запись лога.
+
+        ### Returns:
+            bytes: Кадр для отправки.
+        """
+        data = dict(record.__dict__)
+        data["msg"] = record.getMessage()
+        data["args"] = None
+        data["exc_info"] = None
+        data.pop("message", None)
+        payload = json.dumps(data, default=str, ensure_ascii=False).encode("utf-8")
+        return FRAME_HEADER.pack(len(payload)) + payload
+
+
+class _ShippingQueueHandler(QueueHandler):
+    """
+    ## `QueueHandler`, перезапускающий отправку после `fork` и не блокирующий вызывающего.
+    """
+    def __init__(self, shipper: "LogShipper") -> None:
+        """
+        ## Инициализирует обработчик.
+
+        ### Args:
+            shipper (LogShipper): Владелец очереди и фонового потока.
+        """
+        super().__init__(shipper.queue)
+        self.shipper = shipper
+
+    def emit(self, record: LogRecord) -> None:
+        self.shipper.ensure_started()
+        super().emit(record)
+
+    def enqueue(self, record: LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.shipper.dropped += 1
+
+
+class LogShipper:
+    """
+    ## Очередь записей и фоновый поток отправки в процесс-писатель.
+
+    Фоновый поток не переживает `fork`, поэтому при первой записи в новом
+    процессе (воркере gunicorn) очередь и поток создаются заново.
+
+    ### Attributes:
+        socket_path (str): Путь к unix-сокету писателя.
+        max_queue (int): Максимум записей в очереди.
+        dropped (int): Записи, отброшенные из-за переполнения очереди.
+        handler (QueueHandler): Обработчик, который подключается к логгерам.
+    """
+    def __init__(self, socket_path: str, max_queue: int = 10000) -> None:
+        """
+        ## Инициализирует отправитель (поток запускается при первой записи).
+
+        ### Args:
+            socket_path (str): Путь к unix-сокету писателя.
+            max_queue (int): Максимум записей в очереди.
+        """
+        self.socket_path = socket_path
+        self.max_queue = max_queue
+        self.dropped = 0
+        self.queue: queue.Queue = queue.Queue(max_queue)
+        self.handler = _ShippingQueueHandler(self)
+        self._listener: QueueListener | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self) -> None:
+        """
+        ## Запускает поток отправки в текущем процессе, если он ещё не запущен.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Очередь родителя могла остаться с записями, которые уже некому отправить
+            self.queue = queue.Queue(self.max_queue)
+            self.handler.queue = self.queue
+            self._listener = QueueListener(self.queue, JsonSocketHandler(self.socket_path))
+            self._listener.start()
+            self._pid = os.getpid()
+
+    def stop(self) -> None:
+        """
+        ## Отправляет оставшиеся записи и останавливает поток.
+        """
+        with self._lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+                for handler in self._listener.handlers:
+                    handler.close()
+            self._listener = None
+            self._pid = None
+
+
+_shipper: LogShipper | None = None
+
+
+def get_log_shipper() -> LogShipper:
+    """
+    ## Возвращает отправитель процесса, создавая его при первом вызове.
+
+    ### Returns:
+        LogShipper: Общий отправитель логов.
+    """
+    global _shipper
+    if _shipper is None:
+        _shipper = LogShipper(env_config.log_socket_path, max_queue=env_config.log_queue_size)
+        atexit.register(_shipper.stop)
+    return _shipper
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "FRAME_HEADER",
+    "JsonSocketHandler",
+    "LogShipper",
+    "get_log_shipper",
+]
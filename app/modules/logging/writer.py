@@ -0,0 +1,338 @@
+"""Процесс-писатель логов для режима `LOG_MODE=socket`.
+
+Один процесс принимает записи от всех воркеров по unix-сокету и пишет их
+в `logs/<logger_name>/DD_MM_YY_logs.log` тем же форматом и с той же ротацией
+по дням, что и `DailyRotatingFileHandler` в режиме `file`. Файл каждого логгера
+открыт один раз, буфер сбрасывается пачкой раз в `flush_interval` секунд или
+после `max_buffered` записей, а не после каждой строки.
+
+Запускается лаунчером сервера (`app.server`) до старта воркеров либо вручную:
+    python -m app.modules.logging.writer --socket /tmp/fastapi_app_log.sock
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import selectors
+import signal
+import socket
+import time
+from logging import Formatter, makeLogRecord
+from pathlib import Path
+
+from .app_logger import LOG_DATE_FORMAT, LOG_FORMAT, LOG_ROOT, DailyRotatingFileHandler
+from .shipping import FRAME_HEADER
+
+
+
+_UNSAFE_NAME = re.compile(r"[^\w.\-]")
+
+
+
+class LogWriter:
+    """
+    ## Сервер, записывающий логи всех воркеров в файлы.
+
+    ### Attributes:
+        socket_path (str): Путь к unix-сокету.
+        log_root (Path): Корневой каталог логов.
+        flush_interval (float): Период сброса буферов, секунды.
+        max_buffered (int): Сколько записей можно накопить до принудительного сброса.
+        records (int): Количество записанных записей.
+        flushes (int): Количество сбросов буферов.
+    """
+    def __init__(
+        self,
+        socket_path: str,
+        log_root: Path = LOG_ROOT,
+        flush_interval: float = 0.5,
+        max_buffered: int = 1000,
+    ) -> None:
+        """
+        ## Инициализирует писатель.
+
+        ### Args:
+            socket_path (str): Путь к unix-сокету.
+            log_root (Path): Корневой каталог логов.
+            flush_interval (float): Период сброса буферов, секунды.
+            max_buffered (int): Порог записей для принудительного сброса.
+        """
+        self.socket_path = socket_path
+        self.log_root = Path(log_root)
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.records = 0
+        self.flushes = 0
+        self._formatter = Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+        self._handlers: dict[str, DailyRotatingFileHandler] = {}
+        self._buffers: dict[socket.socket, bytearray] = {}
+        self._pending = 0
+        self._running = False
+        self._selector = selectors.DefaultSelector()
+        self._server: socket.socket | None = None
+
+    def bind(self) -> None:
+        """
+        ## Создаёт unix-сокет (доступный только владельцу) и начинает слушать.
+        """
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        Path(self.socket_path).parent.mkdir(parents=True, exist_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            server.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        server.listen(128)
+        server.setblocking(False)
+        self._selector.register(server, selectors.EVENT_READ)
+        self._server = server
+
+    def serve_forever(self) -> None:
+        """
+        ## Принимает записи до вызова `stop`, затем сбрасывает буферы и закрывает файлы.
+        """
+        if self._server is None:
+            self.bind()
+        self._running = True
+        next_flush = time.monotonic() + self.flush_interval
+        try:
+            while self._running:
+                timeout = max(0.0, next_flush - time.monotonic())
+                for key, _ in self._selector.select(timeout):
+                    if key.fileobj is self._server:
+                        self._accept()
+                    else:
+                        self._read(key.fileobj)
+                if self._pending >= self.max_buffered or time.monotonic() >= next_flush:
+                    self.flush()
+                    next_flush = time.monotonic() + self.flush_interval
+        finally:
+            self.close()
+
+    def stop(self, *_: object) -> None:
+        """
+        ## Просит цикл обработки завершиться (подходит как обработчик сигнала).
+        """
+        self._running = False
+
+    def flush(self) -> None:
+        """
+        ## Сбрасывает буферы всех открытых файлов.
+        """
+        if not self._pending:
+            return
+        for handler in self._handlers.values():
+            handler.flush()
+        self._pending = 0
+        self.flushes += 1
+
+    def close(self) -> None:
+        """
+        ## Сбрасывает буферы, закрывает соединения, файлы и сокет.
+        """
+        self.flush()
+        for conn in list(self._buffers):
+            self._disconnect(conn)
+        for handler in self._handlers.values():
+            handler.close()
+        self._handlers.clear()
+        if self._server is not None:
+            self._selector.unregister(self._server)
+            self._server.close()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        self._selector.close()
+
+    def _accept(self) -> None:
+        """
+        ## Принимает новое соединение воркера.
+        """
+        conn, _ = self._server.accept()
+        conn.setblocking(False)
+        self._buffers[conn] = bytearray()
+        self._selector.register(conn, selectors.EVENT_READ)
+
+    def _read(self, conn: socket.socket) -> None:
+        """
+        ## Читает данные соединения и записывает все полные кадры.
+
+        ### Args:
+            conn (socket.socket): Соединение воркера.
+        """
+        try:
+            chunk = conn.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            chunk = b""
+        if not chunk:
+            self._disconnect(conn)
+            return
+
+        buffer = self._buffers[conn]
+        buffer += chunk
+        offset = 0
+        while len(buffer) - offset >= FRAME_HEADER.size:
+            (length,) = FRAME_HEADER.unpack_from(buffer, offset)
+            end = offset + FRAME_HEADER.size + length
+            if len(buffer) < end:
+                break
+            self._write(bytes(buffer[offset + FRAME_HEADER.size:end]))
+            offset = end
+        del buffer[:offset]
+
+    def _disconnect(self, conn: socket.socket) -> None:
+        """
+        ## Закрывает соединение воркера (незавершённый кадр отбрасывается).
+
+        ### Args:
+            conn (socket.socket): Соединение воркера.
+        """
+        self._selector.unregister(conn)
+        self._buffers.pop(conn, None)
+        conn.close()
+
+    def _write(self, payload: bytes) -> None:
+        """
+        ## Записывает одну запись в файл её логгера.
+
+        ### Args:
+            payload (bytes): JSON-запись от `JsonSocketHandler`.
+        """
+        try:
+            record = makeLogRecord(json.loads(payload))
+        except ValueError:
+            return
+        self._handler_for(str(record.name)).handle(record)
+        self.records += 1
+        self._pending += 1
+
+    def _handler_for(self, logger_name: str) -> DailyRotatingFileHandler:
+        """
+        ## Возвращает (создавая при первом обращении) файловый обработчик логгера.
+
+        ### Args:
+            logger_name (str): Имя логгера из записи.
+
+        ### Returns:
+            DailyRotatingFileHandler: Обработчик без сброса после каждой записи.
+        """
+        handler = self._handlers.get(logger_name)
+        if handler is None:
+            # Имя логгера становится каталогом — не даём выйти за log_root
+            safe_name = _UNSAFE_NAME.sub("_", logger_name).lstrip(".") or "_"
+            handler = DailyRotatingFileHandler(self.log_root / safe_name, flush_each_record=False)
+            handler.setFormatter(self._formatter)
+            self._handlers[logger_name] = handler
+        return handler
+
+
+def run_log_writer(
+    socket_path: str,
+    log_root: str = str(LOG_ROOT),
+    flush_interval: float = 0.5,
+) -> None:
+    """
+    ## Запускает писатель в текущем процессе до `SIGTERM`/`SIGINT`.
+
+    ### Args:
+        socket_path (str): Путь к unix-сокету.
+        log_root (str): Корневой каталог логов.
+        flush_interval (float): Период сброса буферов, секунды.
+    """
+    writer = LogWriter(socket_path, Path(log_root), flush_interval=flush_interval)
+    signal.signal(signal.SIGTERM, writer.stop)
+    signal.signal(signal.SIGINT, writer.stop)
+    writer.serve_forever()
+
+
+def start_log_writer(
+    socket_path: str,
+    log_root: str = str(LOG_ROOT),
+    flush_interval: float = 0.5,
+    timeout: float = 5.0,
+) -> multiprocessing.Process:
+    """
+    ## Запускает писатель отдельным процессом и ждёт появления сокета.
+
+    ### Args:
+        socket_path (str): Путь к unix-сокету.
+        log_root (str): Корневой каталог логов.
+        flush_interval (float): Период сброса буферов, секунды.
+        timeout (float): Сколько ждать готовности сокета, секунды.
+
+    ### Raises:
+        RuntimeError: Писатель не создал сокет за `timeout`.
+
+    ### Returns:
+        multiprocessing.Process: Процесс писателя.
+    """
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    process = multiprocessing.get_context("spawn").Process(
+        target=run_log_writer,
+        args=(socket_path, log_root, flush_interval),
+        name="log-writer",
+        daemon=True,
+    )
+    process.start()
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(socket_path):
+        if not process.is_alive() or time.monotonic() > deadline:
+            process.terminate()
+            raise RuntimeError(f"Писатель логов не запустился на {socket_path}")
+        time.sleep(0.01)
+    return process
+
+
+def stop_log_writer(process: multiprocessing.Process, timeout: float = 5.0) -> None:
+    """
+    ## Останавливает процесс писателя, дав ему сбросить буферы.
+
+    ### Args:
+        process (multiprocessing.Process): Процесс писателя.
+        timeout (float): Сколько ждать завершения, секунды.
+    """
+    if process.is_alive():
+        process.terminate()  # SIGTERM — писатель сбрасывает буферы и выходит
+        process.join(timeout)
+    if process.is_alive():
+        process.kill()
+
+
+def main() -> None:
+    """
+    ## Точка входа для ручного запуска писателя.
+    """
+    from app.config.config_reader import env_config
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", default=env_config.log_socket_path, help="Путь к unix-сокету (LOG_SOCKET_PATH)")
+    parser.add_argument("--log-root", default=str(LOG_ROOT), help="Корневой каталог логов")
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=env_config.log_flush_interval,
+        help="Период сброса буферов, секунды (LOG_FLUSH_INTERVAL)",
+    )
+    args = parser.parse_args()
+    run_log_writer(args.socket, args.log_root, args.flush_interval)
+
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "LogWriter",
+    "run_log_writer",
+    "start_log_writer",
+    "stop_log_writer",
+]
+
+
+if __name__ == "__main__":
+    main()
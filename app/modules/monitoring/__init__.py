@@ -0,0 +1,5 @@
+"""Мониторинг производительности приложения."""
+
+from .loop_lag import LagHistogram, LoopLagMonitor
+
+__all__ = ["LagHistogram", "LoopLagMonitor"]
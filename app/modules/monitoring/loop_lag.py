@@ -0,0 +1,205 @@
+"""Монитор задержки event loop и детектор блокирующих вызовов.
+
+Фоновая корутина раз в `interval` секунд засыпает и измеряет, насколько позже
+запланированного она проснулась, — это и есть лаг цикла событий. Пока цикл
+заблокирован синхронным кодом, сама корутина ничего увидеть не может, поэтому
+рядом работает сторожевой поток: если «сердцебиение» корутины задерживается
+дольше порога, он снимает стек потока event loop через `sys._current_frames()`
+и пишет его в лог. В простое это одно пробуждение корутины и потока за интервал.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from logging import Logger
+
+from app.modules.logging.app_logger import get_app_logger
+
+
+
+class LagHistogram:
+    """
+    ## Гистограмма лагов event loop с фиксированными корзинами (мс).
+
+    ### Attributes:
+        BUCKETS_MS (tuple[float, ...]): Верхние границы корзин, последняя — бесконечность.
+    """
+    BUCKETS_MS: tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+
+    def __init__(self) -> None:
+        """
+        ## Инициализирует пустую гистограмму.
+        """
+        self.counts = [0] * len(self.BUCKETS_MS)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, lag_ms: float) -> None:
+        """
+        ## Добавляет измерение.
+
+        ### Args:
+            lag_ms (float): Лаг в миллисекундах.
+        """
+        self.counts[bisect_left(self.BUCKETS_MS, lag_ms)] += 1
+        self.count += 1
+        self.sum_ms += lag_ms
+        if lag_ms > self.max_ms:
+            self.max_ms = lag_ms
+
+    def snapshot(self) -> dict:
+        """
+        ## Возвращает накопительную гистограмму и агрегаты.
+
+        ### Returns:
+            dict: `buckets` (`{"<=N": количество}` по возрастанию), `count`,
+            `mean_ms`, `max_ms`.
+        """
+        buckets: dict[str, int] = {}
+        total = 0
+        for bound, value in zip(self.BUCKETS_MS, self.counts):
+            total += value
+            buckets["+Inf" if bound == float("inf") else f"<={bound:g}"] = total
+        return {
+            "buckets": buckets,
+            "count": self.count,
+            "mean_ms": self.sum_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+        }
+
+
+class LoopLagMonitor:
+    """
+    ## Фоновый монитор лага event loop.
+
+    ### Attributes:
+        interval (float): Период измерения, секунды.
+        threshold (float): Порог лага, после которого блокировка считается проблемой, секунды.
+        histogram (LagHistogram): Накопленные измерения.
+        stalls (int): Количество зафиксированных блокировок выше порога.
+        last_stall_stack (str | None): Стек последней пойманной блокировки.
+    """
+    def __init__(
+        self,
+        interval: float = 0.25,
+        threshold: float = 0.1,
+        logger: Logger | None = None,
+    ) -> None:
+        """
+        ## Инициализирует монитор (без запуска).
+
+        ### Args:
+            interval (float): Период измерения, секунды.
+            threshold (float): Порог лага, секунды.
+            logger (Logger | None): Логгер; по умолчанию `loop_monitor`.
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.logger = logger or get_app_logger("loop_monitor")
+        self.histogram = LagHistogram()
+        self.stalls = 0
+        self.last_stall_stack: str | None = None
+
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._loop_thread_id: int | None = None
+        self._heartbeat = 0.0
+        self._stall_reported = False
+
+    @property
+    def running(self) -> bool:
+        """ ## Запущен ли монитор. """
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """
+        ## Запускает измерительную корутину и сторожевой поток.
+
+        Должен вызываться из работающего event loop.
+        """
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._measure(), name="loop-lag-monitor")
+        self._thread = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """
+        ## Останавливает монитор и дожидается завершения потока.
+        """
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+            self._thread = None
+
+    def snapshot(self) -> dict:
+        """
+        ## Возвращает состояние монитора для метрик.
+
+        ### Returns:
+            dict: Гистограмма, параметры и счётчик блокировок.
+        """
+        return {
+            **self.histogram.snapshot(),
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "stalls": self.stalls,
+        }
+
+    async def _measure(self) -> None:
+        """
+        ## Измеряет лаг: насколько позже запланированного просыпается корутина.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._heartbeat = time.monotonic()
+            self.histogram.observe(lag * 1000)
+            if lag >= self.threshold and not self._stall_reported:
+                # Сторожевой поток мог не успеть (короткая блокировка) — хотя бы фиксируем факт
+                self.stalls += 1
+                self.logger.warning(f"Event loop был заблокирован на {lag * 1000:.1f} мс")
+            self._stall_reported = False
+
+    def _watch(self) -> None:
+        """
+        ## Сторожевой поток: снимает стек event loop во время блокировки.
+        """
+        while not self._stop.wait(self.interval):
+            overdue = time.monotonic() - self._heartbeat - self.interval
+            if overdue < self.threshold or self._stall_reported:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            self._stall_reported = True
+            self.stalls += 1
+            self.last_stall_stack = stack
+            self.logger.warning(
+                f"Event loop заблокирован уже {overdue * 1000:.1f} мс, стек:\n{stack}"
+            )
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "LagHistogram",
+    "LoopLagMonitor",
+]
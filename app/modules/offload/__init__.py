@@ -0,0 +1,5 @@
+"""Вынос CPU-тяжёлой работы из event loop в пул исполнителей."""
+
+from .pool import WorkerPool, WorkerPoolOverloaded, get_worker_pool
+
+__all__ = ["WorkerPool", "WorkerPoolOverloaded", "get_worker_pool"]
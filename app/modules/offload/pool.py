@@ -0,0 +1,225 @@
+"""Пул исполнителей для CPU-тяжёлой работы с ограничением очереди.
+
+Валидация и сериализация больших пачек данных pydantic выполняется на
+event loop и блокирует остальные запросы воркера. `WorkerPool` переносит
+такую работу в пул потоков или процессов, но только начиная с порога размера:
+для маленьких пачек накладные расходы на передачу данных больше выигрыша.
+
+Режим `process` годится только для функций над «чистыми» данными
+(dict/list/bytes на входе и выходе), объявленных на уровне модуля.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Literal, TypeVar
+
+from app.config.config_reader import env_config
+
+
+
+T = TypeVar("T")
+
+ExecutorKind = Literal["thread", "process", "none"]
+
+
+
+class WorkerPoolOverloaded(Exception):
+    """
+    ## Очередь пула заполнена — новую задачу принять нельзя.
+    """
+
+
+class WorkerPool:
+    """
+    ## Пул исполнителей с порогом выноса и ограничением очереди.
+
+    ### Attributes:
+        kind (ExecutorKind): `thread`, `process` или `none` (всё выполняется inline).
+        max_workers (int): Количество потоков/процессов.
+        min_items (int): Порог количества элементов для выноса.
+        min_bytes (int): Порог размера входных данных в байтах для выноса.
+        max_queue (int): Сколько задач может ждать свободного исполнителя.
+    """
+    def __init__(
+        self,
+        kind: ExecutorKind = "thread",
+        max_workers: int = 2,
+        min_items: int = 1000,
+        min_bytes: int = 256 * 1024,
+        max_queue: int = 64,
+    ) -> None:
+        """
+        ## Инициализирует пул (исполнитель создаётся лениво).
+
+        ### Args:
+            kind (ExecutorKind): Тип исполнителя.
+            max_workers (int): Количество потоков/процессов.
+            min_items (int): Порог количества элементов.
+            min_bytes (int): Порог размера в байтах.
+            max_queue (int): Максимум ожидающих задач.
+        """
+        self.kind = kind
+        self.max_workers = max_workers
+        self.min_items = min_items
+        self.min_bytes = min_bytes
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._waiting = 0
+
+    def should_offload(self, items: int = 0, size_bytes: int = 0) -> bool:
+        """
+        ## Нужно ли выносить работу такого размера из event loop.
+
+        ### Args:
+            items (int): Количество элементов.
+            size_bytes (int): Размер входных данных в байтах.
+
+        ### Returns:
+            bool: `True`, если размер достиг любого из порогов.
+        """
+        if self.kind == "none":
+            return False
+        return items >= self.min_items or size_bytes >= self.min_bytes
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        ## Выполняет `fn(*args)` в пуле.
+
+        Одновременно в исполнителе не больше `max_workers` задач, ещё не больше
+        `max_queue` ждут своей очереди; остальные отклоняются сразу. Слот
+        освобождается, когда задача завершилась в исполнителе: отмена
+        ожидающей корутины не прерывает уже начатую работу.
+
+        ### Args:
+            fn (Callable[..., T]): Функция для выполнения.
+            *args (Any): Аргументы функции.
+
+        ### Raises:
+            WorkerPoolOverloaded: Очередь ожидания заполнена.
+
+        ### Returns:
+            T: Результат функции.
+        """
+        if self.kind == "none":
+            return fn(*args)
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            raise WorkerPoolOverloaded(
+                f"Очередь пула заполнена ({self._waiting} задач ожидает)"
+            )
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._get_executor().submit(partial(fn, *args))
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._release_slot(loop))
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _release_slot(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        ## Освобождает слот из потока исполнителя (колбэк завершения задачи).
+
+        ### Args:
+            loop (asyncio.AbstractEventLoop): Цикл, которому принадлежит семафор.
+        """
+        if self._slots is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._slots.release)
+        except RuntimeError:
+            # Цикл закрылся между проверкой и вызовом (остановка приложения)
+            pass
+
+    async def maybe_offload(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        items: int = 0,
+        size_bytes: int = 0,
+    ) -> T:
+        """
+        ## Выполняет `fn(*args)` в пуле, если размер выше порога, иначе — на месте.
+
+        ### Args:
+            fn (Callable[..., T]): Функция для выполнения.
+            *args (Any): Аргументы функции.
+            items (int): Количество элементов во входных данных.
+            size_bytes (int): Размер входных данных в байтах.
+
+        ### Returns:
+            T: Результат функции.
+        """
+        if self.should_offload(items, size_bytes):
+            return await self.run(fn, *args)
+        return fn(*args)
+
+    def shutdown(self) -> None:
+        """
+        ## Останавливает исполнитель, не дожидаясь очереди.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        """
+        ## Лениво создаёт исполнитель нужного типа.
+
+        Процессы запускаются через `spawn`: форк процесса с работающим event loop
+        и открытыми соединениями к БД небезопасен.
+        """
+        if self._executor is None:
+            if self.kind == "process":
+                # multiprocessing импортируется только для режима process
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="offload",
+                )
+        return self._executor
+
+
+_worker_pool: WorkerPool | None = None
+
+
+def get_worker_pool() -> WorkerPool:
+    """
+    ## Возвращает пул приложения, создавая его по настройкам при первом вызове.
+
+    ### Returns:
+        WorkerPool: Общий пул воркера.
+    """
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = WorkerPool(
+            kind=env_config.offload_executor,
+            max_workers=env_config.offload_max_workers,
+            min_items=env_config.offload_min_items,
+            min_bytes=env_config.offload_min_bytes,
+            max_queue=env_config.offload_max_queue,
+        )
+    return _worker_pool
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "WorkerPool",
+    "WorkerPoolOverloaded",
+    "get_worker_pool",
+]
@@ -0,0 +1,28 @@
+"""Ограничение частоты запросов token bucket'ами по клиенту и маршруту."""
+
+from .backends import (
+    BUCKET_SCRIPT,
+    InProcessSharedStore,
+    MemoryRateLimitBackend,
+    RateLimitBackend,
+    SharedRateLimitBackend,
+    SharedStoreClient,
+    redis_backend,
+)
+from .bucket import RateLimitDecision, RateLimitRule, decide, take
+from .factory import get_rate_limit_backend
+
+__all__ = [
+    "BUCKET_SCRIPT",
+    "InProcessSharedStore",
+    "MemoryRateLimitBackend",
+    "RateLimitBackend",
+    "RateLimitDecision",
+    "RateLimitRule",
+    "SharedRateLimitBackend",
+    "SharedStoreClient",
+    "decide",
+    "get_rate_limit_backend",
+    "redis_backend",
+    "take",
+]
@@ -0,0 +1,242 @@
+"""Хранилища вёдер: память воркера и общее хранилище для всех воркеров.
+
+`MemoryRateLimitBackend` держит вёдра в словаре процесса. Проверка
+выполняется синхронно, без `await` между чтением и записью состояния,
+поэтому на event loop не нужны блокировки. Лимит действует на каждый
+воркер отдельно: при N воркерах клиент получит до N × rate.
+
+`SharedRateLimitBackend` выполняет ту же арифметику атомарно в общем
+хранилище одним скриптом Lua (`EVAL`), с часами хранилища. Поэтому лимит
+общий для всех воркеров и подов, а расхождение часов серверов не влияет.
+Клиент хранилища — любой объект с `eval(script, numkeys, *args)`. Для Redis
+это `redis.asyncio.Redis` (пакет `redis` импортируется лениво), для тестов —
+`InProcessSharedStore`. Если хранилище недоступно, решение принимает
+локальное ведро воркера: ограничение ослабевает, но запросы не падают.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Protocol
+
+from app.modules.logging.app_logger import get_app_logger
+
+from .bucket import RateLimitDecision, RateLimitRule, decide, take
+
+
+
+BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+"""
+    ## BUCKET_SCRIPT
+
+    Атомарное пополнение и списание токенов в общем хранилище. Ключ живёт,
+    пока ведро не наполнится целиком, — дальше его состояние равно новому.
+"""
+
+
+
+class RateLimitBackend(ABC):
+    """
+    ## Хранилище вёдер ограничения запросов.
+    """
+    @abstractmethod
+    async def acquire(self, key: str, rule: RateLimitRule, cost: float = 1) -> RateLimitDecision:
+        """
+        ## Забирает `cost` токенов из ведра `key`.
+
+        ### Args:
+            key (str): Ведро (клиент и маршрут).
+            rule (RateLimitRule): Правило ведра.
+            cost (float): Цена запроса в токенах.
+
+        ### Returns:
+            RateLimitDecision: Решение по запросу.
+        """
+
+    async def aclose(self) -> None:
+        """ ## Освобождает соединения хранилища. """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    ## Вёдра в памяти воркера.
+
+    Словарь хранит ключи в порядке последнего обращения. Сверх `max_keys`
+    вытесняются давно не обращавшиеся клиенты: их ведро и так успело бы
+    наполниться.
+
+    ### Attributes:
+        max_keys (int): Максимум вёдер в памяти.
+    """
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        ## Инициализирует хранилище.
+
+        ### Args:
+            max_keys (int): Максимум вёдер в памяти.
+            clock (Callable[[], float]): Монотонные часы в секундах.
+        """
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def acquire_nowait(self, key: str, rule: RateLimitRule, cost: float = 1) -> RateLimitDecision:
+        """
+        ## Синхронная проверка (то же, что `acquire`, без переключения задач).
+        """
+        now = self._clock()
+        tokens, updated_at = self._buckets.pop(key, (float(rule.burst), now))
+        allowed, tokens = take(tokens, now - updated_at, rule, cost)
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            del self._buckets[next(iter(self._buckets))]
+        return decide(allowed, tokens, rule, cost)
+
+    async def acquire(self, key: str, rule: RateLimitRule, cost: float = 1) -> RateLimitDecision:
+        return self.acquire_nowait(key, rule, cost)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class SharedStoreClient(Protocol):
+    """
+    ## Клиент общего хранилища, выполняющий скрипты Lua.
+    """
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any: ...
+
+
+class SharedRateLimitBackend(RateLimitBackend):
+    """
+    ## Вёдра в общем хранилище (Redis) с запасным локальным ведром.
+
+    ### Attributes:
+        client (SharedStoreClient): Клиент хранилища.
+        prefix (str): Префикс ключей вёдер.
+        fallback (MemoryRateLimitBackend): Локальные вёдра на время недоступности хранилища.
+        fallback_total (int): Сколько решений принято локально.
+    """
+    def __init__(
+        self,
+        client: SharedStoreClient,
+        prefix: str = "rate_limit:",
+        fallback: MemoryRateLimitBackend | None = None,
+    ) -> None:
+        """
+        ## Инициализирует хранилище.
+
+        ### Args:
+            client (SharedStoreClient): Клиент хранилища.
+            prefix (str): Префикс ключей вёдер.
+            fallback (MemoryRateLimitBackend | None): Локальные вёдра на случай сбоя.
+        """
+        self.client = client
+        self.prefix = prefix
+        self.fallback = fallback or MemoryRateLimitBackend()
+        self.fallback_total = 0
+        self._degraded = False
+
+    async def acquire(self, key: str, rule: RateLimitRule, cost: float = 1) -> RateLimitDecision:
+        try:
+            allowed, tokens = await self.client.eval(
+                BUCKET_SCRIPT, 1, self.prefix + key, rule.rate, rule.burst, cost,
+            )
+        except Exception as exc:
+            self.fallback_total += 1
+            if not self._degraded:
+                self._degraded = True
+                get_app_logger("rate_limit").warning(f"Общее хранилище лимитов недоступно, лимиты локальные: {exc!r}")
+            return self.fallback.acquire_nowait(key, rule, cost)
+        if self._degraded:
+            self._degraded = False
+            get_app_logger("rate_limit").info("Общее хранилище лимитов снова доступно")
+        return decide(bool(int(allowed)), float(tokens), rule, cost)
+
+    async def aclose(self) -> None:
+        close = getattr(self.client, "aclose", None)
+        if close is not None:
+            await close()
+
+
+class InProcessSharedStore:
+    """
+    ## Общее хранилище в памяти процесса с семантикой `BUCKET_SCRIPT`.
+
+    Заменяет Redis в тестах: несколько `SharedRateLimitBackend` поверх одного
+    экземпляра ведут себя как воркеры с общим хранилищем.
+
+    ### Attributes:
+        available (bool): `False` имитирует недоступность хранилища.
+    """
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        """
+        ## Инициализирует хранилище.
+
+        ### Args:
+            clock (Callable[[], float]): Часы хранилища в секундах.
+        """
+        self._clock = clock
+        self._data: dict[str, tuple[float, float]] = {}
+        self.available = True
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> list[Any]:
+        if not self.available:
+            raise ConnectionError("хранилище недоступно")
+        if script != BUCKET_SCRIPT or numkeys != 1:
+            raise NotImplementedError("поддерживается только BUCKET_SCRIPT")
+        key, rate, burst, cost = keys_and_args
+        rule = RateLimitRule(float(rate), int(burst))
+        now = self._clock()
+        tokens, updated_at = self._data.get(key, (float(rule.burst), now))
+        allowed, tokens = take(tokens, now - updated_at, rule, float(cost))
+        self._data[key] = (tokens, now)
+        return [int(allowed), repr(tokens)]
+
+
+def redis_backend(url: str) -> SharedRateLimitBackend:
+    """
+    ## Общее хранилище вёдер в Redis.
+
+    ### Args:
+        url (str): Адрес Redis (`redis://host:6379/0`).
+
+    ### Returns:
+        SharedRateLimitBackend: Хранилище поверх `redis.asyncio`.
+
+    ### Raises:
+        RuntimeError: Пакет `redis` не установлен.
+    """
+    try:
+        from redis.asyncio import Redis
+    except ImportError as exc:
+        raise RuntimeError("RATE_LIMIT_BACKEND=redis требует пакет redis (pip install redis)") from exc
+    return SharedRateLimitBackend(Redis.from_url(url))
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "BUCKET_SCRIPT",
+    "InProcessSharedStore",
+    "MemoryRateLimitBackend",
+    "RateLimitBackend",
+    "SharedRateLimitBackend",
+    "SharedStoreClient",
+    "redis_backend",
+]
@@ -0,0 +1,119 @@
+"""Token bucket: правило, решение и арифметика пополнения.
+
+Ведро вмещает `burst` токенов и пополняется со скоростью `rate` токенов
+в секунду; запрос забирает `cost` токенов или получает отказ. Состояние
+ведра — два числа (токены и момент обновления), поэтому его одинаково
+легко хранить в словаре воркера и в общем хранилище.
+"""
+
+import math
+from dataclasses import dataclass
+
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """
+    ## Правило ограничения: скорость пополнения и ёмкость ведра.
+
+    ### Attributes:
+        rate (float): Токенов в секунду (устойчивая скорость запросов).
+        burst (int): Ёмкость ведра (допустимый всплеск).
+    """
+    rate: float
+    burst: int
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimitRule | None":
+        """
+        ## Разбирает правило из строки `"rate:burst"`.
+
+        ### Args:
+            value (str): `"5:10"` — 5 запросов в секунду, всплеск до 10;
+                `"off"` — без ограничения.
+
+        ### Returns:
+            RateLimitRule | None: Правило или `None` для `"off"`.
+
+        ### Raises:
+            ValueError: Строка не в формате `rate:burst` или значения не положительные.
+        """
+        if value.strip().lower() == "off":
+            return None
+        rate, _, burst = value.partition(":")
+        rule = cls(float(rate), int(burst or math.ceil(float(rate))))
+        if rule.rate <= 0 or rule.burst < 1:
+            raise ValueError(f"Правило ограничения должно быть положительным: {value!r}")
+        return rule
+
+    @property
+    def window(self) -> float:
+        """ ## Секунды, за которые пустое ведро наполняется целиком. """
+        return self.burst / self.rate
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """
+    ## Решение по одному запросу.
+
+    ### Attributes:
+        allowed (bool): Запрос пропущен.
+        rule (RateLimitRule): Применённое правило.
+        remaining (float): Токенов в ведре после запроса.
+        retry_after (float): Секунды до появления нужного числа токенов (`0`, если пропущен).
+    """
+    allowed: bool
+    rule: RateLimitRule
+    remaining: float
+    retry_after: float = 0.0
+
+    @property
+    def reset_after(self) -> float:
+        """ ## Секунды до полного наполнения ведра. """
+        return max(self.rule.burst - self.remaining, 0.0) / self.rule.rate
+
+
+def take(tokens: float, elapsed: float, rule: RateLimitRule, cost: float = 1) -> tuple[bool, float]:
+    """
+    ## Пополняет ведро за прошедшее время и забирает `cost` токенов.
+
+    ### Args:
+        tokens (float): Токенов при прошлом обновлении.
+        elapsed (float): Секунды с прошлого обновления.
+        rule (RateLimitRule): Правило.
+        cost (float): Цена запроса в токенах.
+
+    ### Returns:
+        tuple[bool, float]: Пропущен ли запрос и токенов в ведре после него.
+    """
+    tokens = min(float(rule.burst), tokens + max(elapsed, 0.0) * rule.rate)
+    if tokens >= cost:
+        return True, tokens - cost
+    return False, tokens
+
+
+def decide(allowed: bool, tokens: float, rule: RateLimitRule, cost: float = 1) -> RateLimitDecision:
+    """
+    ## Собирает решение по результату `take`.
+
+    ### Args:
+        allowed (bool): Запрос пропущен.
+        tokens (float): Токенов в ведре после запроса.
+        rule (RateLimitRule): Правило.
+        cost (float): Цена запроса в токенах.
+
+    ### Returns:
+        RateLimitDecision: Решение с `retry_after` для отказа.
+    """
+    retry_after = 0.0 if allowed else (cost - tokens) / rule.rate
+    return RateLimitDecision(allowed, rule, tokens, retry_after)
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "RateLimitDecision",
+    "RateLimitRule",
+    "decide",
+    "take",
+]
@@ -0,0 +1,37 @@
+"""Хранилище вёдер воркера, создаваемое по настройкам."""
+
+from app.config.config_reader import env_config
+
+from .backends import MemoryRateLimitBackend, RateLimitBackend, redis_backend
+
+
+
+_backend: RateLimitBackend | None = None
+
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    """
+    ## Возвращает хранилище вёдер воркера, создавая его при первом вызове.
+
+    `RATE_LIMIT_BACKEND=memory` — вёдра в памяти воркера, `redis` — общие
+    для всех воркеров и подов (`RATE_LIMIT_REDIS_URL`).
+
+    ### Returns:
+        RateLimitBackend: Хранилище вёдер.
+    """
+    global _backend
+    if _backend is None:
+        fallback = MemoryRateLimitBackend(max_keys=env_config.rate_limit_max_keys)
+        if env_config.rate_limit_backend == "redis":
+            _backend = redis_backend(env_config.rate_limit_redis_url)
+            _backend.fallback = fallback
+        else:
+            _backend = fallback
+    return _backend
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "get_rate_limit_backend",
+]
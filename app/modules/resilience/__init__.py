@@ -0,0 +1,14 @@
+"""Устойчивость к сбоям БД: выключатель и повтор чтений с джиттером."""
+
+from .breaker import BreakerState, CircuitBreaker, CircuitOpenError
+from .retry import TRANSIENT_SQLSTATES, backoff_delays, is_transient_db_error, retry_transient
+
+__all__ = [
+    "BreakerState",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "TRANSIENT_SQLSTATES",
+    "backoff_delays",
+    "is_transient_db_error",
+    "retry_transient",
+]
@@ -0,0 +1,160 @@
+"""Автоматический выключатель (circuit breaker) для обращений к БД.
+
+Пока PostgreSQL недоступен (переключение на реплику, перезапуск), каждый
+запрос ждёт таймаута подключения и держит воркер, а после восстановления
+все разом обрушиваются на ещё прогревающийся primary. Выключатель после
+`failure_threshold` подряд неудачных запросов «размыкается» и сразу отвечает
+отказом; через `reset_timeout` секунд пропускает один пробный запрос
+(half-open) и по его исходу замыкается или снова размыкается.
+"""
+
+import time
+from typing import Any, Callable, Literal
+
+
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+
+class CircuitOpenError(Exception):
+    """
+    ## Выключатель разомкнут — обращение к зависимости не выполняется.
+
+    ### Attributes:
+        retry_after (float): Через сколько секунд выключатель пропустит пробный запрос.
+    """
+    def __init__(self, name: str, retry_after: float) -> None:
+        """
+        ## Инициализирует исключение.
+
+        ### Args:
+            name (str): Имя выключателя.
+            retry_after (float): Секунды до пробного запроса.
+        """
+        super().__init__(f"{name}: выключатель разомкнут, повтор через {retry_after:.1f} с")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    ## Выключатель с состояниями `closed` → `open` → `half_open`.
+
+    Не использует блокировок: все переходы выполняются синхронно на event
+    loop воркера, у каждого воркера свой выключатель.
+
+    ### Attributes:
+        name (str): Имя выключателя (для сообщений и метрик).
+        failure_threshold (int): Неудач подряд до размыкания.
+        reset_timeout (float): Секунды в `open` до пробного запроса.
+    """
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        ## Инициализирует замкнутый выключатель.
+
+        ### Args:
+            name (str): Имя выключателя.
+            failure_threshold (int): Неудач подряд до размыкания.
+            reset_timeout (float): Секунды в `open` до пробного запроса.
+            clock (Callable[[], float]): Монотонные часы в секундах.
+        """
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probe_in_flight = False
+        self.opened_total = 0
+        self.rejected_total = 0
+
+    @property
+    def state(self) -> BreakerState:
+        """ ## Текущее состояние выключателя. """
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def retry_after(self) -> float:
+        """ ## Секунды до пробного запроса (`0`, если выключатель замкнут). """
+        if self._opened_at is None:
+            return 0.0
+        return max(self._opened_at + self.reset_timeout - self._clock(), 0.0)
+
+    def check(self) -> None:
+        """
+        ## Проверяет выключатель, не занимая место пробного запроса.
+
+        ### Raises:
+            CircuitOpenError: Выключатель разомкнут.
+        """
+        if self.state == "open":
+            raise CircuitOpenError(self.name, self.retry_after())
+
+    def before_call(self) -> None:
+        """
+        ## Разрешает обращение или отказывает сразу.
+
+        В `half_open` пропускается только один запрос; остальные получают отказ,
+        пока не станет известен его исход.
+
+        ### Raises:
+            CircuitOpenError: Выключатель разомкнут или пробный запрос уже выполняется.
+        """
+        state = self.state
+        if state == "closed":
+            return
+        if state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+        self.rejected_total += 1
+        raise CircuitOpenError(self.name, self.retry_after() or self.reset_timeout)
+
+    def record_success(self) -> None:
+        """ ## Обращение прошло: зависимость отвечает, выключатель замыкается. """
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """ ## Обращение не прошло из-за недоступности зависимости. """
+        self._failures += 1
+        if self._probe_in_flight or (self._opened_at is None and self._failures >= self.failure_threshold):
+            self._opened_at = self._clock()
+            self.opened_total += 1
+        self._probe_in_flight = False
+
+    def release(self) -> None:
+        """ ## Обращение прервано без результата (отмена): пробный запрос можно повторить. """
+        self._probe_in_flight = False
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        ## Состояние выключателя для healthcheck и метрик.
+
+        ### Returns:
+            dict[str, Any]: Состояние, неудачи подряд, секунды до пробы и счётчики.
+        """
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_after": round(self.retry_after(), 3),
+            "opened_total": self.opened_total,
+            "rejected_total": self.rejected_total,
+        }
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "BreakerState",
+    "CircuitBreaker",
+    "CircuitOpenError",
+]
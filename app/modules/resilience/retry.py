@@ -0,0 +1,126 @@
+"""Повтор идемпотентных чтений при обрыве связи с БД.
+
+Повторяются только ошибки уровня соединения (SQLSTATE класса `08`,
+остановка сервера `57P01`-`57P03`, инвалидированное соединение): запрос
+до сервера не дошёл или сервер его не выполнил. Ошибки SQL, нарушения
+ограничений и `statement_timeout` не повторяются.
+
+Паузы между попытками — экспоненциальные с полным джиттером (случайная
+пауза от нуля до `base * 2**n`, не больше `cap`): волна запросов, упавших
+одновременно, не возвращается к восстановившемуся серверу одновременно.
+"""
+
+import asyncio
+import random
+from typing import Awaitable, Callable, Iterator, TypeVar
+
+from sqlalchemy.exc import DBAPIError, InterfaceError
+
+from app.modules.deadline import current_deadline
+
+from .breaker import CircuitBreaker
+
+
+
+T = TypeVar("T")
+
+TRANSIENT_SQLSTATES = frozenset({"57P01", "57P02", "57P03"})
+"""
+    ## TRANSIENT_SQLSTATES
+
+    `admin_shutdown`, `crash_shutdown`, `cannot_connect_now` — сервер
+    останавливается или ещё не готов принимать запросы.
+"""
+
+
+
+def is_transient_db_error(exc: BaseException) -> bool:
+    """
+    ## Ошибка — недоступность БД, а не ошибка запроса.
+
+    ### Args:
+        exc (BaseException): Исключение.
+
+    ### Returns:
+        bool: `True` для обрыва/отказа соединения и остановки сервера.
+    """
+    if isinstance(exc, DBAPIError):
+        if exc.connection_invalidated or isinstance(exc, InterfaceError):
+            return True
+        code = getattr(exc.orig, 'pgcode', None) or ''
+        return code.startswith('08') or code in TRANSIENT_SQLSTATES
+    # Отказ в подключении до обёртки драйвером; таймауты — отдельная история (дедлайны)
+    return isinstance(exc, OSError) and not isinstance(exc, TimeoutError)
+
+
+def backoff_delays(
+    attempts: int,
+    base: float,
+    cap: float,
+    rng: Callable[[], float] = random.random,
+) -> Iterator[float]:
+    """
+    ## Паузы перед повторами: экспонента с полным джиттером.
+
+    ### Args:
+        attempts (int): Всего попыток (пауз на одну меньше).
+        base (float): Пауза первой ступени, секунды.
+        cap (float): Верхняя граница ступени, секунды.
+        rng (Callable[[], float]): Источник случайных чисел в `[0, 1)`.
+
+    ### Yields:
+        float: Пауза перед очередным повтором, секунды.
+    """
+    for step in range(max(attempts - 1, 0)):
+        yield rng() * min(cap, base * 2 ** step)
+
+
+async def retry_transient(
+    call: Callable[[], Awaitable[T]],
+    breaker: CircuitBreaker | None = None,
+    attempts: int = 3,
+    base_delay: float = 0.05,
+    max_delay: float = 1.0,
+) -> T:
+    """
+    ## Выполняет идемпотентное обращение, повторяя его при недоступности БД.
+
+    Повтор не выполняется, если выключатель разомкнулся или пауза не
+    укладывается в остаток дедлайна запроса.
+
+    ### Args:
+        call (Callable[[], Awaitable[T]]): Обращение; каждый вызов — новая попытка целиком.
+        breaker (CircuitBreaker | None): Выключатель, разомкнутое состояние которого прекращает повторы.
+        attempts (int): Всего попыток.
+        base_delay (float): Пауза первой ступени, секунды.
+        max_delay (float): Верхняя граница паузы, секунды.
+
+    ### Returns:
+        T: Результат первой успешной попытки.
+
+    ### Raises:
+        Exception: Ошибка последней попытки или первая неповторяемая ошибка.
+    """
+    delays = backoff_delays(attempts, base_delay, max_delay)
+    while True:
+        try:
+            return await call()
+        except Exception as exc:
+            delay = next(delays, None) if is_transient_db_error(exc) else None
+            deadline = current_deadline()
+            if (
+                delay is None
+                or (breaker is not None and breaker.state == "open")
+                or (deadline is not None and deadline.remaining() <= delay)
+            ):
+                raise
+        await asyncio.sleep(delay)
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "TRANSIENT_SQLSTATES",
+    "backoff_delays",
+    "is_transient_db_error",
+    "retry_transient",
+]
@@ -0,0 +1,37 @@
+"""Трассировка запросов (совместимая с OpenTelemetry) с локальными экспортёрами."""
+
+from .exporters import InMemorySpanExporter, JsonlFileSpanExporter, SpanExporter
+from .instrumentation import (
+    TracingMiddleware,
+    install_sqlalchemy_instrumentation,
+    traced,
+    uninstall_sqlalchemy_instrumentation,
+)
+from .tracer import (
+    NoopTracer,
+    Span,
+    TraceIdRatioSampler,
+    Tracer,
+    current_span,
+    get_tracer,
+    parse_traceparent,
+    set_tracer,
+)
+
+__all__ = [
+    "InMemorySpanExporter",
+    "JsonlFileSpanExporter",
+    "NoopTracer",
+    "Span",
+    "SpanExporter",
+    "TraceIdRatioSampler",
+    "Tracer",
+    "TracingMiddleware",
+    "current_span",
+    "get_tracer",
+    "install_sqlalchemy_instrumentation",
+    "parse_traceparent",
+    "set_tracer",
+    "traced",
+    "uninstall_sqlalchemy_instrumentation",
+]
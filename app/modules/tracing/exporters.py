@@ -0,0 +1,120 @@
+"""Экспортёры завершённых спанов: в память (тесты) и в JSONL-файл."""
+
+import json
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .tracer import Span
+
+
+
+class SpanExporter:
+    """
+    ## Базовый экспортёр спанов.
+    """
+    def export(self, spans: list["Span"]) -> None:
+        """
+        ## Принимает завершённые спаны.
+
+        ### Args:
+            spans (list[Span]): Спаны.
+        """
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        """ ## Сбрасывает буферы и освобождает ресурсы. """
+
+
+class InMemorySpanExporter(SpanExporter):
+    """
+    ## Экспортёр, хранящий спаны в памяти (для тестов и отладки).
+
+    ### Attributes:
+        max_spans (int): Сколько последних спанов хранить.
+    """
+    def __init__(self, max_spans: int = 10000) -> None:
+        """
+        ## Инициализирует экспортёр.
+
+        ### Args:
+            max_spans (int): Сколько последних спанов хранить.
+        """
+        self.max_spans = max_spans
+        self._spans: list["Span"] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: list["Span"]) -> None:
+        with self._lock:
+            self._spans.extend(spans)
+            if len(self._spans) > self.max_spans:
+                del self._spans[:len(self._spans) - self.max_spans]
+
+    def get_finished_spans(self) -> list["Span"]:
+        """
+        ## Возвращает копию накопленных спанов.
+
+        ### Returns:
+            list[Span]: Завершённые спаны в порядке завершения.
+        """
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        """ ## Удаляет накопленные спаны. """
+        with self._lock:
+            self._spans.clear()
+
+
+class JsonlFileSpanExporter(SpanExporter):
+    """
+    ## Экспортёр в файл: один спан в формате JSON на строку.
+
+    Спаны копятся в буфере и дописываются в файл пачкой, когда их
+    становится `batch_size`, и при остановке приложения.
+
+    ### Attributes:
+        path (Path): Путь к файлу спанов.
+        batch_size (int): Размер пачки записи.
+    """
+    def __init__(self, path: str | Path, batch_size: int = 256) -> None:
+        """
+        ## Инициализирует экспортёр (файл создаётся при первой записи).
+
+        ### Args:
+            path (str | Path): Путь к файлу спанов.
+            batch_size (int): Размер пачки записи.
+        """
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._buffer: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: list["Span"]) -> None:
+        with self._lock:
+            self._buffer.extend(span.to_dict() for span in spans)
+            if len(self._buffer) >= self.batch_size:
+                self._write_locked()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._write_locked()
+
+    def _write_locked(self) -> None:
+        """ ## Дописывает буфер в файл (вызывается под блокировкой). """
+        if not self._buffer:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(json.dumps(span, ensure_ascii=False, default=str) + "\n" for span in self._buffer)
+        with self.path.open("a", encoding="utf-8") as file:
+            file.write(lines)
+        self._buffer.clear()
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "InMemorySpanExporter",
+    "JsonlFileSpanExporter",
+    "SpanExporter",
+]
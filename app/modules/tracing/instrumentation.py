@@ -0,0 +1,204 @@
+"""Инструментирование приложения: HTTP-запрос → сессия → DAO → SQL.
+
+- `TracingMiddleware` — серверный спан на каждый HTTP-запрос с маршрутом,
+  статусом и входящим/исходящим `traceparent`;
+- `traced` — декоратор методов DAO;
+- `install_sqlalchemy_instrumentation` — спан на каждый SQL-запрос через
+  события движка и событие получения соединения сессией.
+
+Все точки сначала проверяют `get_tracer().enabled`, поэтому при выключенной
+трассировке добавляется одна проверка атрибута, без создания объектов.
+"""
+
+import functools
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .tracer import current_span, get_tracer, parse_traceparent
+
+
+
+T = TypeVar("T")
+
+MAX_STATEMENT_LENGTH = 2048
+"""
+    ## MAX_STATEMENT_LENGTH
+
+    Максимальная длина текста SQL в атрибуте `db.statement`.
+"""
+
+_SPAN_KEY = "_trace_span"
+
+
+
+class TracingMiddleware:
+    """
+    ## `ASGI`-миддлвейр: серверный спан на каждый HTTP-запрос.
+
+    Имя спана — `METHOD /шаблон/маршрута` (например, `GET /v1/users/{user_id}`),
+    чтобы запросы к одному эндпоинту группировались независимо от параметров.
+    В ответ добавляется заголовок `traceparent` текущей трассы.
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        ## Инициализирует миддлвейр.
+
+        ### Args:
+            app (ASGIApp): Следующее `ASGI`-приложение.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        tracer = get_tracer()
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or ())
+        parent = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        method = scope["method"]
+        with tracer.span(f"{method} {scope['path']}", kind="server", parent=parent, attributes={
+            "http.request.method": method,
+            "url.path": scope["path"],
+        }) as span:
+            traceparent = span.traceparent.encode("latin-1")
+
+            async def send_with_trace(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    span.set_attribute("http.response.status_code", status)
+                    if status >= 500:
+                        span.set_status("ERROR", f"HTTP {status}")
+                    message.setdefault("headers", [])
+                    message["headers"] = [*message["headers"], (b"traceparent", traceparent)]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace)
+            finally:
+                route = scope.get("route")
+                if route is not None and span.sampled:
+                    span.name = f"{method} {scope.get('root_path', '')}{route.path}"
+                    span.set_attribute("http.route", route.path)
+
+
+def traced(name: str | None = None) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    ## Декоратор: выполнять корутину внутри спана.
+
+    По умолчанию имя спана — `ИмяКласса.метод` (для методов DAO).
+
+    ### Args:
+        name (str | None): Имя спана.
+
+    ### Returns:
+        Callable: Декоратор корутины.
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            tracer = get_tracer()
+            if not tracer.enabled:
+                return await func(*args, **kwargs)
+            with tracer.span(span_name, attributes={"code.function": func.__qualname__}):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """ ## Открывает спан SQL-запроса (родитель — текущий спан запроса/DAO). """
+    tracer = get_tracer()
+    if not tracer.enabled or context is None:
+        return
+    parent = current_span()
+    if parent is None or not parent.sampled:
+        return
+    span = tracer.start_span(
+        statement.split(None, 1)[0].upper() if statement else "SQL",
+        kind="client",
+        parent=parent,
+        attributes={
+            "db.system": conn.dialect.name,
+            "db.statement": statement[:MAX_STATEMENT_LENGTH],
+            "db.executemany": bool(executemany),
+        },
+    )
+    setattr(context, _SPAN_KEY, span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """ ## Закрывает спан SQL-запроса. """
+    span = getattr(context, _SPAN_KEY, None)
+    if span is not None:
+        rowcount = getattr(cursor, "rowcount", -1)
+        if rowcount is not None and rowcount >= 0:
+            span.set_attribute("db.rowcount", rowcount)
+        span.end()
+        setattr(context, _SPAN_KEY, None)
+
+
+def _handle_error(exception_context) -> None:
+    """ ## Закрывает спан SQL-запроса с ошибкой. """
+    context = exception_context.execution_context
+    span = getattr(context, _SPAN_KEY, None) if context is not None else None
+    if span is not None:
+        span.record_exception(exception_context.original_exception)
+        span.end()
+        setattr(context, _SPAN_KEY, None)
+
+
+def _after_begin(session, transaction, connection) -> None:
+    """ ## Отмечает в текущем спане момент получения соединения из пула. """
+    span = current_span()
+    if span is not None and span.sampled:
+        pool = connection.engine.pool
+        span.add_event("db.connection.acquired", {
+            "db.pool.checked_out": pool.checkedout() if hasattr(pool, "checkedout") else -1,
+        })
+
+
+_LISTENERS = (
+    (Engine, "before_cursor_execute", _before_cursor_execute),
+    (Engine, "after_cursor_execute", _after_cursor_execute),
+    (Engine, "handle_error", _handle_error),
+    (Session, "after_begin", _after_begin),
+)
+
+
+def install_sqlalchemy_instrumentation() -> None:
+    """
+    ## Подключает спаны SQL-запросов ко всем движкам и сессиям (идемпотентно).
+
+    Слушатели вешаются на классы `Engine` и `Session`, поэтому работают и для
+    движка, который создаётся лениво после `fork`.
+    """
+    for target, name, listener in _LISTENERS:
+        if not event.contains(target, name, listener):
+            event.listen(target, name, listener)
+
+
+def uninstall_sqlalchemy_instrumentation() -> None:
+    """
+    ## Отключает спаны SQL-запросов.
+    """
+    for target, name, listener in _LISTENERS:
+        if event.contains(target, name, listener):
+            event.remove(target, name, listener)
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "TracingMiddleware",
+    "install_sqlalchemy_instrumentation",
+    "traced",
+    "uninstall_sqlalchemy_instrumentation",
+]
@@ -0,0 +1,459 @@
+"""Минимальный трассировщик, совместимый с моделью данных OpenTelemetry.
+
+Идентификаторы, `traceparent` (W3C Trace Context), семплирование по доле
+`trace_id` и формат экспортируемых спанов повторяют OpenTelemetry, поэтому
+файлы спанов можно загрузить в совместимые инструменты, а при переходе на
+OpenTelemetry SDK не придётся менять заголовки и атрибуты.
+
+Текущий спан хранится в `contextvars`: каждая задача asyncio (запрос) видит
+свою цепочку спанов. Если трассировка выключена, `get_tracer()` возвращает
+`NoopTracer`, который не создаёт объектов и не читает часы.
+"""
+
+import random
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from app.config.config_reader import env_config
+
+from .exporters import SpanExporter
+
+
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+
+class TraceIdRatioSampler:
+    """
+    ## Семплер по доле `trace_id` (как `TraceIdRatioBased` в OpenTelemetry).
+
+    Решение принимается один раз для корневого спана (head-based) и наследуется
+    всеми дочерними, поэтому трасса либо записывается целиком, либо нет.
+
+    ### Attributes:
+        ratio (float): Доля записываемых трасс от 0 до 1.
+    """
+    def __init__(self, ratio: float) -> None:
+        """
+        ## Инициализирует семплер.
+
+        ### Args:
+            ratio (float): Доля записываемых трасс от 0 до 1.
+        """
+        self.ratio = min(max(ratio, 0.0), 1.0)
+        self._bound = int(self.ratio * (1 << 64))
+
+    def should_sample(self, trace_id: int) -> bool:
+        """
+        ## Решает, записывать ли трассу.
+
+        ### Args:
+            trace_id (int): Идентификатор трассы.
+
+        ### Returns:
+            bool: `True`, если трасса попадает в долю.
+        """
+        return (trace_id & 0xFFFFFFFFFFFFFFFF) < self._bound
+
+
+class Span:
+    """
+    ## Записываемый спан.
+
+    ### Attributes:
+        name (str): Имя операции.
+        trace_id (int): Идентификатор трассы (128 бит).
+        span_id (int): Идентификатор спана (64 бита).
+        parent_span_id (int | None): Идентификатор родительского спана.
+        kind (str): Вид спана (`server`, `client`, `internal`).
+        attributes (dict[str, Any]): Атрибуты спана.
+        events (list[dict]): События внутри спана.
+        status (str): `UNSET`, `OK` или `ERROR`.
+        status_message (str | None): Описание ошибки.
+        start_ns (int): Время начала, наносекунды эпохи.
+        end_ns (int | None): Время окончания, наносекунды эпохи.
+    """
+    sampled = True
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_span_id", "kind", "attributes",
+        "events", "status", "status_message", "start_ns", "end_ns", "_tracer",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        trace_id: int,
+        parent_span_id: int | None,
+        kind: str = "internal",
+        attributes: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        ## Создаёт и начинает спан.
+
+        ### Args:
+            tracer (Tracer): Трассировщик, экспортирующий спан при завершении.
+            name (str): Имя операции.
+            trace_id (int): Идентификатор трассы.
+            parent_span_id (int | None): Идентификатор родителя.
+            kind (str): Вид спана.
+            attributes (dict[str, Any] | None): Начальные атрибуты.
+        """
+        self._tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = random.getrandbits(64) or 1
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.attributes = dict(attributes) if attributes else {}
+        self.events: list[dict[str, Any]] = []
+        self.status = "UNSET"
+        self.status_message: str | None = None
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """ ## Устанавливает атрибут спана. """
+        self.attributes[key] = value
+
+    def add_event(self, name: str, attributes: dict[str, Any] | None = None) -> None:
+        """ ## Добавляет событие с текущим временем. """
+        self.events.append({
+            "name": name,
+            "time_unix_nano": time.time_ns(),
+            "attributes": attributes or {},
+        })
+
+    def set_status(self, code: str, message: str | None = None) -> None:
+        """ ## Устанавливает статус спана (`OK`/`ERROR`). """
+        self.status = code
+        self.status_message = message
+
+    def record_exception(self, exc: BaseException) -> None:
+        """ ## Помечает спан ошибкой и добавляет событие `exception`. """
+        self.status = "ERROR"
+        self.status_message = f"{type(exc).__name__}: {exc}"
+        self.add_event("exception", {
+            "exception.type": type(exc).__name__,
+            "exception.message": str(exc),
+        })
+
+    def end(self) -> None:
+        """ ## Завершает спан и передаёт его экспортёру (повторный вызов игнорируется). """
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self._tracer.exporter.export([self])
+
+    @property
+    def traceparent(self) -> str:
+        """ ## Заголовок `traceparent` для передачи контекста дальше. """
+        return format_traceparent(self.trace_id, self.span_id, True)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        ## Представление спана в духе OTLP/JSON.
+
+        ### Returns:
+            dict[str, Any]: Сериализуемый словарь спана.
+        """
+        return {
+            "trace_id": f"{self.trace_id:032x}",
+            "span_id": f"{self.span_id:016x}",
+            "parent_span_id": f"{self.parent_span_id:016x}" if self.parent_span_id else None,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(((self.end_ns or self.start_ns) - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "events": self.events,
+            "status": {"code": self.status, "message": self.status_message},
+            "resource": {"service.name": self._tracer.service_name},
+        }
+
+
+class NonRecordingSpan:
+    """
+    ## Спан трассы, не попавшей в выборку.
+
+    Хранит только идентификаторы, чтобы дочерние спаны и исходящий
+    `traceparent` сохраняли трассу и решение семплера.
+    """
+    sampled = False
+
+    __slots__ = ("trace_id", "span_id")
+
+    def __init__(self, trace_id: int, span_id: int) -> None:
+        """
+        ## Создаёт незаписываемый спан.
+
+        ### Args:
+            trace_id (int): Идентификатор трассы.
+            span_id (int): Идентификатор спана.
+        """
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: dict[str, Any] | None = None) -> None:
+        pass
+
+    def set_status(self, code: str, message: str | None = None) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    @property
+    def traceparent(self) -> str:
+        return format_traceparent(self.trace_id, self.span_id, False)
+
+
+_NOOP_SPAN = NonRecordingSpan(0, 0)
+
+
+class Tracer:
+    """
+    ## Трассировщик: создаёт спаны, семплирует трассы и передаёт спаны экспортёру.
+
+    ### Attributes:
+        enabled (bool): Всегда `True` (см. `NoopTracer`).
+        exporter (SpanExporter): Экспортёр завершённых спанов.
+        sampler (TraceIdRatioSampler): Семплер корневых спанов.
+        service_name (str): Имя сервиса в ресурсе спана.
+    """
+    enabled = True
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        sampler: TraceIdRatioSampler | None = None,
+        service_name: str = "fastapi-app",
+    ) -> None:
+        """
+        ## Инициализирует трассировщик.
+
+        ### Args:
+            exporter (SpanExporter): Экспортёр завершённых спанов.
+            sampler (TraceIdRatioSampler | None): Семплер; по умолчанию записываются все трассы.
+            service_name (str): Имя сервиса.
+        """
+        self.exporter = exporter
+        self.sampler = sampler or TraceIdRatioSampler(1.0)
+        self.service_name = service_name
+
+    def start_span(
+        self,
+        name: str,
+        kind: str = "internal",
+        attributes: dict[str, Any] | None = None,
+        parent: "Span | NonRecordingSpan | None" = None,
+    ) -> "Span | NonRecordingSpan":
+        """
+        ## Создаёт спан, не делая его текущим.
+
+        ### Args:
+            name (str): Имя операции.
+            kind (str): Вид спана.
+            attributes (dict[str, Any] | None): Атрибуты.
+            parent (Span | NonRecordingSpan | None): Родитель; по умолчанию текущий спан.
+
+        ### Returns:
+            Span | NonRecordingSpan: Новый спан.
+        """
+        parent = parent if parent is not None else _current_span.get()
+        if parent is None:
+            trace_id = random.getrandbits(128) or 1
+            if not self.sampler.should_sample(trace_id):
+                return NonRecordingSpan(trace_id, random.getrandbits(64) or 1)
+            return Span(self, name, trace_id, None, kind, attributes)
+        if not parent.sampled:
+            return NonRecordingSpan(parent.trace_id, random.getrandbits(64) or 1)
+        return Span(self, name, parent.trace_id, parent.span_id, kind, attributes)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        kind: str = "internal",
+        attributes: dict[str, Any] | None = None,
+        parent: "Span | NonRecordingSpan | None" = None,
+    ) -> Iterator["Span | NonRecordingSpan"]:
+        """
+        ## Контекстный менеджер: текущий спан на время блока.
+
+        Исключение из блока записывается в спан и пробрасывается дальше.
+
+        ### Args:
+            name (str): Имя операции.
+            kind (str): Вид спана.
+            attributes (dict[str, Any] | None): Атрибуты.
+            parent (Span | NonRecordingSpan | None): Явный родитель (например, из `traceparent`).
+
+        ### Yields:
+            Span | NonRecordingSpan: Текущий спан.
+        """
+        span = self.start_span(name, kind, attributes, parent)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.record_exception(exc)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def shutdown(self) -> None:
+        """ ## Сбрасывает буфер экспортёра. """
+        self.exporter.shutdown()
+
+
+class NoopTracer:
+    """
+    ## Трассировщик при выключенной трассировке: ничего не создаёт и не экспортирует.
+    """
+    enabled = False
+
+    def start_span(self, name: str, kind: str = "internal", attributes=None, parent=None) -> NonRecordingSpan:
+        return _NOOP_SPAN
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", attributes=None, parent=None) -> Iterator[NonRecordingSpan]:
+        yield _NOOP_SPAN
+
+    def shutdown(self) -> None:
+        pass
+
+
+def current_span() -> "Span | NonRecordingSpan | None":
+    """
+    ## Возвращает текущий спан.
+
+    ### Returns:
+        Span | NonRecordingSpan | None: Текущий спан или `None` вне трассы.
+    """
+    return _current_span.get()
+
+
+def format_traceparent(trace_id: int, span_id: int, sampled: bool) -> str:
+    """
+    ## Формирует заголовок W3C `traceparent`.
+
+    ### Args:
+        trace_id (int): Идентификатор трассы.
+        span_id (int): Идентификатор спана.
+        sampled (bool): Флаг записи трассы.
+
+    ### Returns:
+        str: Значение заголовка.
+    """
+    return f"00-{trace_id:032x}-{span_id:016x}-{'01' if sampled else '00'}"
+
+
+def parse_traceparent(header: str | None) -> NonRecordingSpan | Span | None:
+    """
+    ## Разбирает заголовок W3C `traceparent` входящего запроса.
+
+    Возвращает удалённого родителя: его решение о семплировании
+    наследуется (parent-based), идентификаторы — продолжают трассу.
+
+    ### Args:
+        header (str | None): Значение заголовка.
+
+    ### Returns:
+        NonRecordingSpan | Span | None: Родитель или `None`, если заголовок отсутствует или некорректен.
+    """
+    if not header:
+        return None
+    match = _TRACEPARENT.match(header.strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id = int(match[1], 16), int(match[2], 16)
+    if not trace_id or not span_id:
+        return None
+    parent = NonRecordingSpan(trace_id, span_id)
+    if int(match[3], 16) & 0x01:
+        parent = _RemoteSampledParent(trace_id, span_id)
+    return parent
+
+
+class _RemoteSampledParent(NonRecordingSpan):
+    """
+    ## Удалённый родитель из `traceparent` с флагом `sampled`.
+    """
+    sampled = True
+
+    __slots__ = ()
+
+    @property
+    def traceparent(self) -> str:
+        return format_traceparent(self.trace_id, self.span_id, True)
+
+
+_tracer: "Tracer | NoopTracer | None" = None
+
+
+def get_tracer() -> "Tracer | NoopTracer":
+    """
+    ## Возвращает трассировщик приложения, создавая его по настройкам при первом вызове.
+
+    ### Returns:
+        Tracer | NoopTracer: `NoopTracer`, если `TRACING_ENABLED=False`.
+    """
+    global _tracer
+    if _tracer is None:
+        if not env_config.tracing_enabled:
+            _tracer = NoopTracer()
+        else:
+            from .exporters import InMemorySpanExporter, JsonlFileSpanExporter
+
+            exporter: SpanExporter = (
+                InMemorySpanExporter()
+                if env_config.tracing_exporter == "memory"
+                else JsonlFileSpanExporter(env_config.tracing_file_path)
+            )
+            _tracer = Tracer(
+                exporter,
+                TraceIdRatioSampler(env_config.tracing_sample_ratio),
+                service_name=env_config.tracing_service_name,
+            )
+    return _tracer
+
+
+def set_tracer(tracer: "Tracer | NoopTracer | None") -> None:
+    """
+    ## Подменяет трассировщик приложения (тесты, ручная настройка).
+
+    ### Args:
+        tracer (Tracer | NoopTracer | None): Новый трассировщик; `None` — создать по настройкам заново.
+    """
+    global _tracer
+    _tracer = tracer
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "NonRecordingSpan",
+    "NoopTracer",
+    "Span",
+    "TraceIdRatioSampler",
+    "Tracer",
+    "current_span",
+    "format_traceparent",
+    "get_tracer",
+    "parse_traceparent",
+    "set_tracer",
+]
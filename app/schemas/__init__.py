@@ -1,8 +1,11 @@
 """Пакет схем данных для API."""
 
+from .order import NewOrder, ExistsOrder
 from .user import NewUser, ExistsUser
 
 __all__ = [
+    "NewOrder",
+    "ExistsOrder",
     "NewUser",
     "ExistsUser",
 ]
\ No newline at end of file
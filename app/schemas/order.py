@@ -0,0 +1,43 @@
+"""Базовые Pydantic-схемы для заказа."""
+
+from datetime import datetime
+from decimal import Decimal
+
+from pydantic import BaseModel, Field
+
+
+class NewOrder(BaseModel):
+    """
+    ## Модель создания заказа.
+
+    Используется для валидации входных данных при создании заказа.
+
+    ### Attributes:
+        user_id (int): Идентификатор владельца заказа.
+        title (str): Описание заказа.
+        amount (Decimal): Сумма заказа.
+    """
+    user_id: int = Field(..., description='Идентификатор пользователя-владельца')
+    title: str = Field(..., min_length=1, description='Описание заказа')
+    amount: Decimal = Field(
+        ...,
+        ge=0,
+        max_digits=12,
+        decimal_places=2,
+        description='Сумма заказа'
+    )
+
+
+class ExistsOrder(NewOrder):
+    """
+    ## Модель существующего заказа.
+
+    ### Inherits:
+        NewOrder: Базовые поля заказа.
+
+    ### Attributes:
+        id (int): Уникальный идентификатор в БД.
+        created_at (datetime): Время создания заказа.
+    """
+    id: int = Field(..., description='Уникальный идентификатор заказа в БД')
+    created_at: datetime = Field(..., description='Дата и время создания заказа')
@@ -0,0 +1,5 @@
+"""Запуск сервера приложения (gunicorn + uvicorn)."""
+
+from .launcher import CapacityPlan, detect_http, detect_loop, plan_capacity, run_dev, run_server
+
+__all__ = ["CapacityPlan", "detect_http", "detect_loop", "plan_capacity", "run_dev", "run_server"]
@@ -0,0 +1,50 @@
+"""CLI запуска продакшен-сервера: `python -m app.server [--options]`."""
+
+import argparse
+
+from app.server.launcher import run_server
+
+
+
+def main() -> None:
+    """
+    ## Разбирает аргументы командной строки и запускает сервер.
+
+    Незаданные аргументы берутся из настроек окружения (`SERVER_*`, `DB_*`).
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.server", description=__doc__)
+    parser.add_argument("--host", help="Адрес для прослушивания (API_HOST)")
+    parser.add_argument("--port", type=int, help="Порт (API_PORT)")
+    parser.add_argument("--workers", type=int, help="Количество воркеров, 0 — по числу CPU (SERVER_WORKERS)")
+    parser.add_argument("--keepalive", type=int, help="Таймаут keep-alive, секунды (SERVER_KEEPALIVE)")
+    parser.add_argument("--backlog", type=int, help="Очередь входящих соединений (SERVER_BACKLOG)")
+    parser.add_argument(
+        "--preload",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Загружать приложение до fork (SERVER_PRELOAD)",
+    )
+    parser.add_argument("--max-connections", type=int, help="max_connections Postgres (DB_MAX_CONNECTIONS)")
+    parser.add_argument(
+        "--reserved-connections",
+        type=int,
+        help="Резерв соединений Postgres (DB_RESERVED_CONNECTIONS)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Только вывести план ёмкости")
+    args = parser.parse_args()
+
+    run_server(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        keepalive=args.keepalive,
+        backlog=args.backlog,
+        preload=args.preload,
+        max_connections=args.max_connections,
+        reserved_connections=args.reserved_connections,
+        dry_run=args.dry_run,
+    )
+
+
+if __name__ == "__main__":
+    main()
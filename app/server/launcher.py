@@ -0,0 +1,354 @@
+"""Запуск сервера: gunicorn + uvicorn-воркеры с согласованными настройками.
+
+- event loop и HTTP-парсер выбираются автоматически: `uvloop`/`httptools`,
+  если установлены, иначе `asyncio`/`h11`;
+- количество воркеров по умолчанию равно числу CPU (async-воркеру не нужно
+  больше одного процесса на ядро);
+- размер пула БД каждого воркера подбирается так, чтобы сумма соединений всех
+  воркеров укладывалась в `max_connections` Postgres за вычетом резерва;
+- движок БД пересоздаётся в каждом воркере после `fork`, поэтому `--preload`
+  безопасен: соединения мастер-процесса не разделяются между воркерами.
+"""
+
+import os
+import warnings
+from dataclasses import dataclass
+from importlib.util import find_spec
+from typing import Any
+
+from gunicorn.app.base import BaseApplication
+
+from app.config.config_reader import env_config
+from app.modules.logging.app_logger import get_app_logger
+
+
+
+logger = get_app_logger("server")
+
+APP_URI = "main:app"
+"""
+    ## APP_URI
+
+    Путь импорта ASGI-приложения.
+"""
+
+
+
+@dataclass(frozen=True)
+class CapacityPlan:
+    """
+    ## План ёмкости: воркеры и пул БД каждого воркера.
+
+    ### Attributes:
+        workers (int): Количество процессов-воркеров.
+        pool_size (int): Постоянный размер пула соединений воркера.
+        max_overflow (int): Дополнительные соединения воркера сверх пула.
+        budget (int): Доступный приложению бюджет соединений.
+        dedicated_per_worker (int): Соединения воркера вне пула (например, `LISTEN`).
+    """
+    workers: int
+    pool_size: int
+    max_overflow: int
+    budget: int
+    dedicated_per_worker: int = 0
+
+    @property
+    def connections_per_worker(self) -> int:
+        """ ## Максимум соединений одного воркера. """
+        return self.pool_size + self.max_overflow + self.dedicated_per_worker
+
+    @property
+    def total_connections(self) -> int:
+        """ ## Максимум соединений всех воркеров вместе. """
+        return self.workers * self.connections_per_worker
+
+
+def plan_capacity(
+    cpu_count: int,
+    max_connections: int,
+    reserved_connections: int,
+    pool_size: int,
+    max_overflow: int,
+    workers: int = 0,
+    dedicated_per_worker: int = 0,
+) -> CapacityPlan:
+    """
+    ## Согласует количество воркеров и размер пула БД с бюджетом соединений.
+
+    Если желаемые `pool_size + max_overflow` на всех воркерах не помещаются
+    в бюджет, оба значения пропорционально уменьшаются. Если бюджета не хватает
+    даже на одно соединение на воркер, уменьшается количество воркеров.
+
+    ### Args:
+        cpu_count (int): Количество доступных CPU.
+        max_connections (int): `max_connections` сервера Postgres.
+        reserved_connections (int): Соединения, которые нельзя занимать приложению.
+        pool_size (int): Желаемый размер пула воркера.
+        max_overflow (int): Желаемое количество дополнительных соединений воркера.
+        workers (int): Явное количество воркеров, `0` — по числу CPU.
+        dedicated_per_worker (int): Соединения воркера вне пула (слушатель `LISTEN`).
+
+    ### Raises:
+        ValueError: Бюджета не хватает даже на один воркер.
+
+    ### Returns:
+        CapacityPlan: Итоговый план.
+    """
+    budget = max_connections - reserved_connections
+    minimum_per_worker = 1 + dedicated_per_worker
+    if budget < minimum_per_worker:
+        raise ValueError(
+            f"Нет бюджета соединений: max_connections={max_connections}, "
+            f"reserved={reserved_connections}"
+        )
+
+    workers = min(workers or max(1, cpu_count), budget // minimum_per_worker)
+    per_worker = budget // workers - dedicated_per_worker
+    desired = pool_size + max_overflow
+    if desired <= per_worker:
+        return CapacityPlan(workers, pool_size, max_overflow, budget, dedicated_per_worker)
+
+    # Сохраняем соотношение pool_size/max_overflow, но не меньше одного постоянного соединения
+    new_pool = max(1, per_worker * pool_size // desired) if desired else 1
+    return CapacityPlan(workers, new_pool, per_worker - new_pool, budget, dedicated_per_worker)
+
+
+def detect_loop() -> str:
+    """
+    ## Выбирает реализацию event loop.
+
+    ### Returns:
+        str: `uvloop`, если пакет установлен, иначе `asyncio`.
+    """
+    return "uvloop" if find_spec("uvloop") is not None else "asyncio"
+
+
+def detect_http() -> str:
+    """
+    ## Выбирает HTTP-парсер.
+
+    ### Returns:
+        str: `httptools`, если пакет установлен, иначе `h11`.
+    """
+    return "httptools" if find_spec("httptools") is not None else "h11"
+
+
+def configure_worker_database(plan: CapacityPlan) -> None:
+    """
+    ## Пересоздаёт движок БД в процессе воркера по плану ёмкости.
+
+    Движок создаётся лениво при первом запросе к БД уже с размерами пула из
+    плана; унаследованный от мастера движок (если он успел появиться)
+    отпускается без закрытия сокетов, чтобы не оборвать чужие соединения.
+
+    ### Args:
+        plan (CapacityPlan): План ёмкости.
+    """
+    from app.database.connection import db_connection
+
+    db_connection.configure(pool_size=plan.pool_size, max_overflow=plan.max_overflow)
+
+
+def make_worker_class(loop: str, http: str) -> type:
+    """
+    ## Создаёт класс uvicorn-воркера gunicorn с выбранными loop и http.
+
+    ### Args:
+        loop (str): Реализация event loop.
+        http (str): HTTP-парсер.
+
+    ### Returns:
+        type: Подкласс `UvicornWorker`.
+    """
+    try:
+        from uvicorn_worker import UvicornWorker
+    except ImportError:
+        with warnings.catch_warnings():
+            # uvicorn.workers помечен устаревшим в пользу пакета uvicorn-worker
+            warnings.simplefilter("ignore", DeprecationWarning)
+            from uvicorn.workers import UvicornWorker
+
+    return type(
+        "TunedUvicornWorker",
+        (UvicornWorker,),
+        {"CONFIG_KWARGS": {**UvicornWorker.CONFIG_KWARGS, "loop": loop, "http": http}},
+    )
+
+
+class GunicornApplication(BaseApplication):
+    """
+    ## Встраиваемое gunicorn-приложение с конфигурацией из кода.
+    """
+    def __init__(self, app_uri: str, options: dict[str, Any]) -> None:
+        """
+        ## Инициализирует приложение.
+
+        ### Args:
+            app_uri (str): Путь импорта ASGI-приложения.
+            options (dict[str, Any]): Настройки gunicorn.
+        """
+        self.app_uri = app_uri
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        from gunicorn.util import import_app
+
+        return import_app(self.app_uri)
+
+
+def build_options(
+    plan: CapacityPlan,
+    host: str,
+    port: int,
+    keepalive: int,
+    backlog: int,
+    preload: bool,
+    graceful_timeout: int,
+) -> dict[str, Any]:
+    """
+    ## Собирает настройки gunicorn.
+
+    ### Args:
+        plan (CapacityPlan): План ёмкости.
+        host (str): Адрес для прослушивания.
+        port (int): Порт.
+        keepalive (int): Таймаут keep-alive, секунды.
+        backlog (int): Очередь входящих соединений.
+        preload (bool): Загружать приложение до `fork`.
+        graceful_timeout (int): Время на штатное завершение воркера.
+
+    ### Returns:
+        dict[str, Any]: Настройки для `GunicornApplication`.
+    """
+    loop, http = detect_loop(), detect_http()
+
+    def post_fork(server, worker) -> None:
+        configure_worker_database(plan)
+
+    return {
+        "bind": f"{host}:{port}",
+        "workers": plan.workers,
+        "worker_class": make_worker_class(loop, http),
+        "keepalive": keepalive,
+        "backlog": backlog,
+        "preload_app": preload,
+        "graceful_timeout": graceful_timeout,
+        "post_fork": post_fork,
+    }
+
+
+def run_server(
+    host: str | None = None,
+    port: int | None = None,
+    workers: int | None = None,
+    keepalive: int | None = None,
+    backlog: int | None = None,
+    preload: bool | None = None,
+    max_connections: int | None = None,
+    reserved_connections: int | None = None,
+    dry_run: bool = False,
+) -> CapacityPlan:
+    """
+    ## Запускает продакшен-сервер (gunicorn + uvicorn-воркеры).
+
+    Незаданные параметры берутся из настроек окружения.
+
+    ### Args:
+        host (str | None): Адрес для прослушивания.
+        port (int | None): Порт.
+        workers (int | None): Количество воркеров, `0` — по числу CPU.
+        keepalive (int | None): Таймаут keep-alive, секунды.
+        backlog (int | None): Очередь входящих соединений.
+        preload (bool | None): Загружать приложение до `fork`.
+        max_connections (int | None): `max_connections` Postgres.
+        reserved_connections (int | None): Резерв соединений.
+        dry_run (bool): Только вывести план, не запуская сервер.
+
+    ### Returns:
+        CapacityPlan: Применённый план ёмкости.
+    """
+    plan = plan_capacity(
+        cpu_count=len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1,
+        max_connections=env_config.db_max_connections if max_connections is None else max_connections,
+        reserved_connections=(
+            env_config.db_reserved_connections if reserved_connections is None else reserved_connections
+        ),
+        pool_size=env_config.db_pool_size,
+        max_overflow=env_config.db_max_overflow,
+        workers=env_config.server_workers if workers is None else workers,
+        # Слушатели ленты изменений и шины инвалидации держат свои соединения в каждом воркере
+        dedicated_per_worker=int(env_config.change_feed_enabled) + int(
+            (env_config.user_cache_enabled or env_config.user_email_filter_enabled)
+            and env_config.cache_invalidation_backend == "postgres"
+        ),
+    )
+    log_writer = None
+    if env_config.log_mode == "socket" and not dry_run:
+        # Один процесс пишет файлы логов за всех воркеров (см. app.modules.logging.writer)
+        from app.modules.logging.writer import start_log_writer, stop_log_writer
+
+        log_writer = start_log_writer(
+            env_config.log_socket_path,
+            flush_interval=env_config.log_flush_interval,
+        )
+
+    logger.info(
+        f"План: воркеров={plan.workers}, пул={plan.pool_size}+{plan.max_overflow} на воркер, "
+        f"всего соединений={plan.total_connections} из {plan.budget}; "
+        f"loop={detect_loop()}, http={detect_http()}"
+    )
+    if dry_run:
+        return plan
+
+    options = build_options(
+        plan=plan,
+        host=env_config.api_host if host is None else host,
+        port=env_config.api_port if port is None else port,
+        keepalive=env_config.server_keepalive if keepalive is None else keepalive,
+        backlog=env_config.server_backlog if backlog is None else backlog,
+        preload=env_config.server_preload if preload is None else preload,
+        graceful_timeout=env_config.server_graceful_timeout,
+    )
+    if log_writer is not None:
+        options["on_exit"] = lambda server: stop_log_writer(log_writer)
+    GunicornApplication(APP_URI, options).run()
+    return plan
+
+
+def run_dev(host: str | None = None, port: int | None = None) -> None:
+    """
+    ## Запускает uvicorn в режиме разработки с автоперезагрузкой.
+
+    ### Args:
+        host (str | None): Адрес для прослушивания.
+        port (int | None): Порт.
+    """
+    from uvicorn import run
+
+    run(
+        app=APP_URI,
+        host=env_config.api_host if host is None else host,
+        port=env_config.api_port if port is None else port,
+        reload=True,
+        loop=detect_loop(),
+        http=detect_http(),
+        timeout_keep_alive=env_config.server_keepalive,
+        backlog=env_config.server_backlog,
+    )
+
+
+# Экспортируемый интерфейс модуля
+__all__ = [
+    "CapacityPlan",
+    "detect_http",
+    "detect_loop",
+    "plan_capacity",
+    "run_dev",
+    "run_server",
+]
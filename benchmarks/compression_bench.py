@@ -0,0 +1,114 @@
+"""Бенчмарк сжатия ответов: байты «на проводе» и CPU на ответ.
+
+Генерирует JSON, похожий на ответ `GET /v1/users`, разного размера и прогоняет
+его через те же компрессоры, что использует `CompressionMiddleware`, —
+целиком и потоково (чанками с sync flush, как у `StreamingResponse`).
+
+Запуск из корня проекта:
+    python -m benchmarks.compression_bench --users 1 10 100 1000 10000
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.api.middlewares.compression import CompressionMiddleware, available_encodings
+
+
+
+def make_payload(users: int) -> bytes:
+    """
+    ## Строит JSON-список пользователей заданной длины.
+
+    ### Args:
+        users (int): Количество пользователей в списке.
+
+    ### Returns:
+        bytes: Сериализованный JSON.
+    """
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {
+            "email": f"user_{i}@example.com",
+            "full_name": f"Test User {i}",
+            "is_hidden": i % 17 == 0,
+            "id": -9223372036854775808 + i,
+            "created_at": (start + timedelta(seconds=i * 37)).isoformat(),
+        }
+        for i in range(users)
+    ]
+    return json.dumps(rows, ensure_ascii=False).encode()
+
+
+def measure(
+    middleware: CompressionMiddleware,
+    encoding: str,
+    payload: bytes,
+    repeat: int,
+    chunk_size: int | None,
+) -> tuple[int, float]:
+    """
+    ## Сжимает `payload` `repeat` раз и возвращает размер и CPU на один ответ.
+
+    ### Args:
+        middleware (CompressionMiddleware): Источник компрессоров с настройками.
+        encoding (str): Кодировка (`identity`, `gzip`, `br`, `zstd`).
+        payload (bytes): Тело ответа.
+        repeat (int): Количество повторов.
+        chunk_size (int | None): Размер чанка для потокового режима, `None` — целиком.
+
+    ### Returns:
+        tuple[int, float]: Байт на проводе и миллисекунд CPU на ответ.
+    """
+    size = len(payload)
+    started = time.process_time()
+    for _ in range(repeat):
+        if encoding == "identity":
+            continue
+        compressor = middleware.make_compressor(encoding)
+        if chunk_size is None:
+            size = len(compressor.compress(payload) + compressor.finish())
+            continue
+        size = 0
+        for offset in range(0, len(payload), chunk_size):
+            size += len(compressor.compress(payload[offset:offset + chunk_size]))
+            size += len(compressor.flush())
+        size += len(compressor.finish())
+    cpu_ms = (time.process_time() - started) * 1000 / repeat
+    return size, cpu_ms
+
+
+def main() -> None:
+    """ ## Точка входа бенчмарка. """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--chunk-size", type=int, default=16384)
+    parser.add_argument("--gzip-level", type=int, default=6)
+    parser.add_argument("--brotli-quality", type=int, default=4)
+    parser.add_argument("--zstd-level", type=int, default=3)
+    args = parser.parse_args()
+
+    middleware = CompressionMiddleware(
+        app=None,  # type: ignore[arg-type]  # сам ASGI-вызов не нужен
+        gzip_level=args.gzip_level,
+        brotli_quality=args.brotli_quality,
+        zstd_level=args.zstd_level,
+    )
+    encodings = ("identity", *available_encodings())
+
+    header = f"{'users':>7} {'mode':>7} {'encoding':>9} {'bytes':>10} {'ratio':>7} {'cpu ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for users in args.users:
+        payload = make_payload(users)
+        for mode, chunk_size in (("full", None), ("stream", args.chunk_size)):
+            for encoding in encodings:
+                size, cpu_ms = measure(middleware, encoding, payload, args.repeat, chunk_size)
+                ratio = size / len(payload) if payload else 1.0
+                print(f"{users:>7} {mode:>7} {encoding:>9} {size:>10} {ratio:>7.3f} {cpu_ms:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Бенчмарк холодного старта: время импорта приложения в свежем интерпретаторе.
+
+Каждый прогон запускает отдельный процесс `python -X importtime -c "import main"`,
+как это происходит при загрузке каждого воркера gunicorn, и разбирает отчёт
+`-X importtime` из stderr. Выводит медиану полного времени импорта, медиану
+времени процесса целиком и самые дорогие модули (по накопленному времени),
+а также проверяет побочные эффекты импорта: создан ли движок БД, открыты ли
+файлы логов.
+
+Запуск из корня проекта:
+    python -m benchmarks.import_time --runs 7 --top 15
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+
+
+PROBE = (
+    "import {module}\n"
+    "import sys\n"
+    "from app.database.connection import db_connection\n"
+    "print('engine_created', db_connection.engine_created)\n"
+    "print('asyncpg_loaded', 'asyncpg' in sys.modules)\n"
+)
+"""
+    ## PROBE
+
+    Код, выполняемый в дочернем процессе: импорт модуля и проверка побочных эффектов.
+"""
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """
+    ## Разбирает вывод `-X importtime`.
+
+    ### Args:
+        stderr (str): Поток ошибок процесса.
+
+    ### Returns:
+        dict[str, tuple[int, int]]: `{модуль: (собственное время, накопленное время)}`, мкс.
+    """
+    result: dict[str, tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        result[name.strip()] = (int(self_us), int(cumulative_us))
+    return result
+
+
+def run_once(module: str) -> tuple[dict[str, tuple[int, int]], float, dict[str, str]]:
+    """
+    ## Один прогон импорта в новом процессе.
+
+    ### Args:
+        module (str): Импортируемый модуль.
+
+    ### Returns:
+        tuple: Отчёт importtime, время процесса (мс), проверки побочных эффектов.
+    """
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    probes = dict(line.split(" ", 1) for line in proc.stdout.splitlines() if " " in line)
+    return parse_importtime(proc.stderr), wall_ms, probes
+
+
+def main() -> None:
+    """
+    ## Точка входа бенчмарка.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="Импортируемый модуль (по умолчанию main)")
+    parser.add_argument("--runs", type=int, default=7, help="Количество прогонов")
+    parser.add_argument("--top", type=int, default=15, help="Сколько самых дорогих модулей показать")
+    args = parser.parse_args()
+
+    totals: list[float] = []
+    walls: list[float] = []
+    cumulative: dict[str, list[int]] = defaultdict(list)
+    probes: dict[str, str] = {}
+    for _ in range(args.runs):
+        report, wall_ms, probes = run_once(args.module)
+        walls.append(wall_ms)
+        totals.append(report.get(args.module, (0, 0))[1] / 1000)
+        for name, (_, cumulative_us) in report.items():
+            cumulative[name].append(cumulative_us)
+
+    print(f"import {args.module}: median {statistics.median(totals):.1f} ms "
+          f"(min {min(totals):.1f}, max {max(totals):.1f}) over {args.runs} runs")
+    print(f"process wall time: median {statistics.median(walls):.1f} ms")
+    for key, value in probes.items():
+        print(f"{key}: {value}")
+
+    print(f"\n{'module':<60} {'cumulative, ms':>15}")
+    ranked = sorted(cumulative.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    # Показываем модули приложения и сторонние пакеты верхнего уровня
+    shown = [(name, times) for name, times in ranked if name.startswith("app.") or "." not in name]
+    for name, times in shown[:args.top]:
+        print(f"{name:<60} {statistics.median(times) / 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
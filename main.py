@@ -2,7 +2,7 @@
 
 from typing import Union
 
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 
 from fastapi import APIRouter, FastAPI
 
@@ -10,7 +10,22 @@ from app.config.config_reader import env_config
 from app.modules.logging.app_logger import get_app_logger
 from app.config.constants import DEV_ENV, PROD_ENV
 
+from app.api.dependencies.dao import get_user_dao
+from app.api.middlewares.compression import CompressionMiddleware
+from app.api.middlewares.disconnect import CancelOnDisconnectMiddleware
+from app.api.middlewares.rate_limit import RateLimitMiddleware
+from app.modules.change_feed import create_users_listener, get_change_feed_hub
+from app.modules.invalidation import get_invalidation_bus
+from app.modules.monitoring.loop_lag import LoopLagMonitor
+from app.modules.offload.pool import get_worker_pool
+from app.modules.rate_limit import RateLimitRule, get_rate_limit_backend
+from app.modules.tracing import TracingMiddleware, get_tracer, install_sqlalchemy_instrumentation
+from app.database.connection import db_connection
+
+from app.api.v1.routes.admin import router as admin_router
 from app.api.v1.routes.healthcheck import router as healthcheck_router
+from app.api.v1.routes.metrics import router as metrics_router
+from app.api.v1.routes.orders import router as orders_router
 from app.api.v1.routes.users import router as users_router
 
 
@@ -18,6 +33,17 @@ from app.api.v1.routes.users import router as users_router
 logger = get_app_logger(__name__)
 
 
+async def _close_user_dao() -> None:
+    """
+    ## Закрывает `UserDAO`, если он был создан.
+
+    `get_user_dao()` создаёт экземпляр при первом вызове, поэтому без проверки
+    остановка создавала бы DAO только для того, чтобы сразу его закрыть.
+    """
+    if get_user_dao.cache_info().currsize:
+        await get_user_dao().aclose()
+
+
 
 class FastAPIapp:
     """
@@ -40,6 +66,9 @@ class FastAPIapp:
             '/v1': [
                 healthcheck_router,
                 users_router,
+                orders_router,
+                metrics_router,
+                admin_router,
                 # роутер_который_не_нужен_но_удалять_не_хочу просто закомментить
                 # другие роутеры..
             ]
@@ -48,8 +77,42 @@ class FastAPIapp:
     
     def __post_init(self):
         """ ## Выполняет пост-инициализацию после создания экземпляра класса. """
+        self._include_middlewares()
         self._include_routers()
 
+    def _include_middlewares(self):
+        """
+        ## Подключает `ASGI`-миддлвейры к приложению `FastAPI`.
+
+        Набор миддлвейров определяется настройками окружения.
+        """
+        if env_config.request_cancel_on_disconnect:
+            # Внутренний слой: отменяется только обработчик, сжатие и спан завершаются штатно
+            self.app.add_middleware(CancelOnDisconnectMiddleware)
+        if env_config.compression_enabled:
+            self.app.add_middleware(
+                CompressionMiddleware,
+                minimum_size=env_config.compression_minimum_size,
+                gzip_level=env_config.compression_gzip_level,
+                brotli_quality=env_config.compression_brotli_quality,
+                zstd_level=env_config.compression_zstd_level,
+            )
+        if env_config.rate_limit_enabled:
+            # Отказ 429 не доходит до сжатия и обработчика, но попадает в спан
+            self.app.add_middleware(
+                RateLimitMiddleware,
+                default_rule=RateLimitRule.parse(env_config.rate_limit_default),
+                route_rules={
+                    route: RateLimitRule.parse(rule) for route, rule in env_config.rate_limit_routes.items()
+                },
+                key_header=env_config.rate_limit_key_header,
+                trust_forwarded=env_config.rate_limit_trust_forwarded,
+            )
+        if env_config.tracing_enabled:
+            # Добавляется последним — внешний слой, в спан попадает и время сжатия
+            self.app.add_middleware(TracingMiddleware)
+            install_sqlalchemy_instrumentation()
+
     def _include_routers(self):
         """
         ## Регистрирует все роутеры в приложении `FastAPI`.
@@ -80,10 +143,46 @@ class FastAPIapp:
         # Установка соединия с базой данных / обращение к какому-либо сервису
         # До запуска приложения
         # logger.info(f'Приложение запустилось на хосте: {env_config.api_host} порт: {env_config.api_port}')
-        yield
-        # logger.info('Приложение завершило свой цикл')
-        # После выключения приложения
-        # Например закрытие соединения с базой данных
+        async with AsyncExitStack() as shutdown:
+            # Шаги остановки выполняются в обратном порядке регистрации, и каждый —
+            # даже если предыдущий упал (как вложенные try/finally)
+            shutdown.callback(lambda: get_tracer().shutdown())
+            shutdown.push_async_callback(db_connection.dispose)
+            shutdown.callback(lambda: get_worker_pool().shutdown())
+            if env_config.rate_limit_enabled:
+                shutdown.push_async_callback(lambda: get_rate_limit_backend().aclose())
+
+            app.state.loop_monitor = None
+            if env_config.loop_monitor_enabled:
+                app.state.loop_monitor = LoopLagMonitor(
+                    interval=env_config.loop_monitor_interval,
+                    threshold=env_config.loop_monitor_threshold,
+                )
+                await app.state.loop_monitor.start()
+                shutdown.push_async_callback(app.state.loop_monitor.stop)
+            if env_config.user_cache_enabled or env_config.user_email_filter_enabled:
+                # Кэш пользователей и фильтр email подписываются на шину при создании DAO
+                get_user_dao()
+                await get_invalidation_bus().start()
+                shutdown.push_async_callback(get_invalidation_bus().stop)
+            # DAO закрывается раньше шины: его фоновые задачи публикуют в неё
+            shutdown.push_async_callback(_close_user_dao)
+            if env_config.user_email_filter_enabled:
+                # Фильтр собирается в фоне: до готовности проверки email идут в БД
+                get_user_dao().start_email_filter_refresh(env_config.user_email_filter_refresh_seconds)
+            if env_config.user_archive_enabled:
+                # Периодическая архивация, если не вынесена в cron (USER_ARCHIVE_INTERVAL_SECONDS=0)
+                get_user_dao().start_archiving(env_config.user_archive_interval_seconds)
+            app.state.change_feed_listener = None
+            if env_config.change_feed_enabled:
+                # Одно соединение LISTEN на воркер; события раздаются SSE-подписчикам
+                app.state.change_feed_listener = create_users_listener(get_change_feed_hub())
+                shutdown.callback(get_change_feed_hub().close)
+                shutdown.push_async_callback(app.state.change_feed_listener.stop)
+                app.state.change_feed_listener.start()
+            yield
+            # logger.info('Приложение завершило свой цикл')
+            # После выключения приложения шаги остановки выполняет `shutdown`
 
     def _create_app(self) -> FastAPI:
         """
@@ -111,16 +210,10 @@ fastapi_app = FastAPIapp()
 app: FastAPI = fastapi_app.app
 
 
-if env_config.env.lower() == DEV_ENV.lower():
+if __name__ == '__main__' and env_config.env.lower() == DEV_ENV.lower():
     host_info = f"{env_config.api_host}:{env_config.api_port}"
     logger.info(  # Запись в лог информацию о запуске в dev режиме
         f"Запуск в режиме разработки на {host_info}"
     )
-    if __name__ == '__main__':
-        from uvicorn import run
-        run(
-            app='main:app',
-            host=env_config.api_host,
-            port=env_config.api_port,
-            reload=True,
-        )
\ No newline at end of file
+    from app.server.launcher import run_dev
+    run_dev()
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""Общие фикстуры интеграционных тестов с Postgres.
+
+Каждый xdist-воркер (`pytest -n auto`) получает свою БД — копию шаблона
+`<DB_NAME>_test_template`, накатанного миграциями до `alembic head`. Шаблон
+создаётся один раз и пересоздаётся, только если сменилась head-ревизия;
+копирование `CREATE DATABASE ... TEMPLATE` занимает доли секунды.
+
+Каждый тест выполняется во внешней транзакции, к которой приложение
+присоединяется через `SAVEPOINT` (`db_connection.bound_to`), и откатывается
+в конце: тесты не видят данных друг друга и ничего не оставляют в БД.
+
+Если Postgres недоступен, тесты с этими фикстурами пропускаются.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+from typing import AsyncIterator
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, create_async_engine
+
+from app.config.config_reader import env_config
+from app.database.connection import db_connection
+
+
+ROOT = Path(__file__).resolve().parents[1]
+TEMPLATE_LOCK = 7_343_001  # ключ pg_advisory_lock: шаблон готовит один воркер
+
+
+def _asyncpg_dsn(database: str) -> str:
+    return make_url(env_config.DATABASE_URL_asyncpg).set(
+        drivername="postgresql", database=database
+    ).render_as_string(hide_password=False)
+
+
+def _alembic_config():
+    """Конфиг Alembic без файла: env.py не перенастраивает логирование pytest."""
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    return config
+
+
+def _migrate(database: str) -> None:
+    """Накатывает миграции на `database` (в отдельном потоке: env.py вызывает asyncio.run)."""
+    from alembic import command
+
+    original = env_config.db_name
+    env_config.db_name = database
+    try:
+        command.upgrade(_alembic_config(), "head")
+    finally:
+        env_config.db_name = original
+
+
+def _alembic_head() -> str:
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(_alembic_config()).get_current_head()
+
+
+async def _connect_admin():
+    """Соединение с служебной БД `postgres`; `None`, если сервер недоступен."""
+    import asyncpg
+
+    try:
+        return await asyncpg.connect(_asyncpg_dsn("postgres"), timeout=3)
+    except Exception:
+        return None
+
+
+async def _prepare_database(template: str, database: str) -> bool:
+    """Готовит шаблон (при необходимости) и клонирует из него БД воркера."""
+    import asyncpg
+
+    admin = await _connect_admin()
+    if admin is None:
+        return False
+    try:
+        await admin.execute("SELECT pg_advisory_lock($1)", TEMPLATE_LOCK)
+        exists = await admin.fetchval("SELECT 1 FROM pg_database WHERE datname = $1", template)
+        current = None
+        if exists:
+            conn = await asyncpg.connect(_asyncpg_dsn(template))
+            try:
+                current = await conn.fetchval(
+                    "SELECT version_num FROM alembic_version"
+                ) if await conn.fetchval("SELECT to_regclass('alembic_version')") else None
+            finally:
+                await conn.close()
+        if current != _alembic_head():
+            await admin.execute(f'DROP DATABASE IF EXISTS "{template}" WITH (FORCE)')
+            await admin.execute(f'CREATE DATABASE "{template}"')
+            await asyncio.to_thread(_migrate, template)
+        await admin.execute(f'DROP DATABASE IF EXISTS "{database}" WITH (FORCE)')
+        await admin.execute(f'CREATE DATABASE "{database}" TEMPLATE "{template}"')
+    finally:
+        await admin.close()
+    return True
+
+
+async def _drop_database(database: str) -> None:
+    admin = await _connect_admin()
+    if admin is None:
+        return
+    try:
+        await admin.execute(f'DROP DATABASE IF EXISTS "{database}" WITH (FORCE)')
+    finally:
+        await admin.close()
+
+
+@pytest.fixture(scope="session")
+def worker_database() -> str:
+    """Имя БД текущего xdist-воркера (`<DB_NAME>_test_gw0`, ... или `_test_main`)."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    database = f"{env_config.db_name}_test_{worker}"
+    if not asyncio.run(_prepare_database(f"{env_config.db_name}_test_template", database)):
+        pytest.skip("Postgres недоступен")
+    yield database
+    asyncio.run(_drop_database(database))
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def db_engine(worker_database: str) -> AsyncIterator[AsyncEngine]:
+    """Движок БД воркера; на время тестов к нему привязан `db_connection`."""
+    url = make_url(env_config.DATABASE_URL_asyncpg).set(database=worker_database)
+    engine = create_async_engine(url, pool_size=2, max_overflow=0)
+    db_connection.bind(engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def db_conn(db_engine: AsyncEngine) -> AsyncIterator[AsyncConnection]:
+    """Соединение с внешней транзакцией, которая откатывается после теста."""
+    async with db_engine.connect() as connection:
+        transaction = await connection.begin()
+        with db_connection.bound_to(connection):
+            yield connection
+        await transaction.rollback()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def db_session(db_conn: AsyncConnection) -> AsyncIterator[AsyncSession]:
+    """Сессия внутри транзакции теста (`commit` фиксирует только SAVEPOINT)."""
+    async with AsyncSession(bind=db_conn, join_transaction_mode="create_savepoint", expire_on_commit=False) as session:
+        yield session
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def client(db_conn: AsyncConnection) -> AsyncIterator[httpx.AsyncClient]:
+    """HTTP-клиент приложения в том же event loop, что и транзакция теста.
+
+    `lifespan` не запускается: фоновые задачи (слушатели `LISTEN`, пересборка
+    фильтра email) открывали бы свои соединения мимо транзакции теста.
+    """
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http_client:
+        yield http_client
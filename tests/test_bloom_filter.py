@@ -0,0 +1,192 @@
+"""Тесты фильтра Блума и быстрого пути проверки занятости email (без Postgres)."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dao.user import UserDAO
+from app.api.dependencies.dao import get_user_dao
+from app.api.dependencies.db import get_db_session
+from app.modules.bloom import BloomFilter, RefreshableBloomFilter
+from main import app
+
+
+async def _aiter(items):
+    """Асинхронный итератор по списку."""
+    for item in items:
+        yield item
+
+
+def test_no_false_negatives():
+    """Каждый добавленный элемент находится."""
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    emails = [f"user_{i}@example.com" for i in range(10_000)]
+    for email in emails:
+        bloom.add(email)
+
+    assert all(bloom.might_contain(email) for email in emails)
+
+
+def test_false_positive_rate_is_near_target():
+    """Доля ложноположительных ответов при полном заполнении близка к целевой."""
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    for i in range(10_000):
+        bloom.add(f"user_{i}@example.com")
+
+    false_positives = sum(f"other_{i}@example.com" in bloom for i in range(20_000))
+    assert false_positives / 20_000 < 0.02
+    assert bloom.estimated_error_rate() == pytest.approx(0.01, rel=0.2)
+
+
+@pytest.mark.parametrize("capacity, error_rate", [(0, 0.01), (10, 0), (10, 1)])
+def test_invalid_parameters(capacity: int, error_rate: float):
+    """Некорректная ёмкость или доля ошибок отвергаются."""
+    with pytest.raises(ValueError):
+        BloomFilter(capacity, error_rate)
+
+
+def test_refreshable_filter_is_pessimistic_until_built():
+    """Несобранный фильтр на всё отвечает «возможно есть»."""
+    bloom = RefreshableBloomFilter(capacity=100)
+    assert bloom.might_contain("free@example.com")
+
+    asyncio.run(bloom.rebuild(_aiter(["taken@example.com"]), expected=1))
+    assert bloom.ready
+    assert bloom.might_contain("taken@example.com")
+    assert not bloom.might_contain("free@example.com")
+    assert bloom.stats()["negatives"] == 1
+
+
+def test_items_added_during_rebuild_are_kept():
+    """Элемент, добавленный во время пересборки, не теряется после подмены фильтра."""
+    bloom = RefreshableBloomFilter(capacity=100)
+
+    async def slow_source():
+        yield "old@example.com"
+        await asyncio.sleep(0)
+        bloom.add("new@example.com")
+        yield "other@example.com"
+
+    asyncio.run(bloom.rebuild(slow_source()))
+    assert bloom.might_contain("new@example.com")
+    assert bloom.might_contain("old@example.com")
+
+
+def test_failed_rebuild_keeps_previous_filter():
+    """Ошибка источника оставляет прежний фильтр рабочим."""
+    bloom = RefreshableBloomFilter(capacity=100)
+    asyncio.run(bloom.rebuild(_aiter(["taken@example.com"])))
+
+    async def broken_source():
+        yield "x@example.com"
+        raise ConnectionError("db is down")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(bloom.rebuild(broken_source()))
+    assert bloom.rebuilds == 1
+    assert bloom.might_contain("taken@example.com")
+
+
+def test_stale_filter_is_pessimistic_until_rebuilt():
+    """Устаревший фильтр отвечает «возможно есть»; пометка во время сборки не даёт ей сделать фильтр готовым."""
+    bloom = RefreshableBloomFilter(capacity=100)
+    asyncio.run(bloom.rebuild(_aiter([])))
+    bloom.mark_stale()
+    assert not bloom.ready
+    assert bloom.might_contain("free@example.com")
+
+    async def source_with_lost_message():
+        yield "old@example.com"
+        bloom.mark_stale()
+
+    asyncio.run(bloom.rebuild(source_with_lost_message()))
+    assert not bloom.ready
+    asyncio.run(bloom.rebuild(_aiter([])))
+    assert bloom.ready
+    assert bloom.stats()["stale_marks"] == 2
+
+
+def test_email_created_by_other_worker_reaches_filter(monkeypatch):
+    """Email, созданный одним воркером, приходит в фильтр другого через шину; потеря сообщений делает фильтр неготовым."""
+    from datetime import datetime
+
+    from app.api.dao import user as user_module
+    from app.api.v1.models.request import CreateUserRequestModel
+    from app.config.config_reader import env_config
+    from app.modules.invalidation import InMemoryInvalidationBus, InvalidationMessage
+
+    peers: list[InMemoryInvalidationBus] = []
+    buses = iter([InMemoryInvalidationBus(peers), InMemoryInvalidationBus(peers)])
+    monkeypatch.setattr(user_module, "get_invalidation_bus", lambda: next(buses))
+    monkeypatch.setattr(env_config, "user_email_filter_enabled", True)
+    monkeypatch.setattr(env_config, "user_cache_enabled", False)
+    monkeypatch.setattr(env_config, "user_write_coalesce_enabled", False)
+    monkeypatch.setattr(env_config, "user_archive_enabled", False)
+
+    class InsertedCoalescer:
+        async def submit(self, values):
+            return {**values, "id": 1, "created_at": datetime(2026, 1, 1)}
+
+    async def scenario():
+        writer, reader = UserDAO(), UserDAO()
+        for dao in (writer, reader):
+            await dao.email_filter.rebuild(_aiter([]))
+        writer.coalescer = InsertedCoalescer()
+        await writer.create(
+            CreateUserRequestModel(email="New@example.com", full_name="New", is_hidden=False), session=None
+        )
+        before_delivery = reader.email_maybe_taken("new@example.com")
+        await writer.invalidation.flush()
+        after_delivery = reader.email_maybe_taken("NEW@example.com")
+
+        reader.invalidation._receive(InvalidationMessage(writer.invalidation.source, 5, ()))
+        return before_delivery, after_delivery, reader
+
+    before_delivery, after_delivery, reader = asyncio.run(scenario())
+    assert before_delivery is False
+    assert after_delivery is True
+    assert not reader.email_filter.ready
+    assert reader._email_filter_lost.is_set()
+    assert reader.email_maybe_taken("free@example.com")
+
+
+def test_email_available_skips_db_on_definite_negative():
+    """Свободный по фильтру email проверяется без сессии БД, занятый — через БД."""
+    dao = UserDAO()
+    dao.email_filter = RefreshableBloomFilter(capacity=100)
+    asyncio.run(dao.email_filter.rebuild(_aiter(["taken@example.com"])))
+    checked_in_db: list[str] = []
+
+    async def email_exists(email, session):
+        checked_in_db.append(email)
+        return True
+
+    class NoDbSession:
+        def begin(self):
+            return _NullTransaction()
+
+    dao.email_exists = email_exists
+    app.dependency_overrides[get_user_dao] = lambda: dao
+    app.dependency_overrides[get_db_session] = NoDbSession
+    try:
+        client = TestClient(app)
+        free = client.get("/v1/users/email-available", params={"email": "free@example.com"})
+        taken = client.get("/v1/users/email-available", params={"email": "taken@example.com"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert free.json() == {"email": "free@example.com", "available": True}
+    assert taken.json() == {"email": "taken@example.com", "available": False}
+    assert checked_in_db == ["taken@example.com"]
+
+
+class _NullTransaction:
+    """Заглушка `session.begin()` для подменённой сессии."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
@@ -0,0 +1,183 @@
+"""Тесты ленты изменений: раздача подписчикам, возобновление, SSE-поток (без Postgres)."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from app.api.v1.routes import users as users_routes
+from app.modules.change_feed import (
+    ChangeEvent,
+    ChangeFeedHub,
+    asyncpg_dsn,
+    parse_notification,
+)
+from app.modules.change_feed.listener import PgListener
+
+
+def _event(number: int) -> ChangeEvent:
+    """Событие вставки пользователя с номером `number`."""
+    return ChangeEvent(id=str(number), op="INSERT", data={"id": number, "op": "INSERT", "user_id": number})
+
+
+def _drain(subscription) -> list[ChangeEvent | None]:
+    """Забирает всё, что уже лежит в очереди подписки."""
+    items = []
+    while not subscription.queue.empty():
+        items.append(subscription.queue.get_nowait())
+    return items
+
+
+def test_parse_notification():
+    """Нагрузка триггера превращается в событие с id из последовательности."""
+    event = parse_notification('{"id": 42, "op": "UPDATE", "user_id": 7, "changed_at": "2026-01-01T00:00:00"}')
+    assert (event.id, event.op, event.data["user_id"]) == ("42", "UPDATE", 7)
+
+    with pytest.raises(ValueError):
+        parse_notification('{"user_id": 7}')
+
+
+def test_asyncpg_dsn_drops_driver():
+    """DSN для asyncpg.connect не содержит `+asyncpg` и сохраняет пароль."""
+    assert asyncpg_dsn("postgresql+asyncpg://u:p@db:5432/app") == "postgresql://u:p@db:5432/app"
+
+
+def test_sse_frame_format():
+    """Кадр SSE содержит id, тип события и JSON-данные."""
+    frame = _event(5).to_sse().decode()
+    assert frame.startswith("id: 5\nevent: INSERT\ndata: ")
+    assert frame.endswith("\n\n")
+    assert json.loads(frame.split("data: ")[1])["user_id"] == 5
+
+
+def test_fan_out_to_all_subscribers():
+    """Каждое событие получают все подписчики."""
+    async def scenario():
+        hub = ChangeFeedHub()
+        first, second = hub.subscribe(), hub.subscribe()
+        hub.publish(_event(1))
+        return _drain(first), _drain(second), hub.stats()
+
+    first, second, stats = asyncio.run(scenario())
+    assert [e.id for e in first] == [e.id for e in second] == ["1"]
+    assert stats["subscribers"] == 2
+
+
+def test_slow_subscriber_is_dropped_without_affecting_others():
+    """Переполненная очередь закрывает только медленного клиента, с событием `reset`."""
+    async def scenario():
+        hub = ChangeFeedHub(client_queue_size=3)
+        slow, fast = hub.subscribe(), hub.subscribe()
+        for number in range(1, 5):
+            hub.publish(_event(number))
+            _drain(fast)
+        return hub, slow
+
+    hub, slow = asyncio.run(scenario())
+    items = _drain(slow)
+    assert items[-1] is None
+    assert items[-2].op == "reset" and items[-2].data["reason"] == "overflow"
+    assert hub.subscribers == 1 and hub.overflows == 1
+
+
+def test_resume_from_last_event_id():
+    """Переподключение с `Last-Event-ID` отдаёт пропущенные события по порядку доставки."""
+    async def scenario():
+        hub = ChangeFeedHub()
+        for number in (1, 3, 2, 4):  # порядок фиксации транзакций, а не номеров
+            hub.publish(_event(number))
+        return _drain(hub.subscribe("3")), _drain(hub.subscribe("100"))
+
+    resumed, unknown = asyncio.run(scenario())
+    assert [e.id for e in resumed] == ["2", "4"]
+    assert [e.op for e in unknown] == ["reset"]
+
+
+def test_gap_clears_history():
+    """После обрыва LISTEN буфер очищается, подписчики получают `reset`."""
+    async def scenario():
+        hub = ChangeFeedHub()
+        hub.publish(_event(1))
+        live = hub.subscribe()
+        hub.publish_gap()
+        return _drain(live), _drain(hub.subscribe("1"))
+
+    live, resumed = asyncio.run(scenario())
+    assert live[0].data["reason"] == "gap"
+    assert resumed[0].data["reason"] == "unknown_last_event_id"
+
+
+def test_listener_reports_reconnect_after_failed_first_attempt(monkeypatch):
+    """Если первая попытка подключения не удалась, успешная повторная вызывает `on_reconnect`; пинг ограничен по времени."""
+    asyncpg = pytest.importorskip("asyncpg")
+    pings: list[dict] = []
+
+    class FakeConnection:
+        def add_termination_listener(self, callback):
+            pass
+
+        async def add_listener(self, channel, callback):
+            pass
+
+        async def execute(self, query, timeout=None):
+            pings.append({"query": query, "timeout": timeout})
+
+        def is_closed(self):
+            return False
+
+        def terminate(self):
+            pass
+
+    attempts = iter([OSError("connection refused"), FakeConnection()])
+
+    async def connect(dsn):
+        result = next(attempts)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(asyncpg, "connect", connect)
+
+    async def scenario():
+        reconnected = asyncio.Event()
+        listener = PgListener("postgresql://", "users_changes", on_notify=print,
+                              on_reconnect=reconnected.set, ping_interval=0.01)
+        listener.start()
+        try:
+            await asyncio.wait_for(reconnected.wait(), 5)
+            await asyncio.sleep(0.05)
+        finally:
+            await listener.stop()
+        return listener.reconnects
+
+    assert asyncio.run(scenario()) == 1
+    assert pings and all(ping["timeout"] == 0.01 for ping in pings)
+
+
+def test_sse_endpoint_streams_replay_live_and_heartbeat(monkeypatch):
+    """Эндпоинт отдаёт пропущенные события, новые события и keep-alive, затем отписывается."""
+    hub = ChangeFeedHub()
+    hub.publish(_event(1))
+    hub.publish(_event(2))
+    monkeypatch.setattr(users_routes, "get_change_feed_hub", lambda: hub)
+    monkeypatch.setattr(users_routes.env_config, "change_feed_enabled", True)
+    monkeypatch.setattr(users_routes.env_config, "change_feed_heartbeat_seconds", 0.01)
+
+    async def scenario():
+        response = await users_routes.stream_changes(last_event_id="1", after=None)
+        stream = response.body_iterator
+        chunks = [await anext(stream), await anext(stream)]
+        hub.publish(_event(3))
+        chunks.append(await anext(stream))
+        chunks.append(await anext(stream))
+        await stream.aclose()
+        return response, chunks
+
+    response, chunks = asyncio.run(scenario())
+    assert response.media_type == "text/event-stream"
+    assert chunks[0].startswith(b"retry:")
+    assert chunks[1].startswith(b"id: 2\n")
+    assert chunks[2].startswith(b"id: 3\n")
+    assert chunks[3] == b": keep-alive\n\n"
+    assert hub.subscribers == 0
@@ -0,0 +1,86 @@
+"""Тесты отсутствия тяжёлых побочных эффектов при импорте приложения (без БД)."""
+from __future__ import annotations
+
+import functools
+import os
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.config.config_reader import env_config
+from benchmarks.import_time import parse_importtime
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_import_main_has_no_side_effects(tmp_path):
+    """Импорт main не создаёт движок БД, не грузит asyncpg и не пишет логи."""
+    code = (
+        "import sys, os\n"
+        "import main\n"
+        "from app.database.connection import db_connection\n"
+        "print(db_connection.engine_created, 'asyncpg' in sys.modules, os.path.exists('logs'))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert proc.stdout.split() == ["False", "False", "False"]
+
+
+def test_parse_importtime():
+    """Строки отчёта -X importtime разбираются в (self, cumulative)."""
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        340 |   app.config\n"
+        "import time:        15 |       1200 | main\n"
+    )
+
+    assert parse_importtime(stderr) == {"app.config": (120, 340), "main": (15, 1200)}
+
+
+@pytest.mark.asyncio
+async def test_lifespan_shutdown_runs_every_step(monkeypatch):
+    """Сбой одного шага остановки не пропускает остальные, незапрошенный DAO не создаётся."""
+    import main
+
+    calls: list[str] = []
+
+    class FailingMonitor:
+        def __init__(self, **kwargs):
+            pass
+
+        async def start(self):
+            pass
+
+        async def stop(self):
+            calls.append("monitor")
+            raise RuntimeError("stop failed")
+
+    async def dispose():
+        calls.append("db")
+
+    for flag in ("rate_limit_enabled", "user_cache_enabled", "user_email_filter_enabled",
+                 "user_archive_enabled", "change_feed_enabled"):
+        monkeypatch.setattr(env_config, flag, False)
+    monkeypatch.setattr(env_config, "loop_monitor_enabled", True)
+    monkeypatch.setattr(main, "LoopLagMonitor", FailingMonitor)
+    monkeypatch.setattr(main, "db_connection", SimpleNamespace(dispose=dispose))
+    monkeypatch.setattr(main, "get_worker_pool", lambda: SimpleNamespace(shutdown=lambda: calls.append("pool")))
+    monkeypatch.setattr(main, "get_tracer", lambda: SimpleNamespace(shutdown=lambda: calls.append("tracer")))
+    monkeypatch.setattr(main, "get_user_dao", functools.lru_cache(lambda: pytest.fail("DAO создан при остановке")))
+
+    with pytest.raises(RuntimeError, match="stop failed"):
+        async with main.fastapi_app.lifespan(main.app):
+            pass
+
+    assert calls == ["monitor", "pool", "db", "tracer"]
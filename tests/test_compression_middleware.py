@@ -0,0 +1,105 @@
+"""Тесты миддлвейра сжатия ответов (без БД)."""
+from __future__ import annotations
+
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.api.middlewares.compression import (
+    CompressionMiddleware,
+    available_encodings,
+    negotiate_encoding,
+)
+
+
+BIG_BODY = "x" * 4096
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Создает `TestClient` для минимального приложения с миддлвейром."""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/big")
+    async def big():
+        return PlainTextResponse(BIG_BODY)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i};" * 200
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/sse")
+    async def sse():
+        async def events():
+            yield "data: " + "y" * 2048 + "\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_negotiate_prefers_highest_q():
+    """Берётся кодировка с наибольшим `q`, `q=0` исключает кодировку."""
+    assert negotiate_encoding("gzip;q=0.5, br", ("zstd", "br", "gzip")) == "br"
+    assert negotiate_encoding("gzip;q=0, *;q=0.1", ("gzip",)) is None
+    assert negotiate_encoding("*", ("zstd", "gzip")) == "zstd"
+    assert negotiate_encoding("", ("gzip",)) is None
+
+
+def test_big_response_is_gzipped(client: TestClient):
+    """Ответ больше порога сжимается и помечается `Content-Encoding`."""
+    resp = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in resp.headers["vary"].lower()
+    assert resp.text == BIG_BODY
+
+
+def test_small_response_is_not_compressed(client: TestClient):
+    """Ответ меньше порога уходит без сжатия."""
+    resp = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers
+    assert resp.text == "ok"
+
+
+def test_streaming_response_chunks_are_flushed(client: TestClient):
+    """Потоковый ответ сжимается без `Content-Length` и корректно распаковывается."""
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as resp:
+        assert resp.headers["content-encoding"] == "gzip"
+        assert "content-length" not in resp.headers
+        raw = b"".join(resp.iter_raw())
+    expected = "".join(f"chunk-{i};" * 200 for i in range(3))
+    assert gzip.decompress(raw).decode() == expected
+
+
+def test_event_stream_is_never_compressed(client: TestClient):
+    """SSE не сжимается, чтобы события не задерживались в буфере компрессора."""
+    resp = client.get("/sse", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers
+
+
+@pytest.mark.parametrize("encoding", [e for e in ("br", "zstd") if e in available_encodings()])
+def test_optional_encodings_roundtrip(encoding: str):
+    """Опциональные кодировки дают распаковываемый поток."""
+    middleware = CompressionMiddleware(app=None)  # type: ignore[arg-type]
+    compressor = middleware.make_compressor(encoding)
+    data = compressor.compress(BIG_BODY.encode()) + compressor.flush() + compressor.finish()
+    if encoding == "br":
+        import brotli
+        assert brotli.decompress(data) == BIG_BODY.encode()
+    else:
+        import zstandard
+        assert zstandard.ZstdDecompressor().decompressobj().decompress(data) == BIG_BODY.encode()
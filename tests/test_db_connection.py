@@ -0,0 +1,39 @@
+"""Тесты изоляции тестов транзакцией: `DbConnection.bound_to` и `connect` (SQLite)."""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.connection import DbConnection
+
+
+@pytest.mark.asyncio
+async def test_bound_to_joins_outer_transaction(tmp_path):
+    """`commit` сессии внутри `bound_to` фиксирует SAVEPOINT; откат внешней транзакции убирает данные."""
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+    # Рецепт SQLAlchemy для SAVEPOINT в pysqlite/aiosqlite: транзакциями управляет SQLAlchemy
+    event.listen(engine.sync_engine, "connect", lambda dbapi_conn, _: setattr(dbapi_conn, "isolation_level", None))
+    event.listen(engine.sync_engine, "begin", lambda conn: conn.exec_driver_sql("BEGIN"))
+    db = DbConnection(engine)
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            with db.bound_to(connection):
+                async with db.get_session() as session:
+                    await session.execute(text("INSERT INTO items (id) VALUES (1)"))
+                    await session.commit()
+                async with db.connect() as conn:
+                    assert conn is connection
+                    assert (await conn.execute(text("SELECT count(*) FROM items"))).scalar() == 1
+            await transaction.rollback()
+
+        async with db.connect() as conn:
+            assert conn is not connection
+            assert (await conn.execute(text("SELECT count(*) FROM items"))).scalar() == 0
+    finally:
+        await engine.dispose()
@@ -0,0 +1,179 @@
+"""Тесты дедлайнов запросов: бюджет, 504 по `statement_timeout` и отмена при отключении клиента."""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy.exc import DBAPIError
+
+from app.api.dependencies.db import get_db_session
+from app.api.dependencies.deadline import get_request_deadline
+from app.api.middlewares.disconnect import CancelOnDisconnectMiddleware
+from app.database.connection import db_connection
+from app.modules.deadline import (
+    Deadline,
+    current_deadline,
+    is_statement_timeout,
+    needs_statement_timeout,
+    request_timeout,
+    resolve_timeout_ms,
+    route_timeout_ms,
+)
+
+
+class _PgError(Exception):
+    """Ошибка драйвера с SQLSTATE, как у адаптера asyncpg."""
+    def __init__(self, pgcode: str) -> None:
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+def _query_canceled() -> DBAPIError:
+    return DBAPIError("SELECT pg_sleep(10)", {}, _PgError("57014"))
+
+
+def test_resolve_timeout():
+    """Заголовок заменяет бюджет маршрута, но не больше границы; `0`/`None` — без дедлайна."""
+    assert resolve_timeout_ms(30_000, None, 120_000) == 30_000
+    assert resolve_timeout_ms(30_000, 500, 120_000) == 500
+    assert resolve_timeout_ms(30_000, 600_000, 120_000) == 120_000
+    assert resolve_timeout_ms(None, None, 120_000) is None
+    assert resolve_timeout_ms(0, 1_000, 120_000) == 1_000
+    assert resolve_timeout_ms(30_000, 600_000, 0) == 600_000
+
+
+def test_route_timeout_and_deadline_clock():
+    """`request_timeout` задаёт бюджет маршрута; остаток считается по переданным часам."""
+    @request_timeout(2_000)
+    async def endpoint():
+        pass
+
+    assert route_timeout_ms(endpoint, 30_000) == 2_000
+    assert route_timeout_ms(lambda: None, 30_000) == 30_000
+
+    now = [100.0]
+    deadline = Deadline(1_500, clock=lambda: now[0])
+    assert deadline.remaining_ms() == 1_500 and not deadline.expired
+    now[0] += 2
+    assert deadline.remaining_ms() == 0 and deadline.expired
+
+
+def test_is_statement_timeout():
+    """504 только для SQLSTATE 57014."""
+    assert is_statement_timeout(_query_canceled())
+    assert not is_statement_timeout(DBAPIError("SELECT 1", {}, _PgError("23505")))
+    assert not is_statement_timeout(TimeoutError())
+
+
+def test_statement_timeout_skipped_near_connection_default():
+    """`set_config` не нужен, только если остаток не больше значения соединения и близок к нему."""
+    assert needs_statement_timeout(29_990, 0)
+    assert not needs_statement_timeout(29_990, 30_000)
+    assert not needs_statement_timeout(30_000, 30_000)
+    assert needs_statement_timeout(20_000, 30_000)
+    assert needs_statement_timeout(60_000, 30_000)
+
+
+class _FakeSession:
+    """Сессия без БД: хватает `sync_session` для подписки на `after_begin`."""
+    def __init__(self) -> None:
+        from sqlalchemy.orm import Session
+
+        self.sync_session = Session()
+
+    async def __aenter__(self) -> "_FakeSession":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_statement_timeout_maps_to_504(monkeypatch):
+    """Отмена запроса по `statement_timeout` в эндпоинте превращается в 504; дедлайн виден в контексте."""
+    monkeypatch.setattr(db_connection, "get_session", _FakeSession)
+    app = FastAPI()
+    seen: list[Deadline | None] = []
+
+    @app.get("/slow")
+    @request_timeout(5_000)
+    async def slow(session=Depends(get_db_session)):
+        seen.append(current_deadline())
+        raise _query_canceled()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/slow", headers={"X-Request-Timeout": "750"})
+        bad = await client.get("/slow", headers={"X-Request-Timeout": "-1"})
+
+    assert resp.status_code == 504
+    assert "750" in resp.json()["detail"]
+    assert seen[0].timeout_ms == 750
+    assert bad.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_deadline_dependency_uses_route_budget():
+    """Без заголовка действует бюджет из `request_timeout`."""
+    app = FastAPI()
+
+    @app.get("/budget")
+    @request_timeout(1_234)
+    async def budget(deadline=Depends(get_request_deadline)):
+        return {"timeout_ms": deadline.timeout_ms}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/budget")
+    assert resp.json() == {"timeout_ms": 1_234}
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_handler():
+    """`http.disconnect` до конца ответа отменяет обработчик; после ответа — нет."""
+    started, cancelled = asyncio.Event(), asyncio.Event()
+
+    async def slow_app(scope, receive, send):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    disconnect = asyncio.Event()
+
+    async def receive():
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise AssertionError("ответ не должен отправляться")
+
+    middleware = CancelOnDisconnectMiddleware(slow_app)
+    call = asyncio.create_task(middleware({"type": "http", "method": "GET", "path": "/slow"}, receive, send))
+    await started.wait()
+    disconnect.set()
+    await asyncio.wait_for(call, 1)
+    assert cancelled.is_set()
+    assert middleware.cancelled == 1
+
+    sent: list[dict] = []
+
+    async def fast_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+        assert (await receive())["type"] == "http.disconnect"
+
+    async def receive_after_response():
+        return {"type": "http.disconnect"}
+
+    async def collect(message):
+        sent.append(message)
+
+    middleware = CancelOnDisconnectMiddleware(fast_app)
+    await middleware({"type": "http", "method": "GET", "path": "/"}, receive_after_response, collect)
+    assert middleware.cancelled == 0
+    assert [message["type"] for message in sent] == ["http.response.start", "http.response.body"]
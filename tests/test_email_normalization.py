@@ -0,0 +1,61 @@
+"""Тесты регистронезависимого email: нормализация и функциональный индекс (без Postgres)."""
+from __future__ import annotations
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
+
+from app.api.dao.user import UserDAO
+from app.database.models import User
+
+
+def test_normalize_email():
+    """Email приводится к нижнему регистру без пробелов по краям."""
+    assert UserDAO.normalize_email("  John.Doe@Example.COM ") == "john.doe@example.com"
+
+
+def test_users_have_unique_lower_email_index():
+    """Модель объявляет уникальный индекс по `lower(email)`, индекса по `email` с учётом регистра нет."""
+    indexes = {index.name: index for index in User.__table__.indexes}
+
+    assert "ix_users_email" not in indexes
+    assert not User.__table__.c.email.unique
+    ddl = str(CreateIndex(indexes["ux_users_email_lower"]).compile(dialect=postgresql.dialect()))
+    assert ddl == "CREATE UNIQUE INDEX ux_users_email_lower ON users (lower(email))"
+
+
+def _unique_violation(constraint_name: str) -> IntegrityError:
+    """Ошибка как от адаптера asyncpg: имя ограничения — в исходной ошибке драйвера."""
+    cause = Exception("duplicate key value violates unique constraint")
+    cause.constraint_name = constraint_name
+    orig = Exception(str(cause))
+    orig.pgcode = "23505"
+    orig.__cause__ = cause
+    return IntegrityError("INSERT", {}, orig)
+
+
+def test_only_email_index_violation_is_a_duplicate_email():
+    """Дублем email считается только нарушение его индекса, другие `23505` — нет."""
+    assert UserDAO._is_unique_violation(_unique_violation("ux_users_email_lower"), UserDAO.EMAIL_CONSTRAINTS)
+    assert not UserDAO._is_unique_violation(_unique_violation("users_pkey"), UserDAO.EMAIL_CONSTRAINTS)
+    assert UserDAO._is_unique_violation(_unique_violation("users_pkey"))
+
+
+def test_coalesced_rows_match_normalized_emails():
+    """Строки `RETURNING` сопоставляются с нормализованными входами, дубль по регистру — конфликт."""
+    users = [
+        {"email": UserDAO.normalize_email(email), "full_name": "U", "is_hidden": False}
+        for email in ("A@x.com", "a@X.com")
+    ]
+    inserted = [{"id": 1, "email": "a@x.com"}]
+
+    first, second = UserDAO.match_inserted_rows(users, inserted)
+    assert first["id"] == 1
+    assert isinstance(second, Exception)
+
+
+def test_lookup_expression_matches_index():
+    """Условие поиска совпадает с выражением индекса, иначе планировщик его не использует."""
+    sql = str(select(User).where(func.lower(User.email) == "x").compile(dialect=postgresql.dialect()))
+    assert "lower(users.email) =" in sql
@@ -0,0 +1,142 @@
+"""Тесты потоковой выгрузки пользователей (без Postgres: соединение asyncpg подменено)."""
+from __future__ import annotations
+
+import asyncio
+import io
+from datetime import datetime, timezone
+
+import pytest
+
+from app.api.dao.user import UserDAO
+from app.api.exceptions.base import ServiceUnavailableException
+from app.api.v1.routes import users as users_routes
+from app.database.models import User
+from app.modules.export import copy_query_chunks, fetch_batches
+
+
+class FakeCopyConnection:
+    """Имитирует `copy_from_query`/`cursor` asyncpg (куски COPY — `bytearray`, как у драйвера)."""
+
+    def __init__(self, chunks: list[bytes], error: Exception | None = None) -> None:
+        self.chunks = chunks
+        self.error = error
+        self.sent = 0
+        self.calls: list[tuple] = []
+
+    async def copy_from_query(self, query, *args, output, format, header):
+        self.calls.append((query, args, format, header))
+        for chunk in self.chunks:
+            await output(bytearray(chunk))
+            self.sent += 1
+        if self.error is not None:
+            raise self.error
+
+    def transaction(self, readonly=False):
+        class _Tx:
+            async def __aenter__(self_inner):
+                return self_inner
+
+            async def __aexit__(self_inner, *exc):
+                return False
+
+        return _Tx()
+
+    async def cursor(self, query, *args):
+        rows = list(self.chunks)
+
+        class _Cursor:
+            async def fetch(self_inner, n):
+                batch, rows[:] = rows[:n], rows[n:]
+                return batch
+
+        return _Cursor()
+
+
+def test_export_query_without_filters_is_plain_scan():
+    query, args = UserDAO().export_query()
+    assert query == f"SELECT {', '.join(User.__table__.c.keys())} FROM users"
+    assert args == []
+
+
+def test_export_query_numbers_only_given_filters():
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    query, args = UserDAO().export_query(created_from=start, is_hidden=False)
+    assert query.endswith("WHERE created_at >= $1 AND is_hidden = $2")
+    assert args == [start, False]
+
+
+def test_copy_chunks_are_streamed_in_order():
+    connection = FakeCopyConnection([b"id,email\n", b"1,a@example.com\n"])
+
+    async def scenario():
+        return [chunk async for chunk in copy_query_chunks(connection, "SELECT 1", [5])]
+
+    chunks = asyncio.run(scenario())
+    assert chunks == [b"id,email\n", b"1,a@example.com\n"]
+    assert all(type(chunk) is bytes for chunk in chunks)
+    assert connection.calls == [("SELECT 1", (5,), "csv", True)]
+
+
+def test_copy_applies_backpressure_and_stops_on_close():
+    """Пока клиент не читает, COPY не уходит дальше размера очереди; закрытие прерывает его."""
+    connection = FakeCopyConnection([b"x"] * 100)
+
+    async def scenario():
+        stream = copy_query_chunks(connection, "SELECT 1", max_chunks=2)
+        first = await anext(stream)
+        await asyncio.sleep(0.01)
+        sent_while_idle = connection.sent
+        await stream.aclose()
+        return first, sent_while_idle
+
+    first, sent_while_idle = asyncio.run(scenario())
+    assert first == b"x"
+    assert sent_while_idle <= 4
+    assert connection.sent < 100
+
+
+def test_copy_error_is_raised_to_consumer():
+    connection = FakeCopyConnection([b"a"], error=RuntimeError("boom"))
+
+    async def scenario():
+        return [chunk async for chunk in copy_query_chunks(connection, "SELECT 1")]
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(scenario())
+
+
+def test_fetch_batches_have_fixed_size():
+    connection = FakeCopyConnection(list(range(5)))
+
+    async def scenario():
+        return [batch async for batch in fetch_batches(connection, "SELECT 1", batch_size=2)]
+
+    assert asyncio.run(scenario()) == [[0, 1], [2, 3], [4]]
+
+
+def test_parquet_export_requires_pyarrow(monkeypatch):
+    monkeypatch.setattr(users_routes, "parquet_available", lambda: False)
+    with pytest.raises(ServiceUnavailableException):
+        asyncio.run(users_routes.export_users(UserDAO(), file_format="parquet"))
+
+
+def test_parquet_chunks_roundtrip():
+    """Пачки строк собираются в корректный Parquet с группой строк на пачку."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    from app.modules.export import arrow_schema, parquet_chunks
+
+    created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = [(i, f"u{i}@example.com", f"User {i}", i % 2 == 0, created) for i in range(5)]
+
+    async def batches():
+        yield rows[:3]
+        yield rows[3:]
+
+    async def scenario():
+        schema = arrow_schema(list(User.__table__.c))
+        return b"".join([chunk async for chunk in parquet_chunks(batches(), schema)])
+
+    parquet = pq.ParquetFile(io.BytesIO(asyncio.run(scenario())))
+    assert parquet.metadata.num_rows == 5
+    assert parquet.metadata.num_row_groups == 2
+    assert parquet.read().column("email").to_pylist()[4] == "u4@example.com"
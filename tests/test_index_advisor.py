@@ -0,0 +1,137 @@
+"""Тесты советника индексов: правила, миграция-кандидат и закрытый по умолчанию эндпоинт."""
+from __future__ import annotations
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.config.config_reader import env_config
+from app.modules.index_advisor import (
+    ColumnStats,
+    IndexSnapshot,
+    IndexStats,
+    analyze_indexes,
+    build_index_report,
+    render_migration,
+)
+
+
+def _index(name: str, columns: list[str], table: str = "users", **overrides) -> IndexStats:
+    """Индекс с типичными счётчиками: используется, таблица на 100 тысяч строк."""
+    fields = dict(
+        table=table, name=name, method="btree", columns=tuple(columns), predicate=None,
+        is_unique=False, is_primary=False, backs_constraint=False, is_valid=True,
+        definition=f"CREATE INDEX {name} ...", size_bytes=2_000_000, scans=500,
+        tuples_read=500, blocks_read=10, blocks_hit=1000, table_rows=100_000, table_writes=50_000,
+    )
+    fields.update(overrides)
+    return IndexStats(**fields)
+
+
+def _snapshot(*indexes: IndexStats, columns: dict | None = None) -> IndexSnapshot:
+    return IndexSnapshot(list(indexes), columns or {}, None)
+
+
+def _kinds(findings) -> dict[str, set[str]]:
+    result: dict[str, set[str]] = {}
+    for finding in findings:
+        result.setdefault(finding.index, set()).add(finding.kind)
+    return result
+
+
+def test_current_users_schema():
+    """Схема users: `ix_users_email` избыточен при `ux_users_email_lower`, `ix_users_is_hidden` малоселективен."""
+    snapshot = _snapshot(
+        _index("users_pkey", ["id"], is_unique=True, is_primary=True, backs_constraint=True),
+        _index("ix_users_email", ["email"], is_unique=True, scans=0),
+        _index("ux_users_email_lower", ["lower(email::text)"], is_unique=True),
+        _index("idx_user_email_is_hidden", ["email", "is_hidden"], scans=5),
+        _index("ix_users_is_hidden", ["is_hidden"], scans=12),
+        _index("orders_pkey", ["id"], table="orders", is_unique=True, is_primary=True, backs_constraint=True),
+        _index("ix_orders_user_id", ["user_id"], table="orders"),
+        _index("users_hidden_pkey", ["user_id"], table="users_hidden", is_unique=True, is_primary=True,
+               backs_constraint=True),
+        _index("ix_users_hidden_hidden_at", ["hidden_at"], table="users_hidden"),
+        columns={("users", "is_hidden"): ColumnStats("users", "is_hidden", 2, 0.97)},
+    )
+    findings = analyze_indexes(snapshot)
+    kinds = _kinds(findings)
+
+    assert kinds == {
+        # Миграция 7d41e0b9c3a5 удаляет его, в моделях индекса уже нет
+        "ix_users_email": {"redundant", "unused", "not_in_models"},
+        "ix_users_is_hidden": {"low_selectivity"},
+    }
+    droppable = {finding.index for finding in findings if finding.droppable}
+    assert droppable == {"ix_users_email", "ix_users_is_hidden"}
+
+    migration = render_migration(findings, snapshot.indexes)
+    assert "drop_index_concurrently('ix_users_email', 'users')" in migration
+    assert "create_index_concurrently('ix_users_email', 'users', ['email'], unique=True)" in migration
+    assert "create_index_concurrently('ix_users_is_hidden', 'users', ['is_hidden'])" in migration
+    compile(migration, "migration.py", "exec")
+
+
+def test_duplicate_prefix_unused_and_model_drift():
+    """Дубли, начало другого индекса, неиспользуемые и расхождения с моделями; ограничения не удаляются."""
+    snapshot = _snapshot(
+        _index("users_pkey", ["id"], is_unique=True, is_primary=True, backs_constraint=True, scans=0),
+        _index("ix_users_email", ["email"], is_unique=True),
+        _index("ux_users_email_lower", ["lower(email::text)"], is_unique=True),
+        _index("ix_users_is_hidden", ["is_hidden"]),
+        _index("idx_user_email_is_hidden", ["email", "is_hidden"], scans=0),
+        _index("ix_users_is_hidden_copy", ["is_hidden"], scans=0),
+        _index("ix_users_full_name_part", ["full_name"], predicate="is_hidden", is_valid=False),
+    )
+    findings = analyze_indexes(snapshot)
+    kinds = _kinds(findings)
+
+    assert "users_pkey" not in kinds
+    assert kinds["ix_users_is_hidden_copy"] >= {"duplicate", "not_in_models"}
+    assert kinds["idx_user_email_is_hidden"] == {"unused"}
+    assert "not_in_models" in kinds["ix_users_email"]
+    assert "invalid" in kinds["ix_users_full_name_part"]
+    assert kinds["ix_orders_user_id"] == {"missing"}
+    # Используемый ix_users_email нужен для поиска по точному email и остаётся
+    assert not any(f.droppable for f in findings if f.index == "ix_users_email")
+
+    migration = render_migration(findings, snapshot.indexes)
+    assert "postgresql_where=sa.text('is_hidden')" in migration
+
+
+def test_prefix_index_is_redundant():
+    """Btree-индекс по `(a)` не нужен при индексе по `(a, b)`."""
+    snapshot = _snapshot(
+        _index("ix_orders_user_id", ["user_id"], table="orders"),
+        _index("ix_orders_user_id_created_at", ["user_id", "created_at"], table="orders"),
+    )
+    redundant = [f for f in analyze_indexes(snapshot) if f.kind == "redundant"]
+    assert [(f.index, f.droppable) for f in redundant] == [("ix_orders_user_id", True)]
+
+
+def test_no_droppable_indexes_no_migration():
+    """Без удаляемых индексов миграция не предлагается."""
+    snapshot = _snapshot(_index("users_pkey", ["id"], is_unique=True, is_primary=True, backs_constraint=True))
+    assert render_migration(analyze_indexes(snapshot), snapshot.indexes) is None
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoint_disabled_by_default(monkeypatch):
+    """Без `ADMIN_API_ENABLED` маршрут отвечает 404 и не обращается к БД."""
+    from main import app
+
+    monkeypatch.setattr(env_config, "admin_api_enabled", False)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/v1/admin/indexes")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_report_on_migrated_schema(db_conn: AsyncConnection):
+    """На БД после миграций все индексы моделей на месте, лишних нет."""
+    report = await build_index_report(db_conn)
+    names = {index.name for index in report.indexes}
+    assert {"idx_user_email_is_hidden", "ix_users_is_hidden", "ux_users_email_lower", "ix_orders_user_id"} <= names
+    assert "ix_users_email" not in names
+    assert not [f for f in report.findings if f.kind in ("missing", "not_in_models", "invalid", "duplicate")]
@@ -0,0 +1,244 @@
+"""Тесты кэша с версиями и шины инвалидации (в памяти, без Postgres)."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from app.modules.invalidation import (
+    InMemoryInvalidationBus,
+    InvalidationMessage,
+    VersionedCache,
+    invalidate_after_commit,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_rejects_value_read_before_invalidation():
+    """Значение, прочитанное до инвалидации, не попадает в кэш."""
+    cache = VersionedCache()
+    token = cache.token()
+    cache.invalidate(["user:1"])
+    assert cache.set("user:1", "old", token) is False
+    assert cache.lookup("user:1") == (False, None)
+
+    assert cache.set("user:1", "new", cache.token()) is True
+    assert cache.lookup("user:1") == (True, "new")
+
+
+def test_cache_caches_none_and_expires():
+    """Ответ «не найден» кэшируется, запись живёт не дольше TTL."""
+    clock = FakeClock()
+    cache = VersionedCache(ttl=10, clock=clock)
+    cache.set("user:1", None, cache.token())
+    assert cache.lookup("user:1") == (True, None)
+    clock.now = 10
+    assert cache.lookup("user:1") == (False, None)
+
+
+def test_cache_bounded_invalidation_history_stays_safe():
+    """Вытесненная из истории инвалидация поднимает пол токенов."""
+    cache = VersionedCache(max_entries=2)
+    token = cache.token()
+    cache.invalidate(["a"])
+    cache.invalidate(["b"])
+    cache.invalidate(["c"])  # "a" вытеснена из истории
+    assert cache.set("a", 1, token) is False
+    assert cache.set("a", 1, cache.token()) is True
+
+
+def test_bus_batches_and_invalidates_other_workers():
+    """Ключи уходят одним сообщением и очищают кэши других воркеров."""
+    async def scenario():
+        peers: list[InMemoryInvalidationBus] = []
+        writer = InMemoryInvalidationBus(peers, max_delay=0.01)
+        reader = InMemoryInvalidationBus(peers, max_delay=0.01)
+        writer_cache, reader_cache = VersionedCache(), VersionedCache()
+        writer.subscribe(writer_cache)
+        reader.subscribe(reader_cache)
+        for cache in (writer_cache, reader_cache):
+            cache.set("user:1", "old", cache.token())
+            cache.set("user:2", "old", cache.token())
+
+        writer.invalidate("user:1")
+        writer.invalidate("user:2")
+        assert writer_cache.lookup("user:1") == (False, None)  # свой кэш — сразу
+        assert reader_cache.lookup("user:1") == (True, "old")
+        await asyncio.sleep(0.05)
+        return writer, reader, reader_cache
+
+    writer, reader, reader_cache = asyncio.run(scenario())
+    assert writer.sent == 1 and reader.received == 1
+    assert len(reader_cache) == 0
+
+
+def test_bus_flushes_full_batch_immediately():
+    """При наборе `max_batch` ключей сообщение уходит без ожидания окна."""
+    async def scenario():
+        bus = InMemoryInvalidationBus(max_batch=2, max_delay=60)
+        bus.invalidate("a", "b", "c")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return bus
+
+    bus = asyncio.run(scenario())
+    assert bus.sent == 2 and bus.stats()["pending"] == 0
+
+
+def test_bus_splits_batches_by_payload_size():
+    """Длинные ключи делятся на сообщения по размеру: ни одно не превышает предел NOTIFY, пропусков нет."""
+    from app.modules.invalidation.postgres import NOTIFY_PAYLOAD_LIMIT
+
+    peers: list[InMemoryInvalidationBus] = []
+    sizes: list[int] = []
+    writer = InMemoryInvalidationBus(peers, max_batch=100, max_payload_bytes=NOTIFY_PAYLOAD_LIMIT)
+    reader = InMemoryInvalidationBus(peers)
+    received: list[str] = []
+
+    class Recorder:
+        def invalidate(self, keys):
+            received.extend(keys)
+
+        def clear(self):
+            raise AssertionError("пропуск сообщения")
+
+    reader.subscribe(Recorder())
+    send = writer._send
+
+    async def measured_send(message):
+        sizes.append(len(message.to_json().encode("utf-8")))
+        await send(message)
+
+    writer._send = measured_send
+    keys = [f"email:{'x' * 240}{n}@example.com" for n in range(100)]
+
+    async def scenario():
+        writer.invalidate(*keys)
+        await writer.flush()
+
+    asyncio.run(scenario())
+    assert len(sizes) > 1 and max(sizes) <= NOTIFY_PAYLOAD_LIMIT
+    assert writer.send_errors == 0
+    assert received == keys
+
+
+def test_missed_message_clears_cache():
+    """Пропуск номера сообщения очищает кэш получателя целиком."""
+    bus = InMemoryInvalidationBus()
+    cache = VersionedCache()
+    bus.subscribe(cache)
+    cache.set("user:9", "value", cache.token())
+
+    bus._receive(InvalidationMessage("other", 1, ("user:1",)))
+    assert cache.lookup("user:9") == (True, "value")
+    bus._receive(InvalidationMessage("other", 3, ("user:2",)))
+    assert len(cache) == 0 and bus.gaps == 1 and cache.clears == 1
+
+
+def test_failed_send_is_detected_by_peers():
+    """Неотправленное сообщение занимает номер — получатели видят пропуск."""
+    class FlakyBus(InMemoryInvalidationBus):
+        fail = True
+
+        async def _send(self, message):
+            if self.fail:
+                self.fail = False
+                raise ConnectionError("down")
+            await super()._send(message)
+
+    async def scenario():
+        peers: list[InMemoryInvalidationBus] = []
+        writer, reader = FlakyBus(peers), InMemoryInvalidationBus(peers)
+        reader._receive(InvalidationMessage(writer.source, 0, ()))  # получатель уже знает отправителя
+        writer.invalidate("user:1")
+        await writer.flush()
+        writer.invalidate("user:2")
+        await writer.flush()
+        return writer, reader
+
+    writer, reader = asyncio.run(scenario())
+    assert writer.send_errors == 1 and reader.gaps == 1
+
+
+def test_message_roundtrip():
+    message = InvalidationMessage("src", 5, ("user:1", "user:2"))
+    assert InvalidationMessage.from_json(message.to_json()) == message
+
+
+def test_invalidation_waits_for_commit():
+    """Ключи уходят в шину только после COMMIT, при откате — отбрасываются."""
+    async def scenario():
+        bus = InMemoryInvalidationBus(max_delay=60)
+        engine = create_engine("sqlite://")
+        with Session(engine) as session:
+            session.execute(text("SELECT 1"))
+            invalidate_after_commit(session, bus, "user:1")
+            assert bus.stats()["pending"] == 0
+            session.rollback()
+
+            session.execute(text("SELECT 1"))
+            invalidate_after_commit(session, bus, "user:2")
+            session.commit()
+        pending = list(bus._pending)
+        await bus.stop()
+        return pending
+
+    assert asyncio.run(scenario()) == ["user:2"]
+
+
+def test_user_dao_caches_by_id_until_commit_invalidates(monkeypatch):
+    """`get_by_id` кэширует и «не найден»; созданный пользователь виден после COMMIT."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.api.dao.user import UserDAO
+    from app.api.v1.models.request import CreateUserRequestModel
+    from app.config.config_reader import env_config
+    from app.modules.invalidation import factory
+
+    monkeypatch.setattr(env_config, "user_cache_enabled", True)
+    monkeypatch.setattr(env_config, "user_write_coalesce_enabled", False)
+    monkeypatch.setattr(env_config, "cache_invalidation_backend", "memory")
+    monkeypatch.setattr(factory, "_bus", None)
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            # BIGINT из модели в SQLite не автоинкрементный
+            await conn.execute(text(
+                "CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR(255) NOT NULL UNIQUE, "
+                "full_name TEXT NOT NULL, is_hidden BOOLEAN NOT NULL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            ))
+        statements: list[str] = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        dao = UserDAO()
+        try:
+            async with AsyncSession(engine) as session:
+                async with session.begin():
+                    first = await dao.get_by_id(1, session)
+                    second = await dao.get_by_id(1, session)
+                reads = len(statements)
+                async with session.begin():
+                    await dao.create(
+                        CreateUserRequestModel(email="new@example.com", full_name="New User"), session
+                    )
+                async with session.begin():
+                    created = await dao.get_by_id(1, session)
+            await dao.invalidation.stop()
+        finally:
+            await engine.dispose()
+        return first, second, reads, created
+
+    first, second, reads, created = asyncio.run(scenario())
+    assert first is None and second is None
+    assert reads == 1
+    assert created is not None and created.email == "new@example.com"
@@ -0,0 +1,67 @@
+"""Тесты реестра логгеров и записи логов через процесс-писатель (без БД)."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from app.modules.logging.app_logger import get_app_logger
+from app.modules.logging.shipping import LogShipper
+from app.modules.logging.writer import LogWriter
+
+
+def test_registry_reuses_logger_and_handlers():
+    """Повторный вызов с тем же именем не создаёт новый логгер и обработчики."""
+    first = get_app_logger("registry_test")
+    second = get_app_logger("registry_test", to_console=True)
+    third = get_app_logger("registry_test", to_console=True)
+
+    assert first is second is third
+    assert len(third.handlers) == 2
+
+
+def test_writer_collects_records_from_concurrent_senders(tmp_path):
+    """Записи нескольких отправителей попадают в файл целыми строками, без потерь."""
+    socket_path = str(tmp_path / "writer.sock")
+    writer = LogWriter(socket_path, tmp_path / "logs", flush_interval=0.05)
+    writer.bind()
+    thread = threading.Thread(target=writer.serve_forever, daemon=True)
+    thread.start()
+
+    def send(sender: int) -> None:
+        shipper = LogShipper(socket_path)
+        logger = logging.Logger("aggregated")
+        logger.addHandler(shipper.handler)
+        for i in range(200):
+            logger.info("sender=%d line=%d %s", sender, i, "x" * 200)
+        shipper.stop()
+
+    senders = [threading.Thread(target=send, args=(n,)) for n in range(4)]
+    for sender in senders:
+        sender.start()
+    for sender in senders:
+        sender.join()
+
+    deadline = time.monotonic() + 5
+    while writer.records < 800 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    writer.stop()
+    thread.join(timeout=5)
+
+    files = list((tmp_path / "logs" / "aggregated").glob("*_logs.log"))
+    assert len(files) == 1
+    lines = files[0].read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 800
+    assert all(line.endswith("x" * 200) and "[INFO] - sender=" in line for line in lines)
+    # Буфер сбрасывается пачками, а не после каждой строки
+    assert writer.flushes < writer.records
+
+
+def test_writer_keeps_records_inside_log_root(tmp_path):
+    """Имя логгера не может вывести запись за пределы каталога логов."""
+    writer = LogWriter(str(tmp_path / "w.sock"), tmp_path / "logs")
+
+    handler = writer._handler_for("../../etc/evil")
+
+    assert handler.log_dir.resolve().is_relative_to((tmp_path / "logs").resolve())
+    writer.close()
@@ -0,0 +1,49 @@
+"""Тесты монитора лага event loop (без БД)."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from app.modules.monitoring.loop_lag import LagHistogram, LoopLagMonitor
+
+
+def test_histogram_is_cumulative():
+    """Корзины накопительные, агрегаты считаются по всем измерениям."""
+    histogram = LagHistogram()
+    for lag in (0.5, 3, 30, 7000):
+        histogram.observe(lag)
+
+    snap = histogram.snapshot()
+    assert snap["count"] == 4
+    assert snap["max_ms"] == 7000
+    assert snap["buckets"]["<=1"] == 1
+    assert snap["buckets"]["<=5"] == 2
+    assert snap["buckets"]["<=50"] == 3
+    assert snap["buckets"]["+Inf"] == 4
+
+
+def _blocking_call():
+    """Синхронная «тяжёлая» функция, блокирующая event loop."""
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_monitor_captures_stack_of_blocking_call():
+    """Во время блокировки сторожевой поток снимает стек с блокирующей функцией."""
+    monitor = LoopLagMonitor(interval=0.02, threshold=0.05, logger=logging.getLogger("test_loop_lag"))
+    await monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        _blocking_call()
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert monitor.stalls >= 1
+    assert monitor.last_stall_stack is not None
+    assert "_blocking_call" in monitor.last_stall_stack
+    assert monitor.histogram.max_ms >= 200
+    assert not monitor.running
@@ -0,0 +1,121 @@
+"""Тесты хелперов миграций без простоя (SQLite и генерация SQL для PostgreSQL)."""
+from __future__ import annotations
+
+import io
+
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from app.database.migration_helpers import (
+    add_foreign_key_not_valid,
+    backfill_column,
+    create_index_concurrently,
+    drop_index_concurrently,
+    set_not_null,
+)
+
+
+@pytest.fixture
+def sqlite_ops():
+    """Контекст миграции на SQLite с таблицей из 25 строк с разреженными `id`."""
+    engine = sa.create_engine("sqlite://")
+    with engine.connect() as conn:
+        conn.execute(sa.text("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, email_lower TEXT)"))
+        conn.execute(
+            sa.text("INSERT INTO users (id, email) VALUES (:id, :email)"),
+            [{"id": i * 7 - 100, "email": f"User{i}@Example.com"} for i in range(25)],
+        )
+        conn.commit()
+        context = MigrationContext.configure(conn)
+        with Operations.context(context):
+            yield conn
+    engine.dispose()
+
+
+@pytest.fixture
+def pg_sql():
+    """Offline-контекст PostgreSQL: операции пишут SQL в буфер вместо выполнения."""
+    buffer = io.StringIO()
+    context = MigrationContext.configure(
+        dialect_name="postgresql",
+        opts={"as_sql": True, "output_buffer": buffer, "transactional_ddl": True},
+    )
+    with Operations.context(context):
+        yield buffer
+
+
+def test_backfill_updates_all_rows_in_batches(sqlite_ops):
+    """Все строки заполнены, по одному отчёту о прогрессе на пачку."""
+    reports: list[tuple[int, int, int]] = []
+
+    updated = backfill_column(
+        "users", "email_lower", "lower(email)",
+        batch_size=10, pause=0, progress=lambda *args: reports.append(args),
+    )
+
+    assert updated == 25
+    assert [report[0] for report in reports] == [10, 20, 25]
+    assert reports[-1][1] == reports[-1][2] == 24 * 7 - 100
+    rows = sqlite_ops.execute(sa.text("SELECT email, email_lower FROM users")).all()
+    assert all(lower == email.lower() for email, lower in rows)
+
+
+def test_backfill_skips_filled_rows(sqlite_ops):
+    """Повторный запуск не трогает уже заполненные строки."""
+    backfill_column("users", "email_lower", "lower(email)", batch_size=10, pause=0, progress=lambda *a: None)
+    assert backfill_column("users", "email_lower", "lower(email)", pause=0, progress=lambda *a: None) == 0
+
+
+def test_backfill_where_limits_rows(sqlite_ops):
+    """Условие `where` сужает обновление до подходящих строк."""
+    updated = backfill_column(
+        "users", "email_lower", "lower(email)",
+        batch_size=10, pause=0, where="id % 2 = 0", progress=lambda *a: None,
+    )
+
+    filled = sqlite_ops.execute(sa.text("SELECT count(*) FROM users WHERE email_lower IS NOT NULL")).scalar()
+    # Чётны `id` строк с чётным номером: 0, 2, ..., 24
+    assert updated == filled == 13
+
+
+def test_backfill_empty_table(sqlite_ops):
+    """Пустая таблица — ноль обновлений без ошибок."""
+    sqlite_ops.execute(sa.text("DELETE FROM users"))
+    sqlite_ops.commit()
+    assert backfill_column("users", "email_lower", "lower(email)") == 0
+
+
+def test_backfill_is_rejected_offline(pg_sql):
+    """В режиме `--sql` пачки вычислить нельзя."""
+    with pytest.raises(RuntimeError):
+        backfill_column("users", "email_lower", "lower(email)")
+
+
+def test_index_is_built_concurrently_outside_transaction(pg_sql):
+    """Индекс строится `CONCURRENTLY` после `COMMIT` транзакции миграции."""
+    create_index_concurrently("ux_users_email_lower", "users", [sa.text("lower(email)")], unique=True)
+    drop_index_concurrently("ux_users_email_lower", "users")
+
+    sql = pg_sql.getvalue()
+    assert "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ux_users_email_lower ON users (lower(email))" in sql
+    assert "DROP INDEX CONCURRENTLY IF EXISTS ux_users_email_lower" in sql
+    assert sql.index("COMMIT") < sql.index("CREATE UNIQUE INDEX CONCURRENTLY")
+
+
+def test_not_null_goes_through_validated_check(pg_sql):
+    """`SET NOT NULL` выполняется только после проверенного `CHECK ... NOT VALID`."""
+    add_foreign_key_not_valid("fk_orders_user", "orders", "users", ["user_id"], ["id"])
+    set_not_null("users", "email_lower")
+
+    sql = pg_sql.getvalue()
+    assert "FOREIGN KEY (user_id) REFERENCES users (id) NOT VALID" in sql
+    steps = [
+        "ADD CONSTRAINT users_email_lower_not_null CHECK (email_lower IS NOT NULL) NOT VALID",
+        "VALIDATE CONSTRAINT users_email_lower_not_null",
+        "ALTER COLUMN email_lower SET NOT NULL",
+        "DROP CONSTRAINT users_email_lower_not_null",
+    ]
+    positions = [sql.index(step) for step in steps]
+    assert positions == sorted(positions)
@@ -0,0 +1,85 @@
+"""Тесты загрузки заказов страницы пользователей без N+1 (SQLite, без Postgres)."""
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+
+from app.api.dao.user import UserDAO
+from app.database.models import Order, User, metadata_obj
+
+
+@pytest.fixture
+def engine():
+    """SQLite в памяти с 20 пользователями по 3 заказа у каждого."""
+    engine = create_engine("sqlite://")
+    metadata_obj.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"user_{i}@example.com", "full_name": f"User {i}", "is_hidden": False}
+            for i in range(1, 21)
+        ])
+        conn.execute(insert(Order), [
+            {"id": i * 10 + n, "user_id": i, "title": f"Order {n}", "amount": Decimal("9.99")}
+            for i in range(1, 21)
+            for n in range(3)
+        ])
+    yield engine
+    engine.dispose()
+
+
+def _count_statements(engine) -> list[str]:
+    """Подписывается на выполнение SQL и возвращает список выполненных выражений."""
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+@pytest.mark.parametrize("limit", [1, 5, 20])
+def test_page_with_orders_uses_two_statements(engine, limit: int):
+    """Страница любого размера загружается двумя запросами: пользователи + заказы через IN."""
+    statements = _count_statements(engine)
+    with Session(engine) as session:
+        users = session.execute(
+            UserDAO.page_with_orders_query(), {"limit": limit, "offset": 0}
+        ).scalars().all()
+        orders = [order.id for user in users for order in user.orders]
+
+    assert len(users) == limit
+    assert len(orders) == limit * 3
+    assert len(statements) == 2
+    assert " IN " in statements[1]
+
+
+def test_orders_are_ordered_by_id(engine):
+    """Заказы каждого пользователя идут по возрастанию `id`."""
+    with Session(engine) as session:
+        users = session.execute(
+            UserDAO.page_with_orders_query(), {"limit": 3, "offset": 2}
+        ).scalars().all()
+        assert [user.id for user in users] == [3, 4, 5]
+        assert all(
+            [order.id for order in user.orders] == sorted(order.id for order in user.orders)
+            for user in users
+        )
+
+
+def test_lazy_loading_orders_is_forbidden(engine):
+    """Без явной загрузки обращение к `User.orders` падает, а не выполняет запрос на пользователя."""
+    with Session(engine) as session:
+        user = session.execute(select(User).limit(1)).scalar_one()
+        with pytest.raises(InvalidRequestError):
+            user.orders
+
+
+def test_aggregated_query_is_single_statement():
+    """JSON-вариант собирает заказы подзапросом в том же выражении."""
+    sql = str(UserDAO.page_with_orders_aggregated_query().compile(dialect=postgresql.dialect()))
+
+    assert sql.count("SELECT") == 2
+    assert "json_agg" in sql
+    assert "ORDER BY orders.id" in sql
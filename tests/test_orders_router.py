@@ -0,0 +1,100 @@
+"""Интеграционные тесты маршрутов заказов и страницы пользователей с заказами (httpx.AsyncClient в транзакции теста, см. conftest.py)."""
+from __future__ import annotations
+
+from uuid import uuid4
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+from app.database.connection import db_connection
+
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def _create_user(client: httpx.AsyncClient) -> dict:
+    """Создает пользователя и возвращает его представление."""
+    resp = await client.post("/v1/users/", json={
+        "email": f"user_{uuid4()}@example.com",
+        "full_name": "Test User",
+        "is_hidden": False,
+    })
+    assert resp.status_code in (200, 201)
+    return resp.json()
+
+
+async def _create_order(client: httpx.AsyncClient, user_id: int, title: str = "Order") -> dict:
+    """Создает заказ пользователя и возвращает его представление."""
+    resp = await client.post("/v1/orders/", json={"user_id": user_id, "title": title, "amount": "19.99"})
+    assert resp.status_code in (200, 201)
+    return resp.json()
+
+
+async def test_create_order_and_get_by_id(client: httpx.AsyncClient):
+    """Создает заказ и извлекает его по id."""
+    user = await _create_user(client)
+    created = await _create_order(client, user["id"])
+
+    resp = await client.get(f"/v1/orders/{created['id']}")
+    assert resp.status_code == 200
+    assert resp.json()["user_id"] == user["id"]
+    assert resp.json()["amount"] == "19.99"
+
+
+async def test_create_order_for_missing_user_returns_404(client: httpx.AsyncClient):
+    """Заказ для несуществующего пользователя — 404, а не 500."""
+    resp = await client.post("/v1/orders/", json={"user_id": 0, "title": "Order", "amount": "1.00"})
+    assert resp.status_code == 404
+
+
+async def test_get_orders_by_user(client: httpx.AsyncClient):
+    """Список заказов пользователя упорядочен по id."""
+    user = await _create_user(client)
+    ids = [(await _create_order(client, user["id"], f"Order {n}"))["id"] for n in range(3)]
+
+    resp = await client.get("/v1/orders/", params={"user_id": user["id"]})
+    assert resp.status_code == 200
+    assert [order["id"] for order in resp.json()] == ids
+
+
+@pytest.mark.parametrize("strategy, expected_statements", [("selectin", 2), ("aggregate", 1)])
+async def test_users_with_orders_statement_count(client: httpx.AsyncClient, strategy: str, expected_statements: int):
+    """Количество SQL-запросов на страницу не зависит от числа пользователей на ней."""
+    for _ in range(5):
+        user = await _create_user(client)
+        for n in range(2):
+            await _create_order(client, user["id"], f"Order {n}")
+
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        # `set_config` дедлайна запроса (app.modules.deadline) — не чтение данных
+        if statement.lstrip().upper().startswith("SELECT") and "set_config('statement_timeout'" not in statement:
+            statements.append(statement)
+
+    sync_engine = db_connection.engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", count)
+    try:
+        resp = await client.get("/v1/users/with-orders", params={"limit": 50, "strategy": strategy})
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count)
+
+    assert resp.status_code == 200
+    page = resp.json()
+    assert len(page) >= 5
+    assert all(isinstance(user["orders"], list) for user in page)
+    assert len(statements) == expected_statements
+
+
+async def test_users_with_orders_strategies_agree(client: httpx.AsyncClient):
+    """Обе стратегии возвращают одинаковые данные."""
+    user = await _create_user(client)
+    await _create_order(client, user["id"])
+    params = {"limit": 500, "offset": 0}
+
+    selectin = (await client.get("/v1/users/with-orders", params={**params, "strategy": "selectin"})).json()
+    aggregate = (await client.get("/v1/users/with-orders", params={**params, "strategy": "aggregate"})).json()
+    assert [(u["id"], [o["id"] for o in u["orders"]]) for u in selectin] == [
+        (u["id"], [o["id"] for o in u["orders"]]) for u in aggregate
+    ]
@@ -0,0 +1,174 @@
+"""Регрессия планов запросов DAO: без последовательных сканирований и без роста стоимости.
+
+Каждый сценарий вызывает метод DAO на засеянной БД, перехватывает отправленные
+выражения и объясняет их `EXPLAIN (FORMAT JSON)`. Тест падает, если план читает
+`users` или `orders` через `Seq Scan` (кроме сценариев, которые читают таблицу
+целиком) или если стоимость выросла больше чем на `COST_TOLERANCE` относительно
+`query_plan_baseline.json`.
+
+Базовые стоимости записываются на эталонной БД:
+
+    UPDATE_PLAN_BASELINE=1 pytest tests/test_query_plans.py
+
+Стоимости зависят от версии Postgres и данных засева, поэтому файл обновляют
+вместе с осознанным изменением схемы или запросов. Локально выражение без
+базовой стоимости даёт предупреждение, а в CI (задана переменная `CI`) —
+падение теста, чтобы проверка стоимости не отключалась незаметно.
+"""
+from __future__ import annotations
+
+import json
+import os
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.api.dao.order import OrderDAO
+from app.api.dao.user import UserDAO
+from app.cli.seed_users import COLUMNS, SeedOptions, generate_batch
+from app.database.query_plans import capture_statements, explain, iter_nodes, seq_scans, total_cost
+
+
+BASELINE_PATH = Path(__file__).with_name("query_plan_baseline.json")
+COST_TOLERANCE = 1.25  # во сколько раз стоимость может превысить базовую
+SEED_ROWS = 20_000
+CHECKED_RELATIONS = ("users", "orders")
+
+
+@dataclass
+class Sample:
+    """Засеянная БД и значения для параметров запросов."""
+    session: AsyncSession
+    users: UserDAO
+    orders: OrderDAO
+    user_id: int
+    email: str
+    order_id: int
+
+
+# Сценарий: (вызов DAO, разрешён ли Seq Scan — для чтения таблицы целиком)
+SCENARIOS: dict[str, tuple[Callable[[Sample], Awaitable[object]], bool]] = {
+    "UserDAO.get_by_id": (lambda s: s.users.get_by_id(s.user_id, s.session), False),
+    "UserDAO.get_by_email": (lambda s: s.users.get_by_email(s.email.upper(), s.session), False),
+    "UserDAO.email_exists": (lambda s: s.users.email_exists(s.email, s.session), False),
+    "UserDAO.get_page_with_orders": (lambda s: s.users.get_page_with_orders(50, 1_000, s.session), False),
+    "UserDAO.get_page_with_orders_aggregated": (
+        lambda s: s.users.get_page_with_orders_aggregated(50, 1_000, s.session), False,
+    ),
+    "UserDAO.get_all": (lambda s: s.users.get_all(s.session), True),
+    "UserDAO.get_all_rows": (lambda s: s.users.get_all_rows(s.session), True),
+    "OrderDAO.get_by_id": (lambda s: s.orders.get_by_id(s.order_id, s.session), False),
+    "OrderDAO.get_by_user": (lambda s: s.orders.get_by_user(s.user_id, s.session), False),
+}
+
+
+PLAN = {
+    "Node Type": "Nested Loop",
+    "Total Cost": 42.5,
+    "Plans": [
+        {"Node Type": "Index Scan", "Relation Name": "users", "Total Cost": 8.3},
+        {"Node Type": "Seq Scan", "Relation Name": "orders", "Total Cost": 30.0},
+    ],
+}
+
+
+def test_plan_helpers():
+    """Обход узлов, поиск `Seq Scan` и итоговая стоимость."""
+    assert [node["Node Type"] for node in iter_nodes(PLAN)] == ["Nested Loop", "Index Scan", "Seq Scan"]
+    assert seq_scans(PLAN) == ["orders"]
+    assert seq_scans(PLAN, ["users"]) == []
+    assert total_cost(PLAN) == 42.5
+
+
+async def _seed(connection: AsyncConnection, session: AsyncSession) -> Sample:
+    """Засевает users и orders в транзакции теста и обновляет статистику планировщика."""
+    # Первое выражение через SQLAlchemy отправляет BEGIN (asyncpg открывает транзакцию лениво),
+    # иначе COPY ниже зафиксируется сам и переживёт откат теста
+    first_id = (await connection.execute(text("SELECT nextval('users_id_seq')"))).scalar_one()
+    await connection.execute(
+        text("SELECT setval('users_id_seq', :last_id)"), {"last_id": first_id + SEED_ROWS - 1}
+    )
+    raw = await connection.get_raw_connection()
+    options = SeedOptions(rows=SEED_ROWS, batch_size=SEED_ROWS)
+    await raw.driver_connection.copy_records_to_table(
+        "users", records=generate_batch(options, 0, first_id), columns=COLUMNS,
+    )
+    await connection.execute(text(
+        "INSERT INTO orders (user_id, title, amount) "
+        "SELECT id, 'Order ' || n, 10 * n FROM users CROSS JOIN generate_series(1, 2) AS n"
+    ))
+    await connection.execute(text("ANALYZE users, orders"))
+    user_id, email = (await connection.execute(
+        text("SELECT id, email FROM users ORDER BY id OFFSET :n LIMIT 1"), {"n": SEED_ROWS // 2}
+    )).one()
+    order_id = (await connection.execute(
+        text("SELECT id FROM orders WHERE user_id = :user_id LIMIT 1"), {"user_id": user_id}
+    )).scalar_one()
+    return Sample(session, UserDAO(), OrderDAO(), user_id, email, order_id)
+
+
+async def _vacuum(engine: AsyncEngine) -> None:
+    """
+    Убирает мёртвые строки засева предыдущих сценариев: они раздувают
+    таблицы и стоимость планов зависела бы от порядка тестов и автовакуума.
+    """
+    async with engine.connect() as connection:
+        autocommit = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await autocommit.execute(text("VACUUM users, orders"))
+
+
+def _load_baseline() -> dict[str, float]:
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+
+
+def _save_baseline(costs: dict[str, float]) -> None:
+    baseline = {**_load_baseline(), **costs}
+    BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("scenario", list(SCENARIOS))
+async def test_query_plan(
+    scenario: str,
+    db_engine: AsyncEngine,
+    db_conn: AsyncConnection,
+    db_session: AsyncSession,
+):
+    """Выражения сценария используют индексы и не дороже базовых."""
+    call, allow_seq_scan = SCENARIOS[scenario]
+    await _vacuum(db_engine)
+    sample = await _seed(db_conn, db_session)
+    with capture_statements(db_engine) as captured:
+        await call(sample)
+    assert captured, f"{scenario}: не перехвачено ни одного выражения"
+
+    baseline = _load_baseline()
+    costs: dict[str, float] = {}
+    problems: list[str] = []
+    for index, statement in enumerate(captured):
+        key = f"{scenario}[{index}]"
+        plan = await explain(db_conn, statement)
+        costs[key] = round(total_cost(plan), 2)
+        scans = seq_scans(plan, CHECKED_RELATIONS)
+        if scans and not allow_seq_scan:
+            problems.append(f"{key}: Seq Scan по {', '.join(scans)}\n{statement.sql}")
+        if key not in baseline:
+            missing = f"{key}: нет базовой стоимости, запишите UPDATE_PLAN_BASELINE=1"
+            if os.getenv("CI"):
+                problems.append(missing)
+            else:
+                warnings.warn(missing)
+        elif costs[key] > baseline[key] * COST_TOLERANCE:
+            problems.append(f"{key}: стоимость {costs[key]} > базовой {baseline[key]}\n{statement.sql}")
+
+    if os.getenv("UPDATE_PLAN_BASELINE"):
+        _save_baseline(costs)
+        problems = [problem for problem in problems if "Seq Scan" in problem]
+    assert not problems, "\n\n".join(problems)
@@ -0,0 +1,122 @@
+"""Тесты ограничения частоты: арифметика ведра, общее хранилище и миддлвейр с заголовками `RateLimit-*`."""
+from __future__ import annotations
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.middlewares.rate_limit import RateLimitMiddleware
+from app.modules.rate_limit import (
+    InProcessSharedStore,
+    MemoryRateLimitBackend,
+    RateLimitRule,
+    SharedRateLimitBackend,
+    take,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rule_parse_and_take():
+    """`"rate:burst"`, `"off"`; ведро пополняется со скоростью `rate` до `burst`."""
+    assert RateLimitRule.parse("2:10") == RateLimitRule(2.0, 10)
+    assert RateLimitRule.parse("5") == RateLimitRule(5.0, 5)
+    assert RateLimitRule.parse("off") is None
+    with pytest.raises(ValueError):
+        RateLimitRule.parse("0:1")
+
+    rule = RateLimitRule(2, 10)
+    assert take(0, 1.0, rule) == (True, 1.0)
+    assert take(0, 0.25, rule) == (False, 0.5)
+    assert take(9.5, 100, rule) == (True, 9.0)
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_refills_and_evicts():
+    """Всплеск до `burst`, затем отказ с `retry_after`; старые ключи вытесняются."""
+    clock = _Clock()
+    backend = MemoryRateLimitBackend(max_keys=2, clock=clock)
+    rule = RateLimitRule(1, 3)
+
+    decisions = [await backend.acquire("a", rule) for _ in range(4)]
+    assert [d.allowed for d in decisions] == [True, True, True, False]
+    assert decisions[-1].retry_after == pytest.approx(1.0)
+    assert decisions[-1].reset_after == pytest.approx(3.0)
+
+    clock.now += 1
+    assert (await backend.acquire("a", rule)).allowed
+
+    await backend.acquire("b", rule)
+    await backend.acquire("c", rule)
+    assert len(backend) == 2
+    # «a» вытеснен и начинает с полного ведра
+    assert (await backend.acquire("a", rule)).remaining == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_is_consistent_across_workers():
+    """Два «воркера» поверх одного хранилища делят ведро; при сбое хранилища решают локально."""
+    store = InProcessSharedStore(clock=_Clock())
+    worker_a, worker_b = SharedRateLimitBackend(store), SharedRateLimitBackend(store)
+    rule = RateLimitRule(1, 4)
+
+    allowed = [(await worker.acquire("client", rule)).allowed for worker in (worker_a, worker_b) * 3]
+    assert allowed == [True, True, True, True, False, False]
+
+    store.available = False
+    assert (await worker_a.acquire("client", rule)).allowed
+    assert worker_a.fallback_total == 1
+
+
+def _app(**options) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, **options)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_middleware_headers_429_and_route_rules():
+    """Заголовки `RateLimit-*`, 429 с `Retry-After`, своё ведро у маршрута, ключ API отделяет клиентов."""
+    app = _app(
+        default_rule=RateLimitRule(1, 100),
+        route_rules={"GET /items/{item_id}": RateLimitRule(0.5, 2), "GET /health": None},
+        backend=MemoryRateLimitBackend(),
+    )
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/items/1")
+        second = await client.get("/items/2")
+        limited = await client.get("/items/3")
+        other_client = await client.get("/items/3", headers={"X-API-Key": "secret"})
+        other_route = await client.get("/missing")
+        health = [await client.get("/health") for _ in range(3)]
+
+    assert first.status_code == 200
+    assert first.headers["RateLimit-Limit"] == "2"
+    assert first.headers["RateLimit-Remaining"] == "1"
+    assert first.headers["RateLimit-Policy"] == "2;w=4"
+    assert second.headers["RateLimit-Remaining"] == "0"
+
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "2"
+    assert limited.headers["RateLimit-Reset"] == "4"
+
+    assert other_client.status_code == 200
+    assert other_route.status_code == 404
+    assert other_route.headers["RateLimit-Limit"] == "100"
+    assert all(resp.status_code == 200 and "RateLimit-Limit" not in resp.headers for resp in health)
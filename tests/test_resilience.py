@@ -0,0 +1,141 @@
+"""Тесты устойчивости к сбоям БД: выключатель, повтор чтений с джиттером, 503 и healthcheck."""
+from __future__ import annotations
+
+import httpx
+import pytest
+from sqlalchemy.exc import DBAPIError, IntegrityError
+
+from app.database.connection import db_connection
+from app.modules.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    backoff_delays,
+    is_transient_db_error,
+    retry_transient,
+)
+
+
+class _PgError(Exception):
+    """Ошибка драйвера с SQLSTATE, как у адаптера asyncpg."""
+    def __init__(self, pgcode: str) -> None:
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+def _db_error(pgcode: str, cls: type[DBAPIError] = DBAPIError) -> DBAPIError:
+    return cls("SELECT 1", {}, _PgError(pgcode))
+
+
+def test_breaker_opens_probes_and_closes():
+    """Порог неудач размыкает; после паузы проходит ровно один пробный запрос."""
+    now = [0.0]
+    breaker = CircuitBreaker("db", failure_threshold=2, reset_timeout=5, clock=lambda: now[0])
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.retry_after == 5
+
+    now[0] = 5
+    assert breaker.state == "half_open"
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    # Неудачная проба снова размыкает на полный интервал
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.retry_after() == 5
+
+    now[0] = 10
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.snapshot() == {
+        "state": "closed", "consecutive_failures": 0, "retry_after": 0.0, "opened_total": 2, "rejected_total": 2,
+    }
+
+
+def test_cancelled_probe_is_released():
+    """Отменённая проба не оставляет выключатель в `half_open` навсегда."""
+    breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout=0, clock=lambda: 0.0)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+
+
+def test_transient_classification_and_backoff():
+    """Повторяются только ошибки соединения; паузы — в пределах экспоненты."""
+    assert is_transient_db_error(_db_error("08006"))
+    assert is_transient_db_error(_db_error("57P01"))
+    assert is_transient_db_error(ConnectionRefusedError())
+    assert not is_transient_db_error(_db_error("23505", IntegrityError))
+    assert not is_transient_db_error(_db_error("57014"))
+    assert not is_transient_db_error(TimeoutError())
+
+    assert list(backoff_delays(4, 0.1, 0.25, rng=lambda: 1.0)) == [0.1, 0.2, 0.25]
+    assert list(backoff_delays(1, 0.1, 1.0)) == []
+
+
+@pytest.mark.asyncio
+async def test_retry_transient():
+    """Обрыв связи повторяется, ошибка запроса — нет; разомкнутый выключатель прекращает повторы."""
+    calls = 0
+
+    async def flaky():
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise _db_error("08006")
+        return "ok"
+
+    assert await retry_transient(flaky, attempts=3, base_delay=0, max_delay=0) == "ok"
+    assert calls == 3
+
+    calls = 0
+
+    async def broken_sql():
+        nonlocal calls
+        calls += 1
+        raise _db_error("42703")
+
+    with pytest.raises(DBAPIError):
+        await retry_transient(broken_sql, attempts=3, base_delay=0, max_delay=0)
+    assert calls == 1
+
+    calls = 0
+    open_breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout=60)
+    open_breaker.record_failure()
+
+    async def down():
+        nonlocal calls
+        calls += 1
+        raise _db_error("08001")
+
+    with pytest.raises(DBAPIError):
+        await retry_transient(down, breaker=open_breaker, attempts=5, base_delay=0, max_delay=0)
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_fast_with_503(monkeypatch):
+    """При разомкнутом выключателе маршрут с сессией отвечает 503 без обращения к БД; healthcheck — 200."""
+    from main import app
+
+    breaker = CircuitBreaker("postgres", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    monkeypatch.setattr(db_connection, "_breaker", breaker)
+    monkeypatch.setattr(db_connection, "get_session", None)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/v1/orders/1")
+        health = await client.get("/v1/healthcheck/")
+
+    assert resp.status_code == 503
+    assert 0 < int(resp.headers["Retry-After"]) <= 30
+    assert health.status_code == 200
+    assert health.json()["database"]["state"] == "open"
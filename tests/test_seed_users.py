@@ -0,0 +1,41 @@
+"""Тесты генератора тестовых пользователей (без Postgres)."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from app.cli.seed_users import SeedOptions, generate_batch
+
+
+def test_batches_are_deterministic_and_independent():
+    """Пачка зависит только от зерна и номера, а не от порядка генерации."""
+    options = SeedOptions(rows=3000, batch_size=1000, seed=7)
+    forward = [generate_batch(options, i) for i in range(options.batches)]
+    backward = [generate_batch(options, i) for i in reversed(range(options.batches))][::-1]
+    assert forward == backward
+    assert generate_batch(SeedOptions(rows=3000, batch_size=1000, seed=8), 0) != forward[0]
+    # id — от начала зарезервированного блока и номера строки, а не от порядка загрузки
+    assert generate_batch(options, 2, first_id=-100)[0][0] == -100 + 2000
+
+
+def test_rows_are_unique_lowercase_and_within_period():
+    options = SeedOptions(rows=2500, batch_size=1000, days=30)
+    rows = [row for i in range(options.batches) for row in generate_batch(options, i)]
+    emails = [email for _, email, *_ in rows]
+
+    assert len(rows) == 2500
+    assert len(generate_batch(options, options.batches - 1)) == 500
+    assert len(set(emails)) == len(emails)
+    assert all(email == email.lower() for email in emails)
+    assert [user_id for user_id, *_ in rows] == list(range(1, 2501))
+    assert all(options.end - timedelta(days=30) <= created <= options.end for *_, created in rows)
+
+
+def test_hidden_ratio_and_recent_skew():
+    options = SeedOptions(rows=20000, batch_size=20000, hidden_ratio=0.1, days=100)
+    rows = generate_batch(options, 0)
+    hidden = sum(is_hidden for *_, is_hidden, _ in rows) / len(rows)
+    recent = sum(created > options.end - timedelta(days=50) for *_, created in rows) / len(rows)
+
+    assert 0.08 < hidden < 0.12
+    # Квадрат равномерной величины: ~71% регистраций во второй половине периода
+    assert recent > 0.65
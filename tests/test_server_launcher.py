@@ -0,0 +1,76 @@
+"""Тесты планирования воркеров и пула БД лаунчера сервера (без БД)."""
+from __future__ import annotations
+
+import pytest
+
+from app.server.launcher import (
+    build_options,
+    detect_http,
+    detect_loop,
+    make_worker_class,
+    plan_capacity,
+)
+
+
+def test_plan_keeps_pool_when_budget_allows():
+    """Если соединений хватает, желаемые размеры пула не меняются."""
+    plan = plan_capacity(cpu_count=2, max_connections=100, reserved_connections=10, pool_size=10, max_overflow=20)
+
+    assert (plan.workers, plan.pool_size, plan.max_overflow) == (2, 10, 20)
+    assert plan.total_connections <= plan.budget
+
+
+def test_plan_shrinks_pool_to_fit_budget():
+    """Пул каждого воркера уменьшается пропорционально, сумма укладывается в бюджет."""
+    plan = plan_capacity(cpu_count=8, max_connections=100, reserved_connections=10, pool_size=10, max_overflow=20)
+
+    assert plan.workers == 8
+    assert plan.connections_per_worker == 90 // 8
+    assert plan.pool_size >= 1
+    assert plan.total_connections <= 90
+
+
+def test_plan_limits_workers_by_budget():
+    """Воркеров не больше, чем соединений в бюджете."""
+    plan = plan_capacity(
+        cpu_count=2, max_connections=5, reserved_connections=2, pool_size=5, max_overflow=5, workers=8
+    )
+
+    assert plan.workers == 3
+    assert (plan.pool_size, plan.max_overflow) == (1, 0)
+
+
+def test_plan_reserves_dedicated_connections():
+    """Соединение слушателя LISTEN каждого воркера входит в бюджет."""
+    plan = plan_capacity(
+        cpu_count=4, max_connections=50, reserved_connections=10, pool_size=10, max_overflow=20,
+        dedicated_per_worker=1,
+    )
+
+    assert plan.workers == 4
+    assert plan.connections_per_worker == 10
+    assert plan.pool_size + plan.max_overflow == 9
+    assert plan.total_connections <= 40
+
+
+def test_plan_rejects_empty_budget():
+    """Резерв, равный max_connections, — ошибка конфигурации."""
+    with pytest.raises(ValueError):
+        plan_capacity(cpu_count=4, max_connections=10, reserved_connections=10, pool_size=5, max_overflow=5)
+
+
+def test_worker_class_uses_detected_loop_and_http():
+    """Класс воркера и настройки gunicorn получают выбранные loop/http."""
+    loop, http = detect_loop(), detect_http()
+    assert loop in ("uvloop", "asyncio")
+    assert http in ("httptools", "h11")
+
+    worker_class = make_worker_class(loop, http)
+    assert worker_class.CONFIG_KWARGS["loop"] == loop
+    assert worker_class.CONFIG_KWARGS["http"] == http
+
+    plan = plan_capacity(cpu_count=2, max_connections=100, reserved_connections=10, pool_size=5, max_overflow=5)
+    options = build_options(plan, "0.0.0.0", 8000, keepalive=5, backlog=2048, preload=True, graceful_timeout=30)
+    assert options["workers"] == 2
+    assert options["bind"] == "0.0.0.0:8000"
+    assert callable(options["post_fork"])
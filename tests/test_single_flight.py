@@ -0,0 +1,133 @@
+"""Тесты объединения одинаковых конкурентных чтений (single-flight)."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.modules.coalescing import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    """Одновременные вызовы с одним ключом — одно выполнение; разные ключи и последующие вызовы — свои."""
+    flight: SingleFlight[tuple, int] = SingleFlight()
+    release = asyncio.Event()
+    calls: list[tuple] = []
+
+    def read(key: tuple):
+        async def run() -> int:
+            calls.append(key)
+            await release.wait()
+            return len(calls)
+        return run
+
+    waiters = [asyncio.create_task(flight.do(("user", 1), read(("user", 1)))) for _ in range(10)]
+    other = asyncio.create_task(flight.do(("user", 2), read(("user", 2))))
+    await asyncio.sleep(0)
+    assert flight.stats()["in_flight"] == 2
+    release.set()
+
+    results = await asyncio.gather(*waiters)
+    assert len(set(results)) == 1
+    await other
+    assert calls == [("user", 1), ("user", 2)]
+
+    await flight.do(("user", 1), read(("user", 1)))
+    stats = flight.stats()
+    assert stats["executions"] == 3
+    assert stats["coalesced"] == 9
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared():
+    """Исключение выполнения получают все объединённые вызовы."""
+    flight: SingleFlight[str, int] = SingleFlight()
+
+    async def failing() -> int:
+        await asyncio.sleep(0)
+        raise LookupError("нет")
+
+    tasks = [asyncio.create_task(flight.do("k", failing)) for _ in range(3)]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(result, LookupError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_leader_cancellation_does_not_cancel_followers():
+    """Отключение первого клиента не прерывает чтение; уход всех — отменяет его."""
+    flight: SingleFlight[str, str] = SingleFlight()
+    release = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def read() -> str:
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "ok"
+
+    leader = asyncio.create_task(flight.do("k", read))
+    follower = asyncio.create_task(flight.do("k", read))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await follower == "ok"
+    assert leader.cancelled()
+    assert not cancelled.is_set()
+
+    release.clear()
+    lonely = asyncio.create_task(flight.do("k", read))
+    await asyncio.sleep(0)
+    lonely.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await lonely
+    await asyncio.sleep(0)
+    assert cancelled.is_set()
+    assert flight.stats()["abandoned"] == 1
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_follower_waits_no_longer_than_own_deadline(monkeypatch):
+    """Вызов с коротким дедлайном получает 504, не дожидаясь чтения первого вызова с длинным дедлайном."""
+    from contextlib import asynccontextmanager
+
+    from app.api.dao import base
+    from app.api.dao.base import BaseDAO
+    from app.api.exceptions.base import GatewayTimeoutException
+    from app.modules.deadline import Deadline, set_current_deadline
+
+    class _Db:
+        @asynccontextmanager
+        async def get_session(self):
+            yield object()
+
+    dao = BaseDAO()
+    dao.db = _Db()
+    dao.single_flight = SingleFlight()
+    monkeypatch.setattr(dao, "run_read", lambda session, read: read())
+    monkeypatch.setattr(base, "bind_statement_timeout", lambda session, deadline, default_ms=0: None)
+    release = asyncio.Event()
+
+    async def read(session) -> str:
+        await release.wait()
+        return "rows"
+
+    async def call(timeout_ms: int) -> str:
+        set_current_deadline(Deadline(timeout_ms))
+        return await dao.run_shared_read(None, "page", read)
+
+    leader = asyncio.create_task(call(10_000))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(call(50))
+    with pytest.raises(GatewayTimeoutException):
+        await asyncio.wait_for(follower, 1)
+    assert not leader.done()
+
+    release.set()
+    assert await leader == "rows"
+    assert dao.single_flight.stats()["coalesced"] == 1
@@ -0,0 +1,77 @@
+"""Тесты реестра заранее собранных SQL-выражений DAO (без БД)."""
+from __future__ import annotations
+
+import gc
+
+import pytest
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.dialects import postgresql
+
+from app.api.dao.base import BaseDAO
+from app.api.dao.statements import StatementRegistry
+from app.database.models import User
+
+
+def test_registry_builds_statement_once():
+    """Фабрика вызывается один раз, дальше выражение берётся из реестра."""
+    registry = StatementRegistry("TestDAO")
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return select(User).where(User.id == bindparam("user_id"))
+
+    first = registry.get("get_by_id", factory)
+    second = registry.get("get_by_id", factory)
+
+    assert first is second
+    assert len(calls) == 1
+    assert registry.builds == 1
+    assert registry.snapshot() == {"get_by_id": 2}
+
+
+def test_registry_statement_has_stable_sql():
+    """Выражение из реестра компилируется в ожидаемый SQL с одним `bindparam`."""
+    dialect = postgresql.asyncpg.dialect()
+    registry = StatementRegistry("TestDAO")
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return select(User).where(User.id == bindparam("user_id"))
+
+    compiled = [registry.get("get_by_id", factory).compile(dialect=dialect) for _ in range(2)]
+
+    assert len(calls) == 1
+    for statement in compiled:
+        assert str(statement) == (
+            "SELECT users.id, users.email, users.full_name, users.is_hidden, users.created_at \n"
+            "FROM users \n"
+            "WHERE users.id = $1::BIGINT"
+        )
+        assert statement.positiontup == ["user_id"]
+        assert set(statement.binds) == {"user_id"}
+
+
+@pytest.fixture
+def dao_classes():
+    """
+    Временные наследники `BaseDAO`: после теста они удаляются и пропадают
+    из глобальной статистики `/v1/metrics/statements`.
+    """
+    names = ("FirstDAO", "SecondDAO")
+    classes = [type(name, (BaseDAO,), {"__module__": __name__}) for name in names]
+    yield classes
+    classes.clear()
+    gc.collect()
+    assert not set(names) & set(BaseDAO.statement_stats())
+
+
+def test_each_dao_class_has_own_registry(dao_classes):
+    """Наследники `BaseDAO` получают собственные реестры."""
+    first, second = dao_classes
+
+    assert first.statements is not second.statements
+    assert first.statements.owner == "FirstDAO"
+    assert {"FirstDAO", "SecondDAO"} <= set(BaseDAO.statement_stats())
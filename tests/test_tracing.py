@@ -0,0 +1,135 @@
+"""Тесты трассировки: семплирование, traceparent, вложенность спанов HTTP → DAO → SQL (без Postgres)."""
+from __future__ import annotations
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.modules.tracing import (
+    InMemorySpanExporter,
+    JsonlFileSpanExporter,
+    NoopTracer,
+    TraceIdRatioSampler,
+    Tracer,
+    TracingMiddleware,
+    get_tracer,
+    install_sqlalchemy_instrumentation,
+    parse_traceparent,
+    set_tracer,
+    traced,
+    uninstall_sqlalchemy_instrumentation,
+)
+
+
+@pytest.fixture
+def exporter():
+    """Трассировщик приложения с экспортом в память на время теста."""
+    exporter = InMemorySpanExporter()
+    set_tracer(Tracer(exporter))
+    install_sqlalchemy_instrumentation()
+    yield exporter
+    uninstall_sqlalchemy_instrumentation()
+    set_tracer(NoopTracer())
+
+
+def test_sampling_decision_is_inherited():
+    """Трасса вне выборки не записывает ни корневой, ни дочерние спаны."""
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter, TraceIdRatioSampler(0.0))
+
+    with tracer.span("root") as root:
+        with tracer.span("child") as child:
+            assert child.trace_id == root.trace_id
+
+    assert not root.sampled
+    assert exporter.get_finished_spans() == []
+
+
+def test_traceparent_continues_remote_trace():
+    """Входящий traceparent задаёт trace_id, родителя и решение о записи."""
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter, TraceIdRatioSampler(0.0))
+    header = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+    with tracer.span("server", parent=parse_traceparent(header)) as span:
+        pass
+
+    assert span.to_dict()["trace_id"] == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert span.to_dict()["parent_span_id"] == "00f067aa0ba902b7"
+    assert exporter.get_finished_spans() == [span]
+    assert parse_traceparent("garbage") is None
+
+
+def test_request_dao_sql_spans_are_nested(exporter):
+    """Спан SQL — дочерний для спана DAO, а тот — для серверного спана запроса."""
+    engine = create_engine("sqlite://")
+
+    @traced("FakeDAO.get")
+    async def get_value(value: int) -> int:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT :value"), {"value": value}).scalar_one()
+
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"value": await get_value(item_id)}
+
+    with TestClient(app) as client:
+        response = client.get("/items/7", headers={"traceparent": "00-" + "1" * 32 + "-" + "2" * 16 + "-01"})
+
+    assert response.json() == {"value": 7}
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    server, dao, sql = spans["GET /items/{item_id}"], spans["FakeDAO.get"], spans["SELECT"]
+    assert server.parent_span_id == 0x2222222222222222
+    assert dao.parent_span_id == server.span_id
+    assert sql.parent_span_id == dao.span_id
+    assert sql.attributes["db.statement"].startswith("SELECT")
+    assert server.attributes["http.response.status_code"] == 200
+    assert response.headers["traceparent"].split("-")[1] == "1" * 32
+
+
+def test_sql_error_is_recorded(exporter):
+    """Ошибка SQL помечает спан запроса статусом ERROR."""
+    engine = create_engine("sqlite://")
+
+    with get_tracer().span("root"):
+        with engine.connect() as conn, pytest.raises(Exception):
+            conn.execute(text("SELECT * FROM missing_table"))
+
+    sql = [span for span in exporter.get_finished_spans() if span.kind == "client"]
+    assert sql and sql[0].status == "ERROR"
+
+
+@pytest.mark.asyncio
+async def test_disabled_tracing_is_transparent():
+    """С NoopTracer декоратор и спаны ничего не записывают и не мешают."""
+    set_tracer(NoopTracer())
+
+    @traced()
+    async def work() -> int:
+        return 42
+
+    assert await work() == 42
+    with get_tracer().span("noop") as span:
+        assert not span.sampled
+
+
+def test_jsonl_exporter_writes_on_shutdown(tmp_path):
+    """Файловый экспортёр дописывает спаны построчно при остановке."""
+    path = tmp_path / "traces" / "spans.jsonl"
+    tracer = Tracer(JsonlFileSpanExporter(path, batch_size=100), service_name="test")
+
+    with tracer.span("a"):
+        with tracer.span("b"):
+            pass
+    assert not path.exists()
+    tracer.shutdown()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["b", "a"]
+    assert lines[0]["resource"] == {"service.name": "test"}
@@ -0,0 +1,121 @@
+"""Тесты архива скрытых пользователей: схема, прозрачные чтения `UserDAO` и перенос пачкой."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.schema import CreateTable
+
+from app.api.dao.user import UserDAO
+from app.database.models import UserArchive, metadata_obj
+from app.modules.archive import ARCHIVE_BATCH_SQL, ARCHIVE_PARTITION_PATTERN
+from app.modules.index_advisor import model_indexes
+
+
+def test_archive_table_is_partitioned_and_skipped_by_advisor():
+    """`users_archive` секционирована по `archived_at`; советник не ждёт её индексов."""
+    ddl = str(CreateTable(UserArchive.__table__).compile(dialect=postgresql.dialect()))
+    assert "PRIMARY KEY (id, archived_at)" in ddl
+    assert ddl.rstrip().endswith("PARTITION BY RANGE (archived_at)")
+
+    declared = model_indexes(metadata_obj)
+    assert "ix_users_archive_email_lower" not in declared
+    assert declared["ix_users_hidden_hidden_at"] == "users_hidden"
+
+    assert ARCHIVE_PARTITION_PATTERN.match("users_archive_2026_10")
+    assert not ARCHIVE_PARTITION_PATTERN.match("users_archive")
+    # asyncpg не выведет interval для `now() - $1` сам
+    assert "now() - CAST(:hidden_for AS interval)" in ARCHIVE_BATCH_SQL.text
+
+
+def test_user_dao_reads_fall_back_to_archive(monkeypatch):
+    """С `USER_ARCHIVE_ENABLED` промах по `users` ищется в архиве; списки и проверка email видят архив."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.config.config_reader import env_config
+
+    monkeypatch.setattr(env_config, "user_archive_enabled", True)
+    monkeypatch.setattr(env_config, "user_cache_enabled", False)
+    monkeypatch.setattr(env_config, "user_write_coalesce_enabled", False)
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR(255) NOT NULL UNIQUE, "
+                "full_name TEXT NOT NULL, is_hidden BOOLEAN NOT NULL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            ))
+            await conn.execute(text(
+                "CREATE TABLE users_archive (id INTEGER NOT NULL, email VARCHAR(255) NOT NULL, "
+                "full_name TEXT NOT NULL, is_hidden BOOLEAN NOT NULL, created_at DATETIME NOT NULL, "
+                "hidden_at DATETIME NOT NULL, archived_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            ))
+            await conn.execute(text(
+                "INSERT INTO users (id, email, full_name, is_hidden) VALUES (1, 'hot@example.com', 'Hot', 0)"
+            ))
+            await conn.execute(text(
+                "INSERT INTO users_archive (id, email, full_name, is_hidden, created_at, hidden_at) "
+                "VALUES (2, 'cold@example.com', 'Cold', 1, '2025-01-01 00:00:00', '2025-02-01 00:00:00')"
+            ))
+        dao = UserDAO()
+        try:
+            async with AsyncSession(engine) as session:
+                async with session.begin():
+                    return (
+                        await dao.get_by_id(1, session),
+                        await dao.get_by_id(2, session),
+                        await dao.get_by_id(3, session),
+                        await dao.get_by_email("COLD@example.com", session),
+                        await dao.email_exists("cold@example.com", session),
+                        await dao.email_exists("free@example.com", session),
+                        await dao.get_all(session),
+                    )
+        finally:
+            await engine.dispose()
+
+    hot, cold, missing, by_email, taken, free, everyone = asyncio.run(scenario())
+    assert hot.email == "hot@example.com"
+    assert cold.id == 2 and cold.is_hidden is True
+    assert missing is None
+    assert by_email.id == 2
+    assert taken is True and free is False
+    assert sorted(user.id for user in everyone) == [1, 2]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_archive_batch_moves_long_hidden_users(db_conn: AsyncConnection):
+    """Пачка переносит давно скрытого пользователя без заказов; его email остаётся занятым."""
+    user_id = (await db_conn.execute(text(
+        "INSERT INTO users (email, full_name, is_hidden) VALUES ('archived@example.com', 'A', true) RETURNING id"
+    ))).scalar_one()
+    await db_conn.execute(text(
+        "INSERT INTO users (email, full_name, is_hidden) VALUES ('recent@example.com', 'R', true)"
+    ))
+    await db_conn.execute(
+        text("UPDATE users_hidden SET hidden_at = now() - interval '100 days' WHERE user_id = :id"),
+        {"id": user_id},
+    )
+
+    moved = await db_conn.execute(ARCHIVE_BATCH_SQL, {"hidden_for": timedelta(days=90), "batch_size": 10})
+    assert moved.rowcount == 1
+    assert (await db_conn.execute(text("SELECT count(*) FROM users WHERE id = :id"), {"id": user_id})).scalar() == 0
+    archived = (await db_conn.execute(
+        text("SELECT email FROM users_archive WHERE id = :id"), {"id": user_id}
+    )).scalar_one()
+    assert archived == "archived@example.com"
+
+    savepoint = await db_conn.begin_nested()
+    with pytest.raises(IntegrityError) as exc_info:
+        await db_conn.execute(text(
+            "INSERT INTO users (email, full_name, is_hidden) VALUES ('Archived@example.com', 'B', false)"
+        ))
+    await savepoint.rollback()
+    assert exc_info.value.orig.pgcode == "23505"
+    # Триггер сообщает имя индекса, по которому UserDAO отличает занятый email
+    assert UserDAO._is_unique_violation(exc_info.value, UserDAO.EMAIL_CONSTRAINTS)
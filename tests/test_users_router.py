@@ -1,19 +1,13 @@
-"""Интеграционные тесты маршрутов пользователей API v1 (FastAPI TestClient)."""
+"""Интеграционные тесты маршрутов пользователей API v1 (httpx.AsyncClient в транзакции теста, см. conftest.py)."""
 from __future__ import annotations
 
 from uuid import uuid4
 
+import httpx
 import pytest
-from fastapi.testclient import TestClient
 
-from main import app
 
-
-@pytest.fixture(scope="module")
-def client():
-    """Создает `TestClient` c поддержкой lifespan для интеграционных тестов."""
-    with TestClient(app) as test_client:
-        yield test_client
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
 
 def _create_user_payload():
@@ -25,11 +19,11 @@ def _create_user_payload():
     }
 
 
-def test_create_user_and_get_by_id(client: TestClient):
+async def test_create_user_and_get_by_id(client: httpx.AsyncClient):
     """Создает пользователя и извлекает его по id."""
     payload = _create_user_payload()
 
-    resp_create = client.post("/v1/users/", json=payload)
+    resp_create = await client.post("/v1/users/", json=payload)
     assert resp_create.status_code in (200, 201)
     created = resp_create.json()
     user_id = created["id"]
@@ -38,7 +32,7 @@ def test_create_user_and_get_by_id(client: TestClient):
     assert created["full_name"] == payload["full_name"]
     assert created["is_hidden"] is payload["is_hidden"]
 
-    resp_get = client.get(f"/v1/users/{user_id}")
+    resp_get = await client.get(f"/v1/users/{user_id}")
     assert resp_get.status_code == 200
     fetched = resp_get.json()
 
@@ -47,20 +41,81 @@ def test_create_user_and_get_by_id(client: TestClient):
     assert fetched["full_name"] == payload["full_name"]
 
 
-def test_get_all_contains_created_user(client: TestClient):
+async def test_get_all_contains_created_user(client: httpx.AsyncClient):
     """Убеждаемся, что созданный пользователь присутствует в списке."""
     payload = _create_user_payload()
-    resp_create = client.post("/v1/users/", json=payload)
+    resp_create = await client.post("/v1/users/", json=payload)
     assert resp_create.status_code in (200, 201)
     created = resp_create.json()
 
-    resp_all = client.get("/v1/users/")
+    resp_all = await client.get("/v1/users/")
     assert resp_all.status_code == 200
     all_users = resp_all.json()
     assert any(u["id"] == created["id"] for u in all_users)
 
 
-def test_get_by_id_not_found(client: TestClient):
+async def test_get_by_id_not_found(client: httpx.AsyncClient):
     """Запрос несуществующего пользователя возвращает 404."""
-    resp = client.get("/v1/users/999999999")
+    resp = await client.get("/v1/users/999999999")
     assert resp.status_code == 404
+
+
+async def test_bulk_create_users(client: httpx.AsyncClient):
+    """Пакетно создает пользователей и возвращает их в порядке запроса."""
+    payload = [_create_user_payload() for _ in range(3)]
+
+    resp = await client.post("/v1/users/bulk", json=payload)
+    assert resp.status_code == 200
+    created = resp.json()
+
+    assert [u["email"] for u in created] == [p["email"] for p in payload]
+    assert all("id" in u for u in created)
+
+
+async def test_email_available(client: httpx.AsyncClient):
+    """Созданный email занят, новый — свободен."""
+    payload = _create_user_payload()
+    assert (await client.post("/v1/users/", json=payload)).status_code in (200, 201)
+
+    taken = await client.get("/v1/users/email-available", params={"email": payload["email"]})
+    free = await client.get("/v1/users/email-available", params={"email": f"free_{uuid4()}@example.com"})
+    assert taken.json()["available"] is False
+    assert free.json()["available"] is True
+
+
+async def test_email_is_case_insensitive(client: httpx.AsyncClient):
+    """Email хранится в нижнем регистре, ищется без учёта регистра, дубль по регистру — 409."""
+    payload = _create_user_payload()
+    payload["email"] = payload["email"].upper()
+    resp_create = await client.post("/v1/users/", json=payload)
+    assert resp_create.status_code in (200, 201)
+    assert resp_create.json()["email"] == payload["email"].lower()
+
+    resp_get = await client.get(f"/v1/users/by-email/{payload['email']}")
+    assert resp_get.status_code == 200
+    assert resp_get.json()["id"] == resp_create.json()["id"]
+
+    resp_dup = await client.post("/v1/users/", json={**payload, "email": payload["email"].lower()})
+    assert resp_dup.status_code == 409
+
+
+async def test_get_by_email_not_found(client: httpx.AsyncClient):
+    """Несуществующий email — 404."""
+    resp = await client.get(f"/v1/users/by-email/missing_{uuid4()}@example.com")
+    assert resp.status_code == 404
+
+
+async def test_export_csv_filters_hidden(client: httpx.AsyncClient):
+    """CSV-выгрузка через COPY содержит заголовок и учитывает фильтр `is_hidden`."""
+    visible = _create_user_payload()
+    hidden = {**_create_user_payload(), "is_hidden": True}
+    for payload in (visible, hidden):
+        assert (await client.post("/v1/users/", json=payload)).status_code in (200, 201)
+
+    resp = await client.get("/v1/users/export", params={"format": "csv", "is_hidden": "false"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    lines = resp.text.splitlines()
+    assert lines[0] == "id,email,full_name,is_hidden,created_at"
+    assert any(visible["email"] in line for line in lines)
+    assert not any(hidden["email"] in line for line in lines)
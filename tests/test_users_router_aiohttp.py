@@ -18,8 +18,13 @@ def _base_url() -> str:
 
 @pytest_asyncio.fixture()
 async def client():
-    """Создает aiohttp ClientSession с базовым URL для тестов."""
+    """Создает aiohttp ClientSession с базовым URL; без запущенного сервера тест пропускается."""
     async with aiohttp.ClientSession(base_url=_base_url()) as session:
+        try:
+            async with session.get("/docs", timeout=aiohttp.ClientTimeout(total=2)):
+                pass
+        except (aiohttp.ClientConnectionError, TimeoutError):
+            pytest.skip(f"API не запущен на {_base_url()}")
         yield session
 
 
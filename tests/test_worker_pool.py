@@ -0,0 +1,108 @@
+"""Тесты выноса валидации и сериализации в пул исполнителей (без БД)."""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from app.api.v1.models.batch import dump_users_json, validate_new_users_json
+from app.modules.offload.pool import WorkerPool, WorkerPoolOverloaded
+
+
+def _thread_name(_: object = None) -> str:
+    """Возвращает имя потока, в котором выполнена функция."""
+    return threading.current_thread().name
+
+
+def _slow(seconds: float) -> float:
+    """Имитирует тяжёлую синхронную работу."""
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.mark.asyncio
+async def test_offloads_only_above_threshold():
+    """Маленькие задачи выполняются на месте, большие — в пуле."""
+    pool = WorkerPool(kind="thread", min_items=10)
+    try:
+        inline = await pool.maybe_offload(_thread_name, None, items=1)
+        offloaded = await pool.maybe_offload(_thread_name, None, items=10)
+    finally:
+        pool.shutdown()
+    assert inline == threading.current_thread().name
+    assert offloaded.startswith("offload")
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full():
+    """Сверх `max_workers + max_queue` задачи отклоняются сразу."""
+    pool = WorkerPool(kind="thread", max_workers=1, max_queue=1)
+    try:
+        running = asyncio.create_task(pool.run(_slow, 0.2))
+        await asyncio.sleep(0.01)
+        queued = asyncio.create_task(pool.run(_slow, 0.01))
+        await asyncio.sleep(0.01)
+        with pytest.raises(WorkerPoolOverloaded):
+            await pool.run(_slow, 0.01)
+        assert await running == 0.2
+        assert await queued == 0.01
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_task_keeps_slot_until_work_finishes():
+    """Отмена ожидающей корутины не освобождает слот, пока работа идёт в исполнителе."""
+    pool = WorkerPool(kind="thread", max_workers=1, max_queue=0)
+    try:
+        running = asyncio.create_task(pool.run(_slow, 0.2))
+        await asyncio.sleep(0.01)
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        with pytest.raises(WorkerPoolOverloaded):
+            await pool.run(_slow, 0.01)
+        await asyncio.sleep(0.3)
+        assert await pool.run(_slow, 0.01) == 0.01
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_runs_batch_functions():
+    """Пакетные функции работают в пуле процессов (данные сериализуемы)."""
+    body = json.dumps([
+        {"email": f"user_{i}@example.com", "full_name": "Test User"} for i in range(3)
+    ]).encode()
+    pool = WorkerPool(kind="process", max_workers=1)
+    try:
+        users, errors = await pool.run(validate_new_users_json, body)
+    finally:
+        pool.shutdown()
+    assert errors == []
+    assert [u["email"] for u in users] == [f"user_{i}@example.com" for i in range(3)]
+    assert users[0]["is_hidden"] is False
+
+
+def test_validation_errors_are_returned_as_data():
+    """Ошибки валидации возвращаются списком с позицией элемента."""
+    users, errors = validate_new_users_json(b'[{"email": "bad", "full_name": "x"}]')
+    assert users == []
+    assert errors[0]["loc"] == (0, "email")
+
+
+def test_dump_users_json_matches_response_schema():
+    """Сериализация строк БД совпадает со схемой `UserResponseModel`."""
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = [{
+        "id": 1, "email": "a@example.com", "full_name": "A",
+        "is_hidden": False, "created_at": created_at,
+    }]
+    assert json.loads(dump_users_json(rows)) == [{
+        "email": "a@example.com", "full_name": "A", "is_hidden": False,
+        "id": 1, "created_at": "2025-01-01T00:00:00Z",
+    }]
@@ -0,0 +1,111 @@
+"""Тесты объединения конкурентных вставок в пачки (без БД)."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.api.dao.user import UserDAO
+from app.api.exceptions.user import UserAlreadyExistsException
+from app.modules.coalescing import WriteCoalescer
+
+
+class _FakeStore:
+    """Имитирует запись пачки: запоминает пачки, отклоняет занятые ключи."""
+
+    def __init__(self, taken: set[str] | None = None) -> None:
+        self.batches: list[list[str]] = []
+        self.taken = taken or set()
+
+    async def flush(self, items: list[str]) -> list[str | BaseException]:
+        self.batches.append(list(items))
+        await asyncio.sleep(0)
+        return [ValueError(item) if item in self.taken else item.upper() for item in items]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submits_share_one_batch():
+    """Записи, пришедшие в одном окне, уходят одной пачкой."""
+    store = _FakeStore()
+    coalescer = WriteCoalescer(store.flush, max_batch=100, max_delay=0.01)
+
+    results = await asyncio.gather(*(coalescer.submit(f"u{i}") for i in range(10)))
+
+    assert results == [f"U{i}" for i in range(10)]
+    assert store.batches == [[f"u{i}" for i in range(10)]]
+    assert coalescer.stats()["mean_batch"] == 10
+
+
+@pytest.mark.asyncio
+async def test_max_batch_flushes_without_waiting():
+    """Полная пачка отправляется сразу, не дожидаясь окна."""
+    store = _FakeStore()
+    coalescer = WriteCoalescer(store.flush, max_batch=3, max_delay=10)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(coalescer.submit(str(i)) for i in range(6))),
+        timeout=1,
+    )
+
+    assert results == [str(i) for i in range(6)]
+    assert [len(batch) for batch in store.batches] == [3, 3]
+
+
+@pytest.mark.asyncio
+async def test_per_item_error_reaches_only_its_caller():
+    """Ошибка одного элемента не влияет на остальные элементы пачки."""
+    store = _FakeStore(taken={"b"})
+    coalescer = WriteCoalescer(store.flush, max_delay=0.001)
+
+    results = await asyncio.gather(
+        *(coalescer.submit(item) for item in "abc"),
+        return_exceptions=True,
+    )
+
+    assert results[0] == "A" and results[2] == "C"
+    assert isinstance(results[1], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_reaches_every_caller():
+    """Падение записи пачки целиком получают все ожидающие."""
+    async def broken(items: list[str]) -> list[str]:
+        raise ConnectionError("db down")
+
+    coalescer = WriteCoalescer(broken, max_delay=0.001)
+    results = await asyncio.gather(
+        *(coalescer.submit(item) for item in "ab"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(res, ConnectionError) for res in results)
+
+
+@pytest.mark.asyncio
+async def test_drain_flushes_pending_items():
+    """drain отправляет накопленное, не дожидаясь окна."""
+    store = _FakeStore()
+    coalescer = WriteCoalescer(store.flush, max_delay=60)
+
+    pending = asyncio.ensure_future(coalescer.submit("x"))
+    await asyncio.sleep(0)
+    await asyncio.wait_for(coalescer.drain(), timeout=1)
+
+    assert await pending == "X"
+
+
+def test_match_inserted_rows_reports_conflicts():
+    """Строки RETURNING сопоставляются по email; занятые и дубли — конфликт."""
+    users = [
+        {"email": "a@example.com", "full_name": "A"},
+        {"email": "taken@example.com", "full_name": "T"},
+        {"email": "a@example.com", "full_name": "A2"},
+    ]
+    inserted = [{"id": 1, "email": "a@example.com", "full_name": "A"}]
+
+    results = UserDAO.match_inserted_rows(users, inserted)
+
+    assert results[0] == inserted[0]
+    assert isinstance(results[1], UserAlreadyExistsException)
+    assert isinstance(results[2], UserAlreadyExistsException)
+    assert results[1].status_code == 409